@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+DAG parse-time benchmark for ocp4-disconnected-helper
+
+Imports every DAG file in airflow/dags/ the way the scheduler's DAG file
+processor does, each in a fresh interpreter, with a lightweight stand-in for
+the airflow package so it runs anywhere (CI, laptops) without an Airflow
+install. Reports per-file parse time, memory and inline template size, and
+fails when the folder total exceeds the budget.
+
+Usage:
+    ./benchmark-dag-parse.py                      # table, budget check
+    ./benchmark-dag-parse.py --runs 5             # median of 5 cold imports
+    ./benchmark-dag-parse.py --budget-ms 500
+    ./benchmark-dag-parse.py --json results.json  # machine-readable, for tracking
+"""
+
+import argparse
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import types
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DAGS_DIR = os.path.join(SCRIPT_DIR, "dags")
+DAG_PREFIX = "ocp_"
+DEFAULT_BUDGET_MS = 100
+
+
+# =============================================================================
+# Airflow stand-in (child process only)
+# =============================================================================
+
+class _StubMeta(type):
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return name                                  # TriggerRule.ONE_FAILED, ...
+
+
+class _Stub(metaclass=_StubMeta):
+    """Accepts any constructor arguments and supports task dependency operators."""
+
+    created = []
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        _Stub.created.append(self)
+
+    def __rshift__(self, other):
+        return other
+
+    def __lshift__(self, other):
+        return other
+
+    def __rrshift__(self, other):
+        return self
+
+    def __rlshift__(self, other):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+
+class _AirflowFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Serves airflow.* imports with modules whose attributes are _Stub subclasses."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname == "airflow" or fullname.startswith("airflow."):
+            return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+        return None
+
+    def create_module(self, spec):
+        module = types.ModuleType(spec.name)
+        module.__path__ = []
+        cache = {}
+
+        def __getattr__(name):
+            if name.startswith("__"):
+                raise AttributeError(name)
+            if name not in cache:
+                cache[name] = type(name, (_Stub,), {})
+            return cache[name]
+
+        module.__getattr__ = __getattr__
+        return module
+
+    def exec_module(self, module):
+        pass
+
+
+def _template_bytes(stub):
+    return sum(len(v) for k, v in stub.kwargs.items()
+               if isinstance(v, str) and k in ("bash_command", "remote_script", "doc_md"))
+
+
+def measure_child(path):
+    """Import one DAG file and print its measurements as JSON."""
+    sys.meta_path.insert(0, _AirflowFinder())
+    sys.path.insert(0, os.path.dirname(path))
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    modules_before = set(sys.modules)
+    started = time.perf_counter()
+    spec = importlib.util.spec_from_file_location("benchmarked_dag", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tasks = [s for s in _Stub.created if "task_id" in s.kwargs]
+    print(json.dumps({
+        "file": os.path.basename(path),
+        "parse_ms": round(elapsed * 1000, 2),
+        "rss_kb": rss_after - rss_before,
+        "tasks": len(tasks),
+        "inline_template_kb": round(sum(_template_bytes(t) for t in tasks) / 1024, 1),
+        "modules_imported": len(set(sys.modules) - modules_before),
+    }))
+
+
+# =============================================================================
+# Driver
+# =============================================================================
+
+def measure(path, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-B", os.path.abspath(__file__), "--child", path],
+            capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            return {"file": os.path.basename(path), "error": out.stderr.strip().splitlines()[-1]}
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    result = dict(samples[-1])
+    result["parse_ms"] = round(statistics.median(s["parse_ms"] for s in samples), 2)
+    result["rss_kb"] = int(statistics.median(s["rss_kb"] for s in samples))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DAG folder parse time")
+    parser.add_argument("--dags-dir", default=DAGS_DIR)
+    parser.add_argument("--runs", type=int, default=3, help="Cold imports per file (median reported)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Total parse-time budget for the folder (default: {DEFAULT_BUDGET_MS})")
+    parser.add_argument("--json", metavar="FILE", help="Also write results as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child(args.child)
+        return 0
+
+    files = sorted(
+        os.path.join(args.dags_dir, f) for f in os.listdir(args.dags_dir)
+        if f.startswith(DAG_PREFIX) and f.endswith(".py")
+    )
+    results = [measure(path, args.runs) for path in files]
+
+    print(f"{'DAG file':<38} {'parse ms':>9} {'RSS KB':>8} {'tasks':>6} {'inline KB':>10}")
+    print("-" * 75)
+    for r in results:
+        if "error" in r:
+            print(f"{r['file']:<38} ERROR: {r['error']}")
+            continue
+        print(f"{r['file']:<38} {r['parse_ms']:>9.1f} {r['rss_kb']:>8} {r['tasks']:>6} "
+              f"{r['inline_template_kb']:>10.1f}")
+    total = sum(r.get("parse_ms", 0) for r in results)
+    errors = [r for r in results if "error" in r]
+    print("-" * 75)
+    print(f"{'Total':<38} {total:>9.1f}    budget: {args.budget_ms:.0f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"timestamp": time.time(), "total_ms": round(total, 2),
+                       "budget_ms": args.budget_ms, "files": results}, f, indent=2)
+
+    if errors:
+        print(f"\n[ERROR] {len(errors)} DAG file(s) failed to import")
+        return 1
+    if total > args.budget_ms:
+        print(f"\n[ERROR] DAG folder parse time {total:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        return 1
+    print("\n[OK] DAG folder parse time within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+Helper Modules for ocp4-disconnected-helper
+Imported by the ocp_* DAGs and run as a CLI by their task scripts:
+
+    from ocp4_helpers.remote_exec import RemoteBashOperator
+
+    python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers --help
+
+One package rather than flat modules, so deploy-dags.sh can sync it into the
+shared qubinode_navigator dags folder without shadowing or deleting another
+project's modules. Submodules are imported on use, keeping DAG parsing cheap.
+"""
@@ -0,0 +1,17 @@
+"""
+Command line entry point of the ocp4_helpers package (see dag_helpers.main()):
+
+    python3 airflow/dags/ocp4_helpers <command> ...
+    cd airflow/dags && python3 -m ocp4_helpers <command> ...
+"""
+
+import os
+import sys
+
+if not __package__:
+    # Run as a directory: make the package importable from its parent (the dags folder)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocp4_helpers.dag_helpers import main
+
+sys.exit(main())
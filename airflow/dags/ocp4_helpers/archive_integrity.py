@@ -0,0 +1,292 @@
+"""
+Archive Integrity Manifest for ocp4-disconnected-helper
+Catches archives damaged on the way across the air gap before oc-mirror
+trips over them deep into the push:
+- At the end of the download a sidecar manifest (mirror-integrity.json) is
+  written next to the archives: file, size and sha256 of every
+  mirror_seq*.tar, plus digest, offset and size of every blob inside it
+- Before the push the manifest is checked: sizes first (instant), then
+  every archive is hashed on a process pool, one archive per core
+- Each worker reads its archive sequentially in large blocks into a reused
+  buffer (no per-block allocation), hinted sequential to the page cache
+- Archives shipped zstd-packed (archive_pack.py) are checked in their
+  packed form, recorded in the manifest when they were packed
+- The first bad archive cancels the remaining work (fail fast); only that
+  archive is read again, hashing each blob range to name the damaged blobs
+- Writing the manifest hashes archive and blobs in the same pass, so a
+  download already damaged on the connected side is caught there
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import tarfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from .blob_store import blob_digest
+
+MANIFEST_NAME = "mirror-integrity.json"
+MANIFEST_VERSION = 1
+READ_SIZE = 8 * 1024 * 1024
+
+_cancelled = None                   # multiprocessing.Event shared with pool workers
+
+
+class IntegrityError(Exception):
+    """Raised when an archive does not match the integrity manifest."""
+
+
+@dataclass
+class ArchiveCheck:
+    """Hash result for one archive."""
+
+    file: str
+    size: int
+    sha256: str
+    bad_blobs: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    cancelled: bool = False
+
+
+@dataclass
+class VerifyResult:
+    archives: int = 0
+    bytes_hashed: int = 0
+    duration_seconds: float = 0.0
+    failures: List[str] = field(default_factory=list)
+    unlisted: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return round(self.bytes_hashed / 1e6 / self.duration_seconds, 1) if self.duration_seconds else 0.0
+
+
+def _init_worker(event) -> None:
+    global _cancelled
+    _cancelled = event
+
+
+def _blob_ranges(path: str) -> List[Dict[str, Any]]:
+    """Blobs stored in an archive, by data offset."""
+    try:
+        with tarfile.open(path, "r:") as tar:
+            blobs = [{"digest": blob_digest(m.name.lstrip("./")), "offset": m.offset_data, "size": m.size}
+                     for m in tar.getmembers() if m.isfile()]
+    except (tarfile.TarError, OSError) as e:
+        raise IntegrityError(f"{os.path.basename(path)}: unreadable archive ({e})") from e
+    return sorted((b for b in blobs if b["digest"]), key=lambda b: b["offset"])
+
+
+def _hash_archive(path: str, blobs: Sequence[Dict[str, Any]]) -> ArchiveCheck:
+    """
+    Hash an archive and each blob range in one sequential pass.
+
+    Runs in a pool worker; stops early once another worker found a bad archive.
+    """
+    started = time.monotonic()
+    whole = hashlib.sha256()
+    bad = []
+    buf = bytearray(READ_SIZE)
+    view = memoryview(buf)
+    pos = 0
+    i = 0
+    current = None
+    with open(path, "rb", buffering=0) as f:
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except (AttributeError, OSError):
+            pass
+        while True:
+            if _cancelled is not None and _cancelled.is_set():
+                return ArchiveCheck(path, pos, "", cancelled=True)
+            n = f.readinto(buf)
+            if not n:
+                break
+            whole.update(view[:n])
+            end = pos + n
+            # Feed the blob ranges overlapping [pos, end)
+            while i < len(blobs) and blobs[i]["offset"] < end:
+                blob = blobs[i]
+                if current is None:
+                    current = hashlib.sha256()
+                lo = max(blob["offset"], pos) - pos
+                hi = min(blob["offset"] + blob["size"], end) - pos
+                current.update(view[lo:hi])
+                if blob["offset"] + blob["size"] > end:
+                    break                               # continues in the next block
+                if f"sha256:{current.hexdigest()}" != blob["digest"]:
+                    bad.append(blob["digest"])
+                current = None
+                i += 1
+            pos = end
+    # Blobs past the end of a truncated archive
+    bad += [b["digest"] for b in blobs[i:]]
+    return ArchiveCheck(path, pos, whole.hexdigest(), bad, round(time.monotonic() - started, 2))
+
+
+def _run_pool(jobs: Dict[str, List[Dict[str, Any]]], workers: Optional[int], fail_fast: bool,
+              is_bad) -> List[ArchiveCheck]:
+    """Hash archives on a process pool, largest first; stop at the first bad one if fail_fast."""
+    ctx = multiprocessing.get_context("fork")
+    event = ctx.Event()
+    order = sorted(jobs, key=lambda p: os.path.getsize(p), reverse=True)
+    checks = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=ctx,
+                             initializer=_init_worker, initargs=(event,)) as pool:
+        pending = {pool.submit(_hash_archive, path, jobs[path]) for path in order}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                check = future.result()
+                checks.append(check)
+                if fail_fast and not check.cancelled and is_bad(check):
+                    event.set()
+                    for other in pending:
+                        other.cancel()
+    return checks
+
+
+def write_manifest(archives: Sequence[str], workers: Optional[int] = None,
+                   path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Hash archives and write the integrity manifest next to them.
+
+    Raises:
+        IntegrityError: if a blob inside an archive does not match its digest
+            (the download itself is damaged)
+    """
+    if not archives:
+        raise IntegrityError("No archives to describe")
+    path = path or os.path.join(os.path.dirname(archives[0]), MANIFEST_NAME)
+    jobs = {a: _blob_ranges(a) for a in archives}
+    checks = {c.file: c for c in _run_pool(jobs, workers, fail_fast=False, is_bad=lambda c: c.bad_blobs)}
+    damaged = [f"{os.path.basename(c.file)}: blob(s) {', '.join(c.bad_blobs[:3])}"
+               for c in checks.values() if c.bad_blobs]
+    if damaged:
+        raise IntegrityError("; ".join(damaged))
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "created": time.time(),
+        "algorithm": "sha256",
+        "archives": [{
+            "file": os.path.basename(a),
+            "size": checks[a].size,
+            "sha256": checks[a].sha256,
+            "blobs": jobs[a],
+        } for a in archives],
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return manifest
+
+
+def record_packed(archive_dir: str, packed: Sequence[Dict[str, Any]],
+                  manifest_path: Optional[str] = None) -> None:
+    """
+    Add packed copies (archive_pack.py) to the manifest, so either form verifies.
+
+    Args:
+        archive_dir: Directory holding the manifest
+        packed: {"file": tar name, "packed_file": ..., "bytes_out": ..., "sha256": ...}
+            per packed archive (PackResult.as_dict())
+    """
+    manifest_path = manifest_path or os.path.join(archive_dir, MANIFEST_NAME)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    by_name = {os.path.basename(p["file"]): p for p in packed}
+    for archive in manifest["archives"]:
+        result = by_name.get(archive["file"])
+        if result:
+            archive["packed"] = {"file": os.path.basename(result["packed_file"]),
+                                 "size": result["bytes_out"], "sha256": result["sha256"]}
+    tmp = f"{manifest_path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, manifest_path)
+
+
+def verify_manifest(archive_dir: str, workers: Optional[int] = None, fail_fast: bool = True,
+                    manifest_path: Optional[str] = None) -> VerifyResult:
+    """
+    Check the archives in archive_dir against their integrity manifest.
+
+    Args:
+        archive_dir: Directory holding the archives and mirror-integrity.json
+        workers: Hashing processes (default: one per core)
+        fail_fast: Stop hashing at the first bad archive
+        manifest_path: Manifest file (default: <archive_dir>/mirror-integrity.json)
+
+    Returns:
+        VerifyResult; failures name each bad archive and its damaged blobs
+
+    Raises:
+        IntegrityError: if the manifest is missing or unreadable
+    """
+    started = time.monotonic()
+    manifest_path = manifest_path or os.path.join(archive_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise IntegrityError(f"Cannot read {manifest_path}: {e}") from e
+
+    result = VerifyResult(archives=len(manifest["archives"]))
+    entries = {}
+    for archive in manifest["archives"]:
+        path = os.path.join(archive_dir, archive["file"])
+        packed = archive.get("packed")
+        if not os.path.exists(path) and packed and os.path.exists(os.path.join(archive_dir, packed["file"])):
+            # Shipped zstd-packed: check the packed file (blob offsets refer to the tar)
+            entries[os.path.join(archive_dir, packed["file"])] = {**packed, "blobs": []}
+        else:
+            entries[path] = archive
+    listed = {a["file"] for a in manifest["archives"]} | \
+             {a["packed"]["file"] for a in manifest["archives"] if a.get("packed")}
+    result.unlisted = sorted(n for n in os.listdir(archive_dir) if n.startswith("mirror_seq")
+                             and n.endswith((".tar", ".tar.zst")) and n not in listed)
+
+    # Sizes first: a truncated or missing copy fails without reading anything
+    for path, entry in entries.items():
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            result.failures.append(f"{entry['file']}: missing")
+            continue
+        if size != entry["size"]:
+            result.failures.append(f"{entry['file']}: size {size}, expected {entry['size']}")
+    if result.failures and fail_fast:
+        result.duration_seconds = round(time.monotonic() - started, 2)
+        return result
+
+    def is_bad(check: ArchiveCheck) -> bool:
+        return check.sha256 != entries[check.file]["sha256"]
+
+    # Archive hashes only; blob hashes are needed just to describe a bad archive
+    jobs = {p: [] for p in entries if os.path.exists(p)}
+    for check in _run_pool(jobs, workers, fail_fast, is_bad):
+        result.bytes_hashed += check.size
+        if check.cancelled or not is_bad(check):
+            continue
+        check.bad_blobs = _hash_archive(check.file, entries[check.file]["blobs"]).bad_blobs
+        detail = f" (damaged blobs: {', '.join(check.bad_blobs[:5])})" if check.bad_blobs else ""
+        result.failures.append(f"{entries[check.file]['file']}: sha256 {check.sha256[:16]}..., "
+                               f"expected {entries[check.file]['sha256'][:16]}...{detail}")
+    result.duration_seconds = round(time.monotonic() - started, 2)
+    return result
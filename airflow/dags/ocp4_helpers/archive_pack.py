@@ -0,0 +1,269 @@
+"""
+Zstd Transport Packaging for ocp4-disconnected-helper
+Optional packaging stage that shrinks mirror archives for the trip across the
+air gap, and a reader that lets the push consume them without unpacking:
+- mirror_seqN_NNNNNN.tar is repacked into .tar.zst as a sequence of
+  independent zstd frames (64 MiB of tar each), compressed in parallel by a
+  pool of up to 8 `zstd` processes with at most 1 GiB of tar in flight;
+  concatenated frames are a valid zstd stream, so `zstd -d` still unpacks
+  the file in one go
+- A seek index (.tar.zst.idx, JSON) maps tar offsets to frames and carries
+  the tar member table, so headers and manifests are read without
+  decompressing the archive
+- ZstdArchive serves byte ranges of the original tar by decompressing only
+  the frames that cover them (archive_push.py streams blobs from it)
+- Every archive reports its compression ratio and throughput, to judge per
+  preset whether packaging pays off
+- oc-mirror --from needs seekable plain tars, so its publish still gets a
+  temporary decompressed copy (unpack_archive), removed after the push
+
+Uses the zstd CLI (zstd package in base_packages); the Python standard
+library has no zstd codec.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+PACK_SUFFIX = ".zst"
+INDEX_SUFFIX = ".zst.idx"
+INDEX_VERSION = 1
+DEFAULT_LEVEL = 3
+DEFAULT_FRAME_SIZE = 64 * 1024 * 1024
+FRAME_CACHE = 4                 # decompressed frames kept per open archive
+DEFAULT_MAX_WORKERS = 8         # zstd processes when workers is not given, however many cores
+MAX_PENDING_BYTES = 1024 ** 3   # tar read ahead of the writer; each frame is also piped to zstd
+
+
+class PackError(Exception):
+    """Raised when zstd is unavailable or an archive cannot be packed or read."""
+
+
+@dataclass
+class PackResult:
+    """Outcome of packing one archive."""
+
+    file: str
+    packed_file: str
+    bytes_in: int
+    bytes_out: int
+    frames: int
+    seconds: float
+    sha256: str
+
+    @property
+    def ratio(self) -> float:
+        return round(self.bytes_in / self.bytes_out, 2) if self.bytes_out else 0.0
+
+    @property
+    def mb_s(self) -> float:
+        return round(self.bytes_in / 1e6 / self.seconds, 1) if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "ratio": self.ratio, "mb_s": self.mb_s}
+
+
+def zstd_binary() -> str:
+    path = shutil.which("zstd")
+    if not path:
+        raise PackError("zstd not found; install the zstd package (base_packages)")
+    return path
+
+
+def _zstd(args: List[str], data: bytes) -> bytes:
+    proc = subprocess.run([zstd_binary(), "-q", *args], input=data, capture_output=True)
+    if proc.returncode != 0:
+        raise PackError(proc.stderr.decode(errors="replace").strip() or f"zstd exited with {proc.returncode}")
+    return proc.stdout
+
+
+def _members(path: str) -> List[Dict[str, Any]]:
+    """Tar member table: enough to rebuild TarInfo objects without reading the tar."""
+    with tarfile.open(path, "r:") as tar:
+        return [{"name": m.name, "type": m.type.decode(), "size": m.size, "offset_data": m.offset_data,
+                 "linkname": m.linkname} for m in tar.getmembers()]
+
+
+def pack_archive(
+    path: str,
+    level: int = DEFAULT_LEVEL,
+    frame_size: int = DEFAULT_FRAME_SIZE,
+    workers: Optional[int] = None,
+    remove_source: bool = True,
+) -> PackResult:
+    """
+    Repack a tar archive into independent zstd frames plus a seek index.
+
+    Args:
+        path: mirror_seq*.tar archive
+        level: zstd compression level
+        frame_size: Uncompressed bytes per frame (the unit of random access)
+        workers: Frames compressed concurrently (default: one per core, at most
+            DEFAULT_MAX_WORKERS); frames in flight are also capped at
+            MAX_PENDING_BYTES of tar
+        remove_source: Delete the tar once the packed copy is complete
+
+    Returns:
+        PackResult
+    """
+    started = time.monotonic()
+    workers = workers or min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS)
+    in_flight = max(1, min(workers * 2, MAX_PENDING_BYTES // frame_size))
+    packed, index_path = path + PACK_SUFFIX, path + INDEX_SUFFIX
+    members = _members(path)
+    frames: List[Tuple[int, int, int, int]] = []       # (tar offset, packed offset, tar length, packed length)
+    sha = hashlib.sha256()
+    bytes_in = bytes_out = 0
+
+    tmp = f"{packed}.tmp"
+    with open(path, "rb") as src, open(tmp, "wb") as out, ThreadPoolExecutor(workers) as pool:
+        pending: List[Tuple[int, Any]] = []
+
+        def write_frames(keep: int) -> None:
+            nonlocal bytes_out
+            while len(pending) > keep:
+                size, future = pending.pop(0)
+                frame = future.result()
+                out.write(frame)
+                sha.update(frame)
+                tar_offset = frames[-1][0] + frames[-1][2] if frames else 0
+                frames.append((tar_offset, bytes_out, size, len(frame)))
+                bytes_out += len(frame)
+
+        for block in iter(lambda: src.read(frame_size), b""):
+            bytes_in += len(block)
+            pending.append((len(block), pool.submit(_zstd, [f"-{level}", "-c"], block)))
+            write_frames(keep=in_flight)            # bounded memory: frames in flight
+        write_frames(keep=0)
+        out.flush()
+        os.fsync(out.fileno())
+
+    index = {"version": INDEX_VERSION, "level": level, "frame_size": frame_size, "size": bytes_in,
+             "frames": frames, "members": members}
+    with open(f"{index_path}.tmp", "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp, packed)
+    os.replace(f"{index_path}.tmp", index_path)
+    if remove_source:
+        os.remove(path)
+    return PackResult(path, packed, bytes_in, bytes_out, len(frames),
+                      round(time.monotonic() - started, 2), sha.hexdigest())
+
+
+def unpack_archive(packed: str, remove_source: bool = False) -> str:
+    """Decompress a packed archive back to its tar (for oc-mirror, which needs the file)."""
+    if not packed.endswith(".tar" + PACK_SUFFIX):
+        raise PackError(f"Not a packed archive: {packed}")
+    path = packed[:-len(PACK_SUFFIX)]
+    proc = subprocess.run([zstd_binary(), "-q", "-d", "-f", packed, "-o", f"{path}.tmp"], capture_output=True)
+    if proc.returncode != 0:
+        raise PackError(f"{packed}: {proc.stderr.decode(errors='replace').strip()}")
+    os.replace(f"{path}.tmp", path)
+    if remove_source:
+        os.remove(packed)
+        try:
+            os.remove(path + INDEX_SUFFIX)
+        except OSError:
+            pass
+    return path
+
+
+def is_packed(path: str) -> bool:
+    return path.endswith(".tar" + PACK_SUFFIX)
+
+
+class ZstdArchive:
+    """
+    Random access to the tar inside a packed archive.
+
+    Thread-safe; decompressed frames are cached so consecutive blobs in
+    archive order decompress each frame once.
+    """
+
+    def __init__(self, packed: str):
+        self.path = packed
+        try:
+            with open(packed[:-len(PACK_SUFFIX)] + INDEX_SUFFIX) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError) as e:
+            raise PackError(f"{packed}: seek index unreadable ({e})") from e
+        self.frames = self.index["frames"]
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def members(self) -> List[tarfile.TarInfo]:
+        infos = []
+        for m in self.index["members"]:
+            info = tarfile.TarInfo(m["name"])
+            info.type = m["type"].encode()
+            info.size = m["size"]
+            info.linkname = m["linkname"]
+            info.offset_data = m["offset_data"]
+            infos.append(info)
+        return infos
+
+    def _frame(self, i: int) -> bytes:
+        with self._lock:
+            if i in self._cache:
+                self._cache.move_to_end(i)
+                return self._cache[i]
+        _, offset, _, length = self.frames[i]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = _zstd(["-d", "-c"], f.read(length))
+        with self._lock:
+            self._cache[i] = data
+            while len(self._cache) > FRAME_CACHE:
+                self._cache.popitem(last=False)
+        return data
+
+    def _first_frame(self, offset: int) -> int:
+        lo, hi = 0, len(self.frames) - 1
+        while lo < hi:                              # last frame starting at or before offset
+            mid = (lo + hi + 1) // 2
+            if self.frames[mid][0] <= offset:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def iter_range(self, offset: int, size: int, chunk_size: int) -> Iterator[bytes]:
+        """Yield size bytes of the tar starting at offset, at most chunk_size at a time."""
+        i = self._first_frame(offset)
+        while size > 0:
+            if i >= len(self.frames):
+                raise PackError(f"{self.path}: range past the end of the archive")
+            start = self.frames[i][0]
+            data = self._frame(i)
+            pos = offset - start
+            while pos < len(data) and size > 0:
+                piece = data[pos:pos + min(chunk_size, size)]
+                pos += len(piece)
+                offset += len(piece)
+                size -= len(piece)
+                yield piece
+            i += 1
+
+    def read(self, offset: int, size: int) -> bytes:
+        return b"".join(self.iter_range(offset, size, max(size, 1)))
+
+
+_open_archives: Dict[str, ZstdArchive] = {}
+_open_lock = threading.Lock()
+
+
+def open_packed(packed: str) -> ZstdArchive:
+    """Shared ZstdArchive per path, so concurrent readers share its frame cache."""
+    with _open_lock:
+        if packed not in _open_archives:
+            _open_archives[packed] = ZstdArchive(packed)
+        return _open_archives[packed]
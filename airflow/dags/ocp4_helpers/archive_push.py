@@ -0,0 +1,697 @@
+"""
+Fan-out Archive Push for ocp4-disconnected-helper
+Pushes the registry content of oc-mirror archives (mirror_seq*.tar) to any
+number of target registries in one pass, instead of one oc-mirror run (and
+one full read of the archive set) per registry:
+- Archive headers and manifests are indexed first; what each registry is
+  missing is planned with concurrent HEAD checks answered mostly from a
+  local Bloom-filter cache (registry_delta.py)
+- Blob data is then read from disk once, in archive order, and uploaded
+  to one repository per registry; other repositories needing the same layer
+  get a cross-repository mount from a repository that holds it, falling
+  back to an upload where the registry refuses mounts
+- Each registry gets its own RegistryClient (connection pool, auth), retry
+  budget and progress counters; a failing registry never stalls the others
+- Uploads stream through small bounded queues, so memory stays flat and the
+  slowest registry sets the read pace
+- Manifests follow once their blobs are in place: image manifests, then
+  indexes, then tags
+
+Disk reads stay at 1x however many registries are fed; only retries of a
+failed upload, and uploads in place of a refused mount, read a blob again.
+With a blob store (blob_store.py), blobs it holds are read from the store
+rather than the archive. Packed archives (.tar.zst, archive_pack.py) are
+read in place, decompressing only the frames a blob spans. With an
+AIMDController (parallel_tuner.py) the number of blobs in flight follows
+throughput and throttling instead of staying at parallel_blobs.
+
+Only registry content is pushed here. ICSP/CatalogSource results, release
+signatures, catalogs and oc-mirror metadata come from the single oc-mirror
+publish push_to_registry runs afterwards against the first registry, which
+skips the blobs already present.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import re
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .archive_pack import is_packed, open_packed
+from .parallel_tuner import THROTTLE_STATUSES, AIMDController
+from .registry_client import RegistryClient, RegistryError
+from .registry_delta import BloomFilter, DeltaPlan, cache_path, pair_key, plan_delta
+
+CHUNK_SIZE = 1024 * 1024
+QUEUE_DEPTH = 8                 # chunks buffered per upload stream
+DEFAULT_PARALLEL_BLOBS = 4
+DEFAULT_RETRIES = 3
+DEFAULT_MAX_ERRORS = 20         # errors before a registry is dropped from the run
+LATENCY_SAMPLE_BYTES = 1024 * 1024  # blobs small enough that their upload time is round trips
+
+OCI_MANIFEST = "application/vnd.oci.image.manifest.v1+json"
+OCI_INDEX = "application/vnd.oci.image.index.v1+json"
+INDEX_MEDIA_TYPES = (OCI_INDEX, "application/vnd.docker.distribution.manifest.list.v2+json")
+
+# oc-mirror archive layout: v2/<repo>/manifests/<tag|digest>, and blobs either
+# under v2/<repo>/blobs/ or deduplicated into a top-level blobs/ directory
+_MANIFEST_RE = re.compile(r"^v2/(?P<repo>.+)/manifests/(?P<ref>[^/]+)$")
+_BLOB_RE = re.compile(r"^(?:v2/(?P<repo>.+)/)?blobs/sha256[:/](?P<hex>[0-9a-f]{64})$")
+
+
+@dataclass
+class BlobRef:
+    """Location of one blob's bytes inside an archive."""
+
+    digest: str
+    archive: str
+    offset: int
+    size: int
+
+
+@dataclass
+class ManifestRef:
+    """A manifest (or index) and the reference it is stored under."""
+
+    repository: str
+    reference: str
+    digest: str
+    media_type: str
+    data: bytes
+
+    @property
+    def is_index(self) -> bool:
+        return self.media_type in INDEX_MEDIA_TYPES
+
+    @property
+    def is_tag(self) -> bool:
+        return not self.reference.startswith("sha256:")
+
+
+@dataclass
+class ArchiveIndex:
+    """Blobs and manifests of an archive set, with the repositories using each blob."""
+
+    archives: List[str]
+    blobs: Dict[str, BlobRef] = field(default_factory=dict)
+    manifests: List[ManifestRef] = field(default_factory=list)
+    blob_repositories: Dict[str, Set[str]] = field(default_factory=dict)
+
+    @property
+    def repositories(self) -> Set[str]:
+        return {m.repository for m in self.manifests}
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(b.size for b in self.blobs.values())
+
+
+@dataclass
+class PushTarget:
+    """A registry to push to; path is the repository prefix (registries[].path)."""
+
+    registry: str
+    path: str = ""
+    username: Optional[str] = None
+    password: Optional[str] = None
+    auth_file: Optional[str] = None
+
+    def repository(self, repo: str) -> str:
+        prefix = self.path.strip("/")
+        return f"{prefix}/{repo}" if prefix else repo
+
+
+@dataclass
+class TargetProgress:
+    """Per-registry progress and retry state."""
+
+    registry: str
+    blobs_uploaded: int = 0
+    blobs_present: int = 0
+    bytes_uploaded: int = 0
+    blobs_mounted: int = 0
+    bytes_mounted: int = 0
+    mounts_refused: int = 0
+    manifests_pushed: int = 0
+    manifests_repaired: int = 0
+    retries: int = 0
+    errors: List[str] = field(default_factory=list)
+    dropped: bool = False
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add(self, **counters: int) -> None:
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def fail(self, message: str, max_errors: int) -> None:
+        with self._lock:
+            self.errors.append(message)
+            if len(self.errors) >= max_errors and not self.dropped:
+                self.dropped = True
+                print(f"  ❌ {self.registry}: {max_errors} errors, skipping its remaining uploads")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")} | {"ok": self.ok}
+
+
+@dataclass
+class FanoutResult:
+    """Outcome of a fan-out push."""
+
+    archives: List[str]
+    blobs: int = 0
+    manifests: int = 0
+    bytes_total: int = 0
+    bytes_read: int = 0
+    targets: Dict[str, TargetProgress] = field(default_factory=dict)
+    plans: Dict[str, DeltaPlan] = field(default_factory=dict)
+    parallelism: Dict[str, Any] = field(default_factory=dict)
+    duration_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(t.ok for t in self.targets.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "archives": self.archives,
+            "blobs": self.blobs,
+            "manifests": self.manifests,
+            "bytes_total": self.bytes_total,
+            "bytes_read": self.bytes_read,
+            "targets": {name: t.as_dict() for name, t in self.targets.items()},
+            "delta": {name: p.as_dict() for name, p in self.plans.items()},
+            "parallelism": self.parallelism,
+            "duration_seconds": self.duration_seconds,
+            "ok": self.ok,
+        }
+
+
+# =============================================================================
+# Archive index
+# =============================================================================
+
+def _data_member(members: Dict[str, tarfile.TarInfo], member: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+    """Follow hard and symbolic links (oc-mirror links tags to digests) to the member holding data."""
+    seen = 0
+    while member is not None and not member.isfile() and seen < 8:
+        if member.islnk():
+            member = members.get(member.linkname.lstrip("./"))
+        elif member.issym():
+            base = member.name.rsplit("/", 1)[0]
+            parts = []
+            for part in f"{base}/{member.linkname}".split("/"):
+                if part == "..":
+                    parts = parts[:-1]
+                elif part not in ("", "."):
+                    parts.append(part)
+            member = members.get("/".join(parts))
+        else:
+            return None
+        seen += 1
+    return member if member is not None and member.isfile() else None
+
+
+def _manifest_media_type(doc: Dict[str, Any]) -> str:
+    return doc.get("mediaType") or (OCI_INDEX if "manifests" in doc else OCI_MANIFEST)
+
+
+@contextmanager
+def _open_archive(path: str):
+    """(members, read(offset, size)) for a tar or a packed .tar.zst (via its seek index)."""
+    if is_packed(path):
+        archive = open_packed(path)
+        yield archive.members(), archive.read
+        return
+    with tarfile.open(path, "r:") as tar:
+        def read(offset: int, size: int) -> bytes:
+            tar.fileobj.seek(offset)
+            return tar.fileobj.read(size)
+        yield tar.getmembers(), read
+
+
+def index_archives(archives: Sequence[str]) -> ArchiveIndex:
+    """
+    Index blobs and manifests across an archive set.
+
+    Only tar headers and manifest bodies are read; blob data is located
+    by offset so it can be streamed later in a single pass.
+    """
+    index = ArchiveIndex(archives=list(archives))
+    manifests: Dict[Tuple[str, str], ManifestRef] = {}
+
+    for path in archives:
+        with _open_archive(path) as (member_list, read):
+            members = {m.name.lstrip("./"): m for m in member_list}
+            for name, member in members.items():
+                blob = _BLOB_RE.match(name)
+                if blob:
+                    digest = f"sha256:{blob.group('hex')}"
+                    data = _data_member(members, member)
+                    if data is not None and digest not in index.blobs:
+                        index.blobs[digest] = BlobRef(digest, path, data.offset_data, data.size)
+                    if blob.group("repo"):
+                        index.blob_repositories.setdefault(digest, set()).add(blob.group("repo"))
+                    continue
+
+                manifest = _MANIFEST_RE.match(name)
+                if not manifest or (manifest.group("repo"), manifest.group("ref")) in manifests:
+                    continue
+                data = _data_member(members, member)
+                if data is None:
+                    continue
+                raw = read(data.offset_data, data.size)
+                try:
+                    doc = json.loads(raw)
+                except ValueError:
+                    continue                           # not a manifest (e.g. signatures)
+                repo = manifest.group("repo")
+                manifests[(repo, manifest.group("ref"))] = ManifestRef(
+                    repo, manifest.group("ref"), f"sha256:{hashlib.sha256(raw).hexdigest()}",
+                    _manifest_media_type(doc), raw)
+                for ref in [doc.get("config") or {}] + list(doc.get("layers") or []):
+                    if ref.get("digest"):
+                        index.blob_repositories.setdefault(ref["digest"], set()).add(repo)
+
+    index.manifests = list(manifests.values())
+    return index
+
+
+# =============================================================================
+# Blob streaming
+# =============================================================================
+
+def _read_chunks(blob: BlobRef, chunk_size: int) -> Iterator[bytes]:
+    if is_packed(blob.archive):
+        yield from open_packed(blob.archive).iter_range(blob.offset, blob.size, chunk_size)
+        return
+    with open(blob.archive, "rb") as f:
+        f.seek(blob.offset)
+        remaining = blob.size
+        while remaining:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                raise RegistryError(f"{blob.archive}: {blob.digest} truncated")
+            remaining -= len(chunk)
+            yield chunk
+
+
+class _Sink:
+    """One upload stream (registry + repository) fed from the shared read."""
+
+    def __init__(self, target: PushTarget, client: RegistryClient, progress: TargetProgress,
+                 repository: str):
+        self.target = target
+        self.client = client
+        self.progress = progress
+        self.repository = repository
+        self.chunks: "queue.Queue[Optional[bytes]]" = queue.Queue(QUEUE_DEPTH)
+        self.error: Optional[Exception] = None
+        self._ended = False
+
+    def _stream(self) -> Iterator[bytes]:
+        while not self._ended:
+            chunk = self.chunks.get()
+            if chunk is None:
+                self._ended = True
+            else:
+                yield chunk
+
+    def run(self, blob: BlobRef) -> None:
+        try:
+            self.client.upload_blob(self.repository, blob.digest, blob.size, self._stream())
+        except (RegistryError, OSError) as e:
+            self.error = e
+            for _ in self._stream():
+                pass                                   # keep the reader moving for other sinks
+
+
+class _Fanout:
+    def __init__(self, index: ArchiveIndex, targets: Sequence[PushTarget],
+                 clients: Dict[str, RegistryClient], result: FanoutResult,
+                 retries: int, max_errors: int, chunk_size: int,
+                 blooms: Optional[Dict[str, BloomFilter]] = None,
+                 tuner: Optional[AIMDController] = None):
+        self.index = index
+        self.tuner = tuner
+        self.targets = targets
+        self.clients = clients
+        self.blooms = blooms or {}
+        self.result = result
+        self.retries = retries
+        self.max_errors = max_errors
+        self.chunk_size = chunk_size
+        self.missing: Dict[str, Dict[str, List[str]]] = {t.registry: {} for t in targets}
+        self.holders: Dict[str, Dict[str, str]] = {t.registry: {} for t in targets}
+        self.mount_enabled = {t.registry: True for t in targets}
+        self.mount_succeeded = {t.registry: False for t in targets}
+        self._read_lock = threading.Lock()
+
+    def progress(self, target: PushTarget) -> TargetProgress:
+        return self.result.targets[target.registry]
+
+    def plan(self, target: PushTarget) -> None:
+        """Find the (blob, repository) pairs this registry does not hold yet."""
+        pairs = [(target.repository(repo), digest)
+                 for digest in self.index.blobs
+                 for repo in sorted(self.index.blob_repositories.get(digest, ()))]
+        sizes = {digest: blob.size for digest, blob in self.index.blobs.items()}
+        plan = plan_delta(pairs, sizes, self.clients[target.registry], target.registry,
+                          self.blooms.get(target.registry))
+        self.result.plans[target.registry] = plan
+        self.missing[target.registry] = plan.missing
+        self.holders[target.registry].update(plan.holders)
+        self.progress(target).add(blobs_present=plan.present)
+
+    def _uploaded(self, sink: "_Sink", blob: BlobRef) -> None:
+        sink.progress.add(blobs_uploaded=1, bytes_uploaded=blob.size)
+        self._holds(sink.target, sink.repository, blob.digest)
+
+    def _holds(self, target: PushTarget, repository: str, digest: str) -> None:
+        self.holders[target.registry].setdefault(digest, repository)
+        bloom = self.blooms.get(target.registry)
+        if bloom is not None:
+            bloom.add(pair_key(repository, digest))
+
+    def push_blob(self, blob: BlobRef) -> None:
+        """
+        Stream a blob to every registry missing it.
+
+        Per registry the blob is uploaded to one repository and mounted into
+        the others (or into all of them if the registry already holds it);
+        repositories whose mount is refused get a regular upload.
+        """
+        sinks, mounts = [], []
+        for t in self.targets:
+            repos = self.missing[t.registry].get(blob.digest, [])
+            if not repos or self.progress(t).dropped:
+                continue
+            if not self.mount_enabled[t.registry]:
+                streamed = repos
+            elif blob.digest in self.holders[t.registry]:
+                streamed = []
+            else:
+                streamed = repos[:1]
+            sinks += [_Sink(t, self.clients[t.registry], self.progress(t), repo) for repo in streamed]
+            mounts += [(t, repo) for repo in repos if repo not in streamed]
+
+        if sinks and self.tuner is not None:
+            with self.tuner.slot():
+                self._stream(blob, sinks)
+        elif sinks:
+            self._stream(blob, sinks)
+        for target, repo in mounts:
+            self._mount(target, repo, blob)
+
+    def _stream(self, blob: BlobRef, sinks: List["_Sink"]) -> None:
+        started = time.monotonic()
+        threads = [threading.Thread(target=sink.run, args=(blob,), daemon=True) for sink in sinks]
+        for thread in threads:
+            thread.start()
+        sha = hashlib.sha256()
+        read_error = None
+        try:
+            for chunk in _read_chunks(blob, self.chunk_size):
+                sha.update(chunk)
+                with self._read_lock:
+                    self.result.bytes_read += len(chunk)
+                for sink in sinks:
+                    sink.chunks.put(chunk)
+        except (RegistryError, OSError) as e:
+            read_error = e
+        finally:
+            for sink in sinks:
+                sink.chunks.put(None)
+            for thread in threads:
+                thread.join()
+
+        if read_error is None and f"sha256:{sha.hexdigest()}" != blob.digest:
+            read_error = RegistryError(f"{blob.archive}: {blob.digest} does not match its content")
+        if self.tuner is not None:
+            failed = [sink.error for sink in sinks if sink.error is not None]
+            self.tuner.observe(
+                bytes_moved=blob.size * (len(sinks) - len(failed)),
+                latency=time.monotonic() - started if blob.size <= LATENCY_SAMPLE_BYTES else None,
+                status=next((e.status for e in failed if getattr(e, "status", None) in THROTTLE_STATUSES), None),
+                error=bool(failed))
+        for sink in sinks:
+            if read_error is not None:
+                sink.progress.fail(f"{sink.repository}@{blob.digest}: {read_error}", self.max_errors)
+            elif sink.error is None:
+                self._uploaded(sink, blob)
+            else:
+                self._retry(sink, blob)
+
+    def _mount(self, target: PushTarget, repository: str, blob: BlobRef) -> None:
+        """Mount from a repository holding the blob, uploading it instead if the registry refuses."""
+        progress = self.progress(target)
+        if progress.dropped:
+            return
+        holder = self.holders[target.registry].get(blob.digest)
+        sink = _Sink(target, self.clients[target.registry], progress, repository)
+        if holder is not None and self.mount_enabled[target.registry]:
+            try:
+                mounted = sink.client.mount_blob(repository, blob.digest, holder)
+            except RegistryError:
+                mounted = False
+            if mounted:
+                progress.add(blobs_mounted=1, bytes_mounted=blob.size)
+                self._holds(target, repository, blob.digest)
+                self.mount_succeeded[target.registry] = True
+                return
+            if not self.mount_succeeded[target.registry]:
+                # Never mounted anything here: assume the registry refuses mounts
+                # and stream later blobs to every repository instead
+                self.mount_enabled[target.registry] = False
+            progress.add(mounts_refused=1)
+        self._retry(sink, blob, backoff=False)
+
+    def _retry(self, sink: _Sink, blob: BlobRef, backoff: bool = True) -> None:
+        """Re-read the blob for one failed stream (the only case a blob is read twice)."""
+        error = sink.error
+        for attempt in range(1, self.retries + 1):
+            if backoff:
+                sink.progress.add(retries=1)
+                time.sleep(min(2 ** attempt, 30))
+            backoff = True
+            counted = _Counted(_read_chunks(blob, self.chunk_size))
+            try:
+                sink.client.upload_blob(sink.repository, blob.digest, blob.size, counted)
+                self._uploaded(sink, blob)
+                return
+            except (RegistryError, OSError) as e:
+                error = e
+            finally:
+                with self._read_lock:
+                    self.result.bytes_read += counted.bytes
+        sink.progress.fail(f"{sink.repository}@{blob.digest}: {error}", self.max_errors)
+
+    def push_manifests(self, target: PushTarget) -> None:
+        """Image manifests first, then indexes that reference them, then tags."""
+        client = self.clients[target.registry]
+        progress = self.progress(target)
+        if progress.dropped:
+            return
+        for phase in ((False, False), (False, True), (True, False), (True, True)):
+            batch = [m for m in self.index.manifests if (m.is_tag, m.is_index) == phase]
+            for manifest, _, error in client.map_concurrent(
+                    lambda m: client.put_manifest(target.repository(m.repository), m.reference,
+                                                  m.data, m.media_type), batch):
+                if error and self._repair(target, manifest):
+                    progress.add(manifests_pushed=1, manifests_repaired=1)
+                elif error:
+                    progress.fail(f"{target.repository(manifest.repository)}:{manifest.reference}: {error}",
+                                  self.max_errors)
+                else:
+                    progress.add(manifests_pushed=1)
+
+    def _repair(self, target: PushTarget, manifest: ManifestRef) -> bool:
+        """
+        Upload the blobs a rejected image manifest needs and push it again.
+
+        Covers blobs the cache wrongly reported present (Bloom false
+        positive, registry GC since the cache was written).
+        """
+        if manifest.is_index or not self.blooms.get(target.registry):
+            return False
+        client = self.clients[target.registry]
+        repository = target.repository(manifest.repository)
+        doc = json.loads(manifest.data)
+        try:
+            for ref in [doc.get("config") or {}] + list(doc.get("layers") or []):
+                blob = self.index.blobs.get(ref.get("digest"))
+                if blob is None or client.blob_exists(repository, blob.digest):
+                    continue
+                counted = _Counted(_read_chunks(blob, self.chunk_size))
+                try:
+                    client.upload_blob(repository, blob.digest, blob.size, counted)
+                finally:
+                    with self._read_lock:
+                        self.result.bytes_read += counted.bytes
+                self.progress(target).add(blobs_uploaded=1, bytes_uploaded=blob.size)
+            client.put_manifest(repository, manifest.reference, manifest.data, manifest.media_type)
+        except (RegistryError, OSError):
+            return False
+        return True
+
+
+class _Counted:
+    """Iterator wrapper counting the bytes it yielded."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self.chunks = chunks
+        self.bytes = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.chunks:
+            self.bytes += len(chunk)
+            yield chunk
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+def _client(target: PushTarget, max_workers: int, verify_tls: bool, ca_file: Optional[str]) -> RegistryClient:
+    host, _, port = target.registry.rpartition(":")
+    if not host or not port.isdigit():
+        host, port = target.registry, "443"
+    return RegistryClient(host, int(port), username=target.username, password=target.password,
+                          auth_file=target.auth_file, verify_tls=verify_tls, ca_file=ca_file,
+                          max_workers=max_workers)
+
+
+def _load_index(archives: Sequence[str], store: Optional[Any]) -> ArchiveIndex:
+    index = index_archives(archives)
+    if store is not None:
+        for digest in set(index.blobs) | set(index.blob_repositories):
+            if store.has(digest):
+                path = store.path(digest)
+                index.blobs[digest] = BlobRef(digest, path, 0, os.path.getsize(path))
+    return index
+
+
+def _load_blooms(targets: Sequence[PushTarget], cache_dir: Optional[str]) -> Dict[str, BloomFilter]:
+    if not cache_dir:
+        return {}
+    return {t.registry: BloomFilter.load(cache_path(t.registry, cache_dir)) or BloomFilter() for t in targets}
+
+
+def _save_blooms(blooms: Dict[str, BloomFilter], cache_dir: Optional[str]) -> None:
+    for registry, bloom in blooms.items():
+        try:
+            bloom.save(cache_path(registry, cache_dir))
+        except OSError as e:
+            print(f"  ⚠️  Could not save delta cache for {registry}: {e}")
+
+
+def plan_push(
+    archives: Sequence[str],
+    targets: Sequence[PushTarget],
+    max_workers: int = 16,
+    verify_tls: bool = False,
+    ca_file: Optional[str] = None,
+    store: Optional[Any] = None,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, DeltaPlan]:
+    """Plan what push_archives would upload to each registry, without uploading."""
+    index = _load_index(archives, store)
+    result = FanoutResult(archives=list(archives), targets={t.registry: TargetProgress(t.registry) for t in targets})
+    clients = {t.registry: _client(t, max_workers, verify_tls, ca_file) for t in targets}
+    blooms = _load_blooms(targets, cache_dir)
+    fanout = _Fanout(index, targets, clients, result, 0, DEFAULT_MAX_ERRORS, CHUNK_SIZE, blooms)
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(targets), 1), thread_name_prefix="plan") as pool:
+            list(pool.map(fanout.plan, targets))
+    finally:
+        for client in clients.values():
+            client.close()
+        _save_blooms(blooms, cache_dir)
+    return result.plans
+
+
+def push_archives(
+    archives: Sequence[str],
+    targets: Sequence[PushTarget],
+    parallel_blobs: int = DEFAULT_PARALLEL_BLOBS,
+    retries: int = DEFAULT_RETRIES,
+    max_errors: int = DEFAULT_MAX_ERRORS,
+    max_workers: int = 16,
+    chunk_size: int = CHUNK_SIZE,
+    verify_tls: bool = False,
+    ca_file: Optional[str] = None,
+    store: Optional[Any] = None,
+    cache_dir: Optional[str] = None,
+    tuner: Optional[AIMDController] = None,
+) -> FanoutResult:
+    """
+    Push an archive set to several registries, reading each blob once.
+
+    Args:
+        archives: oc-mirror archives (mirror_seq*.tar), in sequence order
+        targets: Registries to push to
+        parallel_blobs: Blobs streamed concurrently
+        retries: Re-read attempts for an upload that failed mid-stream
+        max_errors: Errors after which a registry is dropped from the run
+        max_workers: Concurrent existence checks/manifest pushes per registry
+        chunk_size: Read size; each chunk is handed to every upload stream
+        verify_tls: Verify registry certificates
+        ca_file: CA bundle for verification
+        store: BlobStore to read blobs from when it holds them, including
+            blobs an incremental archive only references
+        cache_dir: Directory of per-registry known-present caches
+            (registry_delta.py); None checks every blob with HEAD
+        tuner: Adjusts blobs in flight during the push (parallel_tuner.py),
+            in place of the fixed parallel_blobs
+
+    Returns:
+        FanoutResult with per-registry progress
+    """
+    started = time.monotonic()
+    index = _load_index(archives, store)
+    result = FanoutResult(archives=list(archives), blobs=len(index.blobs),
+                          manifests=len(index.manifests), bytes_total=index.total_bytes,
+                          targets={t.registry: TargetProgress(t.registry) for t in targets})
+    clients = {t.registry: _client(t, max_workers, verify_tls, ca_file) for t in targets}
+    blooms = _load_blooms(targets, cache_dir)
+    fanout = _Fanout(index, targets, clients, result, retries, max_errors, chunk_size, blooms, tuner)
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(targets), 1), thread_name_prefix="plan") as pool:
+            list(pool.map(fanout.plan, targets))
+
+        # Archive order keeps the single read sequential on disk
+        order = {path: i for i, path in enumerate(index.archives)}
+        needed = sorted((b for b in index.blobs.values()
+                         if any(b.digest in fanout.missing[t.registry] for t in targets)),
+                        key=lambda b: (order.get(b.archive, -1), b.archive, b.offset))
+        workers = tuner.maximum if tuner is not None else parallel_blobs
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="blob") as pool:
+            list(pool.map(fanout.push_blob, needed))
+
+        with ThreadPoolExecutor(max_workers=max(len(targets), 1), thread_name_prefix="manifest") as pool:
+            list(pool.map(fanout.push_manifests, targets))
+    finally:
+        for client in clients.values():
+            client.close()
+        _save_blooms(blooms, cache_dir)
+
+    if tuner is not None:
+        result.parallelism = {"final": tuner.limit, "best": tuner.best_limit,
+                              "best_mb_s": round(tuner.best_mb_s, 1),
+                              "adjustments": [vars(a) for a in tuner.adjustments]}
+    result.duration_seconds = round(time.monotonic() - started, 1)
+    return result
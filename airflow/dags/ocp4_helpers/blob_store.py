@@ -0,0 +1,445 @@
+"""
+Content-Addressed Blob Store for ocp4-disconnected-helper
+Keeps one copy of every layer under /opt/images, however many releases,
+archives and oc-mirror workspaces refer to it:
+- Blobs live at <root>/sha256/<2 hex>/<digest hex> and are verified on write
+- Blob files found in workspaces or caches (oc-mirror v1 src/v2/<repo>/blobs,
+  v2 cache docker/registry/v2/blobs/sha256/<2>/<hex>/data) are replaced by
+  hardlinks to the stored copy, so shared 4.19.z/4.20.z layers use disk once
+- Blobs are materialised elsewhere by hardlink, then reflink (FICLONE on
+  XFS/btrfs), then plain copy, whichever the filesystems support
+- Owners (a release set, an archive) record the digests they use; a blob is
+  garbage collected once no owner references it and no file outside the
+  store is linked to it
+- Owners also record where each blob sat in their tree, so a new workspace
+  is seeded with the blobs other owners already fetched (hardlinks), and a
+  concurrent sync of another release pair downloads only what is new
+- Concurrent runs share the store: ingests and seeds hold a shared lock,
+  gc an exclusive one, and each owner's refs are updated under its own lock
+
+The push side reads blobs straight from the store (archive_push.py), so
+archive data is only written once per unique digest.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from .workspace_lock import file_lock
+
+DEFAULT_ROOT = "/opt/images/blob-store"
+DEFAULT_GC_GRACE_SECONDS = 3600
+READ_SIZE = 1024 * 1024
+FICLONE = 0x40049409            # linux/fs.h _IOW(0x94, 9, int)
+
+# Blob files in oc-mirror workspaces, registry-layout caches and archive trees
+_BLOB_PATH_RE = re.compile(r"(?:^|/)(?:blobs/sha256[:/]|sha256/[0-9a-f]{2}/)(?P<hex>[0-9a-f]{64})(?:/data)?$")
+_DIGEST_RE = re.compile(r"^sha256:[0-9a-f]{64}$")
+
+
+class BlobStoreError(Exception):
+    """Raised when a blob cannot be stored or does not match its digest."""
+
+
+@dataclass
+class IngestResult:
+    """What an ingest added to the store and how much it deduplicated."""
+
+    files: int = 0
+    stored: int = 0
+    deduplicated: int = 0
+    linked: int = 0
+    bytes_stored: int = 0
+    bytes_saved: int = 0
+    digests: Set[str] = field(default_factory=set)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {k: v for k, v in vars(self).items() if k != "digests"} | {"unique_blobs": len(self.digests)}
+
+
+@dataclass
+class GcResult:
+    removed: int = 0
+    bytes_freed: int = 0
+    kept_linked: int = 0
+
+
+def blob_digest(path: str) -> Optional[str]:
+    """Digest named by a blob file's path in an OCI/oc-mirror layout, or None."""
+    match = _BLOB_PATH_RE.search(path)
+    return f"sha256:{match.group('hex')}" if match else None
+
+
+def _reflink(src: str, dest: str) -> bool:
+    """Copy-on-write clone; False if the filesystem does not support it."""
+    try:
+        with open(src, "rb") as s, open(dest, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        try:
+            os.remove(dest)
+        except OSError:
+            pass
+        return False
+
+
+class BlobStore:
+    """
+    Digest -> file store with owner refcounts.
+
+    Usage:
+        store = BlobStore("/opt/images/blob-store")
+        result = store.ingest_tree("/opt/images/oc-mirror-workspace", owner="4.19-4.20")
+        store.link("sha256:...", "/tmp/layer.tar")
+        store.seed_tree("/opt/images/runs/4.20-4.21/oc-mirror-workspace", exclude_owner="4.20-4.21")
+        store.gc()
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self.refs_dir = os.path.join(root, "refs")
+        self.lock_path = os.path.join(root, ".lock")
+        os.makedirs(os.path.join(root, "sha256"), exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+        os.makedirs(os.path.join(root, "tmp"), exist_ok=True)
+
+    def path(self, digest: str) -> str:
+        if not _DIGEST_RE.match(digest):
+            raise BlobStoreError(f"Not a sha256 digest: {digest}")
+        hexdigest = digest[7:]
+        return os.path.join(self.root, "sha256", hexdigest[:2], hexdigest)
+
+    def has(self, digest: str) -> bool:
+        return os.path.isfile(self.path(digest))
+
+    def iter_digests(self) -> Iterator[str]:
+        base = os.path.join(self.root, "sha256")
+        for prefix in sorted(os.listdir(base)):
+            for name in sorted(os.listdir(os.path.join(base, prefix))):
+                yield f"sha256:{name}"
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def put_stream(self, digest: str, chunks: Iterable[bytes]) -> bool:
+        """
+        Store a blob from a stream of chunks, verifying its digest.
+
+        Returns:
+            True if the blob was written, False if it was already stored
+        """
+        if self.has(digest):
+            return False
+        fd, tmp = tempfile.mkstemp(dir=os.path.join(self.root, "tmp"), prefix="put-")
+        sha = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    sha.update(chunk)
+                    f.write(chunk)
+            if f"sha256:{sha.hexdigest()}" != digest:
+                raise BlobStoreError(f"Content does not match {digest}")
+            return self._commit(tmp, digest)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _commit(self, tmp: str, digest: str) -> bool:
+        dest = self.path(digest)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.chmod(tmp, 0o644)
+        try:
+            os.link(tmp, dest)                      # fails if another writer got there first
+        except FileExistsError:
+            return False
+        return True
+
+    def ingest_file(self, path: str, digest: Optional[str] = None, verify: bool = True) -> bool:
+        """
+        Move a blob file into the store and leave a hardlink in its place.
+
+        If the store already holds the digest the file is replaced by a
+        hardlink to the stored copy, freeing its space.
+
+        Args:
+            path: Blob file
+            digest: Expected digest (computed from the content if None)
+            verify: Hash the content and check it against digest
+
+        Returns:
+            True if the store gained a blob, False if it was a duplicate
+
+        Raises:
+            BlobStoreError: if the content does not match digest
+        """
+        if digest is None or verify:
+            sha = hashlib.sha256()
+            for chunk in self._read(path):
+                sha.update(chunk)
+            actual = f"sha256:{sha.hexdigest()}"
+            if digest is not None and actual != digest:
+                raise BlobStoreError(f"Content does not match {digest}")
+            digest = actual
+        stored = self.path(digest)
+        if os.path.exists(stored):
+            if not os.path.samefile(path, stored):
+                self._replace_with_link(stored, path)
+            return False
+
+        os.makedirs(os.path.dirname(stored), exist_ok=True)
+        try:
+            os.link(path, stored)
+        except FileExistsError:
+            self._replace_with_link(stored, path)
+            return False
+        except OSError:
+            # Different filesystem: keep a copy in the store
+            return self.put_stream(digest, self._read(path))
+        return True
+
+    def _replace_with_link(self, stored: str, path: str) -> None:
+        tmp = f"{path}.blobstore-link"
+        try:
+            os.link(stored, tmp)
+        except OSError:
+            return                                  # cross-device: leave the duplicate
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read(path: str) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            yield from iter(lambda: f.read(READ_SIZE), b"")
+
+    def ingest_tree(self, directory: str, owner: Optional[str] = None, verify: bool = True) -> IngestResult:
+        """
+        Deduplicate every blob file under directory against the store.
+
+        Args:
+            directory: oc-mirror workspace, cache or extracted archive tree
+            owner: Record the digests found under this owner
+            verify: Hash files instead of trusting the digest in their path
+        """
+        result = IngestResult()
+        layout: Dict[str, str] = {}
+        with file_lock(self.lock_path, shared=True):
+            self._ingest_tree(directory, result, layout, verify)
+            if owner:
+                self.add_refs(owner, result.digests, layout)
+        return result
+
+    def _ingest_tree(self, directory: str, result: IngestResult, layout: Dict[str, str], verify: bool) -> None:
+        for dirpath, _, filenames in os.walk(directory):
+            if os.path.commonpath([os.path.abspath(dirpath), os.path.abspath(self.root)]) == \
+                    os.path.abspath(self.root):
+                continue
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                digest = blob_digest(path)
+                if not digest or os.path.islink(path):
+                    continue
+                size = os.path.getsize(path)
+                result.files += 1
+                if self.has(digest) and os.path.samefile(path, self.path(digest)):
+                    result.linked += 1                  # deduplicated by an earlier ingest
+                    result.digests.add(digest)
+                    layout[os.path.relpath(path, directory)] = digest
+                    continue
+                try:
+                    added = self.ingest_file(path, digest, verify=verify)
+                except (BlobStoreError, OSError) as e:
+                    print(f"  ⚠️  {path}: {e}")
+                    continue
+                result.digests.add(digest)
+                layout[os.path.relpath(path, directory)] = digest
+                if added:
+                    result.stored += 1
+                    result.bytes_stored += size
+                else:
+                    result.deduplicated += 1
+                    result.bytes_saved += size
+
+    def ingest_archive(self, archive: str, owner: Optional[str] = None) -> IngestResult:
+        """Copy the blobs of an oc-mirror archive into the store, each unique digest written once."""
+        from .archive_push import index_archives, _read_chunks
+
+        result = IngestResult()
+        with file_lock(self.lock_path, shared=True):
+            for blob in index_archives([archive]).blobs.values():
+                result.files += 1
+                result.digests.add(blob.digest)
+                if self.put_stream(blob.digest, _read_chunks(blob, READ_SIZE)):
+                    result.stored += 1
+                    result.bytes_stored += blob.size
+                else:
+                    result.deduplicated += 1
+                    result.bytes_saved += blob.size
+            if owner:
+                self.add_refs(owner, result.digests)
+        return result
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def link(self, digest: str, dest: str) -> str:
+        """
+        Materialise a blob at dest: hardlink, else reflink, else copy.
+
+        Returns:
+            "hardlink", "reflink" or "copy"
+        """
+        stored = self.path(digest)
+        if not os.path.exists(stored):
+            raise BlobStoreError(f"{digest} is not in the store")
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        try:
+            os.link(stored, dest)
+            return "hardlink"
+        except OSError:
+            pass
+        if _reflink(stored, dest):
+            return "reflink"
+        shutil.copyfile(stored, dest)
+        return "copy"
+
+    def seed_tree(self, directory: str, exclude_owner: Optional[str] = None) -> IngestResult:
+        """
+        Place the blobs other owners already fetched where they sat in their trees.
+
+        Seeding an empty oc-mirror workspace for a new release pair this way
+        leaves only the layers no earlier sync had to be downloaded. Files
+        that already exist are left alone.
+
+        Args:
+            directory: Workspace to seed, laid out like the owners' ingested trees
+            exclude_owner: Owner of the workspace itself
+
+        Returns:
+            IngestResult with linked (files placed) and bytes_saved
+        """
+        result = IngestResult()
+        with file_lock(self.lock_path, shared=True):
+            for owner in self.owners():
+                if owner == exclude_owner:
+                    continue
+                for rel, digest in self.layout(owner).items():
+                    dest = os.path.join(directory, rel)
+                    if os.path.isabs(rel) or rel.startswith("..") or os.path.lexists(dest) or not self.has(digest):
+                        continue
+                    try:
+                        self.link(digest, dest)
+                    except (BlobStoreError, OSError) as e:
+                        print(f"  ⚠️  {dest}: {e}")
+                        continue
+                    result.files += 1
+                    result.linked += 1
+                    result.bytes_saved += os.path.getsize(dest)
+                    result.digests.add(digest)
+        return result
+
+    # -------------------------------------------------------------------------
+    # References and garbage collection
+    # -------------------------------------------------------------------------
+
+    def _refs_path(self, owner: str) -> str:
+        return os.path.join(self.refs_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", owner) + ".json")
+
+    def _refs_lock(self, owner: str) -> str:
+        return os.path.join(self.refs_dir, "." + os.path.basename(self._refs_path(owner))[:-5] + ".lock")
+
+    def _read_refs(self, owner: str) -> Dict[str, Any]:
+        try:
+            with open(self._refs_path(owner)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def refs(self, owner: str) -> Set[str]:
+        return set(self._read_refs(owner).get("digests", []))
+
+    def layout(self, owner: str) -> Dict[str, str]:
+        """Path (relative to the ingested tree) -> digest, for seed_tree()."""
+        return self._read_refs(owner).get("paths", {})
+
+    def add_refs(self, owner: str, digests: Iterable[str], paths: Optional[Dict[str, str]] = None) -> None:
+        """Record that owner uses digests (merged with what it already holds)."""
+        with file_lock(self._refs_lock(owner)):
+            current = self._read_refs(owner)
+            self.set_refs(owner, set(current.get("digests", [])) | set(digests),
+                          {**current.get("paths", {}), **(paths or {})})
+
+    def set_refs(self, owner: str, digests: Iterable[str], paths: Optional[Dict[str, str]] = None) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.refs_dir, prefix=".refs-")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"owner": owner, "updated": time.time(), "digests": sorted(digests),
+                       "paths": paths or {}}, f)
+        os.replace(tmp, self._refs_path(owner))
+
+    def drop_owner(self, owner: str) -> None:
+        try:
+            os.remove(self._refs_path(owner))
+        except FileNotFoundError:
+            pass
+
+    def owners(self) -> List[str]:
+        owners = []
+        for name in sorted(os.listdir(self.refs_dir)):
+            if name.endswith(".json") and not name.startswith("."):
+                try:
+                    with open(os.path.join(self.refs_dir, name)) as f:
+                        owners.append(json.load(f)["owner"])
+                except (OSError, ValueError, KeyError):
+                    continue
+        return owners
+
+    def refcounts(self) -> Dict[str, int]:
+        """digest -> number of owners referencing it."""
+        counts: Dict[str, int] = {}
+        for owner in self.owners():
+            for digest in self.refs(owner):
+                counts[digest] = counts.get(digest, 0) + 1
+        return counts
+
+    def gc(self, grace_seconds: float = DEFAULT_GC_GRACE_SECONDS, dry_run: bool = False) -> GcResult:
+        """
+        Remove blobs no owner references and no outside file links to.
+
+        Blobs younger than grace_seconds are kept so an ingest that has not
+        recorded its refs yet is never collected underneath it.
+        """
+        result = GcResult()
+        with file_lock(self.lock_path):              # no ingest or seed in progress
+            counts = self.refcounts()
+            cutoff = time.time() - grace_seconds
+            for digest in list(self.iter_digests()):
+                if counts.get(digest):
+                    continue
+                path = self.path(digest)
+                st = os.stat(path)
+                if st.st_nlink > 1:
+                    result.kept_linked += 1          # still used by a workspace or archive tree
+                    continue
+                if st.st_mtime > cutoff:
+                    continue
+                if not dry_run:
+                    os.remove(path)
+                result.removed += 1
+                result.bytes_freed += st.st_size
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        blobs = 0
+        size = 0
+        for digest in self.iter_digests():
+            blobs += 1
+            size += os.path.getsize(self.path(digest))
+        return {"blobs": blobs, "bytes": size, "owners": len(self.owners())}
@@ -0,0 +1,415 @@
+"""
+Cluster Configuration Validator for ocp4-disconnected-helper
+Validates cluster.yml / nodes.yml in a single pass:
+- Each file is read once, hashed, and parsed once with yaml.safe_load
+- Fields are checked against a schema compiled at import time, covering the
+  sno / compact / ha topologies in extra_vars/cluster-configs/ and the
+  openshift-agent-install examples layout (cluster.yml + nodes.yml)
+- Topology rules mirror roles/openshift_cluster_deploy/tasks/validate_prerequisites.yml
+- Verdicts are cached by content hash, so re-validating unchanged files on a
+  DAG retrigger returns without parsing anything
+
+Reports expose errors in the keyword form accepted by
+dag_helpers.format_validation_error().
+"""
+
+import hashlib
+import ipaddress
+import json
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "ocp4-disconnected-helper-config-cache.json")
+MAX_CACHE_ENTRIES = 256
+
+TOPOLOGIES = ("sno", "compact", "ha")
+REGISTRY_TYPES = ("quay", "harbor", "jfrog")
+DNS_PROVIDERS = ("dnsmasq", "route53", "none")
+
+_DNS_LABEL_RE = re.compile(r"^[a-z0-9]([-a-z0-9]{0,61}[a-z0-9])?$")
+_DOMAIN_RE = re.compile(r"^([a-z0-9]([-a-z0-9]{0,61}[a-z0-9])?\.)+[a-z]{2,63}$", re.IGNORECASE)
+_OCP_VERSION_RE = re.compile(r"^4\.\d{1,2}(\.\d{1,3})?$")
+_REGISTRY_URL_RE = re.compile(r"^[a-z0-9.-]+(:\d{1,5})?(/[\w./-]*)?$", re.IGNORECASE)
+_MAC_RE = re.compile(r"^([0-9a-f]{2}:){5}[0-9a-f]{2}$", re.IGNORECASE)
+
+
+# =============================================================================
+# Schema
+# =============================================================================
+# (field, required, expected, check). A check returns an error string or None.
+
+def _is_str(value: Any) -> Optional[str]:
+    return None if isinstance(value, str) and value else "not a non-empty string"
+
+
+def _matches(pattern: "re.Pattern", what: str) -> Callable[[Any], Optional[str]]:
+    def check(value: Any) -> Optional[str]:
+        if not isinstance(value, str):
+            return f"{type(value).__name__} {value!r} (quote the value)"
+        return None if pattern.match(value) else f"{value!r} is not a valid {what}"
+    return check
+
+
+def _one_of(choices: Tuple[str, ...]) -> Callable[[Any], Optional[str]]:
+    def check(value: Any) -> Optional[str]:
+        return None if value in choices else f"{value!r}"
+    return check
+
+
+def _int_range(low: int, high: Optional[int] = None) -> Callable[[Any], Optional[str]]:
+    def check(value: Any) -> Optional[str]:
+        if not isinstance(value, int) or isinstance(value, bool):
+            return f"{type(value).__name__} {value!r}"
+        if value < low or (high is not None and value > high):
+            return f"{value}"
+        return None
+    return check
+
+
+def _ip(value: Any) -> Optional[str]:
+    try:
+        ipaddress.ip_address(str(value))
+    except ValueError:
+        return f"{value!r} is not an IP address"
+    return None
+
+
+def _cidr(value: Any) -> Optional[str]:
+    try:
+        ipaddress.ip_network(str(value))
+    except ValueError:
+        return f"{value!r} is not a network CIDR"
+    return None
+
+
+def _ip_list(value: Any) -> Optional[str]:
+    if not isinstance(value, list) or not value:
+        return "not a non-empty list"
+    for item in value:
+        error = _ip(item)
+        if error:
+            return error
+    return None
+
+
+def _is_bool(value: Any) -> Optional[str]:
+    return None if isinstance(value, bool) else f"{type(value).__name__} {value!r}"
+
+
+_CLUSTER_SCHEMA = [
+    ("cluster_name", True, "DNS label (lowercase, digits, '-')", _matches(_DNS_LABEL_RE, "DNS label")),
+    ("base_domain", True, "DNS domain", _matches(_DOMAIN_RE, "domain")),
+    ("ocp_version", False, "quoted version string, e.g. \"4.21\"", _matches(_OCP_VERSION_RE, "OpenShift version")),
+    ("cluster_topology", False, f"one of {', '.join(TOPOLOGIES)}", _one_of(TOPOLOGIES)),
+    ("control_plane_replicas", False, "integer >= 1", _int_range(1)),
+    ("compute_replicas", False, "integer >= 0", _int_range(0)),
+    ("app_node_replicas", False, "integer >= 0", _int_range(0)),
+    ("registry_type", False, f"one of {', '.join(REGISTRY_TYPES)}", _one_of(REGISTRY_TYPES)),
+    ("registry_url", False, "host[:port][/path]", _matches(_REGISTRY_URL_RE, "registry URL")),
+    ("dns_provider", False, f"one of {', '.join(DNS_PROVIDERS)}", _one_of(DNS_PROVIDERS)),
+    ("cluster_network_cidr", False, "network CIDR", _cidr),
+    ("cluster_network_host_prefix", False, "integer 1-128", _int_range(1, 128)),
+    ("service_network_cidr", False, "network CIDR", _cidr),
+    ("machine_network_cidr", False, "network CIDR", _cidr),
+    ("api_vip", False, "IP address", _ip),
+    ("ingress_vip", False, "IP address", _ip),
+    ("rendezvous_ip", False, "IP address", _ip),
+    ("api_vips", False, "list of IP addresses", _ip_list),
+    ("app_vips", False, "list of IP addresses", _ip_list),
+    ("pull_secret_path", False, "file path", _is_str),
+    ("provision_vms", False, "boolean", _is_bool),
+    ("validate_manifests", False, "boolean", _is_bool),
+    ("install_timeout_minutes", False, "integer >= 1", _int_range(1)),
+    ("vm_memory_mb", False, "integer >= 1024", _int_range(1024)),
+    ("vm_vcpus", False, "integer >= 1", _int_range(1)),
+    ("vm_disk_size_gb", False, "integer >= 1", _int_range(1)),
+]
+
+# Topology -> (control_plane_replicas predicate, compute_replicas predicate, description)
+_TOPOLOGY_RULES = {
+    "sno": (lambda cp: cp == 1, lambda w: w == 0, "1 control plane, 0 compute"),
+    "compact": (lambda cp: cp == 3, lambda w: w == 0, "3 control plane, 0 compute"),
+    "ha": (lambda cp: cp == 3, lambda w: w >= 2, "3 control plane, >= 2 compute"),
+}
+
+
+def _schema_fingerprint() -> str:
+    """Changes whenever the schema or this module changes, invalidating the cache."""
+    with open(__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+SCHEMA_VERSION = _schema_fingerprint()
+
+
+# =============================================================================
+# Report
+# =============================================================================
+
+@dataclass
+class ConfigReport:
+    """Verdict for one cluster.yml / nodes.yml pair."""
+
+    cluster_yml: str
+    nodes_yml: Optional[str] = None
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    summary: Dict[str, Any] = field(default_factory=dict)
+    content_hash: str = ""
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def error(self, check_name: str, expected: str, actual: str, config_file: str) -> None:
+        self.errors.append({
+            "check_name": check_name,
+            "expected": expected,
+            "actual": actual,
+            "config_file": config_file,
+        })
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form (for XCom and the cache)."""
+        result = asdict(self)
+        result["ok"] = self.ok
+        return result
+
+
+# =============================================================================
+# Validation
+# =============================================================================
+
+def _read(path: str, report: ConfigReport) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        report.error(f"File {os.path.basename(path)}", "readable file", e.strerror or str(e), path)
+        return None
+
+
+def _parse(raw: bytes, path: str, report: ConfigReport) -> Tuple[bool, Any]:
+    """Parse a file's content once; returns (parsed, document)."""
+    try:
+        return True, yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        mark = getattr(e, "problem_mark", None)
+        where = f" at line {mark.line + 1}, column {mark.column + 1}" if mark else ""
+        report.error(f"YAML syntax ({os.path.basename(path)})", "valid YAML",
+                     f"{getattr(e, 'problem', None) or e}{where}", path)
+        return False, None
+
+
+def _node_name(node: Dict[str, Any]) -> Optional[str]:
+    return node.get("hostname") or node.get("name")
+
+
+def _node_macs(node: Dict[str, Any]) -> List[str]:
+    macs = [node["mac"]] if node.get("mac") else []
+    for interface in node.get("interfaces") or []:
+        if isinstance(interface, dict) and interface.get("mac_address"):
+            macs.append(interface["mac_address"])
+    return macs
+
+
+def _check_nodes(nodes: Any, label: str, path: str, report: ConfigReport) -> List[Dict[str, Any]]:
+    if not isinstance(nodes, list):
+        report.error(f"{label} ({os.path.basename(path)})", "list of nodes",
+                     type(nodes).__name__, path)
+        return []
+    valid = []
+    for index, node in enumerate(nodes):
+        if not isinstance(node, dict) or not _node_name(node):
+            report.error(f"{label}[{index}]", "mapping with hostname or name", repr(node), path)
+            continue
+        if node.get("ip") is not None and _ip(node["ip"]):
+            report.error(f"{label}[{index}].ip", "IP address", repr(node["ip"]), path)
+        for mac in _node_macs(node):
+            if not isinstance(mac, str):
+                # Unquoted MACs of digits only are read by YAML 1.1 as base-60 integers
+                report.error(f"{label}[{index}] MAC", "quoted aa:bb:cc:dd:ee:ff",
+                             f"{type(mac).__name__} {mac!r} (quote the value)", path)
+            elif not _MAC_RE.match(mac):
+                report.error(f"{label}[{index}] MAC", "aa:bb:cc:dd:ee:ff", repr(mac), path)
+        valid.append(node)
+    return valid
+
+
+def _check_cluster(cluster: Dict[str, Any], path: str, report: ConfigReport) -> None:
+    for name, required, expected, check in _CLUSTER_SCHEMA:
+        if name not in cluster or cluster[name] is None:
+            if required:
+                report.error(f"Required field {name}", expected, "missing", path)
+            continue
+        problem = check(cluster[name])
+        if problem:
+            report.error(f"Field {name}", expected, problem, path)
+
+    topology = cluster.get("cluster_topology")
+    control_plane = cluster.get("control_plane_replicas")
+    compute = cluster.get("compute_replicas", cluster.get("app_node_replicas"))
+    if topology in _TOPOLOGY_RULES and isinstance(control_plane, int) and isinstance(compute, int):
+        cp_ok, compute_ok, description = _TOPOLOGY_RULES[topology]
+        if not (cp_ok(control_plane) and compute_ok(compute)):
+            report.error(f"Topology {topology}", description,
+                         f"{control_plane} control plane, {compute} compute", path)
+
+    api_vip, ingress_vip = cluster.get("api_vip"), cluster.get("ingress_vip")
+    if topology in ("compact", "ha") and api_vip and api_vip == ingress_vip:
+        report.error(f"Topology {topology} VIPs", "api_vip != ingress_vip",
+                     f"both {api_vip}", path)
+
+    if "additional_trust_bundle" not in cluster:
+        report.warnings.append("No additional_trust_bundle configured (may be needed for disconnected)")
+
+
+def _check_addresses(cluster: Dict[str, Any], nodes: List[Dict[str, Any]],
+                     path: str, report: ConfigReport) -> None:
+    """Node IPs and VIPs inside machine_network_cidr; names and MACs unique."""
+    names = [_node_name(node) for node in nodes]
+    for duplicate in sorted({n for n in names if names.count(n) > 1}):
+        report.error("Unique node names", "no duplicates", f"{duplicate} defined more than once", path)
+    macs = [mac.lower() for node in nodes for mac in _node_macs(node) if isinstance(mac, str)]
+    for duplicate in sorted({m for m in macs if macs.count(m) > 1}):
+        report.error("Unique MAC addresses", "no duplicates", f"{duplicate} used more than once", path)
+
+    try:
+        network = ipaddress.ip_network(str(cluster.get("machine_network_cidr")))
+    except ValueError:
+        return
+    addresses = [(k, cluster[k]) for k in ("api_vip", "ingress_vip", "rendezvous_ip") if cluster.get(k)]
+    addresses += [(f"{_node_name(node)}.ip", node["ip"]) for node in nodes if node.get("ip")]
+    for label, address in addresses:
+        try:
+            inside = ipaddress.ip_address(str(address)) in network
+        except ValueError:
+            continue                                    # reported by the field check
+        if not inside:
+            report.error(f"Address {label}", f"inside machine_network_cidr {network}",
+                         str(address), path)
+
+    rendezvous = cluster.get("rendezvous_ip")
+    node_ips = {str(node["ip"]) for node in nodes if node.get("ip")}
+    if rendezvous and node_ips and str(rendezvous) not in node_ips:
+        report.warnings.append(f"rendezvous_ip {rendezvous} is not the IP of any listed node")
+
+
+def _validate(cluster_yml: str, cluster_raw: bytes, nodes_yml: Optional[str],
+              nodes_raw: Optional[bytes], report: ConfigReport) -> None:
+    parsed, cluster = _parse(cluster_raw, cluster_yml, report)
+    nodes_parsed, nodes_doc = _parse(nodes_raw, nodes_yml, report) if nodes_yml else (False, None)
+    if not parsed:
+        return
+    if not isinstance(cluster, dict):
+        report.error("cluster.yml structure", "YAML mapping", type(cluster).__name__, cluster_yml)
+        return
+
+    _check_cluster(cluster, cluster_yml, report)
+
+    listed = []
+    for key in ("control_plane_nodes", "worker_nodes"):
+        if key in cluster:
+            listed.extend(_check_nodes(cluster[key], key, cluster_yml, report))
+    for key, replicas in (("control_plane_nodes", "control_plane_replicas"),
+                          ("worker_nodes", "compute_replicas")):
+        expected = cluster.get(replicas)
+        if isinstance(cluster.get(key), list) and isinstance(expected, int) \
+                and len(cluster[key]) != expected:
+            report.error(f"Node count {key}", f"{expected} ({replicas})",
+                         str(len(cluster[key])), cluster_yml)
+
+    if nodes_parsed:
+        entries = nodes_doc.get("nodes") if isinstance(nodes_doc, dict) else nodes_doc
+        nodes = _check_nodes(entries if entries is not None else [], "nodes", nodes_yml, report)
+        if not nodes:
+            report.error("Nodes defined", "at least one node", "0", nodes_yml)
+        control_plane = cluster.get("control_plane_replicas")
+        compute = cluster.get("compute_replicas", cluster.get("app_node_replicas", 0))
+        if nodes and isinstance(control_plane, int) and isinstance(compute, int) \
+                and len(nodes) != control_plane + compute:
+            report.error("Node count nodes.yml",
+                         f"{control_plane + compute} (control plane + compute replicas)",
+                         str(len(nodes)), nodes_yml)
+        listed.extend(nodes)
+
+    _check_addresses(cluster, listed, cluster_yml, report)
+    report.summary = {
+        "cluster": f"{cluster.get('cluster_name')}.{cluster.get('base_domain')}",
+        "topology": cluster.get("cluster_topology"),
+        "nodes": len(listed),
+    }
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+def _read_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(path: str, entries: Dict[str, Any]) -> None:
+    if len(entries) > MAX_CACHE_ENTRIES:
+        entries = dict(list(entries.items())[-MAX_CACHE_ENTRIES:])
+    directory = os.path.dirname(path) or "."
+    try:
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".config-cache-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass                                            # cache is best effort
+
+
+def validate_config_files(cluster_yml: str, nodes_yml: Optional[str] = None,
+                          cache_path: Optional[str] = DEFAULT_CACHE_PATH) -> ConfigReport:
+    """
+    Validate cluster.yml (and optionally nodes.yml), reusing a cached verdict
+    when neither file has changed.
+
+    Args:
+        cluster_yml: Path to cluster.yml
+        nodes_yml: Path to nodes.yml (None for extra_vars/cluster-configs
+            files, which list nodes inline)
+        cache_path: Verdict cache file (None disables caching)
+
+    Returns:
+        ConfigReport; errors are format_validation_error() keyword dicts
+    """
+    report = ConfigReport(cluster_yml=cluster_yml, nodes_yml=nodes_yml)
+    cluster_raw = _read(cluster_yml, report)
+    nodes_raw = _read(nodes_yml, report) if nodes_yml else None
+    if report.errors:
+        # Missing files are never cached: they may appear before the next retrigger
+        return report
+
+    digest = hashlib.sha256(SCHEMA_VERSION.encode())
+    for raw in (cluster_raw, nodes_raw):
+        digest.update(b"\0" if raw is None else hashlib.sha256(raw).digest())
+    report.content_hash = digest.hexdigest()
+    key = f"{report.content_hash}|{cluster_yml}|{nodes_yml or ''}"
+
+    entries = _read_cache(cache_path) if cache_path else {}
+    if key in entries:
+        cached = ConfigReport(**entries[key])
+        cached.cached = True
+        return cached
+
+    _validate(cluster_yml, cluster_raw, nodes_yml, nodes_raw, report)
+
+    if cache_path:
+        entries.pop(key, None)
+        entries[key] = {k: v for k, v in asdict(report).items() if k != "cached"}
+        _write_cache(cache_path, entries)
+    return report
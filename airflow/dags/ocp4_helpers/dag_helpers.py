@@ -0,0 +1,2637 @@
+"""
+DAG Helper Functions for ocp4-disconnected-helper
+Provides reusable utilities for:
+- VM cleanup on failure
+- Clear error reporting with file paths
+- Credential management via Airflow Variables
+- Validation helpers
+- Native OCI registry image validation (see registry_client.py)
+- Release payload completeness checks (see release_verifier.py)
+- Parallel multi-registry health checks (see registry_health.py)
+- Batched, cached DNS validation for cluster fleets (see dns_resolver.py)
+- Single-parse cluster.yml/nodes.yml schema validation (see config_validator.py)
+- Structured timing/metrics events from timed helpers (see helper_metrics.py)
+- Read-once fan-out push of archives to several registries (see archive_push.py)
+- Content-addressed blob store deduplicating layers across releases (see blob_store.py)
+- Blob-level checkpoint/resume of interrupted downloads (see transfer_journal.py)
+- Pre-push registry delta planning with a known-present blob cache (see registry_delta.py)
+- Archive integrity manifest written at download, verified before push (see archive_integrity.py)
+- Optional zstd transport packaging of archives, read in place by the push (see archive_pack.py)
+- Mirror size and duration planning from image manifests and measured throughput (see mirror_planner.py)
+- Adaptive transfer concurrency remembered per registry and uplink (see parallel_tuner.py)
+- Per-run sync metrics with a SQLite trend store and regression flags (see sync_metrics.py)
+- Per-version-pair workspaces with leases, so different syncs run concurrently (see workspace_lock.py)
+- Cached, revalidated OpenShift update graph with offline snapshots (see upgrade_graph.py)
+- Shortest upgrade path solver choosing the exact releases to mirror (see upgrade_path.py)
+- Precomputed version matrix for lookups without the network (see version_matrix.py)
+
+These helpers implement CI/CD-style patterns:
+- Idempotent operations
+- Self-healing (automatic cleanup)
+- Clear error messages pointing to specific files
+"""
+
+import os
+import re
+import sys
+import json
+import subprocess
+from datetime import datetime
+from typing import Optional, Dict, List, Any, Tuple
+
+from .helper_metrics import emit_event, timed
+
+# `python3 <CLI_PATH> <command>` runs main() below (the package's __main__.py)
+CLI_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# =============================================================================
+# Error Reporting Helpers
+# =============================================================================
+
+def format_config_error(
+    config_file: str,
+    field: str,
+    error_msg: str,
+    suggested_fix: Optional[str] = None,
+    related_dag: Optional[str] = None
+) -> str:
+    """
+    Format a configuration error with actionable information.
+    
+    Args:
+        config_file: Full path to the config file with the error
+        field: The field/key that has the issue
+        error_msg: Description of what's wrong
+        suggested_fix: Optional command or steps to fix
+        related_dag: Optional DAG that can fix this issue
+    
+    Returns:
+        Formatted error message string
+    """
+    separator = "=" * 60
+    
+    message = f"""
+{separator}
+CONFIGURATION ERROR
+{separator}
+
+File:  {config_file}
+Field: {field}
+Error: {error_msg}
+
+"""
+    
+    if suggested_fix:
+        message += f"""To fix manually:
+{suggested_fix}
+
+"""
+    
+    if related_dag:
+        message += f"""Or run this DAG to fix automatically:
+  airflow dags trigger {related_dag}
+
+"""
+    
+    message += f"""After fixing, retrigger this DAG to continue.
+{separator}
+"""
+    return message
+
+
+def format_validation_error(
+    check_name: str,
+    expected: str,
+    actual: str,
+    config_file: Optional[str] = None,
+    fix_command: Optional[str] = None
+) -> str:
+    """
+    Format a validation error with expected vs actual values.
+    """
+    separator = "-" * 60
+    
+    message = f"""
+{separator}
+VALIDATION FAILED: {check_name}
+{separator}
+Expected: {expected}
+Actual:   {actual}
+"""
+    
+    if config_file:
+        message += f"Config:   {config_file}\n"
+    
+    if fix_command:
+        message += f"\nTo fix:\n  {fix_command}\n"
+    
+    message += separator + "\n"
+    return message
+
+
+def format_success_report(
+    operation: str,
+    details: Dict[str, Any],
+    next_steps: Optional[List[str]] = None
+) -> str:
+    """
+    Format a success report with details and next steps.
+    """
+    separator = "=" * 60
+    
+    message = f"""
+{separator}
+SUCCESS: {operation}
+{separator}
+Timestamp: {datetime.now().isoformat()}
+
+Details:
+"""
+    
+    for key, value in details.items():
+        message += f"  {key}: {value}\n"
+    
+    if next_steps:
+        message += "\nNext Steps:\n"
+        for i, step in enumerate(next_steps, 1):
+            message += f"  {i}. {step}\n"
+    
+    message += separator + "\n"
+    return message
+
+
+# =============================================================================
+# VM Cleanup Helpers (Bash Commands)
+# =============================================================================
+
+def _domain_volumes(conn, dom) -> List[Any]:
+    """Storage volumes backing a domain's disks (CD-ROMs such as agent ISOs are kept)."""
+    import xml.etree.ElementTree as ET
+    import libvirt
+
+    volumes = []
+    for disk in ET.fromstring(dom.XMLDesc(0)).findall("./devices/disk[@device='disk']"):
+        source = disk.find("source")
+        if source is None:
+            continue
+        try:
+            if source.get("pool") and source.get("volume"):
+                pool = conn.storagePoolLookupByName(source.get("pool"))
+                volumes.append(pool.storageVolLookupByName(source.get("volume")))
+            elif source.get("file"):
+                volumes.append(conn.storageVolLookupByPath(source.get("file")))
+        except libvirt.libvirtError:
+            pass  # not managed by a storage pool
+    return volumes
+
+
+def _teardown_domain(conn, dom, force: bool, remove_storage: bool) -> Dict[str, Any]:
+    import libvirt
+
+    result = {"status": "removed", "volumes": [], "error": None}
+    try:
+        volumes = _domain_volumes(conn, dom) if remove_storage else []
+        if dom.isActive():
+            if not force:
+                return {"status": "skipped (running)", "volumes": [], "error": None}
+            dom.destroy()
+        flags = (libvirt.VIR_DOMAIN_UNDEFINE_MANAGED_SAVE
+                 | libvirt.VIR_DOMAIN_UNDEFINE_SNAPSHOTS_METADATA
+                 | libvirt.VIR_DOMAIN_UNDEFINE_NVRAM)
+        try:
+            dom.undefineFlags(flags)
+        except libvirt.libvirtError:
+            dom.undefine()
+        for vol in volumes:
+            path = vol.path()
+            vol.delete(0)
+            result["volumes"].append(path)
+    except libvirt.libvirtError as e:
+        result.update(status="failed", error=str(e))
+    return result
+
+
+def _is_vm_volume(volume: str, vm_name: str) -> bool:
+    """<vm>.qcow2 / <vm>.img, or a <vm>-* / <vm>_* disk image (ocp-master-0 does not own ocp-master-01)."""
+    if not volume.endswith((".qcow2", ".img")):
+        return False
+    return os.path.splitext(volume)[0] == vm_name or volume.startswith((f"{vm_name}-", f"{vm_name}_"))
+
+
+@timed("teardown_vms")
+def teardown_vms(
+    vm_names: Optional[List[str]] = None,
+    patterns: Optional[List[str]] = None,
+    uri: str = "qemu:///system",
+    force: bool = True,
+    remove_storage: bool = True,
+    max_workers: int = 8,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Tear down many libvirt VMs concurrently over one connection.
+
+    Domains are destroyed and undefined in parallel, their disk volumes are
+    deleted through the storage pool API, and leftover volumes of the domains
+    undefined here (<vm>.qcow2, <vm>.img, <vm>-*/<vm>_* images) in active
+    pools are removed, so a whole cluster (masters, workers, registry VM) is
+    cleaned up in one pass.
+
+    Args:
+        vm_names: Exact domain names; empty names (an unset DAG param) are ignored
+        patterns: fnmatch patterns, e.g. "ocp4-ha-*"
+        uri: libvirt connection URI
+        force: Destroy running domains (otherwise they are skipped)
+        remove_storage: Delete disk volumes
+        max_workers: Domains torn down concurrently
+
+    Returns:
+        VM name -> {"status", "volumes", "error"}; status is one of
+        removed, not found, skipped (running) or failed
+    """
+    import fnmatch
+    from concurrent.futures import ThreadPoolExecutor
+    try:
+        import libvirt
+    except ImportError:
+        raise RuntimeError(format_validation_error(
+            "libvirt Python bindings", "import libvirt", "module not installed",
+            fix_command="dnf install -y python3-libvirt",
+        ))
+
+    try:
+        conn = libvirt.open(uri)
+    except libvirt.libvirtError as e:
+        raise RuntimeError(format_validation_error(
+            f"libvirt connection ({uri})", "connection opened", str(e),
+            fix_command="systemctl status libvirtd",
+        ))
+    vm_names = [name.strip() for name in vm_names or [] if name and name.strip()]
+    patterns = [pattern.strip() for pattern in patterns or [] if pattern and pattern.strip()]
+    if not vm_names and not patterns:
+        print("  ℹ️  No VM names or patterns given, nothing to tear down")
+        conn.close()
+        return {}
+    try:
+        domains = {dom.name(): dom for dom in conn.listAllDomains(0)}
+        wanted = list(dict.fromkeys(vm_names))
+        for pattern in patterns:
+            wanted += [name for name in sorted(domains)
+                       if fnmatch.fnmatchcase(name, pattern) and name not in wanted]
+
+        results = {name: {"status": "not found", "volumes": [], "error": None}
+                   for name in wanted if name not in domains}
+        present = [name for name in wanted if name in domains]
+        if present:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(present))) as pool:
+                futures = {name: pool.submit(_teardown_domain, conn, domains[name], force, remove_storage)
+                           for name in present}
+            results.update({name: future.result() for name, future in futures.items()})
+
+        # Leftover images of the domains undefined here; never those of a VM that
+        # was not found (its name may prefix other VMs') or of one still defined
+        removed = [name for name, r in results.items() if r["status"] == "removed"]
+        remaining = [name for name in domains if name not in removed]
+        if remove_storage and removed:
+            for storage_pool in conn.listAllStoragePools(libvirt.VIR_CONNECT_LIST_STORAGE_POOLS_ACTIVE):
+                for vol in storage_pool.listAllVolumes(0):
+                    name = vol.name()
+                    owners = [vm for vm in removed if _is_vm_volume(name, vm)]
+                    if not owners:
+                        continue
+                    owner = max(owners, key=len)
+                    if any(len(vm) > len(owner) and _is_vm_volume(name, vm) for vm in remaining):
+                        continue
+                    try:
+                        path = vol.path()
+                        vol.delete(0)
+                        results[owner]["volumes"].append(path)
+                    except libvirt.libvirtError:
+                        pass
+    finally:
+        conn.close()
+
+    results = {name: results[name] for name in wanted}
+    for name, result in results.items():
+        icon = {"removed": "✅", "not found": "⚠️ ", "failed": "❌"}.get(result["status"], "⚠️ ")
+        print(f"  {icon} {name}: {result['status']}"
+              + (f" ({len(result['volumes'])} volume(s))" if result["volumes"] else "")
+              + (f" - {result['error']}" if result["error"] else ""))
+    return results
+
+
+def get_vm_cleanup_command(vm_name: str, force: bool = True) -> str:
+    """
+    Generate bash command to cleanup a VM completely.
+    Runs teardown_vms() via this module's CLI.
+    
+    Args:
+        vm_name: Name of the VM to cleanup
+        force: If True, force destroy even if running
+    
+    Returns:
+        Bash command string for VM cleanup
+    """
+    force_arg = "" if force else " --no-force"
+    return f'''
+    echo "========================================"
+    echo "Cleaning up VM: {vm_name}"
+    echo "========================================"
+    
+    python3 "{CLI_PATH}" cleanup-vms --vm "{vm_name}"{force_arg} || true
+    
+    echo "VM cleanup complete: {vm_name}"
+    echo "Safe to retrigger DAG"
+    '''
+
+
+def get_cleanup_on_failure_task_command(
+    vm_name_param: str = "{{ params.vm_name }}",
+    vm_patterns: Optional[List[str]] = None,
+) -> str:
+    """
+    Generate bash command for cleanup-on-failure task.
+    Uses Jinja template for VM name parameter; vm_patterns (e.g.
+    "{{ params.cluster_name }}-*") tear down a whole cluster in the same pass.
+    """
+    vm_arg = f' --vm "{vm_name_param}"' if vm_name_param else ""
+    pattern_args = "".join(f' --pattern "{pattern}"' for pattern in vm_patterns or [])
+    return f'''
+    set +e  # Don't exit on error during cleanup
+    
+    echo "========================================"
+    echo "CLEANUP ON FAILURE"
+    echo "========================================"
+    
+    python3 "{CLI_PATH}" cleanup-vms{vm_arg}{pattern_args}
+    
+    echo ""
+    echo "========================================"
+    echo "Cleanup complete - review error above"
+    echo "Fix the configuration and retrigger DAG"
+    echo "========================================"
+    '''
+
+
+# =============================================================================
+# Credential Management Helpers (Bash Commands)
+# =============================================================================
+
+def fetch_airflow_credentials(
+    variable_keys: List[str],
+    connection_ids: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Load Airflow Variables and Connections in one process.
+
+    Replaces one `airflow variables get` CLI boot per value. Values are
+    looked up through Variable.get() and
+    Connection.get_connection_from_secrets(), so environment overrides
+    (AIRFLOW_VAR_<KEY>, AIRFLOW_CONN_<ID>), configured secrets backends
+    (Vault, AWS Secrets Manager, ...) and the metastore are searched in
+    Airflow's own order.
+
+    Args:
+        variable_keys: Variable keys to load
+        connection_ids: Connection ids to load (login/password used)
+
+    Returns:
+        dict with "variables" {key: value} and "connections"
+        {conn_id: (login, password)}; missing entries are omitted
+    """
+    from airflow.exceptions import AirflowNotFoundException
+    from airflow.models import Connection, Variable
+
+    variables = {}
+    connections = {}
+    for key in dict.fromkeys(variable_keys):
+        value = Variable.get(key, default_var=None)
+        if value is not None:
+            variables[key] = value
+    for conn_id in dict.fromkeys(connection_ids or []):
+        try:
+            conn = Connection.get_connection_from_secrets(conn_id)
+        except AirflowNotFoundException:
+            continue
+        connections[conn_id] = (conn.login, conn.password)
+
+    return {"variables": variables, "connections": connections}
+
+
+def write_auth_file(path: str, auths: Dict[str, Any]) -> None:
+    """Atomically write a container auth file (mode 0600)."""
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".auth-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(auths, f, indent=2)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+@timed("setup_registry_credentials")
+def setup_registry_credentials(
+    registries: Dict[str, Dict[str, str]],
+    pull_secret_path: str = "/root/pull-secret.json",
+    output_path: str = "/tmp/merged-pull-secret.json",
+    podman_login: bool = False,
+) -> str:
+    """
+    Resolve credentials for many registries and merge them into the pull secret.
+
+    All Variables/Connections are fetched in one process (secrets backends
+    included) and merged in memory; the result is written atomically, so readers never see a
+    partially written auth file.
+
+    Args:
+        registries: "host:port" -> {"username_var", "password_var"} or {"conn_id"}
+        pull_secret_path: Pull secret to merge into (skipped if missing)
+        output_path: Merged auth file to write
+        podman_login: Also `podman login` to each registry
+
+    Returns:
+        output_path
+
+    Raises:
+        RuntimeError: if a registry password is not configured, or the pull
+            secret is not valid JSON
+    """
+    import base64
+
+    variable_keys = []
+    connection_ids = []
+    for spec in registries.values():
+        if "conn_id" in spec:
+            connection_ids.append(spec["conn_id"])
+        else:
+            variable_keys += [spec.get("username_var", "quay_username"), spec.get("password_var", "quay_password")]
+    creds = fetch_airflow_credentials(variable_keys, connection_ids)
+
+    resolved = {}
+    for registry, spec in registries.items():
+        if "conn_id" in spec:
+            username, password = creds["connections"].get(spec["conn_id"], (None, None))
+            source = f"Airflow Connection '{spec['conn_id']}'"
+            fix = f"airflow connections add {spec['conn_id']} --conn-type generic --conn-login <user> --conn-password <password>"
+        else:
+            password_var = spec.get("password_var", "quay_password")
+            username = creds["variables"].get(spec.get("username_var", "quay_username"))
+            password = creds["variables"].get(password_var)
+            source = f"Airflow Variable '{password_var}'"
+            fix = f"airflow variables set {password_var} '<your-password>'"
+        if not password:
+            raise RuntimeError(format_config_error(
+                source, registry, "Registry password not found", suggested_fix=f"  {fix}"))
+        resolved[registry] = (username or "init", password)
+
+    try:
+        with open(pull_secret_path) as f:
+            merged = json.load(f)
+        print(f"Merging credentials with pull-secret: {pull_secret_path}")
+    except FileNotFoundError:
+        print(f"WARNING: Pull secret not found at {pull_secret_path}, creating minimal auth file")
+        merged = {}
+    except ValueError as e:
+        raise RuntimeError(format_config_error(
+            pull_secret_path, "auths", f"Pull secret is not valid JSON: {e}",
+            suggested_fix="  Download it again from https://console.redhat.com/openshift/install/pull-secret",
+        ))
+    if not isinstance(merged, dict) or not isinstance(merged.setdefault("auths", {}), dict):
+        raise RuntimeError(format_config_error(
+            pull_secret_path, "auths", "Pull secret has no auths object",
+            suggested_fix="  Download it again from https://console.redhat.com/openshift/install/pull-secret",
+        ))
+
+    for registry, (username, password) in resolved.items():
+        token = base64.b64encode(f"{username}:{password}".encode()).decode()
+        merged["auths"][registry] = {"auth": token}
+        print(f"  ✅ {registry} (user: {username})")
+        if podman_login:
+            login = subprocess.run(
+                ["podman", "login", registry, "-u", username, "--password-stdin", "--tls-verify=false"],
+                input=password, capture_output=True, text=True,
+            )
+            if login.returncode != 0:
+                raise RuntimeError(format_validation_error(
+                    f"Registry login ({registry})", "podman login succeeds",
+                    login.stderr.strip() or f"exit code {login.returncode}",
+                ))
+
+    write_auth_file(output_path, merged)
+    print(f"Merged pull-secret written to: {output_path}")
+    print("Registries in merged pull-secret:")
+    for registry in merged["auths"]:
+        print(f"  {registry}")
+    return output_path
+
+
+def get_credential_setup_command(
+    registry_host: str,
+    registry_port: str = "8443",
+    username_var: str = "quay_username",
+    password_var: str = "quay_password",
+    pull_secret_path: str = "/root/pull-secret.json",
+    output_path: str = "/tmp/merged-pull-secret.json"
+) -> str:
+    """
+    Generate bash command to setup registry credentials.
+    Runs setup_registry_credentials() via this module's CLI: Variables are
+    read in one process and merged with the pull-secret in process.
+    """
+    registry = f"{registry_host}:{registry_port}"
+    
+    return f'''
+    set -euo pipefail
+    
+    echo "========================================"
+    echo "Setting up registry credentials"
+    echo "========================================"
+    
+    python3 "{CLI_PATH}" setup-credentials \\
+        --registry "{registry}" \\
+        --username-var "{username_var}" \\
+        --password-var "{password_var}" \\
+        --pull-secret "{pull_secret_path}" \\
+        --output "{output_path}" \\
+        --podman-login
+    
+    echo ""
+    echo "Credential setup complete"
+    '''
+
+
+# =============================================================================
+# Validation Helpers (Bash Commands)
+# =============================================================================
+
+@timed("validate_registries")
+def validate_registries(
+    registries: List[str],
+    min_cert_days: int = 7,
+    timeout: float = 15,
+    ca_file: Optional[str] = None,
+    deploy_dags: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Validate API health, auth challenge and certificate of many registries at once.
+
+    All registries are probed concurrently with a per-registry timeout, so
+    validating Quay, Harbor and JFrog side by side takes as long as the
+    slowest of them.
+
+    Args:
+        registries: "host:port" entries
+        min_cert_days: Minimum days of certificate validity
+        timeout: Per-registry timeout in seconds
+        ca_file: CA bundle for chain verification (system trust store if None)
+        deploy_dags: "host:port" -> DAG that redeploys it, for the fix hint
+
+    Returns:
+        List of per-registry result dicts
+
+    Raises:
+        RuntimeError: with formatted validation errors for every failed check
+    """
+    from .registry_health import check_registries
+
+    results = check_registries(registries, min_cert_days=min_cert_days,
+                               timeout=timeout, ca_file=ca_file)
+
+    failures = []
+    for result in results:
+        status = "✅" if result.ok else "❌"
+        print(f"{status} {result.registry} ({result.elapsed:.2f}s)")
+        print(f"    API: HTTP {result.api_status or 'n/a'}"
+              f"  Auth: {result.auth_scheme or 'none'}"
+              f"{f' ({result.auth_realm})' if result.auth_realm else ''}")
+        if result.days_left is not None:
+            print(f"    Certificate: expires {result.cert_not_after:%Y-%m-%d} "
+                  f"({result.days_left} days), chain {'trusted' if result.chain_trusted else 'untrusted'}")
+        for warning in result.warnings:
+            print(f"    ⚠️  {warning}")
+        failures.extend(result.validation_errors((deploy_dags or {}).get(result.registry)))
+
+    if failures:
+        raise RuntimeError("".join(format_validation_error(**f) for f in failures))
+    return [result.as_dict() for result in results]
+
+
+def get_registry_validation_command(
+    registry_host: str,
+    registry_port: str = "8443",
+    min_cert_days: int = 7,
+    additional_registries: Optional[List[str]] = None,
+    deploy_dag: Optional[str] = None,
+) -> str:
+    """
+    Generate bash command to validate registry health and certificate.
+    Runs validate_registries() via this module's CLI; additional_registries
+    ("host:port") are validated in the same parallel pass. deploy_dag is the
+    redeploy hint for the first registry.
+    """
+    registries = [f"{registry_host}:{registry_port}"] + list(additional_registries or [])
+    registry_args = " ".join(f'--registry "{r}"' for r in registries)
+    if deploy_dag:
+        registry_args += f' --deploy-dag "{registries[0]}={deploy_dag}"'
+    
+    return f'''
+    set -euo pipefail
+    
+    echo "========================================"
+    echo "Validating Registries: {' '.join(registries)}"
+    echo "========================================"
+    
+    python3 "{CLI_PATH}" validate-registries \\
+        {registry_args} \\
+        --min-cert-days {min_cert_days}
+    
+    echo "VALIDATION PASSED"
+    '''
+
+
+@timed("validate_cluster_dns")
+def validate_cluster_dns(
+    clusters: List[Dict[str, Any]],
+    nameservers: Optional[List[str]] = None,
+    timeout: float = 2.0,
+    attempts: int = 2,
+) -> Dict[str, List[str]]:
+    """
+    Validate api, api-int and *.apps records for many clusters in one batch.
+
+    Every record of every cluster is resolved concurrently against the given
+    nameservers (FreeIPA, dnsmasq on 127.0.0.1, ...), with answers cached
+    for a short TTL across the tasks of a run.
+
+    Args:
+        clusters: Dicts with cluster_name, base_domain and optional expected_ip
+        nameservers: Nameserver IPs ("ip" or "ip:port"); resolv.conf if None
+        timeout: Per-query timeout in seconds
+        attempts: Attempts per nameserver
+
+    Returns:
+        Record name -> resolved addresses
+
+    Raises:
+        RuntimeError: with a formatted validation error per missing record
+    """
+    from .dns_resolver import cluster_record_names, resolve_many
+
+    wanted = []
+    for cluster in clusters:
+        for record, query in cluster_record_names(cluster["cluster_name"], cluster["base_domain"]).items():
+            wanted.append((cluster, record, query))
+
+    answers = resolve_many([query for _, _, query in wanted], nameservers=nameservers,
+                           timeout=timeout, attempts=attempts)
+
+    failures = []
+    resolved = {}
+    for cluster, record, query in wanted:
+        answer = answers[query]
+        domain = f"{cluster['cluster_name']}.{cluster['base_domain']}"
+        if not answer.found:
+            print(f"  ❌ {record}: {answer.error or 'no A record'}")
+            failures.append(format_validation_error(
+                f"DNS record {record}", "A record", answer.error or "no A record",
+                fix_command=(
+                    "airflow dags trigger freeipa_dns_management --conf "
+                    f"'{{\"action\": \"add-cluster\", \"cluster\": \"{cluster['cluster_name']}\", "
+                    f"\"domain\": \"{cluster['base_domain']}\"}}'"
+                ),
+            ))
+            continue
+        resolved[record] = answer.addresses
+        print(f"  ✅ {record} -> {', '.join(answer.addresses)}")
+        expected_ip = cluster.get("expected_ip")
+        if expected_ip and record.startswith("api.") and expected_ip not in answer.addresses:
+            print(f"  ⚠️  Warning: {record} expected {expected_ip} ({domain})")
+
+    if failures:
+        raise RuntimeError("".join(failures))
+    return resolved
+
+
+def get_dns_validation_command(
+    cluster_name: str,
+    base_domain: str,
+    expected_ip: Optional[str] = None,
+    nameservers: Optional[List[str]] = None,
+) -> str:
+    """
+    Generate bash command to validate DNS entries for OpenShift cluster.
+    Runs validate_cluster_dns() via this module's CLI.
+    """
+    cluster_arg = f"{cluster_name},{base_domain}" + (f",{expected_ip}" if expected_ip else "")
+    nameserver_args = "".join(f' --nameserver "{ns}"' for ns in nameservers or [])
+    
+    return f'''
+    set -euo pipefail
+    
+    echo "========================================"
+    echo "Validating DNS for: {cluster_name}.{base_domain}"
+    echo "========================================"
+    
+    python3 "{CLI_PATH}" validate-dns \\
+        --cluster "{cluster_arg}"{nameserver_args}
+    
+    echo "DNS VALIDATION PASSED"
+    '''
+
+
+@timed("validate_cluster_config")
+def validate_cluster_config(
+    cluster_yml_path: str,
+    nodes_yml_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Validate cluster.yml and nodes.yml against the cluster config schema.
+
+    Each file is parsed once; verdicts are cached by content hash, so
+    retriggering a DAG with unchanged configs returns immediately.
+
+    Args:
+        cluster_yml_path: Path to cluster.yml
+        nodes_yml_path: Path to nodes.yml (None when nodes are listed inline,
+            as in extra_vars/cluster-configs/)
+
+    Returns:
+        ConfigReport as a dict
+
+    Raises:
+        RuntimeError: with a formatted validation error per failed check
+    """
+    from .config_validator import validate_config_files
+
+    report = validate_config_files(cluster_yml_path, nodes_yml_path)
+    source = " (cached)" if report.cached else ""
+    for name, value in report.summary.items():
+        print(f"  {name}: {value}")
+    for warning in report.warnings:
+        print(f"  ⚠️  {warning}")
+    if not report.ok:
+        for error in report.errors:
+            print(f"  ❌ {error['check_name']}: {error['actual']}")
+        raise RuntimeError("".join(format_validation_error(**error) for error in report.errors))
+
+    print(f"  ✅ Configuration valid{source}")
+    return report.as_dict()
+
+
+def get_config_validation_command(
+    cluster_yml_path: str,
+    nodes_yml_path: str
+) -> str:
+    """
+    Generate bash command to validate cluster.yml and nodes.yml.
+    Runs validate_cluster_config() via this module's CLI.
+    """
+    return f'''
+    set -euo pipefail
+    
+    echo "========================================"
+    echo "Validating Configuration Files"
+    echo "========================================"
+    
+    python3 "{CLI_PATH}" validate-config \\
+        --cluster-yml "{cluster_yml_path}" \\
+        --nodes-yml "{nodes_yml_path}"
+    
+    echo "CONFIG VALIDATION PASSED"
+    '''
+
+
+# =============================================================================
+# Image Validation Helpers
+# =============================================================================
+
+# Repositories holding OpenShift release payloads: oc-mirror v1 (ocp4/openshift4,
+# openshift-release-dev/*) and oc-mirror v2 (openshift/release, openshift/release-images)
+OCP_RELEASE_REPO_PATTERN = r"(openshift-release-dev|ocp4|openshift4|openshift/release)"
+
+
+@timed("validate_registry_images", images=lambda r: len(r["release_tags"]))
+def validate_registry_images(
+    registry_host: str,
+    registry_port: str = "8443",
+    ocp_version: str = "4.19",
+    auth_file: Optional[str] = "/root/pull-secret.json",
+    repo_pattern: str = OCP_RELEASE_REPO_PATTERN,
+    max_workers: int = 16,
+    registry_type: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Validate OCP images exist in the registry using the native registry client.
+
+    Streams the full catalog (all pages), then lists tags of every release
+    repository and HEADs each release manifest for ocp_version concurrently.
+
+    Args:
+        registry_host: Registry hostname
+        registry_port: Registry port
+        ocp_version: OpenShift version or minor (e.g. 4.19 or 4.19.10)
+        auth_file: Pull-secret style auth file with registry credentials
+        repo_pattern: Regex selecting OpenShift release repositories
+        max_workers: Size of the worker pool for tag/manifest lookups
+        registry_type: quay, harbor, jfrog, ...: the target_registry of the sync hint
+
+    Returns:
+        Summary dict (repository counts, matching repos, release tags)
+
+    Raises:
+        RuntimeError: with a formatted validation error if images are missing
+    """
+    from .registry_client import RegistryClient, RegistryError
+
+    registry = f"{registry_host}:{registry_port}"
+    sync_conf = {"ocp_version": ocp_version}
+    if registry_type:
+        sync_conf["target_registry"] = registry_type
+    sync_fix = f"Sync OCP images to registry:\n  airflow dags trigger ocp_registry_sync --conf '{json.dumps(sync_conf)}'"
+    release_tag = re.compile(rf"^{re.escape(ocp_version)}(\.\d+)*-[a-z0-9_]+$")
+    matcher = re.compile(repo_pattern)
+
+    print(f"Validating OCP {ocp_version} images in {registry}")
+    with RegistryClient(registry_host, registry_port, auth_file=auth_file,
+                        max_workers=max_workers) as client:
+        repo_count = 0
+        ocp_repos = []
+        try:
+            for repo in client.iter_repositories():
+                repo_count += 1
+                if matcher.search(repo):
+                    ocp_repos.append(repo)
+        except RegistryError as e:
+            raise RuntimeError(format_validation_error(
+                "Registry catalog", "readable /v2/_catalog", str(e),
+                fix_command=f"Check https://{registry}/v2/ is reachable and credentials in {auth_file}",
+            ))
+
+        print(f"Repositories in registry: {repo_count}")
+        print(f"OpenShift release repositories: {len(ocp_repos)}")
+        if repo_count == 0:
+            raise RuntimeError(format_validation_error(
+                "Registry contents", "at least one repository",
+                "registry is empty - no images found", fix_command=sync_fix,
+            ))
+        if not ocp_repos:
+            raise RuntimeError(format_validation_error(
+                "OpenShift release images",
+                "repositories like openshift/release-images or ocp4/openshift4",
+                f"none of {repo_count} repositories match {repo_pattern}",
+                fix_command=sync_fix,
+            ))
+
+        # Fan out tag listing across the release repositories
+        releases = []
+        tag_errors = []
+        for repo, tags, error in client.map_concurrent(client.list_tags, ocp_repos):
+            if error:
+                tag_errors.append(f"{repo}: {error}")
+                continue
+            releases.extend((repo, tag) for tag in tags if release_tag.match(tag))
+
+        # Confirm every release manifest actually resolves
+        missing = []
+        for (repo, tag), digest, error in client.map_concurrent(
+                lambda ref: client.head_manifest(*ref), releases):
+            if error or digest is None:
+                missing.append(f"{repo}:{tag}")
+
+    for repo in ocp_repos[:5]:
+        print(f"  - {repo}")
+    for err in tag_errors:
+        print(f"  WARNING: could not list tags for {err}")
+
+    if not releases:
+        raise RuntimeError(format_validation_error(
+            f"OpenShift {ocp_version} release images",
+            f"release tags matching {ocp_version}*-<arch>",
+            f"no {ocp_version} release tags in {len(ocp_repos)} release repositories",
+            fix_command=sync_fix,
+        ))
+    if missing:
+        raise RuntimeError(format_validation_error(
+            f"OpenShift {ocp_version} release manifests",
+            "all release tags resolve to a manifest",
+            f"{len(missing)} missing: {', '.join(missing[:5])}",
+            fix_command=sync_fix,
+        ))
+
+    return {
+        "registry": registry,
+        "repositories": repo_count,
+        "release_repositories": len(ocp_repos),
+        "release_tags": sorted(f"{repo}:{tag}" for repo, tag in releases),
+    }
+
+
+@timed("verify_release_images", images=lambda r: r["components"])
+def verify_release_images(
+    registry_host: str,
+    registry_port: str = "8443",
+    ocp_version: str = "4.19",
+    release_repository: str = "ocp4/openshift4",
+    component_repository: Optional[str] = None,
+    arch: str = "x86_64",
+    auth_file: Optional[str] = "/root/pull-secret.json",
+    image_references_file: Optional[str] = None,
+    max_workers: int = 256,
+) -> Dict[str, Any]:
+    """
+    Verify every component digest of the ocp_version release payload is mirrored.
+
+    Reads the release image's image-references and HEADs each component
+    manifest concurrently, so missing content is found before an install or
+    upgrade starts pulling it.
+
+    Args:
+        registry_host: Mirror registry hostname
+        registry_port: Mirror registry port
+        ocp_version: Full version (4.19.10) or minor (latest mirrored patch)
+        release_repository: Repository holding the release image
+        component_repository: Repository holding component images (defaults to release_repository)
+        arch: Release architecture
+        auth_file: Pull-secret style auth file with registry credentials
+        image_references_file: Optional pre-extracted image-references JSON
+        max_workers: Concurrent HEAD requests
+
+    Returns:
+        Verification summary dict
+
+    Raises:
+        RuntimeError: with a formatted validation error if digests are missing
+    """
+    from .registry_client import RegistryClient, RegistryError
+    from .release_verifier import parse_image_references, verify_release_payload
+
+    registry = f"{registry_host}:{registry_port}"
+    sync_fix = (f"airflow dags trigger ocp_registry_sync "
+                f"--conf '{{\"ocp_version\": \"{ocp_version}\"}}'")
+
+    image_references = None
+    if image_references_file:
+        try:
+            with open(image_references_file, "rb") as f:
+                image_references = parse_image_references(f.read())
+        except (OSError, ValueError) as e:
+            raise RuntimeError(format_validation_error(
+                "Release image-references", f"ImageStream JSON in {image_references_file}", str(e),
+                config_file=image_references_file,
+                fix_command=f"oc adm release extract --file=image-references <release image> > {image_references_file}",
+            ))
+
+    print(f"Verifying OCP {ocp_version} release payload in {registry}/{release_repository}")
+    with RegistryClient(registry_host, registry_port, auth_file=auth_file,
+                        max_workers=max_workers) as client:
+        try:
+            result = verify_release_payload(
+                client, ocp_version,
+                release_repository=release_repository,
+                component_repository=component_repository,
+                arch=arch,
+                image_references=image_references,
+                max_workers=max_workers,
+            )
+        except RegistryError as e:
+            raise RuntimeError(format_validation_error(
+                f"OpenShift {ocp_version} release image",
+                f"release image in {registry}/{release_repository}",
+                str(e), fix_command=sync_fix,
+            ))
+
+    print(f"Release: {result['release']}")
+    print(f"Components checked: {result['components']} in {result['duration_seconds']}s")
+    for name, digest in result["missing"]:
+        print(f"  MISSING {name}: {digest}")
+    for name, digest, error in result["errors"]:
+        print(f"  ERROR   {name}: {digest} ({error})")
+
+    if result["missing"] or result["errors"]:
+        raise RuntimeError(format_validation_error(
+            f"OpenShift {ocp_version} release payload",
+            f"all {result['components']} component digests in {result['component_repository']}",
+            f"{len(result['missing'])} missing, {len(result['errors'])} unreadable",
+            fix_command=sync_fix,
+        ))
+    return result
+
+
+def get_image_validation_command(
+    registry_host: str,
+    registry_port: str = "8443",
+    ocp_version: str = "4.19",
+    registry_type: str = "{{ params.registry_type }}",
+) -> str:
+    """
+    Generate bash command to validate OCP images exist in registry.
+    Runs validate_registry_images() via this module's CLI.
+    """
+    return f'''
+    set -euo pipefail
+    
+    echo "========================================"
+    echo "Validating OCP Images in Registry"
+    echo "========================================"
+    
+    python3 "{CLI_PATH}" validate-images \\
+        --registry-host "{registry_host}" \\
+        --registry-port "{registry_port}" \\
+        --ocp-version "{ocp_version}" \\
+        --registry-type "{registry_type}"
+    
+    echo "IMAGE VALIDATION PASSED"
+    '''
+
+
+# =============================================================================
+# Mirror Sync Helpers
+# =============================================================================
+
+def _fanout_inputs(archive_dir: str, registries: List[Dict[str, Any]], auth_file: Optional[str],
+                   blob_store: Optional[str]):
+    """Archives, push targets and blob store for the fan-out push and its delta plan."""
+    from .archive_push import PushTarget
+    from .mirror_archives import find_chunks
+
+    archives = [chunk.path for chunk in find_chunks(archive_dir, packed=True)]
+    if not archives:
+        raise RuntimeError(format_validation_error(
+            "Archive set", f"mirror_seq*.tar[.zst] in {archive_dir}", "no archives found",
+            fix_command="airflow dags trigger ocp_registry_sync --conf '{\"skip_download\": false}'",
+        ))
+    targets = [PushTarget(r["server"], r.get("path") or "", r.get("username"), r.get("password"),
+                          auth_file) for r in registries]
+    store = None
+    if blob_store:
+        from .blob_store import BlobStore
+        store = BlobStore(blob_store)
+    return archives, targets, store
+
+
+def _print_delta(plan) -> None:
+    from .mirror_archives import GIB
+
+    print(f"  📉 {plan.registry}: {plan.bytes_missing / GIB:.2f} GiB to upload, "
+          f"{plan.bytes_avoided / GIB:.2f} GiB avoided ({plan.bytes_mounted / GIB:.2f} GiB by mounts, "
+          f"{plan.present}/{plan.pairs} blobs present, "
+          f"{plan.cache_hits} from cache, {plan.head_checks} HEAD checks)")
+
+
+@timed("plan_registry_delta", bytes_moved=lambda r: sum(p["bytes_missing"] for p in r.values()))
+def plan_registry_delta(
+    archive_dir: str,
+    registries: List[Dict[str, Any]],
+    auth_file: Optional[str] = None,
+    blob_store: Optional[str] = None,
+    delta_cache: Optional[str] = "/opt/images/.registry-delta",
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Report which archive blobs each registry is missing, without pushing.
+
+    Args:
+        archive_dir: Directory holding mirror_seq*.tar
+        registries: Entries like push-tar-to-registry-vars.yml `registries`
+        auth_file: Pull-secret style auth file for entries without credentials
+        blob_store: Blob store directory (sizes of referenced-only blobs)
+        delta_cache: Directory of known-present caches; None HEADs every blob
+
+    Returns:
+        {registry: DeltaPlan as a dict}
+    """
+    from .archive_push import plan_push
+
+    archives, targets, store = _fanout_inputs(archive_dir, registries, auth_file, blob_store)
+    plans = plan_push(archives, targets, store=store, cache_dir=delta_cache)
+    for plan in plans.values():
+        _print_delta(plan)
+    return {registry: plan.as_dict() for registry, plan in plans.items()}
+
+
+@timed("push_archives_fanout", bytes_moved=lambda r: r["bytes_read"],
+       retries=lambda r: sum(t["retries"] for t in r["targets"].values()))
+def push_archives_fanout(
+    archive_dir: str,
+    registries: List[Dict[str, Any]],
+    auth_file: Optional[str] = None,
+    parallel_blobs: int = 4,
+    retries: int = 3,
+    blob_store: Optional[str] = None,
+    delta_cache: Optional[str] = "/opt/images/.registry-delta",
+    adaptive: bool = False,
+    tuning_store: str = "/opt/images/.parallel-tuning.json",
+) -> Dict[str, Any]:
+    """
+    Push every archive chunk in archive_dir to several registries at once.
+
+    Each blob is read from disk once and streamed to every registry that
+    lacks it, rather than running push-tar-to-registry.yml once per registry.
+    Blobs a registry already holds are planned out first (registry_delta.py).
+
+    Args:
+        archive_dir: Directory holding mirror_seq*.tar (e.g. /opt/images)
+        registries: Entries like push-tar-to-registry-vars.yml `registries`:
+            {"server": "harbor.example.com", "path": "oc-mirror",
+             "username": ..., "password": ...}
+        auth_file: Pull-secret style auth file for entries without credentials
+        parallel_blobs: Blobs streamed concurrently
+        retries: Re-read attempts for an upload that failed mid-stream
+        blob_store: Blob store directory to read blobs from when it holds them
+        delta_cache: Directory of known-present caches; None HEADs every blob
+        adaptive: Adjust blobs in flight from throughput and throttling
+            (parallel_tuner.py), starting from the best count remembered for
+            these registries over this uplink instead of parallel_blobs
+        tuning_store: Where adaptive concurrency is remembered
+
+    Returns:
+        FanoutResult as a dict
+
+    Raises:
+        RuntimeError: with a formatted validation error per failed registry
+    """
+    from .archive_push import push_archives
+    from .mirror_archives import GIB
+
+    archives, targets, store = _fanout_inputs(archive_dir, registries, auth_file, blob_store)
+    print(f"  Pushing {len(archives)} archive(s) to {len(targets)} registr{'y' if len(targets) == 1 else 'ies'}")
+
+    tuner = tuning = key = None
+    if adaptive:
+        from .parallel_tuner import AIMDController, TuningStore, fanout_key
+        tuning = TuningStore(tuning_store)
+        key = fanout_key([t.registry for t in targets])
+        tuner = AIMDController(tuning.limit(key, parallel_blobs))
+        print(f"  📐 Adaptive concurrency for {key}: starting at {tuner.limit} blobs in flight")
+
+    result = push_archives(archives, targets, parallel_blobs=parallel_blobs, retries=retries, store=store,
+                           cache_dir=delta_cache, tuner=tuner)
+    if tuner is not None:
+        for adjustment in tuner.adjustments:
+            print(f"  📐 {adjustment.limit} blobs in flight at {adjustment.mb_s:.0f} MB/s ({adjustment.reason})")
+        if tuner.best_mb_s:
+            tuning.record_live(key, tuner)
+            print(f"  📐 Best: {tuner.best_limit} blobs in flight at {tuner.best_mb_s:.0f} MB/s (remembered)")
+    print(f"  Blobs: {result.blobs} ({result.bytes_total / GIB:.1f} GiB), read {result.bytes_read / GIB:.1f} GiB")
+    for plan in result.plans.values():
+        _print_delta(plan)
+    errors = []
+    for registry, progress in result.targets.items():
+        icon = "✅" if progress.ok else "❌"
+        print(f"  {icon} {registry}: {progress.blobs_uploaded} uploaded "
+              f"({progress.bytes_uploaded / GIB:.1f} GiB), {progress.blobs_mounted} mounted "
+              f"({progress.bytes_mounted / GIB:.1f} GiB), {progress.blobs_present} present, "
+              f"{progress.manifests_pushed} manifests, {progress.retries} retries")
+        if not progress.ok:
+            errors.append(format_validation_error(
+                f"Fan-out push to {registry}",
+                f"{result.manifests} manifests and their blobs pushed",
+                f"{len(progress.errors)} error(s), first: {progress.errors[0]}",
+                config_file="extra_vars/push-tar-to-registry-vars.yml",
+                fix_command=f"curl -sk https://{registry}/v2/",
+            ))
+    if errors:
+        raise RuntimeError("".join(errors))
+    return result.as_dict()
+
+
+@timed("ingest_blob_store", bytes_moved=lambda r: r["bytes_stored"])
+def ingest_blob_store(
+    paths: List[str],
+    owner: str,
+    root: str = "/opt/images/blob-store",
+    verify: bool = True,
+) -> Dict[str, Any]:
+    """
+    Deduplicate workspaces, caches and archives into the content-addressed blob store.
+
+    Directories (oc-mirror workspaces, the oc-mirror v2 cache) have their
+    blob files replaced by hardlinks to the stored copy; archives
+    (mirror_seq*.tar) have their blobs copied in once per unique digest.
+
+    Args:
+        paths: Directories and/or .tar archives
+        owner: Reference owner, e.g. "release-4.19-4.20"; its digests are
+            kept until the owner is dropped
+        root: Blob store directory (same filesystem as the paths for hardlinks)
+        verify: Hash blob files before trusting the digest in their path
+
+    Returns:
+        Totals across all paths plus the store's stats
+    """
+    from .blob_store import BlobStore
+    from .mirror_archives import GIB
+
+    store = BlobStore(root)
+    totals = {"files": 0, "stored": 0, "deduplicated": 0, "linked": 0, "bytes_stored": 0, "bytes_saved": 0}
+    for path in paths:
+        if path.endswith(".tar") and os.path.isfile(path):
+            result = store.ingest_archive(path, owner)
+        elif os.path.isdir(path):
+            result = store.ingest_tree(path, owner, verify=verify)
+        else:
+            print(f"  ⚠️  {path}: not found, skipped")
+            continue
+        print(f"  {path}: {result.stored} new, {result.deduplicated} deduplicated "
+              f"({result.bytes_saved / GIB:.2f} GiB saved), {result.linked} already linked")
+        for key in totals:
+            totals[key] += getattr(result, key)
+
+    stats = store.stats()
+    print(f"  ✅ Blob store {root}: {stats['blobs']} blobs, {stats['bytes'] / GIB:.1f} GiB, "
+          f"{stats['owners']} owner(s)")
+    return {**totals, "store": stats}
+
+
+@timed("gc_blob_store", bytes_moved=lambda r: r["bytes_freed"])
+def gc_blob_store(
+    root: str = "/opt/images/blob-store",
+    drop_owners: Optional[List[str]] = None,
+    grace_seconds: float = 3600,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Drop owners, then delete blobs no owner references and nothing links to.
+
+    Args:
+        root: Blob store directory
+        drop_owners: Owners whose references are released first
+        grace_seconds: Keep unreferenced blobs younger than this
+        dry_run: Report what would be removed
+
+    Returns:
+        {"removed", "bytes_freed", "kept_linked", "owners"}
+    """
+    from .blob_store import BlobStore
+    from .mirror_archives import GIB
+
+    store = BlobStore(root)
+    for owner in drop_owners or []:
+        store.drop_owner(owner)
+    result = store.gc(grace_seconds=grace_seconds, dry_run=dry_run)
+    action = "Would remove" if dry_run else "Removed"
+    print(f"  ✅ {action} {result.removed} blob(s), {result.bytes_freed / GIB:.2f} GiB; "
+          f"{result.kept_linked} unreferenced but still linked")
+    return {"removed": result.removed, "bytes_freed": result.bytes_freed,
+            "kept_linked": result.kept_linked, "owners": store.owners()}
+
+
+@timed("seed_workspace", bytes_moved=lambda r: r["bytes_saved"])
+def seed_workspace(
+    workspace: str,
+    owner: Optional[str] = None,
+    root: str = "/opt/images/blob-store",
+) -> Dict[str, Any]:
+    """
+    Hardlink the layers other syncs already stored into a new oc-mirror workspace.
+
+    Blobs land where the owning sync's oc-mirror left them, so the download
+    of another release pair only fetches the layers no earlier sync had.
+
+    Args:
+        workspace: oc-mirror workspace to seed (created if missing)
+        owner: Blob store owner of this workspace, left out of the seed
+        root: Blob store directory (same filesystem as workspace for hardlinks)
+
+    Returns:
+        {"linked", "bytes_saved", "unique_blobs"}
+    """
+    from .blob_store import BlobStore
+    from .mirror_archives import GIB
+
+    if not os.path.isdir(root):
+        print(f"  ℹ️  No blob store at {root}, nothing to seed")
+        return {"linked": 0, "bytes_saved": 0, "unique_blobs": 0}
+    os.makedirs(workspace, exist_ok=True)
+    result = BlobStore(root).seed_tree(workspace, exclude_owner=owner)
+    print(f"  ✅ Seeded {workspace}: {result.linked} file(s), {result.bytes_saved / GIB:.2f} GiB "
+          f"not downloaded again")
+    return {"linked": result.linked, "bytes_saved": result.bytes_saved, "unique_blobs": len(result.digests)}
+
+
+@timed("write_archive_manifest", bytes_moved=lambda r: sum(a["size"] for a in r["archives"]))
+def write_archive_manifest(archive_dir: str = "/opt/images", workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Write mirror-integrity.json (sha256 per archive and per blob) for the archives in archive_dir.
+
+    Args:
+        archive_dir: Directory holding mirror_seq*.tar
+        workers: Hashing processes (default: one per core)
+
+    Returns:
+        The manifest
+
+    Raises:
+        RuntimeError: if there are no archives or a blob does not match its digest
+    """
+    from .archive_integrity import IntegrityError, MANIFEST_NAME, write_manifest
+    from .mirror_archives import GIB, find_chunks
+
+    archives = [chunk.path for chunk in find_chunks(archive_dir)]
+    try:
+        manifest = write_manifest(archives, workers=workers)
+    except IntegrityError as e:
+        raise RuntimeError(format_validation_error(
+            "Archive integrity manifest", f"mirror_seq*.tar in {archive_dir} with intact blobs", str(e),
+            fix_command="airflow dags trigger ocp_registry_sync --conf '{\"clean_mirror\": true}'",
+        ))
+    total = sum(a["size"] for a in manifest["archives"])
+    print(f"  ✅ {MANIFEST_NAME}: {len(archives)} archive(s), "
+          f"{sum(len(a['blobs']) for a in manifest['archives'])} blobs, {total / GIB:.1f} GiB")
+    return manifest
+
+
+@timed("verify_archive_manifest", bytes_moved=lambda r: r["bytes_hashed"])
+def verify_archive_manifest(archive_dir: str = "/opt/images", workers: Optional[int] = None,
+                            fail_fast: bool = True) -> Dict[str, Any]:
+    """
+    Verify the archives in archive_dir against mirror-integrity.json before pushing.
+
+    Args:
+        archive_dir: Directory holding the archives and the manifest
+        workers: Hashing processes (default: one per core)
+        fail_fast: Stop at the first bad archive
+
+    Returns:
+        {"archives", "bytes_hashed", "duration_seconds", "throughput_mb_s"}
+
+    Raises:
+        RuntimeError: naming each bad archive
+    """
+    from .archive_integrity import IntegrityError, MANIFEST_NAME, verify_manifest
+
+    try:
+        result = verify_manifest(archive_dir, workers=workers, fail_fast=fail_fast)
+    except IntegrityError as e:
+        raise RuntimeError(format_validation_error(
+            "Archive integrity", f"{MANIFEST_NAME} next to the archives", str(e),
+            fix_command=f"python3 ocp4_helpers archive-manifest --archive-dir {archive_dir}  # on the connected side",
+        ))
+    for name in result.unlisted:
+        print(f"  ⚠️  {name} is not in {MANIFEST_NAME}, not verified")
+    if not result.ok:
+        raise RuntimeError(format_validation_error(
+            "Archive integrity", f"{result.archives} archive(s) matching {MANIFEST_NAME}",
+            "; ".join(result.failures),
+            fix_command=f"Copy the named archive(s) across again, then: "
+                        f"python3 ocp4_helpers archive-verify --archive-dir {archive_dir}",
+        ))
+    print(f"  ✅ {result.archives} archive(s) intact ({result.throughput_mb_s} MB/s)")
+    return {"archives": result.archives, "bytes_hashed": result.bytes_hashed,
+            "duration_seconds": result.duration_seconds, "throughput_mb_s": result.throughput_mb_s}
+
+
+@timed("pack_archives", bytes_moved=lambda r: r["bytes_in"])
+def pack_archives(
+    archive_dir: str = "/opt/images",
+    level: int = 3,
+    workers: Optional[int] = None,
+    frame_mib: int = 64,
+) -> Dict[str, Any]:
+    """
+    Repack every mirror_seq*.tar in archive_dir into seekable zstd for transport.
+
+    The tars are replaced by .tar.zst plus a seek index, and the packed
+    copies are added to mirror-integrity.json when it exists.
+
+    Args:
+        archive_dir: Directory holding the archives
+        level: zstd level (1-19); 3 is near disk speed, higher trades CPU for size
+        workers: Frames compressed concurrently (default: one per core, at most 8)
+        frame_mib: MiB of tar per independently decompressible frame
+
+    Returns:
+        {"archives": [PackResult dicts], "bytes_in", "bytes_out", "ratio"}
+
+    Raises:
+        RuntimeError: if zstd is missing or an archive cannot be packed
+    """
+    from .archive_integrity import MANIFEST_NAME, record_packed
+    from .archive_pack import PackError, pack_archive
+    from .mirror_archives import GIB, find_chunks
+
+    results = []
+    for chunk in find_chunks(archive_dir):
+        try:
+            result = pack_archive(chunk.path, level=level, workers=workers, frame_size=frame_mib * 1024 * 1024)
+        except (PackError, OSError) as e:
+            raise RuntimeError(format_validation_error(
+                "zstd packaging", f"{chunk.name} packed", str(e),
+                fix_command="dnf install -y zstd",
+            ))
+        print(f"  📦 {chunk.name}: {result.bytes_in / GIB:.2f} -> {result.bytes_out / GIB:.2f} GiB "
+              f"(ratio {result.ratio}, {result.mb_s} MB/s)")
+        results.append(result.as_dict())
+
+    bytes_in = sum(r["bytes_in"] for r in results)
+    bytes_out = sum(r["bytes_out"] for r in results)
+    if results and os.path.exists(os.path.join(archive_dir, MANIFEST_NAME)):
+        record_packed(archive_dir, results)
+    ratio = round(bytes_in / bytes_out, 2) if bytes_out else 0.0
+    print(f"  ✅ Packed {len(results)} archive(s): {bytes_in / GIB:.1f} -> {bytes_out / GIB:.1f} GiB "
+          f"(ratio {ratio})")
+    if results:
+        # oc-mirror --from cannot read zstd, nor a stream: it needs seekable plain tars
+        print(f"  ℹ️  The oc-mirror publish decompresses a temporary plain copy ({bytes_in / GIB:.1f} GiB "
+              f"free needed on the push side), removed after the push; fan-out push reads .tar.zst in place")
+    return {"archives": results, "bytes_in": bytes_in, "bytes_out": bytes_out, "ratio": ratio}
+
+
+@timed("unpack_archives", bytes_moved=lambda r: r["bytes_out"])
+def unpack_archives(archive_dir: str = "/opt/images", remove_packed: bool = True) -> Dict[str, Any]:
+    """
+    Decompress packed archives back to mirror_seq*.tar for the oc-mirror push.
+
+    Fan-out push reads .tar.zst in place; only oc-mirror needs the tars.
+
+    Raises:
+        RuntimeError: if zstd is missing or an archive is damaged
+    """
+    from .archive_pack import PackError, is_packed, unpack_archive
+    from .mirror_archives import GIB, find_chunks
+
+    packed = [c for c in find_chunks(archive_dir, packed=True) if is_packed(c.path)]
+    bytes_out = 0
+    for chunk in packed:
+        try:
+            path = unpack_archive(chunk.path, remove_source=remove_packed)
+        except (PackError, OSError) as e:
+            raise RuntimeError(format_validation_error(
+                "zstd unpack", f"{chunk.name} decompressed", str(e),
+                fix_command=f"python3 ocp4_helpers archive-verify --archive-dir {archive_dir}",
+            ))
+        bytes_out += os.path.getsize(path)
+    print(f"  ✅ Unpacked {len(packed)} archive(s), {bytes_out / GIB:.1f} GiB")
+    return {"archives": len(packed), "bytes_out": bytes_out}
+
+
+@timed("checkpoint_transfer", bytes_moved=lambda r: r["bytes_verified"])
+def checkpoint_transfer(
+    workspace: str = "/opt/images/oc-mirror-workspace",
+    run_key: str = "",
+    journal: str = "/opt/images/.transfer-journal.jsonl",
+    prune: bool = False,
+    settle_seconds: float = 60,
+) -> Dict[str, Any]:
+    """
+    Journal the verified blobs and manifests of an oc-mirror workspace.
+
+    Run periodically while the download is in progress (prune=False) and
+    once after it failed or before it is retried (prune=True), which removes
+    partial and corrupt files and keeps the verified ones for the next run.
+
+    Args:
+        workspace: oc-mirror workspace directory
+        run_key: Release pair, e.g. "4.19-4.20"; a journal for another pair is discarded
+        journal: Journal file
+        prune: Remove content that did not verify
+        settle_seconds: Without prune, skip files modified this recently
+
+    Returns:
+        CheckpointResult as a dict
+    """
+    from .transfer_journal import checkpoint_workspace
+    from .mirror_archives import GIB
+
+    if not os.path.isdir(workspace):
+        print(f"  ℹ️  {workspace} does not exist, nothing to checkpoint")
+        return {"run_key": run_key, "verified": 0, "bytes_verified": 0, "bytes_kept": 0}
+    result = checkpoint_workspace(workspace, journal_path=journal, run_key=run_key,
+                                  prune=prune, settle_seconds=settle_seconds)
+    action = "Resuming from" if result.resumed and prune else "Checkpoint:"
+    print(f"  ✅ {action} {result.verified + result.journaled} verified file(s), "
+          f"{result.bytes_kept / GIB:.2f} GiB kept ({result.verified} newly hashed)")
+    if result.corrupt or result.pruned:
+        print(f"  ⚠️  {result.corrupt} corrupt file(s); pruned {result.pruned} file(s), "
+              f"{result.bytes_pruned / GIB:.2f} GiB")
+    return result.as_dict()
+
+
+def _graph_channels(versions: List[str], channels: Optional[List[str]]) -> List[str]:
+    from .upgrade_graph import channel_for
+    return list(dict.fromkeys((channels or []) + [channel_for(v) for v in versions]))
+
+
+@timed("fetch_upgrade_graphs", images=lambda r: sum(g["releases"] for g in r.values()))
+def fetch_upgrade_graphs(
+    versions: List[str],
+    channels: Optional[List[str]] = None,
+    arch: str = "amd64",
+    cache_dir: str = "/opt/images/.graph-cache",
+    offline: bool = False,
+    max_age_seconds: float = 3600,
+) -> Dict[str, Any]:
+    """
+    Fetch (or revalidate) the update graph of several channels concurrently into the cache.
+
+    A graph that cannot be refreshed is served from the cache (stale) with a
+    warning, so version resolution survives an unreachable api.openshift.com.
+
+    Args:
+        versions: Minor or patch versions; each selects stable-<minor>
+        channels: Channels to fetch in addition, e.g. fast-4.20
+        arch: Release architecture
+        cache_dir: Graph cache directory
+        offline: Use only the cache (disconnected side, after a snapshot import)
+        max_age_seconds: Cached graphs younger than this are not revalidated
+
+    Returns:
+        channel -> {"source", "releases", "latest", "age_seconds"}
+
+    Raises:
+        RuntimeError: if a channel is neither reachable nor cached
+    """
+    from .upgrade_graph import GraphClient, GraphError
+
+    client = GraphClient(cache_dir, max_age_seconds=max_age_seconds, offline=offline)
+    try:
+        graphs = client.get_many(_graph_channels(versions, channels), arch)
+    except GraphError as e:
+        raise RuntimeError(format_validation_error(
+            "Update graph", "channel graph from api.openshift.com or the graph cache", str(e),
+            fix_command="python3 ocp4_helpers upgrade-graph import --snapshot <upgrade-graph.json from the connected side>",
+        ))
+    labels = {"network": "downloaded", "revalidated": "unchanged (304)", "cache": "cache hit"}
+    result = {}
+    for channel, graph in graphs.items():
+        if graph.source == "stale":
+            print(f"  ⚠️  {channel}: upstream unavailable, using cache from {_duration(graph.age_seconds)} ago "
+                  f"({graph.error})")
+        else:
+            print(f"  ✅ {channel} ({arch}): {len(graph.versions())} releases, latest {graph.latest()}, "
+                  f"{labels.get(graph.source, graph.source)}")
+        result[channel] = {"source": graph.source, "releases": len(graph.versions()), "latest": graph.latest(),
+                           "age_seconds": round(graph.age_seconds)}
+    return result
+
+
+def latest_release(
+    version: str,
+    arch: str = "amd64",
+    cache_dir: str = "/opt/images/.graph-cache",
+    offline: bool = False,
+    max_age_seconds: float = 3600,
+) -> str:
+    """
+    Print the newest release of a minor version (4.20 -> 4.20.6) from stable-<minor>.
+
+    Only the version goes to stdout, for $(...) in shell scripts; warnings go to stderr.
+
+    Raises:
+        RuntimeError: if the channel is unavailable or has no release of that minor
+    """
+    from .upgrade_graph import GraphClient, GraphError, channel_for
+
+    channel = channel_for(version)
+    try:
+        graph = GraphClient(cache_dir, max_age_seconds=max_age_seconds, offline=offline).get(channel, arch)
+    except GraphError as e:
+        raise RuntimeError(format_validation_error(
+            f"Update graph {channel}", "Graph reachable or cached", str(e), config_file=cache_dir))
+    if graph.source == "stale":
+        print(f"  ⚠️  {channel}: upstream unavailable, using cache from {_duration(graph.age_seconds)} ago",
+              file=sys.stderr)
+    latest = graph.latest(version)
+    if not latest:
+        raise RuntimeError(format_validation_error(
+            f"Latest {version} release", f"A {version} release in {channel}",
+            f"{len(graph.versions())} releases, none of {version}"))
+    print(latest)
+    return latest
+
+
+@timed("export_upgrade_graph")
+def export_upgrade_graph(
+    snapshot: str,
+    versions: Optional[List[str]] = None,
+    channels: Optional[List[str]] = None,
+    cache_dir: str = "/opt/images/.graph-cache",
+) -> Dict[str, Any]:
+    """Write cached graphs (all, or the channels of versions/channels) to a snapshot for the air gap."""
+    from .upgrade_graph import GraphClient
+
+    wanted = _graph_channels(versions or [], channels) or None
+    result = GraphClient(cache_dir).export_snapshot(snapshot, wanted)
+    print(f"  ✅ {snapshot}: {result.graphs} graph(s) ({', '.join(result.channels) or 'none cached'})")
+    return {"graphs": result.graphs, "channels": result.channels}
+
+
+@timed("import_upgrade_graph")
+def import_upgrade_graph(snapshot: str, cache_dir: str = "/opt/images/.graph-cache") -> Dict[str, Any]:
+    """Load a snapshot from the connected side into the graph cache."""
+    from .upgrade_graph import GraphClient, GraphError
+
+    try:
+        result = GraphClient(cache_dir).import_snapshot(snapshot)
+    except GraphError as e:
+        raise RuntimeError(format_validation_error("Update graph snapshot", "readable snapshot", str(e)))
+    print(f"  ✅ Imported {result.graphs} graph(s) into {cache_dir}"
+          + (f", {result.skipped} already newer" if result.skipped else ""))
+    return {"graphs": result.graphs, "skipped": result.skipped, "channels": result.channels}
+
+
+def _solve_path(source: str, target: str, accept_risks: Optional[List[str]] = None,
+                blocked: Optional[List[str]] = None, arch: str = "amd64",
+                cache_dir: str = "/opt/images/.graph-cache", offline: bool = False):
+    """UpgradePath over the cached graphs of every minor from source to target."""
+    from .upgrade_graph import GraphClient, GraphError, channel_for
+    from .upgrade_path import PathError, UpgradeGraph, minors_between, solve
+
+    try:
+        channels = [channel_for(m) for m in minors_between(source, target)]
+        graphs = GraphClient(cache_dir, offline=offline).get_many(channels, arch)
+        for channel, graph in graphs.items():
+            if graph.source == "stale":
+                print(f"  ⚠️  {channel}: upstream unavailable, using cache from {_duration(graph.age_seconds)} ago")
+        return solve(UpgradeGraph.from_channels(graphs.values()), source, target,
+                     accept_risks=accept_risks or (), blocked=blocked or ())
+    except (GraphError, PathError) as e:
+        raise RuntimeError(format_validation_error(
+            "Upgrade path", f"a supported update path {source} -> {target}", str(e),
+            fix_command=f"python3 ocp4_helpers upgrade-path --from {source} --to {target} --accept-risk '*'  "
+                        f"# to see paths through conditional updates",
+        ))
+
+
+@timed("solve_upgrade_path", images=lambda r: len(r["to_mirror"]))
+def solve_upgrade_path(
+    source: str,
+    target: str,
+    accept_risks: Optional[List[str]] = None,
+    blocked: Optional[List[str]] = None,
+    arch: str = "amd64",
+    cache_dir: str = "/opt/images/.graph-cache",
+    offline: bool = False,
+    output: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Releases an upgrade goes through, as exact openshift_releases entries.
+
+    Args:
+        source: The cluster's exact current release, e.g. 4.19.12
+        target: Exact target release, or a minor for its newest reachable release
+        accept_risks: Conditional-update risk names to accept ("*" for all)
+        blocked: Releases or "from->to" edges not to use
+        arch: Release architecture
+        cache_dir: Graph cache directory (upgrade_graph.py)
+        offline: Use only the cached graphs
+        output: Write the path as JSON (its openshift_releases feed the vars file)
+
+    Returns:
+        UpgradePath as a dict
+
+    Raises:
+        RuntimeError: if no usable path exists
+    """
+    path = _solve_path(source, target, accept_risks, blocked, arch=arch, cache_dir=cache_dir, offline=offline)
+    result = path.as_dict()
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(result, f, indent=1)
+    print(f"  📐 {' -> '.join(path.releases)} ({path.hops} hop(s), {len(path.to_mirror)} payload(s) to mirror)")
+    for edge, risks in path.risks_accepted.items():
+        print(f"  ⚠️  {edge} is a conditional update (risks accepted: {', '.join(risks)})")
+    return result
+
+
+@timed("build_version_matrix", images=lambda r: r["releases"])
+def build_version_matrix(
+    minors: Optional[List[str]] = None,
+    matrix: str = "/opt/images/version-matrix.json",
+    arch: str = "amd64",
+    cache_dir: str = "/opt/images/.graph-cache",
+    offline: bool = False,
+    max_age_seconds: float = 3600,
+) -> Dict[str, Any]:
+    """
+    Rebuild the version matrix from the (revalidated) channel graphs.
+
+    Args:
+        minors: Minors to cover (default: the supported 4.17-4.20)
+        matrix: Matrix file to write
+        arch: Release architecture
+        cache_dir: Graph cache directory (upgrade_graph.py)
+        offline: Build from the cached graphs only (disconnected side)
+        max_age_seconds: Graph cache age after which a channel is revalidated
+
+    Returns:
+        Releases, minors with their latest patch, and the file size
+
+    Raises:
+        RuntimeError: if a channel is neither reachable nor cached
+    """
+    from .upgrade_graph import GraphClient, GraphError
+    from .version_matrix import SUPPORTED_MINORS, VersionMatrix
+
+    client = GraphClient(cache_dir, max_age_seconds=max_age_seconds, offline=offline)
+    try:
+        built = VersionMatrix.build(client, minors or SUPPORTED_MINORS, arch)
+    except GraphError as e:
+        raise RuntimeError(format_validation_error(
+            "Version matrix", "update graphs of every supported minor", str(e),
+            fix_command="python3 ocp4_helpers upgrade-graph import --snapshot <upgrade-graph.json>  # offline",
+        ))
+    size = built.save(matrix)
+    for minor, entry in built.minors.items():
+        print(f"  ✅ {minor}: latest {entry['latest'] or 'none'} ({entry['channel']})")
+    print(f"  📐 {matrix}: {len(built.releases)} releases, {sum(map(len, built.edges))} recommended updates, "
+          f"{size / 1024:.0f} KiB")
+    return {"releases": len(built.releases), "size": size,
+            "latest": {m: e["latest"] for m, e in built.minors.items()}}
+
+
+def matrix_latest(version: str, matrix: str = "/opt/images/version-matrix.json",
+                  max_age_hours: float = 24) -> str:
+    """
+    Print the latest patch of a minor from the version matrix, for $(...).
+
+    Raises:
+        RuntimeError: if the matrix is missing, too old or does not cover the minor
+    """
+    from .version_matrix import MatrixError, VersionMatrix
+
+    try:
+        latest = VersionMatrix.load(matrix, max_age_hours).latest(version)
+    except MatrixError as e:
+        raise RuntimeError(format_validation_error(
+            f"Latest {version} patch", f"Covered by a version matrix under {max_age_hours}h old",
+            str(e), config_file=matrix, fix_command="airflow dags trigger ocp_version_matrix"))
+    print(latest)
+    return latest
+
+
+@timed("check_versions")
+def check_versions(
+    source: Optional[str] = None,
+    target: Optional[str] = None,
+    upgrade_type: str = "major",
+    cluster_version: Optional[str] = None,
+    accept_risks: Optional[List[str]] = None,
+    direct: bool = False,
+    matrix: str = "/opt/images/version-matrix.json",
+    max_age_hours: float = 24,
+) -> Dict[str, Any]:
+    """
+    Validate a version request against the version matrix, without the network.
+
+    Args:
+        source: Source minor (DAG source_version)
+        target: Target minor or exact release
+        upgrade_type: major (target minor above source) or patch (same minor)
+        cluster_version: Exact release the cluster runs; target must be reachable from it
+        accept_risks: Conditional-update risks the upgrade may take ("*" for all)
+        direct: Target must be a single update from cluster_version (oc adm upgrade --to)
+        matrix: Matrix file
+        max_age_hours: Oldest matrix to trust
+
+    Returns:
+        The checked versions, and the target's latest patch and payload digest
+
+    Raises:
+        RuntimeError: on the first version the matrix rejects
+    """
+    from .upgrade_graph import version_key
+    from .version_matrix import MatrixError, VersionMatrix
+
+    # "Version matrix": the matrix cannot answer; "Version check": it rejects the request
+    def fail(expected: str, actual: str, check_name: str = "Version check") -> RuntimeError:
+        return RuntimeError(format_validation_error(check_name, expected, actual,
+                                                    fix_command="python3 ocp4_helpers version-matrix build"))
+
+    try:
+        vm = VersionMatrix.load(matrix, max_age_hours)
+    except MatrixError as e:
+        raise fail("a current version matrix", str(e), "Version matrix")
+    for version in filter(None, (source, target, cluster_version)):
+        if not vm.has(version):
+            raise fail(f"a release of {', '.join(vm.minors)}", f"{version} is unknown", "Version matrix")
+    def minor(version: str) -> tuple:
+        return version_key(".".join(version.split(".")[:2]))
+
+    if source and target:
+        if upgrade_type == "patch" and minor(source) != minor(target):
+            raise fail("source and target in the same minor for a patch upgrade", f"{source} -> {target}")
+        if minor(target) < minor(source):
+            raise fail("a target at or above the source", f"{source} -> {target}")
+    result: Dict[str, Any] = {"source": source, "target": target, "matrix_age_hours": round(vm.age_hours, 1)}
+    if target:
+        latest = target if target.count(".") >= 2 else vm.latest(target)
+        result.update(latest=latest, payload=vm.payload(latest))
+        print(f"  ✅ {target}: {latest} ({vm.payload(latest)})")
+    if cluster_version and target:
+        if direct:
+            risks = vm.risks(cluster_version, target)
+            usable = target in vm.recommended(cluster_version) or (
+                risks is not None and ("*" in (accept_risks or []) or set(risks) <= set(accept_risks or [])))
+            if not usable:
+                raise fail(f"{target} as a supported update of {cluster_version}",
+                           f"not offered (recommended: {', '.join(vm.recommended(cluster_version)) or 'none'})"
+                           + (f"; conditional, risks {', '.join(risks)}" if risks else ""))
+        else:
+            reachable = vm.reachable(cluster_version, accept_risks or [])
+            if not any(v == target or (target.count(".") < 2 and minor(v) == minor(target) and "-" not in v)
+                       for v in reachable):
+                raise fail(f"{target} reachable from {cluster_version}",
+                           "no supported update path"
+                           + ("" if accept_risks else " without accepting conditional-update risks"))
+        print(f"  ✅ {cluster_version} -> {target}: supported")
+    print(f"  ℹ️  Version matrix built {vm.age_hours:.1f}h ago")
+    return result
+
+
+def _duration(seconds: float) -> str:
+    return f"{int(seconds // 3600)}h{int(seconds % 3600 // 60):02d}m"
+
+
+@timed("plan_mirror", bytes_moved=lambda r: r["bytes_total"], images=lambda r: r["images"])
+def plan_mirror_size(
+    vars_file: Optional[str] = "/root/ocp4-disconnected-helper/extra_vars/download-to-tar-vars.yml",
+    imageset_file: Optional[str] = None,
+    versions: Optional[List[str]] = None,
+    mirror_path: str = "/opt/images",
+    auth_file: Optional[str] = "/root/.docker/config.json",
+    clean: bool = False,
+    run_key: Optional[str] = None,
+    output: Optional[str] = None,
+    run_id: Optional[str] = None,
+    workspace_root: str = "/opt/images",
+    upgrade_from: Optional[str] = None,
+    accept_risks: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Predict the disk space and time a download needs, and fail if the disk is too small.
+
+    Args:
+        vars_file: download-to-tar-vars.yml to read the image set from
+        imageset_file: ImageSetConfiguration to read instead of vars_file
+        versions: Releases to plan instead of openshift_releases
+            (4.20 = latest stable-4.20, 4.20.6 = exactly that release)
+        mirror_path: target_mirror_path
+        auth_file: Pull secret for the source registries
+        clean: clean_mirror: previous archives are removed first
+        run_key: Release pair, to count the blobs of a resumable download
+        output: Write the plan as JSON here (disk_required_kb feeds download-to-tar.yml)
+        run_id: Run holding the lease on mirror_path: plan against the disk
+            concurrent runs reserved, and reserve disk_required for this one
+        workspace_root: Directory whose workspaces share the disk with mirror_path
+        upgrade_from: Exact cluster release: plan the releases on its upgrade
+            path to the last entry of versions instead
+        accept_risks: Conditional-update risks the upgrade path may take
+
+    Returns:
+        MirrorPlan as a dict
+
+    Raises:
+        RuntimeError: if the image set cannot be resolved or does not fit
+    """
+    import yaml
+    from .mirror_archives import GIB
+    from .mirror_planner import (HEADROOM, PlanError, plan_mirror, release_spec, save_plan,
+                                spec_from_imageset, spec_from_vars)
+    from .workspace_lock import LeaseError, reserve_disk, reserved_by_others
+
+    source = imageset_file or vars_file
+    try:
+        with open(source) as f:
+            document = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise RuntimeError(format_config_error(source, "image set", str(e)))
+    spec = spec_from_imageset(document) if imageset_file else spec_from_vars(document)
+    if upgrade_from and versions:
+        versions = _solve_path(upgrade_from, versions[-1], accept_risks).to_mirror
+    if versions:
+        spec.releases = [release_spec(v) for v in versions]
+
+    reserved = reserved_by_others(mirror_path, workspace_root) if run_id else 0
+    try:
+        plan = plan_mirror(spec, mirror_path=mirror_path, auth_file=auth_file, clean=clean, run_key=run_key,
+                           reserved_bytes=reserved)
+    except PlanError as e:
+        raise RuntimeError(format_validation_error(
+            "Mirror plan", "every release channel resolvable in the update graph", str(e),
+            config_file=source,
+            fix_command="curl -s 'https://api.openshift.com/api/upgrades_info/v1/graph?channel=stable-4.20' | jq '.nodes[].version'",
+        ))
+    if output:
+        save_plan(plan, output)
+
+    print(f"  📐 Releases: {', '.join(plan.releases) or 'none'}")
+    print(f"  📐 {plan.images} images, {plan.blobs} unique blobs, {plan.bytes_total / GIB:.1f} GiB "
+          f"(release {plan.bytes_release / GIB:.1f}, operators {plan.bytes_operators / GIB:.1f}, "
+          f"additional {plan.bytes_additional / GIB:.1f})")
+    if plan.bytes_shipped or plan.bytes_resumed:
+        print(f"  📐 Incremental: {plan.bytes_shipped / GIB:.1f} GiB already shipped, "
+              f"{plan.bytes_resumed / GIB:.1f} GiB already downloaded")
+    for phase, seconds, rate, samples in (("Download", plan.download_seconds, plan.download_rate, plan.download_samples),
+                                          ("Push", plan.push_seconds, plan.push_rate, plan.push_samples)):
+        basis = f"median of {samples} run(s)" if samples else "default, no runs measured yet"
+        print(f"  ⏱️  {phase}: ~{_duration(seconds)} at {rate / 1e6:.0f} MB/s ({basis})")
+    for item in plan.unresolved[:10]:
+        print(f"  ⚠️  Not resolved (numbers are a lower bound): {item}")
+    if len(plan.unresolved) > 10:
+        print(f"  ⚠️  ... and {len(plan.unresolved) - 10} more")
+    if plan.download_seconds > 7200:
+        print("  ⚠️  Predicted download exceeds the 2h oc-mirror async limit in download-to-tar.yml")
+
+    if not plan.fits:
+        raise RuntimeError(format_validation_error(
+            "Mirror disk space",
+            f"{plan.disk_required / GIB:.1f} GiB free in {mirror_path} "
+            f"({plan.bytes_download / GIB:.1f} GiB download + {plan.bytes_archives / GIB:.1f} GiB archives "
+            f"+ {HEADROOM:.0%} headroom)",
+            f"{plan.disk_available / GIB:.1f} GiB free"
+            + (f" after {plan.disk_reserved / GIB:.1f} GiB reserved by concurrent syncs" if plan.disk_reserved else ""),
+            config_file=source,
+            fix_command=f"Grow {mirror_path}, trim operators/additional_images, or set clean_mirror=true",
+        ))
+    if run_id:
+        try:
+            reserve_disk(mirror_path, run_id, plan.disk_required)
+        except LeaseError as e:
+            print(f"  ⚠️  Disk not reserved: {e}")
+    if plan.disk_reserved:
+        print(f"  📐 {plan.disk_reserved / GIB:.1f} GiB reserved by concurrent syncs")
+    print(f"  ✅ Disk: {plan.disk_required / GIB:.1f} GiB needed, {plan.disk_available / GIB:.1f} GiB free")
+    return plan.as_dict()
+
+
+def record_throughput(phase: str, started: float, archive_dir: str = "/opt/images") -> Dict[str, Any]:
+    """
+    Record the throughput of a finished download or push for future plans.
+
+    Bytes are the archives written since started (download) or the whole
+    archive set (push); seconds run from started to now.
+    """
+    import time
+    from .mirror_planner import ThroughputHistory
+
+    bytes_moved, count = _phase_bytes(phase, started, archive_dir)
+    seconds = time.time() - started
+    ThroughputHistory().record(phase, bytes_moved, seconds)
+    emit_event(f"mirror_{phase}", "success", duration_seconds=seconds, bytes_moved=bytes_moved, archives=count)
+    rate = bytes_moved / 1e6 / seconds if seconds > 0 else 0.0
+    print(f"  ✅ Recorded {phase} throughput: {rate:.0f} MB/s over {count} archive(s)")
+    return {"phase": phase, "bytes": bytes_moved, "seconds": round(seconds, 1)}
+
+
+def _phase_bytes(phase: str, started: float, archive_dir: str) -> Tuple[int, int]:
+    """(bytes, archives) a download wrote since started, or of the whole set for a push."""
+    from .mirror_archives import find_chunks
+
+    chunks = find_chunks(archive_dir, packed=True)
+    if phase == "download":
+        chunks = [c for c in chunks if os.path.getmtime(c.path) >= started]
+    return sum(os.path.getsize(c.path) for c in chunks), len(chunks)
+
+
+def mirror_parallelism(
+    registries: List[str],
+    store: str = "/opt/images/.parallel-tuning.json",
+    log_file: Optional[str] = None,
+    shell: bool = False,
+) -> Dict[str, Any]:
+    """
+    oc-mirror concurrency to use next for these registries over this uplink.
+
+    Args:
+        registries: Registries the run talks to, e.g. ["quay.io", "registry.redhat.io"]
+        store: Tuning store (parallel_tuner.py)
+        log_file: oc-mirror log; its current size is the offset the run's
+            throttling is read from afterwards
+        shell: Print NAME=value lines for `eval` instead of a report
+
+    Returns:
+        {"key", "max_per_registry", "parallel_images", "parallel_layers", "log_offset"}
+    """
+    from .parallel_tuner import TuningStore, fanout_key, log_size
+
+    key = fanout_key(registries)
+    settings = TuningStore(store).settings(key)
+    result = {"key": key, "max_per_registry": settings.layers, "parallel_images": settings.images,
+              "parallel_layers": settings.layers, "log_offset": log_size(log_file)}
+    if shell:
+        for name in ("max_per_registry", "parallel_images", "parallel_layers", "log_offset"):
+            print(f"{name.upper()}={result[name]}")
+    else:
+        print(f"  📐 {key}: max-per-registry {settings.layers} "
+              f"(v2: --parallel-images {settings.images} --parallel-layers {settings.layers})")
+    return result
+
+
+@timed("record_mirror_parallelism", bytes_moved=lambda r: r["bytes"])
+def record_mirror_parallelism(
+    registries: List[str],
+    phase: str,
+    started: float,
+    images: int,
+    layers: int,
+    ok: bool = True,
+    archive_dir: str = "/opt/images",
+    log_file: Optional[str] = None,
+    log_offset: int = 0,
+    store: str = "/opt/images/.parallel-tuning.json",
+) -> Dict[str, Any]:
+    """
+    Step the remembered oc-mirror concurrency from the outcome of a run.
+
+    Throughput is measured as in record_throughput; throttling (HTTP 429)
+    and errors are counted in the oc-mirror log from log_offset on.
+    """
+    import time
+    from .parallel_tuner import MirrorConcurrency, RunOutcome, TuningStore, fanout_key, scan_log
+
+    key = fanout_key(registries)
+    bytes_moved, _ = _phase_bytes(phase, started, archive_dir)
+    throttled, errors, _ = scan_log(log_file, log_offset) if log_file else (0, 0, 0)
+    outcome = RunOutcome(bytes_moved, time.time() - started, throttled, errors, ok)
+    following, reason = TuningStore(store).record(key, MirrorConcurrency(images, layers), outcome)
+    icon = "✅" if ok and not throttled else "⚠️ "
+    print(f"  {icon} {phase} at max-per-registry {layers}: {outcome.mb_s:.0f} MB/s, "
+          f"{throttled} throttled, {errors} error lines")
+    print(f"  📐 Next run for {key}: max-per-registry {following.layers} ({reason})")
+    return {"key": key, "bytes": bytes_moved, "mb_s": round(outcome.mb_s, 1), "throttled": throttled,
+            "next_max_per_registry": following.layers, "reason": reason}
+
+
+def report_sync_metrics(
+    run_id: str,
+    tasks: Optional[Dict[str, Dict[str, Any]]] = None,
+    source_version: str = "",
+    target_version: str = "",
+    mode: str = "",
+    downloaded: bool = True,
+    mirror_path: str = "/opt/images",
+    journal_dir: str = "/opt/images/.sync-metrics",
+    store: str = "/opt/images/.sync-metrics/trends.db",
+    last: int = 10,
+) -> Dict[str, Any]:
+    """
+    Report a sync run's metrics per phase and against the last runs, and store them.
+
+    Regressions (slower, larger, more retries than the median of the last
+    runs) are reported with ⚠️ but do not fail the report.
+
+    Args:
+        run_id: Airflow run id
+        tasks: {task_id: {"seconds": ..., "tries": ...}} from Airflow
+        source_version: Release pair, for the trend listing
+        target_version: Release pair, for the trend listing
+        mode: oc-mirror or fan-out
+        downloaded: False for skip_download runs (the plan on disk is older)
+        mirror_path: Directory holding the archives
+        journal_dir: Directory of run journals (OCP4_METRICS_JOURNAL_DIR)
+        store: SQLite trend store
+        last: Runs to compare with
+
+    Returns:
+        {"run": SyncRun as a dict, "regressions": [metric names]}
+    """
+    from .sync_metrics import TrendStore, collect_run, compare, format_value, prune_journals
+
+    run = collect_run(run_id, mirror_path, journal_dir, tasks, source_version, target_version, mode, downloaded)
+    print(f"  📊 Run {run_id} ({mode or 'oc-mirror'}, {source_version}→{target_version})")
+    for task, info in run.tasks.items():
+        tries = int(info.get("tries") or 1)
+        print(f"     {task:<22} {format_value('task_seconds', info.get('seconds')):>9}"
+              f"{f'  ({tries} tries)' if tries > 1 else ''}")
+    if run.phases:
+        print(f"  ⏱️  {'Phase':<30} {'Time':>9} {'Data':>11} {'MB/s':>8}")
+        for name, phase in sorted(run.phases.items(), key=lambda p: -p[1].seconds):
+            failed = f"  ❌ {phase.failed} failed" if phase.failed else ""
+            print(f"     {name:<30} {format_value('phase_seconds', phase.seconds):>9} "
+                  f"{format_value('bytes_', phase.bytes) if phase.bytes else '-':>11} "
+                  f"{format_value('phase_mb_s', phase.mb_s):>8}{failed}")
+
+    with TrendStore(store) as trends:
+        history = trends.recent(last, exclude=run_id)
+        rows = compare(run.metrics(), history)
+        trends.record(run)
+    prune_journals(journal_dir)
+    print(f"  📈 {'Metric':<16} {'This run':>11} {f'Median of {len(history)}':>13} {'Change':>8}")
+    for row in rows:
+        change = f"{row.change * 100:+.0f}%" if row.change is not None else "-"
+        print(f"     {row.label:<16} {format_value(row.name, row.current):>11} "
+              f"{format_value(row.name, row.baseline):>13} {change:>8}{'  ⚠️' if row.regression else ''}")
+    regressions = [row for row in rows if row.regression]
+    if regressions:
+        print(f"  ⚠️  Regression vs. the last {len(history)} run(s): "
+              + ", ".join(f"{r.label} {r.change * 100:+.0f}%" if r.change is not None else r.label
+                          for r in regressions))
+    elif history:
+        print(f"  ✅ No regression vs. the last {len(history)} run(s)")
+    return {"run": run.as_dict(), "regressions": [r.name for r in regressions]}
+
+
+# =============================================================================
+# Airflow Task Generators
+# =============================================================================
+
+@timed("workspace_lease")
+def workspace_lease(
+    action: str,
+    workspace: str,
+    run_id: str,
+    wait_seconds: float = 0,
+    stale_hours: float = 12,
+) -> Dict[str, Any]:
+    """
+    Acquire (or renew), check and release a sync run's lease on its workspace.
+
+    Args:
+        action: "acquire", "check" (is it held by run_id) or "release"
+        workspace: Mirror path of the run (/opt/images or /opt/images/runs/<pair>)
+        run_id: Airflow run_id
+        wait_seconds: acquire: how long to wait for another run of this workspace
+        stale_hours: acquire: take over a lease not renewed for this long
+
+    Returns:
+        The lease as a dict ({} after release)
+
+    Raises:
+        RuntimeError: if another run still holds the workspace (check: if
+            run_id does not hold it)
+    """
+    from dataclasses import asdict
+    from .workspace_lock import LeaseError, acquire_lease, read_lease, release_lease
+
+    if action == "release":
+        if release_lease(workspace, run_id):
+            print(f"  ✅ Released {workspace}")
+        else:
+            holder = read_lease(workspace)
+            print(f"  ℹ️  {workspace} not held by {run_id}" + (f" (held by {holder.run_id})" if holder else ""))
+        return {}
+    if action == "check":
+        holder = read_lease(workspace)
+        if holder is None or holder.run_id != run_id:
+            raise RuntimeError(format_validation_error(
+                "Workspace lease", f"{workspace} leased to run {run_id}",
+                f"held by {holder.run_id}" if holder else "not leased"))
+        print(f"  ✅ {workspace} held by {run_id}")
+        return asdict(holder)
+
+    print(f"  ⏳ Acquiring {workspace} for {run_id}" + (f" (waiting up to {wait_seconds:.0f}s)" if wait_seconds else ""))
+    try:
+        lease = acquire_lease(workspace, run_id, wait_seconds=wait_seconds, stale_seconds=stale_hours * 3600)
+    except LeaseError as e:
+        raise RuntimeError(format_validation_error(
+            "Workspace lease", f"{workspace} free for run {run_id}", str(e),
+            fix_command=f"Wait for that run, or if it is gone: rm {os.path.join(workspace, '.lease.json')}",
+        ))
+    print(f"  ✅ {workspace} leased to {run_id}")
+    return asdict(lease)
+
+
+def create_cleanup_on_failure_task(
+    dag,
+    vm_name_param: str = "{{ params.vm_name }}",
+    vm_patterns: Optional[List[str]] = None,
+):
+    """
+    Create a BashOperator task for cleanup on failure.
+    Import this in your DAG and add to task dependencies.
+    
+    Usage in DAG:
+        from ocp4_helpers.dag_helpers import create_cleanup_on_failure_task
+        cleanup = create_cleanup_on_failure_task(dag)
+        main_task >> cleanup  # cleanup runs if main_task fails
+    
+    Whole cluster (all VMs named <cluster>-*) in one pass:
+        cleanup = create_cleanup_on_failure_task(
+            dag, vm_name_param=None, vm_patterns=["{{ params.cluster_name }}-*"])
+    """
+    from airflow.operators.bash import BashOperator
+    from airflow.utils.trigger_rule import TriggerRule
+    
+    return BashOperator(
+        task_id='cleanup_on_failure',
+        bash_command=get_cleanup_on_failure_task_command(vm_name_param, vm_patterns),
+        trigger_rule=TriggerRule.ONE_FAILED,
+        dag=dag,
+    )
+
+
+# =============================================================================
+# Command Line Entry Point
+# =============================================================================
+# The get_*_command() generators above call back into this module so BashOperator
+# tasks get the same in-process engines as PythonOperator tasks:
+#   python3 ocp4_helpers validate-images --registry-host <host> ...
+
+def _registries_arg(vars_file: Optional[str], specs: List[str]) -> List[Dict[str, Any]]:
+    """`registries` of a push vars file plus host[:port][/path] specs."""
+    registries = []
+    if vars_file:
+        import yaml
+        with open(vars_file) as f:
+            registries += yaml.safe_load(f).get("registries") or []
+    for spec in specs:
+        server, _, path = spec.partition("/")
+        registries.append({"server": server, "path": path})
+    return registries
+
+
+def _words(values: List[str]) -> List[str]:
+    """Repeatable options that also take space- or comma-separated lists."""
+    return [w for value in values for w in value.replace(",", " ").split()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="ocp4_helpers", description="ocp4-disconnected-helper DAG helpers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cleanup = commands.add_parser("cleanup-vms", help="Tear down libvirt VMs and their storage in parallel")
+    cleanup.add_argument("--vm", action="append", help="Domain name (repeatable)")
+    cleanup.add_argument("--pattern", action="append", help="fnmatch pattern, e.g. 'ocp4-ha-*' (repeatable)")
+    cleanup.add_argument("--uri", default="qemu:///system")
+    cleanup.add_argument("--no-force", dest="force", action="store_false",
+                         help="Skip running VMs instead of destroying them")
+    cleanup.add_argument("--keep-storage", dest="remove_storage", action="store_false")
+    cleanup.add_argument("--max-workers", type=int, default=8)
+
+    creds = commands.add_parser("setup-credentials",
+                                help="Merge registry credentials from Airflow into the pull secret")
+    creds.add_argument("--registry", required=True, help="host:port")
+    creds.add_argument("--username-var", default="quay_username")
+    creds.add_argument("--password-var", default="quay_password")
+    creds.add_argument("--conn-id", help="Airflow Connection to use instead of Variables")
+    creds.add_argument("--pull-secret", default="/root/pull-secret.json")
+    creds.add_argument("--output", default="/tmp/merged-pull-secret.json")
+    creds.add_argument("--podman-login", action="store_true")
+
+    images = commands.add_parser("validate-images", help="Validate OCP images exist in a registry")
+    images.add_argument("--registry-host", required=True)
+    images.add_argument("--registry-port", default="8443")
+    images.add_argument("--ocp-version", default="4.19")
+    images.add_argument("--auth-file", default="/root/pull-secret.json")
+    images.add_argument("--max-workers", type=int, default=16)
+    images.add_argument("--registry-type", help="target_registry for the sync hint (quay, harbor, jfrog)")
+
+    health = commands.add_parser("validate-registries",
+                                 help="Validate API, auth and TLS of registries in parallel")
+    health.add_argument("--registry", action="append", required=True, help="host:port (repeatable)")
+    health.add_argument("--min-cert-days", type=int, default=7)
+    health.add_argument("--timeout", type=float, default=15)
+    health.add_argument("--ca-file")
+    health.add_argument("--deploy-dag", action="append", default=[],
+                        help="host:port=dag_id that redeploys a registry, for the fix hint (repeatable)")
+
+    dns = commands.add_parser("validate-dns", help="Validate cluster DNS records in one batch")
+    dns.add_argument("--cluster", action="append", required=True,
+                     help="cluster_name,base_domain[,expected_ip] (repeatable)")
+    dns.add_argument("--nameserver", action="append", help="ip or ip:port (repeatable)")
+    dns.add_argument("--timeout", type=float, default=2.0)
+
+    config = commands.add_parser("validate-config", help="Validate cluster.yml and nodes.yml")
+    config.add_argument("--cluster-yml", required=True)
+    config.add_argument("--nodes-yml")
+
+    release = commands.add_parser("verify-release",
+                                  help="Verify all release payload digests are mirrored")
+    release.add_argument("--registry-host", required=True)
+    release.add_argument("--registry-port", default="8443")
+    release.add_argument("--ocp-version", required=True)
+    release.add_argument("--release-repository", default="ocp4/openshift4")
+    release.add_argument("--component-repository")
+    release.add_argument("--arch", default="x86_64")
+    release.add_argument("--auth-file", default="/root/pull-secret.json")
+    release.add_argument("--image-references-file")
+    release.add_argument("--max-workers", type=int, default=256)
+
+    fanout = commands.add_parser("push-fanout",
+                                 help="Push archive chunks to several registries, reading each blob once")
+    fanout.add_argument("--archive-dir", default="/opt/images")
+    fanout.add_argument("--vars-file", help="push-tar-to-registry-vars.yml (its `registries` list)")
+    fanout.add_argument("--registry", action="append", default=[],
+                        help="host[:port][/path], credentials from --auth-file (repeatable)")
+    fanout.add_argument("--auth-file", default="/root/pull-secret.json")
+    fanout.add_argument("--parallel-blobs", type=int, default=4)
+    fanout.add_argument("--retries", type=int, default=3)
+    fanout.add_argument("--blob-store", help="Read blobs from this blob store when it holds them")
+    fanout.add_argument("--delta-cache", default="/opt/images/.registry-delta",
+                        help="Known-present blob cache directory ('' to HEAD every blob)")
+    fanout.add_argument("--adaptive", action="store_true",
+                        help="Adjust blobs in flight from throughput and throttling during the push")
+
+    delta = commands.add_parser("registry-delta",
+                                help="Report the blobs each registry is missing and the transfer avoided")
+    delta.add_argument("--archive-dir", default="/opt/images")
+    delta.add_argument("--vars-file", help="push-tar-to-registry-vars.yml (its `registries` list)")
+    delta.add_argument("--registry", action="append", default=[], help="host[:port][/path] (repeatable)")
+    delta.add_argument("--auth-file", default="/root/pull-secret.json")
+    delta.add_argument("--blob-store")
+    delta.add_argument("--delta-cache", default="/opt/images/.registry-delta")
+
+    ingest = commands.add_parser("blob-store-ingest",
+                                 help="Deduplicate workspaces and archives into the blob store")
+    ingest.add_argument("paths", nargs="+", help="Directories and/or mirror_seq*.tar archives")
+    ingest.add_argument("--owner", required=True, help="Reference owner, e.g. release-4.19-4.20")
+    ingest.add_argument("--root", default="/opt/images/blob-store")
+    ingest.add_argument("--no-verify", dest="verify", action="store_false")
+
+    gc = commands.add_parser("blob-store-gc", help="Remove unreferenced blobs from the blob store")
+    gc.add_argument("--root", default="/opt/images/blob-store")
+    gc.add_argument("--drop-owner", action="append", help="Release an owner first (repeatable)")
+    gc.add_argument("--grace-seconds", type=float, default=3600)
+    gc.add_argument("--dry-run", action="store_true")
+
+    seed = commands.add_parser("blob-store-seed",
+                               help="Hardlink layers other syncs stored into a new oc-mirror workspace")
+    seed.add_argument("workspace")
+    seed.add_argument("--owner", help="This workspace's owner, left out of the seed")
+    seed.add_argument("--root", default="/opt/images/blob-store")
+
+    manifest = commands.add_parser("archive-manifest",
+                                   help="Write the integrity manifest for the archives (connected side)")
+    manifest.add_argument("--archive-dir", default="/opt/images")
+    manifest.add_argument("--workers", type=int, help="Hashing processes (default: one per core)")
+
+    verify = commands.add_parser("archive-verify",
+                                 help="Verify archives against the integrity manifest (disconnected side)")
+    verify.add_argument("--archive-dir", default="/opt/images")
+    verify.add_argument("--workers", type=int, help="Hashing processes (default: one per core)")
+    verify.add_argument("--all", dest="fail_fast", action="store_false",
+                        help="Hash every archive instead of stopping at the first bad one")
+
+    pack = commands.add_parser("archive-pack", help="Repack archives as seekable zstd for transport")
+    pack.add_argument("--archive-dir", default="/opt/images")
+    pack.add_argument("--level", type=int, default=3)
+    pack.add_argument("--workers", type=int, help="Frames compressed concurrently (default: one per core, at most 8)")
+    pack.add_argument("--frame-mib", type=int, default=64)
+
+    unpack = commands.add_parser("archive-unpack", help="Decompress packed archives back to tar")
+    unpack.add_argument("--archive-dir", default="/opt/images")
+    unpack.add_argument("--keep-packed", dest="remove_packed", action="store_false")
+
+    plan = commands.add_parser("mirror-plan",
+                               help="Predict download disk space and duration from image manifests")
+    plan.add_argument("--vars-file", default="/root/ocp4-disconnected-helper/extra_vars/download-to-tar-vars.yml")
+    plan.add_argument("--imageset", help="ImageSetConfiguration to plan instead of --vars-file")
+    plan.add_argument("--version", action="append", default=[],
+                      help="Release to plan instead of openshift_releases, e.g. 4.20 or 4.20.6 (repeatable)")
+    plan.add_argument("--mirror-path", default="/opt/images")
+    plan.add_argument("--auth-file", default="/root/.docker/config.json")
+    plan.add_argument("--clean", action="store_true", help="clean_mirror: previous archives are removed")
+    plan.add_argument("--run-key", help="Release pair of a resumable download, e.g. 4.19-4.20")
+    plan.add_argument("--output", help="Write the plan as JSON")
+    plan.add_argument("--upgrade-from", help="Exact cluster release: plan its upgrade path to --version")
+    plan.add_argument("--accept-risk", action="append", default=[],
+                      help="Conditional-update risks the upgrade path may take, space-separated (repeatable)")
+    plan.add_argument("--run-id", help="Lease holder of --mirror-path: reserve its disk against concurrent runs")
+    plan.add_argument("--workspace-root", default="/opt/images")
+
+    throughput = commands.add_parser("mirror-throughput",
+                                     help="Record download/push throughput for future mirror plans")
+    throughput.add_argument("--phase", choices=["download", "push"], required=True)
+    throughput.add_argument("--started", type=float, required=True, help="Epoch seconds the phase started")
+    throughput.add_argument("--archive-dir", default="/opt/images")
+
+    parallelism = commands.add_parser("mirror-parallelism",
+                                      help="oc-mirror concurrency to use next, or --record a run's outcome")
+    parallelism.add_argument("--registry", action="append", default=[], help="host[:port] (repeatable)")
+    parallelism.add_argument("--vars-file", help="push-tar-to-registry-vars.yml (its `registries` list)")
+    parallelism.add_argument("--store", default="/opt/images/.parallel-tuning.json")
+    parallelism.add_argument("--log-file", help="oc-mirror log to read throttling from")
+    parallelism.add_argument("--shell", action="store_true", help="Print NAME=value lines for eval")
+    parallelism.add_argument("--record", action="store_true", help="Record a finished run and step")
+    parallelism.add_argument("--phase", choices=["download", "push"], default="download")
+    parallelism.add_argument("--started", type=float, help="Epoch seconds the run started")
+    parallelism.add_argument("--images", type=int, default=4)
+    parallelism.add_argument("--layers", type=int, default=6, help="max-per-registry the run used")
+    parallelism.add_argument("--log-offset", type=int, default=0)
+    parallelism.add_argument("--failed", action="store_true")
+    parallelism.add_argument("--archive-dir", default="/opt/images")
+
+    metrics = commands.add_parser("sync-metrics",
+                                  help="Report a sync run per phase and against recent runs (trend store)")
+    metrics.add_argument("--run-id", required=True)
+    metrics.add_argument("--task", action="append", default=[],
+                         help="task_id=seconds[:tries] from Airflow (repeatable)")
+    metrics.add_argument("--source-version", default="")
+    metrics.add_argument("--target-version", default="")
+    metrics.add_argument("--mode", default="")
+    metrics.add_argument("--no-download", dest="downloaded", action="store_false",
+                         help="skip_download run: ignore the mirror plan on disk")
+    metrics.add_argument("--mirror-path", default="/opt/images")
+    metrics.add_argument("--journal-dir", default="/opt/images/.sync-metrics")
+    metrics.add_argument("--store", default="/opt/images/.sync-metrics/trends.db")
+    metrics.add_argument("--last", type=int, default=10)
+
+    lease = commands.add_parser("workspace-lease",
+                                help="Acquire/renew or release a sync run's lease on its workspace")
+    lease.add_argument("action", choices=["acquire", "check", "release"])
+    lease.add_argument("--workspace", default="/opt/images")
+    lease.add_argument("--run-id", required=True)
+    lease.add_argument("--wait-seconds", type=float, default=0)
+    lease.add_argument("--stale-hours", type=float, default=12)
+
+    graph = commands.add_parser("upgrade-graph",
+                                help="Cached OpenShift update graph: fetch, latest release, export/import snapshot")
+    graph.add_argument("action", choices=["fetch", "latest", "export", "import"])
+    graph.add_argument("versions", nargs="*", help="Versions whose stable-<minor> channel to use, e.g. 4.20")
+    graph.add_argument("--channel", action="append", default=[], help="Channel, e.g. fast-4.20 (repeatable)")
+    graph.add_argument("--arch", default="amd64")
+    graph.add_argument("--cache-dir", default="/opt/images/.graph-cache")
+    graph.add_argument("--offline", action="store_true", help="Use only the cache")
+    graph.add_argument("--max-age-seconds", type=float, default=3600)
+    graph.add_argument("--snapshot", help="export/import: snapshot file")
+
+    path = commands.add_parser("upgrade-path",
+                               help="Shortest upgrade path from the cluster's release: the exact releases to mirror")
+    path.add_argument("--from", dest="source", required=True, help="Exact current release, e.g. 4.19.12")
+    path.add_argument("--to", dest="target", required=True, help="Target release or minor, e.g. 4.20.6 or 4.20")
+    path.add_argument("--accept-risk", action="append", default=[],
+                      help="Conditional-update risks to accept, space-separated, '*' for all (repeatable)")
+    path.add_argument("--block", action="append", default=[],
+                      help="Releases (4.20.3) or edges (4.19.12->4.20.3) not to use, space-separated (repeatable)")
+    path.add_argument("--arch", default="amd64")
+    path.add_argument("--cache-dir", default="/opt/images/.graph-cache")
+    path.add_argument("--offline", action="store_true", help="Use only the cached graphs")
+    path.add_argument("--output", help="Write the path and its openshift_releases as JSON")
+
+    vmatrix = commands.add_parser("version-matrix",
+                                  help="Precomputed latest patches, updates and payloads: build, latest, check")
+    vmatrix.add_argument("action", choices=["build", "latest", "check"])
+    vmatrix.add_argument("versions", nargs="*", help="build: minors (default 4.17-4.20); latest: one minor")
+    vmatrix.add_argument("--matrix", default="/opt/images/version-matrix.json")
+    vmatrix.add_argument("--max-age-hours", type=float, default=24, help="latest/check: oldest matrix to trust")
+    vmatrix.add_argument("--source", help="check: source minor")
+    vmatrix.add_argument("--target", help="check: target minor or release")
+    vmatrix.add_argument("--upgrade-type", choices=["major", "patch"], default="major")
+    vmatrix.add_argument("--cluster-version", help="check: exact release the cluster runs")
+    vmatrix.add_argument("--accept-risk", action="append", default=[],
+                         help="check: conditional-update risks the upgrade may take, space-separated")
+    vmatrix.add_argument("--direct", action="store_true", help="check: target must be a single update away")
+    vmatrix.add_argument("--arch", default="amd64")
+    vmatrix.add_argument("--cache-dir", default="/opt/images/.graph-cache")
+    vmatrix.add_argument("--offline", action="store_true", help="build: from the cached graphs only")
+    vmatrix.add_argument("--max-age-seconds", type=float, default=3600, help="build: graph cache age to revalidate")
+
+    checkpoint = commands.add_parser("transfer-checkpoint",
+                                     help="Journal verified workspace content so a failed download can resume")
+    checkpoint.add_argument("--workspace", default="/opt/images/oc-mirror-workspace")
+    checkpoint.add_argument("--run-key", required=True, help="Release pair, e.g. 4.19-4.20")
+    checkpoint.add_argument("--journal", default="/opt/images/.transfer-journal.jsonl")
+    checkpoint.add_argument("--prune", action="store_true",
+                            help="Remove partial and corrupt files (download not running)")
+    checkpoint.add_argument("--settle-seconds", type=float, default=60)
+    checkpoint.add_argument("--reset", action="store_true", help="Remove the journal (download finished)")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "cleanup-vms":
+            teardown_vms(args.vm, args.pattern, uri=args.uri, force=args.force,
+                         remove_storage=args.remove_storage, max_workers=args.max_workers)
+        elif args.command == "setup-credentials":
+            spec = ({"conn_id": args.conn_id} if args.conn_id else
+                    {"username_var": args.username_var, "password_var": args.password_var})
+            setup_registry_credentials({args.registry: spec}, args.pull_secret, args.output,
+                                       podman_login=args.podman_login)
+        elif args.command == "validate-images":
+            result = validate_registry_images(
+                args.registry_host, args.registry_port, args.ocp_version,
+                auth_file=args.auth_file, max_workers=args.max_workers,
+                registry_type=args.registry_type or None,
+            )
+            print(format_success_report("Image validation", {
+                "Registry": result["registry"],
+                "Repositories": result["repositories"],
+                "Release repositories": result["release_repositories"],
+                "Release tags": len(result["release_tags"]),
+            }))
+        elif args.command == "validate-registries":
+            validate_registries(args.registry, min_cert_days=args.min_cert_days,
+                                timeout=args.timeout, ca_file=args.ca_file,
+                                deploy_dags=dict(spec.rpartition("=")[::2] for spec in args.deploy_dag))
+        elif args.command == "validate-dns":
+            clusters = []
+            for spec in args.cluster:
+                parts = spec.split(",")
+                clusters.append({"cluster_name": parts[0], "base_domain": parts[1],
+                                 "expected_ip": parts[2] if len(parts) > 2 else None})
+            validate_cluster_dns(clusters, nameservers=args.nameserver, timeout=args.timeout)
+        elif args.command == "validate-config":
+            validate_cluster_config(args.cluster_yml, args.nodes_yml)
+        elif args.command == "verify-release":
+            result = verify_release_images(
+                args.registry_host, args.registry_port, args.ocp_version,
+                release_repository=args.release_repository,
+                component_repository=args.component_repository,
+                arch=args.arch,
+                auth_file=args.auth_file,
+                image_references_file=args.image_references_file,
+                max_workers=args.max_workers,
+            )
+            print(format_success_report("Release payload verification", {
+                "Release": result["release"],
+                "Components": result["components"],
+                "Duration": f"{result['duration_seconds']}s",
+            }))
+        elif args.command in ("push-fanout", "registry-delta"):
+            registries = _registries_arg(args.vars_file, args.registry)
+            if args.command == "registry-delta":
+                plan_registry_delta(args.archive_dir, registries, auth_file=args.auth_file,
+                                    blob_store=args.blob_store, delta_cache=args.delta_cache or None)
+            else:
+                push_archives_fanout(args.archive_dir, registries, auth_file=args.auth_file,
+                                     parallel_blobs=args.parallel_blobs, retries=args.retries,
+                                     blob_store=args.blob_store, delta_cache=args.delta_cache or None,
+                                     adaptive=args.adaptive)
+        elif args.command == "mirror-parallelism":
+            registries = [r["server"] for r in _registries_arg(args.vars_file, args.registry)]
+            if args.record and args.started is None:
+                parser.error("--record needs --started")
+            if args.record:
+                record_mirror_parallelism(registries, args.phase, args.started, args.images, args.layers,
+                                          ok=not args.failed, archive_dir=args.archive_dir,
+                                          log_file=args.log_file, log_offset=args.log_offset, store=args.store)
+            else:
+                mirror_parallelism(registries, store=args.store, log_file=args.log_file, shell=args.shell)
+        elif args.command == "blob-store-ingest":
+            ingest_blob_store(args.paths, args.owner, root=args.root, verify=args.verify)
+        elif args.command == "blob-store-gc":
+            gc_blob_store(args.root, drop_owners=args.drop_owner, grace_seconds=args.grace_seconds,
+                          dry_run=args.dry_run)
+        elif args.command == "blob-store-seed":
+            seed_workspace(args.workspace, owner=args.owner, root=args.root)
+        elif args.command == "archive-manifest":
+            write_archive_manifest(args.archive_dir, workers=args.workers)
+        elif args.command == "archive-verify":
+            verify_archive_manifest(args.archive_dir, workers=args.workers, fail_fast=args.fail_fast)
+        elif args.command == "archive-pack":
+            pack_archives(args.archive_dir, level=args.level, workers=args.workers, frame_mib=args.frame_mib)
+        elif args.command == "archive-unpack":
+            unpack_archives(args.archive_dir, remove_packed=args.remove_packed)
+        elif args.command == "mirror-plan":
+            plan_mirror_size(args.vars_file, imageset_file=args.imageset, versions=args.version,
+                             mirror_path=args.mirror_path, auth_file=args.auth_file, clean=args.clean,
+                             run_key=args.run_key, output=args.output,
+                             run_id=args.run_id, workspace_root=args.workspace_root,
+                             upgrade_from=args.upgrade_from, accept_risks=_words(args.accept_risk))
+        elif args.command == "mirror-throughput":
+            record_throughput(args.phase, args.started, archive_dir=args.archive_dir)
+        elif args.command == "sync-metrics":
+            tasks = {}
+            for spec in args.task:
+                task, _, timing = spec.partition("=")
+                seconds, _, tries = timing.partition(":")
+                tasks[task] = {"seconds": float(seconds), "tries": int(tries or 1)}
+            report_sync_metrics(args.run_id, tasks, source_version=args.source_version,
+                                target_version=args.target_version, mode=args.mode,
+                                downloaded=args.downloaded, mirror_path=args.mirror_path,
+                                journal_dir=args.journal_dir, store=args.store, last=args.last)
+        elif args.command == "workspace-lease":
+            workspace_lease(args.action, args.workspace, args.run_id,
+                            wait_seconds=args.wait_seconds, stale_hours=args.stale_hours)
+        elif args.command == "upgrade-graph":
+            if args.action in ("export", "import") and not args.snapshot:
+                parser.error(f"{args.action} needs --snapshot")
+            if args.action == "latest" and len(args.versions) != 1:
+                parser.error("latest needs exactly one version")
+            if args.action == "fetch":
+                fetch_upgrade_graphs(args.versions, args.channel, arch=args.arch, cache_dir=args.cache_dir,
+                                     offline=args.offline, max_age_seconds=args.max_age_seconds)
+            elif args.action == "latest":
+                latest_release(args.versions[0], arch=args.arch, cache_dir=args.cache_dir,
+                               offline=args.offline, max_age_seconds=args.max_age_seconds)
+            elif args.action == "export":
+                export_upgrade_graph(args.snapshot, args.versions, args.channel, cache_dir=args.cache_dir)
+            else:
+                import_upgrade_graph(args.snapshot, cache_dir=args.cache_dir)
+        elif args.command == "upgrade-path":
+            solve_upgrade_path(args.source, args.target, accept_risks=_words(args.accept_risk),
+                               blocked=_words(args.block), arch=args.arch, cache_dir=args.cache_dir, offline=args.offline, output=args.output)
+        elif args.command == "version-matrix":
+            if args.action == "build":
+                build_version_matrix(args.versions, matrix=args.matrix, arch=args.arch, cache_dir=args.cache_dir,
+                                     offline=args.offline, max_age_seconds=args.max_age_seconds)
+            elif args.action == "latest":
+                if len(args.versions) != 1:
+                    parser.error("latest needs exactly one version")
+                matrix_latest(args.versions[0], matrix=args.matrix, max_age_hours=args.max_age_hours)
+            else:
+                check_versions(args.source, args.target, upgrade_type=args.upgrade_type,
+                               cluster_version=args.cluster_version, accept_risks=_words(args.accept_risk),
+                               direct=args.direct, matrix=args.matrix, max_age_hours=args.max_age_hours)
+        elif args.command == "transfer-checkpoint":
+            if args.reset:
+                from .transfer_journal import reset_journal
+                reset_journal(args.journal)
+            else:
+                checkpoint_transfer(args.workspace, args.run_key, journal=args.journal,
+                                    prune=args.prune, settle_seconds=args.settle_seconds)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""
+Batched DNS Resolver for ocp4-disconnected-helper
+Resolves every record an OpenShift cluster needs (api, api-int, *.apps) for
+many clusters at once, without spawning a dig process per name:
+- All queries share one UDP socket per nameserver and are sent concurrently
+- Nameservers are configurable (FreeIPA, or the dnsmasq instance set up by
+  roles/openshift_cluster_deploy/tasks/configure_dnsmasq.yml on 127.0.0.1)
+- Per-query timeout and retry count, falling back to the next nameserver
+- Short-TTL answer cache shared by the tasks of one DAG run through a JSON
+  file of that run only, so no run is served another run's (negative) answers
+
+A fleet check therefore costs roughly one round trip, not one per record.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import struct
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_ATTEMPTS = 2
+DEFAULT_CACHE_TTL = 60          # upper bound on how long answers are reused
+NEGATIVE_CACHE_TTL = 10         # NXDOMAIN / empty answers
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "ocp4-disconnected-helper-dns-cache")
+CACHE_RETENTION_SECONDS = 24 * 3600   # cache files of finished runs are removed after this
+PER_RUN = "per-run"                   # cache_path: the current DAG run's cache file
+
+TYPE_A = 1
+TYPE_AAAA = 28
+RCODE_NXDOMAIN = 3
+
+
+@dataclass
+class DnsAnswer:
+    """Addresses for one name, as returned by the first nameserver that answered."""
+
+    name: str
+    addresses: List[str] = field(default_factory=list)
+    ttl: int = 0
+    nameserver: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def found(self) -> bool:
+        return bool(self.addresses)
+
+
+def system_nameservers(resolv_conf: str = "/etc/resolv.conf") -> List[str]:
+    """Nameservers from resolv.conf (falls back to the local dnsmasq)."""
+    servers = []
+    try:
+        with open(resolv_conf) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    servers.append(parts[1])
+    except OSError:
+        pass
+    return servers or ["127.0.0.1"]
+
+
+def cluster_record_names(cluster_name: str, base_domain: str) -> Dict[str, str]:
+    """Records required by an OpenShift cluster (label -> name to query)."""
+    domain = f"{cluster_name}.{base_domain}"
+    return {
+        f"api.{domain}": f"api.{domain}",
+        f"api-int.{domain}": f"api-int.{domain}",
+        # Wildcards cannot be queried directly; probe a name underneath
+        f"*.apps.{domain}": f"test.apps.{domain}",
+    }
+
+
+def _nameserver_addr(nameserver: str) -> Tuple[str, int]:
+    """"10.0.0.1" or "10.0.0.1:5353" -> (host, port); IPv6 literals use port 53."""
+    if nameserver.count(":") == 1:
+        host, port = nameserver.split(":")
+        return host, int(port)
+    return nameserver, 53
+
+
+# =============================================================================
+# Wire format
+# =============================================================================
+
+def _encode_query(txid: int, name: str, rtype: int) -> bytes:
+    header = struct.pack(">HHHHHH", txid, 0x0100, 1, 0, 0, 0)   # RD=1, one question
+    qname = b"".join(bytes([len(label)]) + label.encode("idna")
+                     for label in name.rstrip(".").split(".")) + b"\x00"
+    return header + qname + struct.pack(">HH", rtype, 1)
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        if length == 0:
+            return offset + 1
+        offset += length + 1
+
+
+def _decode_response(data: bytes, rtype: int) -> Tuple[int, int, List[str], int]:
+    """Returns (txid, rcode, addresses, min_ttl)."""
+    txid, flags, qdcount, ancount, _, _ = struct.unpack(">HHHHHH", data[:12])
+    offset = 12
+    for _ in range(qdcount):
+        offset = _skip_name(data, offset) + 4
+
+    addresses = []
+    ttls = []
+    for _ in range(ancount):
+        offset = _skip_name(data, offset)
+        atype, _, ttl, rdlength = struct.unpack(">HHIH", data[offset:offset + 10])
+        offset += 10
+        rdata = data[offset:offset + rdlength]
+        offset += rdlength
+        if atype == rtype == TYPE_A:
+            addresses.append(".".join(str(b) for b in rdata))
+        elif atype == rtype == TYPE_AAAA:
+            addresses.append(":".join(f"{rdata[i] << 8 | rdata[i + 1]:x}" for i in range(0, 16, 2)))
+        else:
+            continue
+        ttls.append(ttl)
+    return txid, flags & 0x000F, addresses, min(ttls) if ttls else 0
+
+
+class _DnsProtocol(asyncio.DatagramProtocol):
+    """Matches responses on a shared UDP socket to pending queries by txid."""
+
+    def __init__(self):
+        self.pending: Dict[int, asyncio.Future] = {}
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        if len(data) < 12:
+            return
+        txid = struct.unpack(">H", data[:2])[0]
+        future = self.pending.pop(txid, None)
+        if future and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self.pending.clear()
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+def run_cache_path(cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[str]:
+    """
+    Cache file of the current DAG run (AIRFLOW_CTX_DAG_ID / _DAG_RUN_ID, set
+    for local and remote tasks alike); None outside a run, which disables caching.
+    """
+    run_id = os.environ.get("AIRFLOW_CTX_DAG_RUN_ID")
+    if not run_id:
+        return None
+    run = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{os.environ.get('AIRFLOW_CTX_DAG_ID', '')}__{run_id}")
+    return os.path.join(cache_dir, f"{run}.json")
+
+
+class DnsCache:
+    """Short-TTL answer cache persisted to a JSON file shared by a run's tasks."""
+
+    def __init__(self, path: Optional[str] = PER_RUN, max_ttl: int = DEFAULT_CACHE_TTL):
+        if path == PER_RUN:
+            path = run_cache_path()
+        self.path = path
+        self.max_ttl = max_ttl
+        self._entries: Dict[str, Tuple[float, List[str]]] = {}
+        if path:
+            try:
+                with open(path) as f:
+                    self._entries = {k: (v[0], v[1]) for k, v in json.load(f).items()}
+            except (OSError, ValueError):
+                self._entries = {}
+
+    @staticmethod
+    def key(name: str, rtype: int, nameservers: Sequence[str]) -> str:
+        return f"{name.lower()}|{rtype}|{','.join(nameservers)}"
+
+    def get(self, key: str) -> Optional[List[str]]:
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.time():
+            return entry[1]
+        return None
+
+    def put(self, key: str, addresses: List[str], ttl: int) -> None:
+        ttl = min(ttl, self.max_ttl) if addresses else NEGATIVE_CACHE_TTL
+        self._entries[key] = (time.time() + ttl, addresses)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        now = time.time()
+        live = {k: v for k, v in self._entries.items() if v[0] > now}
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".dns-cache-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(live, f)
+        os.replace(tmp, self.path)
+        self._prune(directory, now)
+
+    @staticmethod
+    def _prune(directory: str, now: float) -> None:
+        """Drop the cache files of runs that ended long ago."""
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                if name.endswith(".json") and now - os.path.getmtime(path) > CACHE_RETENTION_SECONDS:
+                    os.remove(path)
+            except OSError:
+                continue
+
+
+# =============================================================================
+# Resolver
+# =============================================================================
+
+async def _query_server(loop, nameserver: str, names: List[str], rtype: int,
+                        timeout: float, attempts: int) -> Dict[str, DnsAnswer]:
+    """Send every query to one nameserver over a single UDP socket."""
+    transport, protocol = await loop.create_datagram_endpoint(
+        _DnsProtocol, remote_addr=_nameserver_addr(nameserver))
+    answers: Dict[str, DnsAnswer] = {}
+    try:
+        async def one(name: str) -> None:
+            for _ in range(attempts):
+                txid = random.randint(0, 0xFFFF)
+                while txid in protocol.pending:
+                    txid = random.randint(0, 0xFFFF)
+                future = loop.create_future()
+                protocol.pending[txid] = future
+                transport.sendto(_encode_query(txid, name, rtype))
+                try:
+                    data = await asyncio.wait_for(future, timeout)
+                except asyncio.TimeoutError:
+                    protocol.pending.pop(txid, None)
+                    continue
+                _, rcode, addresses, ttl = _decode_response(data, rtype)
+                error = "NXDOMAIN" if rcode == RCODE_NXDOMAIN else (f"rcode {rcode}" if rcode else None)
+                answers[name] = DnsAnswer(name, addresses, ttl, nameserver, error)
+                return
+
+        await asyncio.gather(*(one(name) for name in names), return_exceptions=True)
+    finally:
+        transport.close()
+    return answers
+
+
+async def resolve_many_async(names: Iterable[str], nameservers: Optional[Sequence[str]] = None,
+                             rtype: int = TYPE_A, timeout: float = DEFAULT_TIMEOUT,
+                             attempts: int = DEFAULT_ATTEMPTS,
+                             cache: Optional[DnsCache] = None) -> Dict[str, DnsAnswer]:
+    loop = asyncio.get_running_loop()
+    nameservers = list(nameservers or system_nameservers())
+    results: Dict[str, DnsAnswer] = {}
+
+    todo = []
+    for name in dict.fromkeys(names):
+        cached = cache.get(DnsCache.key(name, rtype, nameservers)) if cache else None
+        if cached is not None:
+            results[name] = DnsAnswer(name, cached, cached=True)
+        else:
+            todo.append(name)
+
+    # Unanswered names move on to the next nameserver
+    for nameserver in nameservers:
+        if not todo:
+            break
+        try:
+            answers = await _query_server(loop, nameserver, todo, rtype, timeout, attempts)
+        except OSError:
+            continue
+        results.update(answers)
+        todo = [name for name in todo if name not in answers]
+
+    for name in todo:
+        results[name] = DnsAnswer(name, error=f"no response from {', '.join(nameservers)}")
+
+    if cache:
+        for name, answer in results.items():
+            if not answer.cached and answer.nameserver:
+                cache.put(DnsCache.key(name, rtype, nameservers), answer.addresses, answer.ttl)
+        cache.save()
+    return results
+
+
+def resolve_many(names: Iterable[str], nameservers: Optional[Sequence[str]] = None,
+                 rtype: int = TYPE_A, timeout: float = DEFAULT_TIMEOUT,
+                 attempts: int = DEFAULT_ATTEMPTS,
+                 cache_path: Optional[str] = PER_RUN) -> Dict[str, DnsAnswer]:
+    """
+    Resolve many names concurrently.
+
+    Args:
+        names: Names to resolve
+        nameservers: Nameserver IPs tried in order (resolv.conf if None)
+        rtype: TYPE_A or TYPE_AAAA
+        timeout: Per-attempt timeout in seconds
+        attempts: Attempts per nameserver before falling back to the next
+        cache_path: Cache file; PER_RUN for the current DAG run's (none
+            outside a run), None disables caching
+
+    Returns:
+        name -> DnsAnswer
+    """
+    cache = DnsCache(cache_path) if cache_path else None
+    return asyncio.run(resolve_many_async(names, nameservers, rtype, timeout, attempts, cache))
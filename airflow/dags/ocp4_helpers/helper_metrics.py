@@ -0,0 +1,255 @@
+"""
+Structured Metrics Events for ocp4-disconnected-helper
+Timed helpers of dag_helpers emit one machine-readable event per phase:
+
+    {"event": "ocp4_helper_phase", "phase": "Release payload verification",
+     "outcome": "success", "duration_seconds": 3.2, "bytes": null, "images": 512, ...}
+
+Events are sent to:
+- The task log, one "OCP4_METRIC {json}" line per event on stderr, so
+  stdout stays clean for $(...) callers
+- XCom (key "metrics_events") when running inside an Airflow task, pushed
+  once per task when its outermost timed phase ends
+- A Prometheus node_exporter textfile, if OCP4_METRICS_TEXTFILE_DIR is set
+- StatsD over UDP, if OCP4_METRICS_STATSD is set ("host:port")
+- A per-run journal, <dir>/<run_id>.jsonl, if OCP4_METRICS_JOURNAL_DIR is
+  set and the event has a run id (read back by sync_metrics.py)
+
+Sinks are best effort: a broken sink never fails the task that reports.
+"""
+
+import functools
+import json
+import os
+import re
+import socket
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+LOG_PREFIX = "OCP4_METRIC"
+XCOM_KEY = "metrics_events"
+TEXTFILE_DIR_ENV = "OCP4_METRICS_TEXTFILE_DIR"
+STATSD_ENV = "OCP4_METRICS_STATSD"
+JOURNAL_DIR_ENV = "OCP4_METRICS_JOURNAL_DIR"
+STATSD_PREFIX = "ocp4_helper"
+
+_NAME_RE = re.compile(r"[^a-z0-9_]+")
+
+# Events of the current task; pushed to XCom as one list when its outermost phase ends
+_events: List[Dict[str, Any]] = []
+_task: Dict[str, str] = {}
+_depth = 0
+
+
+def _slug(text: str) -> str:
+    return _NAME_RE.sub("_", text.lower()).strip("_") or "unknown"
+
+
+def _airflow_labels() -> Dict[str, str]:
+    """dag/task/run ids exported by Airflow to every task process (also BashOperator children)."""
+    return {
+        "dag_id": os.environ.get("AIRFLOW_CTX_DAG_ID", ""),
+        "task_id": os.environ.get("AIRFLOW_CTX_TASK_ID", ""),
+        "run_id": os.environ.get("AIRFLOW_CTX_DAG_RUN_ID", ""),
+    }
+
+
+# =============================================================================
+# Sinks
+# =============================================================================
+
+def _to_log(event: Dict[str, Any]) -> None:
+    print(f"{LOG_PREFIX} {json.dumps(event, sort_keys=True, default=str)}", file=sys.stderr)
+
+
+def _to_xcom() -> None:
+    try:
+        from airflow.operators.python import get_current_context
+        context = get_current_context()
+    except Exception:
+        return  # not inside a PythonOperator (CLI, BashOperator child, tests)
+    try:
+        context["ti"].xcom_push(key=XCOM_KEY, value=list(_events))
+    except Exception as e:
+        print(f"  ⚠️  Metrics not pushed to XCom: {e}", file=sys.stderr)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _to_textfile(event: Dict[str, Any], directory: str) -> None:
+    """One .prom file per dag/phase, replaced atomically for the textfile collector."""
+    labels = {k: event[k] for k in ("phase", "outcome", "dag_id", "task_id")}
+    label_text = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+    lines = []
+    for metric, key, help_text in (
+        ("duration_seconds", "duration_seconds", "Duration of the phase"),
+        ("bytes", "bytes", "Bytes moved by the phase"),
+        ("images", "images", "Images handled by the phase"),
+        ("timestamp_seconds", "timestamp", "Unix time the phase finished"),
+    ):
+        if event.get(key) is None:
+            continue
+        name = f"{STATSD_PREFIX}_phase_{metric}"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge",
+                  f"{name}{{{label_text}}} {event[key]}"]
+
+    filename = f"{STATSD_PREFIX}_{_slug(event['dag_id'] or 'cli')}_{_slug(event['phase'])}.prom"
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".prom.tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, os.path.join(directory, filename))
+
+
+def journal_path(directory: str, run_id: str) -> str:
+    return os.path.join(directory, f"{_slug(run_id)}.jsonl")
+
+
+def _to_journal(event: Dict[str, Any], directory: str) -> None:
+    """Append the event to its run's journal (one O_APPEND write per line)."""
+    os.makedirs(directory, exist_ok=True)
+    line = json.dumps(event, sort_keys=True, default=str) + "\n"
+    fd = os.open(journal_path(directory, event["run_id"]), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+
+def _to_statsd(event: Dict[str, Any], address: str) -> None:
+    host, _, port = address.rpartition(":")
+    base = f"{STATSD_PREFIX}.{_slug(event['phase'])}"
+    packets = [f"{base}.{_slug(event['outcome'])}:1|c"]
+    if event.get("duration_seconds") is not None:
+        packets.append(f"{base}.duration:{event['duration_seconds'] * 1000:.0f}|ms")
+    if event.get("bytes") is not None:
+        packets.append(f"{base}.bytes:{event['bytes']}|g")
+    if event.get("images") is not None:
+        packets.append(f"{base}.images:{event['images']}|g")
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.sendto("\n".join(packets).encode(), (host or "127.0.0.1", int(port or 8125)))
+
+
+# =============================================================================
+# Emission
+# =============================================================================
+
+def emit_event(
+    phase: str,
+    outcome: str,
+    duration_seconds: Optional[float] = None,
+    bytes_moved: Optional[int] = None,
+    images: Optional[int] = None,
+    **fields: Any,
+) -> Dict[str, Any]:
+    """
+    Emit one structured phase event to every configured sink.
+
+    Inside a timed phase the XCom push is left to the outermost phase, so a
+    task pushes its events once instead of once per event.
+
+    Args:
+        phase: Phase or check name (e.g. "Release payload verification")
+        outcome: success, failed, config_error, ...
+        duration_seconds: Wall time of the phase
+        bytes_moved: Bytes transferred or verified
+        images: Images/components handled
+        **fields: Extra JSON-serialisable context
+
+    Returns:
+        The event dict
+    """
+    labels = _airflow_labels()
+    if labels != _task:                     # a new task in this process: start its own list
+        _events.clear()
+        _task.clear()
+        _task.update(labels)
+    event = {
+        "event": f"{STATSD_PREFIX}_phase",
+        "timestamp": round(time.time(), 3),
+        "phase": phase,
+        "outcome": outcome,
+        "duration_seconds": round(duration_seconds, 3) if duration_seconds is not None else None,
+        "bytes": bytes_moved,
+        "images": images,
+        **labels,
+        **fields,
+    }
+    _events.append(event)
+
+    _to_log(event)
+    if not _depth:
+        _to_xcom()
+    textfile_dir = os.environ.get(TEXTFILE_DIR_ENV)
+    statsd = os.environ.get(STATSD_ENV)
+    journal_dir = os.environ.get(JOURNAL_DIR_ENV)
+    try:
+        if textfile_dir:
+            _to_textfile(event, textfile_dir)
+    except OSError as e:
+        print(f"  ⚠️  Metrics textfile not written ({textfile_dir}): {e}", file=sys.stderr)
+    try:
+        if statsd:
+            _to_statsd(event, statsd)
+    except (OSError, ValueError) as e:
+        print(f"  ⚠️  StatsD metrics not sent ({statsd}): {e}", file=sys.stderr)
+    try:
+        if journal_dir and event["run_id"]:
+            _to_journal(event, journal_dir)
+    except OSError as e:
+        print(f"  ⚠️  Metrics journal not written ({journal_dir}): {e}", file=sys.stderr)
+    return event
+
+
+@contextmanager
+def timed_phase(phase: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block and emit its event; the outcome is "failed" if it raises.
+
+    The yielded dict may be updated with bytes_moved/images/extra fields:
+
+        with timed_phase("Image push") as metrics:
+            metrics["images"] = push()
+    """
+    global _depth
+    metrics: Dict[str, Any] = dict(fields)
+    started = time.monotonic()
+    outcome = "success"
+    _depth += 1
+    try:
+        yield metrics
+    except BaseException:
+        outcome = "failed"
+        raise
+    finally:
+        _depth -= 1
+        requested = metrics.pop("outcome", None)
+        emit_event(phase, requested if requested and outcome == "success" else outcome,
+                   duration_seconds=time.monotonic() - started, **metrics)
+
+
+def timed(phase: str, **extractors: Callable[[Any], Any]) -> Callable:
+    """
+    Decorator form of timed_phase(); extractors derive event fields from
+    the return value, e.g. @timed("verify_release_images", images=lambda r: r["components"]).
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed_phase(phase) as metrics:
+                result = fn(*args, **kwargs)
+                for name, extract in extractors.items():
+                    metrics[name] = extract(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def events() -> List[Dict[str, Any]]:
+    """Events emitted by the current task so far."""
+    return list(_events)
@@ -0,0 +1,59 @@
+"""
+Mirror Archive Set for ocp4-disconnected-helper
+Finds the archives oc-mirror wrote to a mirror path:
+- download-to-tar.yml writes the archive set as archiveSize chunks,
+  mirror_seq<N>_<NNNNNN>.tar (see templates/imageset-config.yml.j2)
+- zstd-packed archives (.tar.zst, archive_pack.py) are found as well
+- Chunks come back in the order oc-mirror wrote them, which the push,
+  integrity manifest, packaging and metrics helpers all rely on
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+GIB = 1024 ** 3
+CHUNK_RE = re.compile(r"^mirror_seq(\d+)_(\d+)\.tar$")
+PACKED_CHUNK_RE = re.compile(r"^mirror_seq(\d+)_(\d+)\.tar\.zst$")
+
+
+@dataclass(order=True)
+class ArchiveChunk:
+    """One archiveSize chunk written by oc-mirror."""
+
+    seq: int
+    index: int
+    path: str = field(compare=False)
+    size: int = field(default=0, compare=False)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+
+def find_chunks(mirror_path: str, packed: bool = False) -> List[ArchiveChunk]:
+    """
+    Archive chunks in mirror_path, in the order oc-mirror wrote them.
+
+    With packed=True, zstd-packed chunks (.tar.zst, see archive_pack.py) are
+    included; a chunk present in both forms is returned as the plain tar.
+    """
+    chunks: Dict[tuple, ArchiveChunk] = {}
+    try:
+        entries = list(os.scandir(mirror_path))
+    except OSError:
+        return []
+    for entry in entries:
+        match = CHUNK_RE.match(entry.name) or (packed and PACKED_CHUNK_RE.match(entry.name))
+        if not match:
+            continue
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            continue                                   # removed meanwhile
+        chunk = ArchiveChunk(int(match.group(1)), int(match.group(2)), entry.path, size)
+        key = (chunk.seq, chunk.index)
+        if key not in chunks or entry.name.endswith(".tar"):
+            chunks[key] = chunk
+    return sorted(chunks.values())
@@ -0,0 +1,582 @@
+"""
+Mirror Size and Duration Planner for ocp4-disconnected-helper
+Predicts what a download needs before oc-mirror starts, in place of the fixed
+50GB / 30GB-per-release disk checks:
+- The image set (openshift_releases, operators and additional_images from
+  download-to-tar-vars.yml, or an ImageSetConfiguration) is resolved to image
+  manifests: release payloads from the OpenShift update graph (cached by
+  upgrade_graph.py) plus their image-references, the operator bundles at the
+  head of each requested channel (file-based catalog in the index image), and
+  additional images
+- Blob sizes come from the manifests and are deduplicated by digest. Image
+  layers are never downloaded; only the release-manifests layer of each
+  payload and the configs layer of each catalog are read
+- For an incremental run, blobs already shipped in the previous archive set
+  (mirror-integrity.json) and blobs a resumed download already verified
+  (transfer journal) are subtracted
+- Download and push durations use the throughput measured on previous runs
+  (median of the most recent ones), with conservative defaults until then
+"""
+
+import io
+import json
+import os
+import re
+import statistics
+import tarfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .registry_client import RegistryClient, RegistryError
+from .release_verifier import read_image_references
+from .upgrade_graph import GRAPH_URL, GraphClient, GraphError, version_key
+from .workspace_lock import file_lock
+
+DEFAULT_PLAN_DIR = "/opt/images/.mirror-plan"
+DEFAULT_HISTORY = os.path.join(DEFAULT_PLAN_DIR, "throughput.json")
+DEFAULT_RATES = {"download": 40e6, "push": 100e6}     # bytes/s until a run has been measured
+HISTORY_KEEP = 20                   # samples kept per phase
+HISTORY_WINDOW = 5                  # most recent samples the rate is taken from
+MIN_SAMPLE_BYTES = 1024 ** 3        # smaller runs are dominated by setup time
+HEADROOM = 0.10
+DEFAULT_MAX_WORKERS = 16
+
+_TEMPLATE_RE = re.compile(r"^\{\{\s*(\w+)\s*\}\}$")
+_CONFIGS_RE = re.compile(r"^(?:\./)?configs/(?P<package>[^/]+)/")
+
+
+class PlanError(Exception):
+    """Raised when the image set cannot be resolved."""
+
+
+# =============================================================================
+# Image set
+# =============================================================================
+
+@dataclass
+class ReleaseSpec:
+    channel: str                    # e.g. stable-4.20
+    min_version: Optional[str] = None
+    max_version: Optional[str] = None
+
+
+@dataclass
+class PackageSpec:
+    name: str
+    channels: List[str] = field(default_factory=list)     # empty: the default channel
+
+
+@dataclass
+class CatalogSpec:
+    catalog: str
+    packages: List[PackageSpec] = field(default_factory=list)
+
+
+@dataclass
+class ImageSetSpec:
+    releases: List[ReleaseSpec] = field(default_factory=list)
+    architectures: List[str] = field(default_factory=lambda: ["amd64"])
+    catalogs: List[CatalogSpec] = field(default_factory=list)
+    additional_images: List[str] = field(default_factory=list)
+
+
+def _packages(entries: List[Dict[str, Any]]) -> List[PackageSpec]:
+    return [PackageSpec(p["name"], [c["name"] for c in p.get("channels") or []]) for p in entries or []]
+
+
+def spec_from_vars(variables: Dict[str, Any]) -> ImageSetSpec:
+    """Image set from download-to-tar-vars.yml (bare "{{ var }}" references are resolved)."""
+    def resolve(value: Any, depth: int = 0) -> Any:
+        match = _TEMPLATE_RE.match(value.strip()) if isinstance(value, str) else None
+        if match and match.group(1) in variables and depth < 5:
+            return resolve(variables[match.group(1)], depth + 1)
+        return value
+
+    return ImageSetSpec(
+        releases=[ReleaseSpec(r["name"], r.get("minVersion"), r.get("maxVersion"))
+                  for r in resolve(variables.get("openshift_releases")) or []],
+        architectures=resolve(variables.get("architectures")) or ["amd64"],
+        catalogs=[CatalogSpec(c["catalog"], _packages(resolve(c.get("packages"))))
+                  for c in resolve(variables.get("operators")) or []],
+        additional_images=list(resolve(variables.get("additional_images")) or []),
+    )
+
+
+def spec_from_imageset(config: Dict[str, Any]) -> ImageSetSpec:
+    """Image set from an ImageSetConfiguration (mirror.openshift.io/v1alpha2)."""
+    mirror = config.get("mirror") or {}
+    platform = mirror.get("platform") or {}
+    return ImageSetSpec(
+        releases=[ReleaseSpec(c["name"], c.get("minVersion"), c.get("maxVersion"))
+                  for c in platform.get("channels") or []],
+        architectures=platform.get("architectures") or ["amd64"],
+        catalogs=[CatalogSpec(c["catalog"], _packages(c.get("packages")))
+                  for c in mirror.get("operators") or []],
+        additional_images=[i["name"] for i in mirror.get("additionalImages") or []],
+    )
+
+
+def release_spec(version: str) -> ReleaseSpec:
+    """4.20 -> latest stable-4.20 release; 4.20.6 -> exactly that release."""
+    minor = ".".join(version.split(".")[:2])
+    if version.count(".") >= 2:
+        return ReleaseSpec(f"stable-{minor}", version, version)
+    return ReleaseSpec(f"stable-{minor}")
+
+
+def parse_image(pullspec: str) -> Tuple[str, str, str]:
+    """(registry, repository, tag or digest) of an image pull spec."""
+    name, at, digest = pullspec.partition("@")
+    reference = digest
+    if not at:
+        slash, colon = name.rfind("/"), name.rfind(":")
+        name, reference = (name[:colon], name[colon + 1:]) if colon > slash else (name, "latest")
+    registry, _, repository = name.partition("/")
+    if not repository or not ("." in registry or ":" in registry or registry == "localhost"):
+        registry, repository = "docker.io", name if "/" in name else f"library/{name}"
+    return registry, repository, reference
+
+
+# =============================================================================
+# Resolution
+# =============================================================================
+
+def _fetch_graph(url: str) -> Dict[str, Any]:
+    """Graph JSON through the on-disk graph cache (upgrade_graph.py)."""
+    return GraphClient(graph_url=url.partition("?")[0]).fetch(url)
+
+
+def release_payloads(
+    releases: List[ReleaseSpec],
+    architectures: List[str],
+    graph_url: str = GRAPH_URL,
+    fetch: Callable[[str], Dict[str, Any]] = _fetch_graph,
+) -> List[Tuple[str, str, str]]:
+    """
+    Release payloads selected by each channel range, from the update graph.
+
+    A range selects every release in [minVersion, maxVersion] (shortestPath
+    is not applied, so a wide range is over- rather than under-estimated);
+    a channel without one selects its latest release.
+
+    Returns:
+        [(version, architecture, payload pull spec)]
+    """
+    payloads = []
+    graphs: Dict[Tuple[str, str], Dict[str, str]] = {}
+    for release in releases:
+        for arch in architectures:
+            key = (release.channel, arch)
+            if key not in graphs:
+                url = f"{graph_url}?{urllib.parse.urlencode({'channel': release.channel, 'arch': arch})}"
+                try:
+                    graph = fetch(url)
+                except (GraphError, OSError, ValueError) as e:
+                    raise PlanError(f"Update graph for {release.channel}/{arch} unavailable: {e}") from e
+                graphs[key] = {n["version"]: n["payload"] for n in graph.get("nodes", [])}
+            nodes = graphs[key]
+            low = version_key(release.min_version) if release.min_version else None
+            high = version_key(release.max_version) if release.max_version else None
+            if low is None and high is None:
+                selected = [max(nodes, key=version_key)] if nodes else []
+            else:
+                selected = [v for v in nodes if (low is None or version_key(v) >= low)
+                            and (high is None or version_key(v) <= high)]
+            if not selected:
+                wanted = (f" between {release.min_version or 'any'} and {release.max_version or 'any'}"
+                          if low or high else "")
+                raise PlanError(f"No {arch} release in {release.channel}{wanted}")
+            payloads += [(v, arch, nodes[v]) for v in sorted(selected, key=version_key)]
+    return payloads
+
+
+def image_blobs(client: RegistryClient, repository: str, reference: str,
+                architectures: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Blob digest -> size for an image, from its manifest only.
+
+    An image index is expanded to the listed architectures (all when None).
+    """
+    manifest = client.get_manifest(repository, reference)
+    blobs: Dict[str, int] = {}
+    if "manifests" in manifest:
+        for entry in manifest["manifests"]:
+            arch = entry.get("platform", {}).get("architecture")
+            if architectures and arch not in architectures and arch != "unknown":
+                continue
+            blobs.update(image_blobs(client, repository, entry["digest"]))
+        return blobs
+    for ref in [manifest.get("config") or {}] + manifest.get("layers", []):
+        if ref.get("digest"):
+            blobs[ref["digest"]] = int(ref.get("size") or 0)
+    return blobs
+
+
+def _platform_digest(client: RegistryClient, repository: str, reference: str, arch: str) -> str:
+    manifest = client.get_manifest(repository, reference)
+    for entry in manifest.get("manifests", []):
+        if entry.get("platform", {}).get("architecture") == arch:
+            return entry["digest"]
+    return reference
+
+
+def _fbc_objects(name: str, data: bytes) -> Iterator[Dict[str, Any]]:
+    """Objects of one file-based catalog file (JSON stream or YAML documents)."""
+    text = data.decode(errors="replace")
+    if name.endswith((".yaml", ".yml")):
+        import yaml
+        yield from (doc for doc in yaml.safe_load_all(text) if isinstance(doc, dict))
+        return
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos >= len(text):
+            return
+        obj, pos = decoder.raw_decode(text, pos)
+        yield obj
+
+
+def channel_heads(entries: List[Dict[str, Any]]) -> List[str]:
+    """Bundles in a channel that nothing else replaces or skips."""
+    superseded: Set[str] = set()
+    for entry in entries:
+        if entry.get("replaces"):
+            superseded.add(entry["replaces"])
+        superseded.update(entry.get("skips") or [])
+    return [e["name"] for e in entries if e["name"] not in superseded]
+
+
+def catalog_images(client: RegistryClient, repository: str, reference: str,
+                   packages: List[PackageSpec], arch: str = "amd64") -> Tuple[List[str], List[str]]:
+    """
+    Bundle and related image pull specs for the requested packages of a catalog.
+
+    Layers are read newest first and only until the one holding configs/.
+
+    Returns:
+        (pull specs, packages or channels not found in the catalog)
+    """
+    wanted = {p.name for p in packages}
+    objects: Dict[str, List[Dict[str, Any]]] = {name: [] for name in wanted}
+    manifest = client.get_manifest(repository, _platform_digest(client, repository, reference, arch))
+    for layer in reversed(manifest.get("layers", [])):
+        found_configs = False
+        blob = client.get_blob(repository, layer["digest"])
+        with tarfile.open(fileobj=io.BytesIO(blob), mode="r:*") as tar:
+            for member in tar:
+                match = _CONFIGS_RE.match(member.name)
+                if not match:
+                    continue
+                found_configs = True
+                if member.isfile() and match.group("package") in wanted:
+                    objects[match.group("package")] += _fbc_objects(member.name, tar.extractfile(member).read())
+        if found_configs:
+            break
+
+    images: List[str] = []
+    unresolved: List[str] = []
+    for package in packages:
+        schema = {}
+        for obj in objects[package.name]:
+            schema.setdefault(obj.get("schema"), []).append(obj)
+        default = next((p.get("defaultChannel") for p in schema.get("olm.package", [])), None)
+        channels = {c["name"]: c.get("entries", []) for c in schema.get("olm.channel", [])}
+        bundles = {b["name"]: b for b in schema.get("olm.bundle", [])}
+        if not bundles:
+            unresolved.append(f"{package.name} (no such package)")
+            continue
+        for channel in package.channels or [default]:
+            if channel not in channels:
+                unresolved.append(f"{package.name}/{channel} (no such channel)")
+                continue
+            for head in channel_heads(channels[channel]):
+                bundle = bundles.get(head)
+                if not bundle:
+                    unresolved.append(f"{package.name}/{channel} (head bundle {head} missing)")
+                    continue
+                images += [bundle["image"]] if bundle.get("image") else []
+                images += [r["image"] for r in bundle.get("relatedImages", []) if r.get("image")]
+    return sorted(set(images)), unresolved
+
+
+# =============================================================================
+# Throughput history
+# =============================================================================
+
+class ThroughputHistory:
+    """
+    Measured download/push throughput of previous runs, as a small JSON file.
+
+    Usage:
+        history = ThroughputHistory()
+        history.record("download", bytes_moved=84 * 1024 ** 3, seconds=5400)
+        rate, samples = history.rate("download")
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY):
+        self.path = path
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                self.samples: Dict[str, List[Dict[str, float]]] = json.load(f)
+        except (OSError, ValueError):
+            self.samples = {}
+
+    def record(self, phase: str, bytes_moved: int, seconds: float) -> None:
+        if bytes_moved <= 0 or seconds <= 0:
+            return
+        # Concurrent runs record into the same file: re-read under the lock
+        with file_lock(f"{self.path}.lock"):
+            self._load()
+            runs = self.samples.setdefault(phase, [])
+            runs.append({"bytes": bytes_moved, "seconds": round(seconds, 1), "time": round(time.time())})
+            del runs[:-HISTORY_KEEP]
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.samples, f, indent=1)
+            os.replace(tmp, self.path)
+
+    def rate(self, phase: str) -> Tuple[float, int]:
+        """(bytes/s, samples it is based on); 0 samples means the default rate."""
+        runs = [r for r in self.samples.get(phase, []) if r["bytes"] >= MIN_SAMPLE_BYTES][-HISTORY_WINDOW:]
+        if not runs:
+            return DEFAULT_RATES[phase], 0
+        return statistics.median(r["bytes"] / r["seconds"] for r in runs), len(runs)
+
+
+# =============================================================================
+# Plan
+# =============================================================================
+
+@dataclass
+class MirrorPlan:
+    """Predicted size and duration of one download."""
+
+    releases: List[str] = field(default_factory=list)
+    images: int = 0
+    blobs: int = 0
+    bytes_total: int = 0
+    bytes_release: int = 0
+    bytes_operators: int = 0
+    bytes_additional: int = 0
+    bytes_shipped: int = 0          # in the previous archive set (incremental)
+    bytes_resumed: int = 0          # already verified in the workspace
+    bytes_download: int = 0
+    bytes_archives: int = 0
+    disk_required: int = 0
+    disk_available: int = 0
+    disk_reserved: int = 0          # planned by concurrent runs, not written yet
+    download_rate: float = 0.0
+    download_samples: int = 0
+    push_rate: float = 0.0
+    push_samples: int = 0
+    unresolved: List[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    @property
+    def fits(self) -> bool:
+        return self.disk_required <= self.disk_available
+
+    @property
+    def download_seconds(self) -> float:
+        return self.bytes_download / self.download_rate if self.download_rate else 0.0
+
+    @property
+    def push_seconds(self) -> float:
+        return self.bytes_archives / self.push_rate if self.push_rate else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "fits": self.fits,
+            "disk_required_kb": self.disk_required // 1024,
+            "download_seconds": round(self.download_seconds),
+            "push_seconds": round(self.push_seconds),
+        }
+
+
+def read_shipped(mirror_path: str) -> Set[str]:
+    """Blob digests of the previous archive set, from its integrity manifest."""
+    from .archive_integrity import MANIFEST_NAME
+    try:
+        with open(os.path.join(mirror_path, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    return {b["digest"] for a in manifest.get("archives", []) for b in a.get("blobs", [])}
+
+
+def _archive_bytes(mirror_path: str) -> int:
+    from .mirror_archives import find_chunks
+    return sum(os.path.getsize(c.path) for c in find_chunks(mirror_path, packed=True))
+
+
+def _guard(fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """fn, returning expected registry failures instead of raising (for pool.map)."""
+    def wrapper(item: Any) -> Any:
+        try:
+            return fn(item)
+        except (RegistryError, OSError, ValueError) as e:
+            return e
+    return wrapper
+
+
+def plan_mirror(
+    spec: ImageSetSpec,
+    mirror_path: str = "/opt/images",
+    auth_file: Optional[str] = None,
+    clean: bool = False,
+    run_key: Optional[str] = None,
+    reserved_bytes: int = 0,
+    history: Optional[ThroughputHistory] = None,
+    graph_url: str = GRAPH_URL,
+    fetch_graph: Callable[[str], Dict[str, Any]] = _fetch_graph,
+    client_factory: Optional[Callable[[str], RegistryClient]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> MirrorPlan:
+    """
+    Resolve an image set to blob sizes and predict disk and duration.
+
+    Args:
+        spec: Image set to mirror
+        mirror_path: target_mirror_path (free space, previous archives, journal)
+        auth_file: Pull secret for the source registries
+        clean: clean_mirror: previous archives are deleted, nothing is incremental
+        run_key: Release pair of a resumable transfer journal
+        reserved_bytes: Free space other runs on the same disk still need
+            (workspace_lock.reserved_by_others)
+        history: Throughput history (default: DEFAULT_HISTORY)
+        graph_url: OpenShift update graph endpoint
+        fetch_graph: Fetches a graph URL as JSON
+        client_factory: RegistryClient per registry name
+        max_workers: Manifests resolved concurrently
+
+    Returns:
+        MirrorPlan; images that could not be resolved are listed in
+        unresolved and make the numbers a lower bound
+
+    Raises:
+        PlanError: if a release channel cannot be resolved
+    """
+    from .transfer_journal import DEFAULT_JOURNAL, read_journal_digests
+
+    started = time.monotonic()
+    plan = MirrorPlan()
+    clients: Dict[str, RegistryClient] = {}
+    lock = threading.Lock()
+
+    def client_for(registry: str) -> RegistryClient:
+        with lock:
+            if registry not in clients:
+                if client_factory:
+                    clients[registry] = client_factory(registry)
+                else:
+                    host, _, port = registry.partition(":")
+                    clients[registry] = RegistryClient(
+                        "registry-1.docker.io" if host == "docker.io" else host, int(port or 443),
+                        auth_file=auth_file, verify_tls=True)
+            return clients[registry]
+
+    def resolve(job: Tuple[str, str, Optional[List[str]]]) -> Dict[str, int]:
+        pullspec, _, arches = job
+        registry, repository, reference = parse_image(pullspec)
+        return image_blobs(client_for(registry), repository, reference, arches)
+
+    payloads = release_payloads(spec.releases, spec.architectures, graph_url, fetch_graph)
+    plan.releases = [f"{version} ({arch})" for version, arch, _ in payloads]
+    jobs: List[Tuple[str, str, Optional[List[str]]]] = []
+
+    def expand_release(payload: Tuple[str, str, str]) -> List[str]:
+        _, arch, pullspec = payload
+        registry, repository, reference = parse_image(pullspec)
+        return list(read_image_references(client_for(registry), repository, reference, arch).values())
+
+    def expand_catalog(catalog: CatalogSpec) -> Tuple[List[str], List[str]]:
+        registry, repository, reference = parse_image(catalog.catalog)
+        return catalog_images(client_for(registry), repository, reference, catalog.packages,
+                              spec.architectures[0])
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="planner") as pool:
+            releases = {pool.submit(expand_release, p): p for p in payloads}
+            catalogs = {pool.submit(expand_catalog, c): c for c in spec.catalogs}
+            for future, (version, arch, pullspec) in releases.items():
+                jobs.append((pullspec, "release", [arch]))
+                try:
+                    jobs += [(ref, "release", [arch]) for ref in future.result()]
+                except (RegistryError, OSError, tarfile.TarError, ValueError) as e:
+                    plan.unresolved.append(f"release {version} ({arch}): {e}")
+            for future, catalog in catalogs.items():
+                jobs.append((catalog.catalog, "operators", spec.architectures))
+                try:
+                    images, missing = future.result()
+                except (RegistryError, OSError, tarfile.TarError, ValueError) as e:
+                    plan.unresolved.append(f"catalog {catalog.catalog}: {e}")
+                    continue
+                jobs += [(ref, "operators", None) for ref in images]
+                plan.unresolved += [f"{catalog.catalog}: {m}" for m in missing]
+            jobs += [(ref, "additional", None) for ref in spec.additional_images]
+
+            unique: Dict[str, Tuple[str, str, Optional[List[str]]]] = {}
+            for job in jobs:
+                unique.setdefault(job[0], job)                          # first category wins
+            plan.images = len(unique)
+            sizes: Dict[str, int] = {}
+            category_of: Dict[str, str] = {}
+            for job, blobs in zip(unique.values(), pool.map(_guard(resolve), unique.values())):
+                if isinstance(blobs, Exception):
+                    plan.unresolved.append(f"{job[0]}: {blobs}")
+                    continue
+                for digest, size in blobs.items():
+                    sizes.setdefault(digest, size)
+                    category_of.setdefault(digest, job[1])
+    finally:
+        for client in clients.values():
+            client.close()
+
+    plan.blobs = len(sizes)
+    plan.bytes_total = sum(sizes.values())
+    by_category = {"release": 0, "operators": 0, "additional": 0}
+    for digest, size in sizes.items():
+        by_category[category_of[digest]] += size
+    plan.bytes_release = by_category["release"]
+    plan.bytes_operators = by_category["operators"]
+    plan.bytes_additional = by_category["additional"]
+
+    shipped = set() if clean else read_shipped(mirror_path)
+    resumed = read_journal_digests(os.path.join(mirror_path, os.path.basename(DEFAULT_JOURNAL)), run_key)
+    plan.bytes_shipped = sum(size for d, size in sizes.items() if d in shipped)
+    plan.bytes_resumed = sum(size for d, size in sizes.items() if d in resumed and d not in shipped)
+    plan.bytes_archives = plan.bytes_total - plan.bytes_shipped
+    plan.bytes_download = plan.bytes_archives - plan.bytes_resumed
+
+    # oc-mirror keeps the downloaded blobs in its workspace while it writes the
+    # archives, so new content is on disk twice at the peak
+    plan.disk_required = int((plan.bytes_download + plan.bytes_archives) * (1 + HEADROOM))
+    os.makedirs(mirror_path, exist_ok=True)
+    st = os.statvfs(mirror_path)
+    plan.disk_reserved = reserved_bytes
+    plan.disk_available = (st.f_bavail * st.f_frsize + (_archive_bytes(mirror_path) if clean else 0)
+                           - reserved_bytes)
+
+    history = history or ThroughputHistory()
+    plan.download_rate, plan.download_samples = history.rate("download")
+    plan.push_rate, plan.push_samples = history.rate("push")
+    plan.duration_seconds = round(time.monotonic() - started, 2)
+    return plan
+
+
+def save_plan(plan: MirrorPlan, path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(plan.as_dict(), f, indent=1)
+    os.replace(tmp, path)
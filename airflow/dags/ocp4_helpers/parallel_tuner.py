@@ -0,0 +1,356 @@
+"""
+Adaptive Parallelism Tuner for ocp4-disconnected-helper
+Sizes transfer concurrency to the link and registry at hand instead of fixed
+defaults, using AIMD feedback (additive increase, multiplicative decrease):
+- AIMDController adjusts a concurrency limit while a transfer runs. Every
+  window it adds one slot while throughput keeps rising, halves the limit on
+  throttling (HTTP 429/503), errors or a latency spike, and holds once extra
+  slots stop paying off (the link is saturated). The fan-out push
+  (archive_push.py) runs its blob uploads under it
+- oc-mirror cannot change its concurrency mid-process, so its
+  --parallel-images/--parallel-layers (v2) and --max-per-registry (v1) are
+  stepped the same way from one run to the next. The throughput and
+  throttling of a run are read from its log
+- The best settings are remembered per registry and uplink (egress address
+  and proxy) in /opt/images/.parallel-tuning.json and are the next start
+"""
+
+import json
+import os
+import re
+import socket
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .workspace_lock import file_lock
+
+DEFAULT_STORE = "/opt/images/.parallel-tuning.json"
+DEFAULT_WINDOW_SECONDS = 15.0
+DEFAULT_BACKOFF = 0.5               # multiplicative decrease
+LATENCY_FACTOR = 3.0                # median latency over baseline that counts as congestion
+PLATEAU_GAIN = 1.05                 # an extra slot must add 5% throughput to be kept
+REVERT_RATIO = 0.9                  # an oc-mirror step losing 10% goes back to the best settings
+THROTTLE_STATUSES = (429, 503)
+MAX_IMAGES = 16
+MAX_LAYERS = 32
+
+_THROTTLE_RE = re.compile(r"\b429\b|too ?many ?requests|toomanyrequests|rate.?limit", re.IGNORECASE)
+_ERROR_RE = re.compile(r"\berror\b|\bfailed\b", re.IGNORECASE)
+
+
+# =============================================================================
+# Live controller
+# =============================================================================
+
+@dataclass
+class Adjustment:
+    at: float
+    limit: int
+    mb_s: float
+    reason: str
+
+
+class AIMDController:
+    """
+    Concurrency limit adjusted from throughput, throttling and latency while work runs.
+
+    Usage:
+        controller = AIMDController(initial=4, maximum=32)
+        with controller.slot():
+            started = time.monotonic()
+            upload(...)
+            controller.observe(size, time.monotonic() - started, status=None)
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = MAX_LAYERS,
+                 window_seconds: float = DEFAULT_WINDOW_SECONDS, backoff: float = DEFAULT_BACKOFF):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = max(minimum, min(initial, maximum))
+        self.window_seconds = window_seconds
+        self.backoff = backoff
+        self.adjustments: List[Adjustment] = []
+        self.best_limit = self.limit
+        self.best_mb_s = 0.0
+        self._active = 0
+        self._cond = threading.Condition()
+        self._window_started = time.monotonic()
+        self._bytes = 0
+        self._throttled = 0
+        self._errors = 0
+        self._latencies: List[float] = []
+        self._baseline_latency: Optional[float] = None
+        self._last_mb_s = 0.0
+        self._plateau = False
+        self._probing = False
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one unit of concurrency; blocks while the limit is in use."""
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def observe(self, bytes_moved: int = 0, latency: Optional[float] = None,
+                status: Optional[int] = None, error: bool = False) -> None:
+        """
+        Record one finished transfer.
+
+        Args:
+            bytes_moved: Bytes it moved
+            latency: Seconds of a request dominated by round trips (small
+                blobs, mounts); large transfers measure bandwidth, not latency
+            status: HTTP status of a failed request, if any
+            error: The transfer failed
+        """
+        with self._cond:
+            self._bytes += bytes_moved
+            if status in THROTTLE_STATUSES:
+                self._throttled += 1
+            elif error:
+                self._errors += 1
+            if latency is not None:
+                self._latencies.append(latency)
+            if time.monotonic() - self._window_started >= self.window_seconds:
+                self._adjust()
+
+    def _adjust(self) -> None:
+        """End the current window and move the limit (caller holds the lock)."""
+        now = time.monotonic()
+        mb_s = self._bytes / 1e6 / max(now - self._window_started, 1e-6)
+        latency = statistics.median(self._latencies) if self._latencies else None
+        if latency is not None and (self._baseline_latency is None or latency < self._baseline_latency):
+            self._baseline_latency = latency
+        congested = (latency is not None and self._baseline_latency
+                     and latency > self._baseline_latency * LATENCY_FACTOR)
+
+        clean = not (self._throttled or self._errors or congested)
+        if clean and mb_s > self.best_mb_s:
+            self.best_mb_s, self.best_limit = mb_s, self.limit
+
+        new, reason = self.limit, ""
+        if not clean:
+            new = max(self.minimum, int(self.limit * self.backoff))
+            reason = (f"{self._throttled} throttled" if self._throttled else
+                      f"{self._errors} errors" if self._errors else f"latency {latency * 1000:.0f}ms")
+            self._plateau = False
+        elif self._plateau:
+            pass
+        elif self._probing and mb_s < self._last_mb_s * PLATEAU_GAIN:
+            # The last extra slot did not pay: settle one below it and stop probing
+            new = max(self.minimum, self.limit - 1)
+            reason = "saturated"
+            self._plateau = True
+        elif self.limit < self.maximum:
+            new = self.limit + 1
+            reason = "+1"
+        self._probing = reason == "+1"
+
+        if new != self.limit:
+            self.adjustments.append(Adjustment(round(now, 1), new, round(mb_s, 1), reason))
+        self.limit = new
+        self._last_mb_s = mb_s
+        self._window_started = now
+        self._bytes = self._throttled = self._errors = 0
+        self._latencies = []
+        self._cond.notify_all()
+
+
+# =============================================================================
+# oc-mirror (per invocation)
+# =============================================================================
+
+@dataclass
+class MirrorConcurrency:
+    """oc-mirror concurrency; v1 has one knob, --max-per-registry, which maps to layers."""
+
+    images: int = 4
+    layers: int = 6
+
+
+@dataclass
+class RunOutcome:
+    """What one oc-mirror invocation achieved."""
+
+    bytes_moved: int
+    seconds: float
+    throttled: int = 0
+    errors: int = 0
+    ok: bool = True
+
+    @property
+    def mb_s(self) -> float:
+        return self.bytes_moved / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+
+def scan_log(path: str, offset: int = 0) -> Tuple[int, int, int]:
+    """(throttle lines, error lines, end offset) of an oc-mirror log from offset on."""
+    throttled = errors = 0
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                line = raw.decode(errors="replace")
+                if _THROTTLE_RE.search(line):
+                    throttled += 1
+                elif _ERROR_RE.search(line):
+                    errors += 1
+            return throttled, errors, f.tell()
+    except OSError:
+        return 0, 0, offset
+
+
+def log_size(path: Optional[str]) -> int:
+    """Current end of a log, the offset to scan a following invocation from."""
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        return 0
+
+
+def step(current: MirrorConcurrency, outcome: RunOutcome,
+         best: Optional[Tuple[MirrorConcurrency, float]] = None,
+         settled: bool = False, v2: bool = False) -> Tuple[MirrorConcurrency, str, bool]:
+    """
+    Settings for the next invocation, why, and whether probing has settled.
+
+    Throttling or failure halves the settings. A probe that lost throughput
+    against the best settings goes back to them and settles there, until a
+    run at the best settings falls to half their throughput (the link or
+    registry changed) and probing resumes. Otherwise one more layer (v2:
+    or, once layers are twice the images, one more image) is tried.
+    """
+    if outcome.throttled or not outcome.ok:
+        return (MirrorConcurrency(max(1, int(current.images * DEFAULT_BACKOFF)),
+                                  max(1, int(current.layers * DEFAULT_BACKOFF))),
+                f"{outcome.throttled} throttled" if outcome.throttled else "failed", False)
+    if best is not None and best[0] != current and outcome.mb_s < best[1] * REVERT_RATIO:
+        return MirrorConcurrency(best[0].images, best[0].layers), "saturated, back to best", True
+    if settled and (best is None or outcome.mb_s >= best[1] * DEFAULT_BACKOFF):
+        return current, "holding at best", True
+    if outcome.errors:
+        return current, f"{outcome.errors} errors, holding", False
+    if v2 and current.layers >= 2 * current.images and current.images < MAX_IMAGES:
+        return MirrorConcurrency(current.images + 1, current.layers), "+1 image", False
+    if current.layers < MAX_LAYERS:
+        return MirrorConcurrency(current.images, current.layers + 1), "+1 layer", False
+    return current, "at maximum", False
+
+
+# =============================================================================
+# Memory per registry and uplink
+# =============================================================================
+
+def uplink_key(registry: str) -> str:
+    """
+    "<registry> via <egress address>[ proxy <host>]" for a registry.
+
+    The egress address is the local address the kernel routes the registry
+    through (no packet is sent); a proxy replaces the path entirely.
+    """
+    host, _, port = registry.partition("/")[0].partition(":")
+    proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("https_proxy")
+    source = "unknown"
+    try:
+        target = urlsplit(proxy).hostname if proxy else host
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect((socket.gethostbyname(target), int(port or 443)))
+            source = s.getsockname()[0]
+    except (OSError, ValueError):
+        pass
+    return f"{registry} via {source}" + (f" proxy {urlsplit(proxy).hostname}" if proxy else "")
+
+
+class TuningStore:
+    """
+    Remembered concurrency per registry and uplink, as a small JSON file.
+
+    Usage:
+        store = TuningStore()
+        key = uplink_key("quay.io")
+        settings = store.settings(key)
+        ... oc-mirror --max-per-registry=<settings.layers> ...
+        store.record(key, settings, RunOutcome(bytes_moved, seconds, throttled))
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        self.path = path
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                self.entries: Dict[str, Dict[str, Any]] = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @contextmanager
+    def _update(self) -> Iterator[None]:
+        """Re-read, change and save under a lock: concurrent syncs share the file."""
+        with file_lock(f"{self.path}.lock"):
+            self._load()
+            yield
+            self._save()
+
+    def _save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def settings(self, key: str, default: Optional[MirrorConcurrency] = None) -> MirrorConcurrency:
+        entry = self.entries.get(key)
+        if not entry:
+            return default or MirrorConcurrency()
+        return MirrorConcurrency(**entry["next"])
+
+    def best(self, key: str) -> Optional[Tuple[MirrorConcurrency, float]]:
+        entry = self.entries.get(key, {}).get("best")
+        return (MirrorConcurrency(entry["images"], entry["layers"]), entry["mb_s"]) if entry else None
+
+    def record(self, key: str, used: MirrorConcurrency, outcome: RunOutcome,
+               v2: bool = False) -> Tuple[MirrorConcurrency, str]:
+        """Step from an invocation's outcome; returns the next settings and why."""
+        with self._update():
+            best = self.best(key)
+            entry = self.entries.setdefault(key, {"runs": 0})
+            following, reason, entry["settled"] = step(used, outcome, best, entry.get("settled", False), v2)
+            entry["runs"] += 1
+            entry["next"] = asdict(following)
+            entry["last"] = {**asdict(used), "mb_s": round(outcome.mb_s, 1), "throttled": outcome.throttled,
+                             "errors": outcome.errors, "ok": outcome.ok, "reason": reason}
+            if outcome.ok and not outcome.throttled and (best is None or outcome.mb_s > best[1]):
+                entry["best"] = {**asdict(used), "mb_s": round(outcome.mb_s, 1)}
+            entry["updated"] = round(time.time())
+        return following, reason
+
+    def limit(self, key: str, default: int) -> int:
+        """Starting limit for a live controller."""
+        return int(self.entries.get(key, {}).get("live", {}).get("limit", default))
+
+    def record_live(self, key: str, controller: AIMDController) -> None:
+        """Remember the best limit a live controller found."""
+        with self._update():
+            entry = self.entries.setdefault(key, {"runs": 0})
+            entry["runs"] += 1
+            entry["live"] = {"limit": controller.best_limit, "mb_s": round(controller.best_mb_s, 1),
+                             "adjustments": len(controller.adjustments)}
+            entry["updated"] = round(time.time())
+
+
+def fanout_key(registries: Sequence[str]) -> str:
+    """Store key for a fan-out push: the slowest target paces every blob, so the set is the unit."""
+    return " + ".join(uplink_key(r) for r in sorted(registries))
+
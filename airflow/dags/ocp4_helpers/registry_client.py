@@ -0,0 +1,533 @@
+"""
+OCI Registry Client for ocp4-disconnected-helper
+Provides a native client for the OCI distribution API (/v2/) used by the
+DAG helpers instead of shelling out to curl/jq:
+- Keep-alive HTTPS connections pooled and shared across worker threads
+- Streaming pagination of /v2/_catalog and tags/list (Link header or n=&last=)
+- Auth negotiated once per run (Basic, or Bearer tokens cached per scope)
+- Bounded worker pool for concurrent tag and manifest lookups
+- Blob uploads streamed from any chunk source, cross-repository mounts and
+  manifest pushes
+
+Only the Python standard library is used so the module works unchanged in the
+Airflow worker, on the registry host and inside an execution environment.
+"""
+
+import base64
+import http.client
+import json
+import queue
+import re
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlencode, urlsplit, parse_qs
+
+MANIFEST_ACCEPT = ", ".join([
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+])
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_TIMEOUT = 30
+
+_LINK_NEXT_RE = re.compile(r'<([^>]+)>\s*;\s*rel="?next"?')
+_CHALLENGE_PARAM_RE = re.compile(r'(\w+)="([^"]*)"')
+
+
+def _request_target(url) -> str:
+    """Path plus query of a parsed URL, as sent on the request line."""
+    return f"{url.path or '/'}?{url.query}" if url.query else (url.path or "/")
+
+
+class RegistryError(Exception):
+    """Raised when the registry returns an unexpected response."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def load_registry_auth(auth_file: str, registry: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read username/password for a registry from a pull-secret style auth file.
+
+    Args:
+        auth_file: Path to a JSON file with an "auths" map (pull-secret.json)
+        registry: host[:port] key to look up
+
+    Returns:
+        (username, password), or (None, None) if no entry exists
+    """
+    try:
+        with open(auth_file) as f:
+            auths = json.load(f).get("auths", {})
+    except (OSError, ValueError):
+        return None, None
+
+    entry = auths.get(registry) or auths.get(registry.split(":")[0])
+    if not entry or "auth" not in entry:
+        return None, None
+
+    decoded = base64.b64decode(entry["auth"]).decode()
+    username, _, password = decoded.partition(":")
+    return username, password
+
+
+class _ConnectionPool:
+    """Thread-safe pool of keep-alive HTTPS connections to one registry."""
+
+    def __init__(self, host: str, port: int, context: ssl.SSLContext,
+                 timeout: float, maxsize: int):
+        self.host = host
+        self.port = port
+        self.context = context
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPSConnection]" = queue.LifoQueue(maxsize)
+
+    def get(self) -> http.client.HTTPSConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout, context=self.context
+            )
+
+    def put(self, conn: http.client.HTTPSConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class RegistryClient:
+    """
+    Pooled client for a single OCI registry.
+
+    Usage:
+        with RegistryClient("mirror-registry.example.com", 8443,
+                            auth_file="/root/pull-secret.json") as client:
+            for repo in client.iter_repositories():
+                ...
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 443,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        auth_file: Optional[str] = None,
+        verify_tls: bool = False,
+        ca_file: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        self.host = host
+        self.port = int(port)
+        self.registry = host if self.port == 443 else f"{host}:{self.port}"
+        self.max_workers = max_workers
+        self.page_size = page_size
+
+        if username is None and auth_file:
+            username, password = load_registry_auth(auth_file, self.registry)
+        self._basic = None
+        if username is not None:
+            token = base64.b64encode(f"{username}:{password or ''}".encode()).decode()
+            self._basic = f"Basic {token}"
+
+        if verify_tls or ca_file:
+            context = ssl.create_default_context(cafile=ca_file)
+        else:
+            # Matches `curl -sk`: mirror registries commonly use self-signed certs
+            context = ssl._create_unverified_context()
+        self._pool = _ConnectionPool(host, self.port, context, timeout, maxsize=max_workers * 2)
+
+        # Auth scheme is negotiated on the first 401 and reused for the run
+        self._scheme: Optional[str] = None
+        self._challenge: Dict[str, str] = {}
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._auth_lock = threading.Lock()
+
+    def __enter__(self) -> "RegistryClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.close()
+
+    # -------------------------------------------------------------------------
+    # Transport
+    # -------------------------------------------------------------------------
+
+    def _send(self, method: str, path: str, headers: Dict[str, str],
+              body: Union[bytes, Iterable[bytes], None] = None) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """Send one request on a pooled connection, reconnecting once if stale."""
+        for attempt in (1, 2):
+            conn = self._pool.get()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionError,
+                    http.client.CannotSendRequest, http.client.BadStatusLine) as e:
+                conn.close()
+                # A streamed body has been consumed and cannot be replayed
+                if attempt == 2 or not (body is None or isinstance(body, bytes)):
+                    raise RegistryError(f"{method} {path}: {e}") from e
+                continue
+            except OSError as e:
+                conn.close()
+                raise RegistryError(f"{method} {path}: {e}") from e
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._pool.put(conn)
+            return resp.status, resp.headers, data
+        raise AssertionError("unreachable")
+
+    def request(self, method: str, path: str, scope: Optional[str] = None,
+                headers: Optional[Dict[str, str]] = None,
+                body: Union[bytes, Iterable[bytes], None] = None) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """
+        Perform an authenticated request against the registry.
+
+        Args:
+            method: HTTP method
+            path: Request path including query string (e.g. /v2/_catalog?n=100)
+            scope: Token scope (e.g. repository:ocp4/openshift4:pull)
+            headers: Extra request headers
+            body: Optional request body (bytes, or an iterable of chunks
+                streamed with the Content-Length given in headers)
+
+        Returns:
+            (status, headers, body)
+        """
+        hdrs = dict(headers or {})
+        auth = self._authorization(scope)
+        if auth is None and self._scheme == "bearer":
+            # Scheme already known: fetch the scope's token up front instead
+            # of paying a 401 round trip for every new repository
+            with self._auth_lock:
+                if self._authorization(scope) is None:
+                    self._fetch_token(scope)
+            auth = self._authorization(scope)
+        if auth:
+            hdrs["Authorization"] = auth
+
+        status, resp_headers, data = self._send(method, path, hdrs, body)
+        replayable = body is None or isinstance(body, bytes)
+        if status == 401 and replayable and self._negotiate(resp_headers.get("WWW-Authenticate", ""), scope):
+            hdrs["Authorization"] = self._authorization(scope)
+            status, resp_headers, data = self._send(method, path, hdrs, body)
+        return status, resp_headers, data
+
+    def _get_json(self, path: str, scope: Optional[str] = None) -> Tuple[Any, http.client.HTTPMessage]:
+        status, headers, data = self.request("GET", path, scope=scope,
+                                             headers={"Accept": "application/json"})
+        if status != 200:
+            raise RegistryError(f"GET {path} returned HTTP {status}", status)
+        return json.loads(data or b"{}"), headers
+
+    # -------------------------------------------------------------------------
+    # Authentication
+    # -------------------------------------------------------------------------
+
+    def _authorization(self, scope: Optional[str]) -> Optional[str]:
+        if self._scheme == "bearer":
+            cached = self._tokens.get(scope or "")
+            if cached and cached[1] > time.monotonic():
+                return f"Bearer {cached[0]}"
+            return None
+        if self._scheme == "basic":
+            return self._basic
+        return None
+
+    def _negotiate(self, challenge: str, scope: Optional[str]) -> bool:
+        """Handle a 401 challenge; returns True if the request should be retried."""
+        scheme, _, params = challenge.partition(" ")
+        scheme = scheme.lower()
+
+        with self._auth_lock:
+            if scheme == "basic":
+                if self._basic is None or self._scheme == "basic":
+                    return False
+                self._scheme = "basic"
+                return True
+
+            if scheme != "bearer":
+                return False
+
+            self._scheme = "bearer"
+            self._challenge = dict(_CHALLENGE_PARAM_RE.findall(params))
+            cached = self._tokens.get(scope or "")
+            if cached and cached[1] > time.monotonic():
+                # Another worker fetched the token while we waited on the lock
+                return True
+            return self._fetch_token(scope)
+
+    def _fetch_token(self, scope: Optional[str]) -> bool:
+        realm = self._challenge.get("realm")
+        if not realm:
+            return False
+
+        query = {"service": self._challenge.get("service", self.host)}
+        if scope:
+            query["scope"] = scope.split(" ")           # several scopes: one parameter each
+        url = urlsplit(realm)
+        path = f"{url.path or '/'}?{urlencode(query, doseq=True)}"
+        headers = {"Authorization": self._basic} if self._basic else {}
+
+        if (url.hostname, url.port or 443) == (self.host, self.port):
+            status, _, data = self._send("GET", path, headers)
+        else:
+            conn = http.client.HTTPSConnection(url.hostname, url.port or 443,
+                                               timeout=self._pool.timeout,
+                                               context=self._pool.context)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                status, data = resp.status, resp.read()
+            finally:
+                conn.close()
+
+        if status != 200:
+            raise RegistryError(f"Token request to {realm} returned HTTP {status}", status)
+
+        payload = json.loads(data)
+        token = payload.get("token") or payload.get("access_token")
+        # Refresh a little early so in-flight requests never carry a stale token
+        ttl = max(int(payload.get("expires_in", 300)) - 30, 30)
+        self._tokens[scope or ""] = (token, time.monotonic() + ttl)
+        return True
+
+    # -------------------------------------------------------------------------
+    # Distribution API
+    # -------------------------------------------------------------------------
+
+    def ping(self) -> int:
+        """Return the HTTP status of GET /v2/ (200 or 401 means the API is up)."""
+        status, _, _ = self.request("GET", "/v2/")
+        return status
+
+    def _paginate(self, path: str, key: str, scope: Optional[str]) -> Iterator[str]:
+        """Yield entries of `key` across all pages of a paginated listing."""
+        next_path: Optional[str] = f"{path}?{urlencode({'n': self.page_size})}"
+        while next_path:
+            body, headers = self._get_json(next_path, scope=scope)
+            entries = body.get(key) or []
+            yield from entries
+
+            link = _LINK_NEXT_RE.search(headers.get("Link", ""))
+            if link:
+                target = urlsplit(link.group(1))
+                next_path = _request_target(target)
+                # Some registries drop `n` from the Link target; keep our page size
+                if "n" not in parse_qs(target.query):
+                    next_path += f"&n={self.page_size}" if target.query else f"?n={self.page_size}"
+            elif len(entries) >= self.page_size:
+                # No Link header but a full page: fall back to n=&last=
+                next_path = f"{path}?{urlencode({'n': self.page_size, 'last': entries[-1]})}"
+            else:
+                next_path = None
+
+    def iter_repositories(self) -> Iterator[str]:
+        """Stream every repository name from /v2/_catalog, following pagination."""
+        return self._paginate("/v2/_catalog", "repositories", "registry:catalog:*")
+
+    def iter_tags(self, repository: str) -> Iterator[str]:
+        """Stream every tag of a repository, following pagination."""
+        return self._paginate(f"/v2/{repository}/tags/list", "tags",
+                              f"repository:{repository}:pull")
+
+    def list_tags(self, repository: str) -> List[str]:
+        return list(self.iter_tags(repository))
+
+    def head_manifest(self, repository: str, reference: str) -> Optional[str]:
+        """
+        Check a manifest exists without downloading it.
+
+        Returns:
+            The Docker-Content-Digest (or the reference itself when the
+            registry omits the header), or None if the manifest is missing
+        """
+        status, headers, _ = self.request(
+            "HEAD", f"/v2/{repository}/manifests/{reference}",
+            scope=f"repository:{repository}:pull",
+            headers={"Accept": MANIFEST_ACCEPT},
+        )
+        if status == 404:
+            return None
+        if status != 200:
+            raise RegistryError(f"HEAD {repository}:{reference} returned HTTP {status}", status)
+        return headers.get("Docker-Content-Digest") or reference
+
+    def get_manifest(self, repository: str, reference: str) -> Dict[str, Any]:
+        """Fetch and decode a manifest or image index."""
+        status, _, data = self.request(
+            "GET", f"/v2/{repository}/manifests/{reference}",
+            scope=f"repository:{repository}:pull",
+            headers={"Accept": MANIFEST_ACCEPT},
+        )
+        if status != 200:
+            raise RegistryError(f"GET {repository}:{reference} returned HTTP {status}", status)
+        return json.loads(data)
+
+    def get_blob(self, repository: str, digest: str) -> bytes:
+        """Download a blob, following the storage redirect some registries issue."""
+        path = f"/v2/{repository}/blobs/{digest}"
+        status, headers, data = self.request("GET", path, scope=f"repository:{repository}:pull")
+        if status in (301, 302, 303, 307, 308):
+            target = urlsplit(headers["Location"])
+            if target.hostname in (None, self.host) and (target.port or self.port) == self.port:
+                status, _, data = self.request("GET", _request_target(target),
+                                               scope=f"repository:{repository}:pull")
+            else:
+                # Pre-signed storage URL: fetch without registry credentials
+                if target.scheme == "https":
+                    conn = http.client.HTTPSConnection(target.hostname, target.port, timeout=self._pool.timeout,
+                                                       context=self._pool.context)
+                else:
+                    conn = http.client.HTTPConnection(target.hostname, target.port, timeout=self._pool.timeout)
+                try:
+                    conn.request("GET", _request_target(target))
+                    resp = conn.getresponse()
+                    status, data = resp.status, resp.read()
+                finally:
+                    conn.close()
+        if status != 200:
+            raise RegistryError(f"GET blob {repository}@{digest} returned HTTP {status}", status)
+        return data
+
+    # -------------------------------------------------------------------------
+    # Push
+    # -------------------------------------------------------------------------
+
+    def blob_exists(self, repository: str, digest: str) -> bool:
+        """HEAD a blob in a repository."""
+        status, _, _ = self.request("HEAD", f"/v2/{repository}/blobs/{digest}",
+                                    scope=f"repository:{repository}:pull")
+        if status in (200, 307):
+            return True
+        if status == 404:
+            return False
+        raise RegistryError(f"HEAD blob {repository}@{digest} returned HTTP {status}", status)
+
+    def upload_blob(self, repository: str, digest: str, size: int,
+                    chunks: Union[bytes, Iterable[bytes]]) -> None:
+        """
+        Upload a blob in one monolithic PUT, streaming the body from chunks.
+
+        Args:
+            repository: Target repository
+            digest: Blob digest (sha256:...)
+            size: Blob size in bytes (sent as Content-Length)
+            chunks: The blob, or an iterable yielding it in pieces
+        """
+        scope = f"repository:{repository}:pull,push"
+        status, headers, _ = self.request("POST", f"/v2/{repository}/blobs/uploads/", scope=scope,
+                                          headers={"Content-Length": "0"}, body=b"")
+        if status != 202 or "Location" not in headers:
+            raise RegistryError(f"Upload to {repository} not started: HTTP {status}", status)
+
+        target = _request_target(urlsplit(headers["Location"]))
+        target += ("&" if "?" in target else "?") + urlencode({"digest": digest})
+        status, _, data = self.request("PUT", target, scope=scope, body=chunks, headers={
+            "Content-Type": "application/octet-stream",
+            "Content-Length": str(size),
+        })
+        if status not in (201, 204):
+            raise RegistryError(f"PUT blob {repository}@{digest} returned HTTP {status}: "
+                                f"{data[:200].decode(errors='replace')}", status)
+
+    def mount_blob(self, repository: str, digest: str, from_repository: str) -> bool:
+        """
+        Cross-repository mount of a blob the registry already holds in from_repository.
+
+        Returns:
+            True if mounted; False if the registry refused (it opened a
+            regular upload session instead, which is cancelled)
+        """
+        scope = f"repository:{repository}:pull,push repository:{from_repository}:pull"
+        query = urlencode({"mount": digest, "from": from_repository})
+        status, headers, _ = self.request("POST", f"/v2/{repository}/blobs/uploads/?{query}", scope=scope,
+                                          headers={"Content-Length": "0"}, body=b"")
+        if status == 201:
+            return True
+        if status == 202 and "Location" in headers:
+            try:
+                self.request("DELETE", _request_target(urlsplit(headers["Location"])), scope=scope)
+            except RegistryError:
+                pass                                    # the registry expires abandoned sessions
+        return False
+
+    def put_manifest(self, repository: str, reference: str, data: bytes, media_type: str) -> str:
+        """
+        Push a manifest or image index under a tag or digest.
+
+        Returns:
+            The digest reported by the registry
+        """
+        status, headers, body = self.request(
+            "PUT", f"/v2/{repository}/manifests/{reference}",
+            scope=f"repository:{repository}:pull,push",
+            headers={"Content-Type": media_type}, body=data,
+        )
+        if status not in (200, 201):
+            raise RegistryError(f"PUT manifest {repository}:{reference} returned HTTP {status}: "
+                                f"{body[:200].decode(errors='replace')}", status)
+        return headers.get("Docker-Content-Digest") or reference
+
+    # -------------------------------------------------------------------------
+    # Concurrency
+    # -------------------------------------------------------------------------
+
+    def map_concurrent(self, fn: Callable[[Any], Any], items: Iterable[Any],
+                       max_workers: Optional[int] = None) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        Apply fn to items on a bounded worker pool, yielding results as they complete.
+
+        Items are pulled lazily, so a streamed catalog is never fully
+        materialised and at most 2x max_workers calls are in flight.
+
+        Yields:
+            (item, result, error) - error is the exception raised by fn, if any
+        """
+        workers = max_workers or self.max_workers
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="registry") as pool:
+            pending = {}
+
+            def submit_next() -> bool:
+                for item in items:
+                    pending[pool.submit(fn, item)] = item
+                    return True
+                return False
+
+            for _ in range(workers * 2):
+                if not submit_next():
+                    break
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    error = future.exception()
+                    yield item, (None if error else future.result()), error
+                    submit_next()
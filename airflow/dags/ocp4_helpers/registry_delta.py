@@ -0,0 +1,205 @@
+"""
+Registry Delta Planner for ocp4-disconnected-helper
+Works out which blobs of a pending archive set a target registry is missing
+before anything is uploaded:
+- Every (repository, blob) pair in the archives is checked with concurrent
+  HEAD /v2/<repo>/blobs/<digest> requests on the registry's connection pool
+- A local Bloom filter per registry (/opt/images/.registry-delta/) remembers
+  pairs already seen present or pushed, so repeat syncs answer most checks
+  without a network call
+- The plan reports bytes to upload and bytes avoided per registry
+
+A Bloom filter can answer "present" for a pair the registry does not hold (a
+false positive, or a blob removed by registry GC). archive_push.py recovers
+from that: a manifest rejected for a missing blob has its blobs re-checked
+with real HEAD requests and uploaded, and the manifest is retried.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = "/opt/images/.registry-delta"
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_ERROR_RATE = 1e-6
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600     # rebuild weekly so registry GC is picked up
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings, persisted as a JSON header line plus the bit array.
+
+    Usage:
+        bloom = BloomFilter.load(path) or BloomFilter()
+        bloom.add("ocp4/openshift/release@sha256:...")
+        "ocp4/openshift/release@sha256:..." in bloom
+        bloom.save(path)
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE,
+                 bits: Optional[bytearray] = None, count: int = 0, created: Optional[float] = None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+        self.created = created or time.time()
+        self._lock = threading.Lock()
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        with self._lock:
+            for pos in self._positions(item):
+                self.bits[pos >> 3] |= 1 << (pos & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        header = {"capacity": self.capacity, "error_rate": self.error_rate,
+                  "count": self.count, "created": self.created}
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            with self._lock:
+                f.write(json.dumps(header).encode() + b"\n")
+                f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS) -> Optional["BloomFilter"]:
+        """The saved filter, or None if it is missing, unreadable, expired or full."""
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                bits = bytearray(f.read())
+            bloom = cls(header["capacity"], header["error_rate"], bits, header["count"], header["created"])
+        except (OSError, ValueError, KeyError):
+            return None
+        if len(bits) != (bloom.size + 7) // 8 or bloom.full or time.time() - bloom.created > max_age_seconds:
+            return None
+        return bloom
+
+
+def cache_path(registry: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", registry) + ".bloom")
+
+
+def pair_key(repository: str, digest: str) -> str:
+    return f"{repository}@{digest}"
+
+
+@dataclass
+class DeltaPlan:
+    """Blobs one registry is missing, and what checking spared."""
+
+    registry: str
+    missing: Dict[str, List[str]] = field(default_factory=dict)   # digest -> repositories
+    holders: Dict[str, str] = field(default_factory=dict)         # digest -> a repository holding it
+    pairs: int = 0
+    present: int = 0
+    cache_hits: int = 0
+    head_checks: int = 0
+    check_errors: int = 0
+    bytes_total: int = 0                # every pair, as one push per repository would upload
+    bytes_missing: int = 0              # each missing digest once: uploaded to one repository
+    bytes_mounted: int = 0              # missing pairs served by a cross-repository mount instead
+    duration_seconds: float = 0.0
+
+    @property
+    def bytes_avoided(self) -> int:
+        """Present pairs plus cross-repository mounts."""
+        return self.bytes_total - self.bytes_missing
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "registry": self.registry,
+            "pairs": self.pairs,
+            "pairs_missing": sum(len(repos) for repos in self.missing.values()),
+            "present": self.present,
+            "cache_hits": self.cache_hits,
+            "head_checks": self.head_checks,
+            "check_errors": self.check_errors,
+            "bytes_total": self.bytes_total,
+            "bytes_missing": self.bytes_missing,
+            "bytes_mounted": self.bytes_mounted,
+            "bytes_avoided": self.bytes_avoided,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+def plan_delta(
+    pairs: Iterable[Tuple[str, str]],
+    sizes: Dict[str, int],
+    client: Any,
+    registry: str,
+    bloom: Optional[BloomFilter] = None,
+) -> DeltaPlan:
+    """
+    Find the (repository, digest) pairs a registry does not hold.
+
+    Args:
+        pairs: (repository, digest) pairs, repositories already prefixed for the target
+        sizes: Blob sizes by digest (blobs without one count as 0 bytes)
+        client: RegistryClient for the target (its pool bounds concurrency)
+        registry: Registry name for the plan
+        bloom: Known-present cache; answered pairs skip the HEAD request,
+            pairs found present are added
+
+    Returns:
+        DeltaPlan; a pair whose check failed is treated as missing. holders
+        names a repository already holding each present digest, the source
+        for cross-repository mounts. A missing digest counts once towards
+        bytes_missing, and not at all if the registry already holds it
+        elsewhere; its other repositories count as bytes_mounted (a
+        registry refusing mounts uploads them after all)
+    """
+    started = time.monotonic()
+    plan = DeltaPlan(registry=registry)
+    to_check = []
+    for repo, digest in pairs:
+        plan.pairs += 1
+        plan.bytes_total += sizes.get(digest, 0)
+        if bloom is not None and pair_key(repo, digest) in bloom:
+            plan.present += 1
+            plan.cache_hits += 1
+            plan.holders.setdefault(digest, repo)
+        else:
+            to_check.append((repo, digest))
+
+    for (repo, digest), exists, error in client.map_concurrent(
+            lambda pair: client.blob_exists(*pair), to_check):
+        plan.head_checks += 1
+        if error:
+            plan.check_errors += 1
+        if exists and not error:
+            plan.present += 1
+            plan.holders.setdefault(digest, repo)
+            if bloom is not None:
+                bloom.add(pair_key(repo, digest))
+        else:
+            plan.missing.setdefault(digest, []).append(repo)
+    for digest, repos in plan.missing.items():
+        size = sizes.get(digest, 0)
+        uploads = 0 if digest in plan.holders else 1
+        plan.bytes_missing += size * uploads
+        plan.bytes_mounted += size * (len(repos) - uploads)
+    plan.duration_seconds = round(time.monotonic() - started, 2)
+    return plan
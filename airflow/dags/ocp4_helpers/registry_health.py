@@ -0,0 +1,247 @@
+"""
+Registry Health Engine for ocp4-disconnected-helper
+Probes many registries (Quay, Harbor, JFrog mirrors) in parallel with asyncio:
+- TLS handshake, chain verification and certificate expiry via the ssl module
+- /v2/ API availability over the same connection
+- Auth challenge (WWW-Authenticate scheme and realm)
+
+Each registry gets its own timeout, so a full validation takes as long as the
+slowest registry rather than the sum of all of them. Results are structured
+(RegistryHealth) and expose validation_errors() in the keyword form accepted
+by dag_helpers.format_validation_error().
+"""
+
+import asyncio
+import re
+import ssl
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_TIMEOUT = 15
+DEFAULT_MIN_CERT_DAYS = 7
+
+_CHALLENGE_PARAM_RE = re.compile(r'(\w+)="([^"]*)"')
+
+
+@dataclass
+class RegistryHealth:
+    """Result of probing one registry."""
+
+    registry: str
+    api_status: Optional[int] = None
+    auth_scheme: Optional[str] = None
+    auth_realm: Optional[str] = None
+    chain_trusted: Optional[bool] = None
+    chain_error: Optional[str] = None
+    cert_not_after: Optional[datetime] = None
+    days_left: Optional[int] = None
+    elapsed: float = 0.0
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    min_cert_days: int = DEFAULT_MIN_CERT_DAYS
+
+    @property
+    def host(self) -> str:
+        return self.registry.rsplit(":", 1)[0]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def validation_errors(self, deploy_dag: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Failures as keyword arguments for format_validation_error().
+
+        deploy_dag names the DAG that (re)deploys this registry, for the fix hint.
+        """
+        failures = []
+        if self.api_status not in (200, 401):
+            fix = "1. Check if registry VM is running:\n     virsh list --all | grep -i registry"
+            if deploy_dag:
+                fix += (f"\n  2. Redeploy registry:\n     airflow dags trigger {deploy_dag} "
+                        "--conf '{\"action\": \"create\"}'")
+            failures.append({
+                "check_name": f"Registry API ({self.registry})",
+                "expected": "HTTP 200 or 401 from /v2/",
+                "actual": f"HTTP {self.api_status}" if self.api_status else "; ".join(self.errors),
+                "fix_command": fix,
+            })
+        if self.api_status == 401 and not self.auth_scheme:
+            failures.append({
+                "check_name": f"Registry auth challenge ({self.registry})",
+                "expected": "WWW-Authenticate: Basic or Bearer",
+                "actual": "401 without an auth challenge",
+            })
+        if self.days_left is not None and self.days_left < self.min_cert_days:
+            failures.append({
+                "check_name": f"Certificate expiry ({self.registry})",
+                "expected": f">= {self.min_cert_days} days remaining",
+                "actual": f"{self.days_left} days (expires {self.cert_not_after:%Y-%m-%d})",
+                "fix_command": (
+                    "airflow dags trigger step_ca_operations --conf "
+                    f"'{{\"action\": \"renew-cert\", \"target\": \"{self.host}\"}}'"
+                ),
+            })
+        return failures
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form (for XCom)."""
+        return {
+            "registry": self.registry,
+            "ok": self.ok,
+            "api_status": self.api_status,
+            "auth_scheme": self.auth_scheme,
+            "auth_realm": self.auth_realm,
+            "chain_trusted": self.chain_trusted,
+            "chain_error": self.chain_error,
+            "cert_not_after": self.cert_not_after.isoformat() if self.cert_not_after else None,
+            "days_left": self.days_left,
+            "elapsed": round(self.elapsed, 3),
+            "errors": self.errors,
+            "warnings": self.warnings,
+        }
+
+
+# =============================================================================
+# Certificate parsing
+# =============================================================================
+
+def _der_read(data: bytes, offset: int) -> Tuple[int, int, int]:
+    """Read a DER TLV header; returns (tag, content_start, content_end)."""
+    tag = data[offset]
+    length = data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        count = length & 0x7F
+        length = int.from_bytes(data[offset:offset + count], "big")
+        offset += count
+    return tag, offset, offset + length
+
+
+def _der_time(tag: int, raw: bytes) -> datetime:
+    text = raw.decode()
+    fmt = "%y%m%d%H%M%SZ" if tag == 0x17 else "%Y%m%d%H%M%SZ"
+    return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+
+
+def cert_not_after(der: bytes) -> datetime:
+    """
+    Extract notAfter from a DER certificate.
+
+    ssl only decodes peer certificates it has verified, so self-signed mirror
+    certificates are parsed directly: Certificate -> TBSCertificate -> Validity.
+    """
+    _, cert_start, _ = _der_read(der, 0)
+    _, pos, _ = _der_read(der, cert_start)          # TBSCertificate
+    tag, start, end = _der_read(der, pos)
+    if tag == 0xA0:                                  # [0] explicit version
+        pos = end
+        tag, start, end = _der_read(der, pos)
+    for _ in range(2):                               # signature, issuer
+        pos = end
+        tag, start, end = _der_read(der, pos)
+    _, validity_start, _ = _der_read(der, end)       # Validity
+    _, nb_start, nb_end = _der_read(der, validity_start)
+    tag, na_start, na_end = _der_read(der, nb_end)
+    return _der_time(tag, der[na_start:na_end])
+
+
+# =============================================================================
+# Probes
+# =============================================================================
+
+async def _handshake(host: str, port: int, context: ssl.SSLContext
+                     ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    return await asyncio.open_connection(host, port, ssl=context, server_hostname=host)
+
+
+async def _probe(host: str, port: int, result: RegistryHealth,
+                 verified_context: ssl.SSLContext) -> None:
+    try:
+        reader, writer = await _handshake(host, port, verified_context)
+        result.chain_trusted = True
+    except ssl.SSLCertVerificationError as e:
+        result.chain_trusted = False
+        result.chain_error = e.verify_message or str(e)
+        result.warnings.append(f"Certificate chain not trusted: {result.chain_error}")
+        reader, writer = await _handshake(host, port, ssl._create_unverified_context())
+
+    try:
+        der = writer.get_extra_info("ssl_object").getpeercert(binary_form=True)
+        if der:
+            result.cert_not_after = cert_not_after(der)
+            result.days_left = (result.cert_not_after - datetime.now(timezone.utc)).days
+            if result.days_left < result.min_cert_days:
+                result.errors.append(
+                    f"Certificate expires in {result.days_left} days (minimum: {result.min_cert_days})")
+
+        # Reuse the handshake for the API probe
+        writer.write(
+            f"GET /v2/ HTTP/1.1\r\nHost: {result.registry}\r\n"
+            "User-Agent: ocp4-disconnected-helper\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+    finally:
+        writer.close()
+
+    lines = head.decode("latin-1").split("\r\n")
+    result.api_status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    challenge = headers.get("www-authenticate", "")
+    if challenge:
+        scheme, _, params = challenge.partition(" ")
+        result.auth_scheme = scheme.capitalize()
+        result.auth_realm = dict(_CHALLENGE_PARAM_RE.findall(params)).get("realm")
+
+    if result.api_status not in (200, 401):
+        result.errors.append(f"API not responding (HTTP {result.api_status})")
+    elif result.api_status == 401 and not result.auth_scheme:
+        result.errors.append("HTTP 401 without WWW-Authenticate challenge")
+
+
+async def check_registry(registry: str, min_cert_days: int = DEFAULT_MIN_CERT_DAYS,
+                         timeout: float = DEFAULT_TIMEOUT,
+                         ca_file: Optional[str] = None) -> RegistryHealth:
+    """Probe one registry ("host:port", port defaults to 443) within timeout."""
+    host, _, port = registry.partition(":")
+    result = RegistryHealth(registry=registry, min_cert_days=min_cert_days)
+    context = ssl.create_default_context(cafile=ca_file)
+    started = time.monotonic()
+    try:
+        await asyncio.wait_for(_probe(host, int(port or 443), result, context), timeout)
+    except asyncio.TimeoutError:
+        result.errors.append(f"Timed out after {timeout}s")
+    except (OSError, ssl.SSLError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+        result.errors.append(f"Connection failed: {e}")
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+async def check_registries_async(registries: Sequence[str], **kwargs) -> List[RegistryHealth]:
+    return list(await asyncio.gather(*(check_registry(r, **kwargs) for r in registries)))
+
+
+def check_registries(registries: Sequence[str], min_cert_days: int = DEFAULT_MIN_CERT_DAYS,
+                     timeout: float = DEFAULT_TIMEOUT,
+                     ca_file: Optional[str] = None) -> List[RegistryHealth]:
+    """
+    Probe all registries concurrently.
+
+    Args:
+        registries: "host:port" entries
+        min_cert_days: Minimum days of certificate validity
+        timeout: Per-registry timeout in seconds
+        ca_file: CA bundle used to verify the chain (system trust store if None)
+
+    Returns:
+        RegistryHealth per registry, in input order
+    """
+    return asyncio.run(check_registries_async(
+        registries, min_cert_days=min_cert_days, timeout=timeout, ca_file=ca_file))
@@ -0,0 +1,179 @@
+"""
+Release Payload Verifier for ocp4-disconnected-helper
+Checks that every component image of an OpenShift release payload is present
+in the mirror registry, before an install or upgrade depends on it:
+- Reads release-manifests/image-references from the mirrored release image
+- HEADs every component digest concurrently over pooled keep-alive connections
+- Reports the exact components whose digests are missing
+
+Default repositories follow the mirror layout used by the cluster deploy role
+(roles/openshift_cluster_deploy/vars/*.yml): release and component images share
+one repository, e.g. ocp4/openshift4 (Quay) or ocp4-docker-local/openshift4 (JFrog).
+"""
+
+import io
+import json
+import re
+import tarfile
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .registry_client import RegistryClient, RegistryError
+
+IMAGE_REFERENCES_PATH = "release-manifests/image-references"
+DEFAULT_RELEASE_REPOSITORY = "ocp4/openshift4"
+DEFAULT_ARCH = "x86_64"
+DEFAULT_MAX_WORKERS = 256
+
+# OCI platform architecture -> release tag suffix
+_GO_ARCH = {"x86_64": "amd64", "aarch64": "arm64", "ppc64le": "ppc64le", "s390x": "s390x"}
+
+
+def resolve_release_tag(client: RegistryClient, repository: str,
+                        ocp_version: str, arch: str = DEFAULT_ARCH) -> str:
+    """
+    Return the release tag for ocp_version.
+
+    A full version (4.19.10) maps directly to 4.19.10-<arch>; a minor (4.19)
+    resolves to the highest patch release mirrored in the repository.
+    """
+    if ocp_version.count(".") >= 2:
+        return f"{ocp_version}-{arch}"
+
+    pattern = re.compile(rf"^{re.escape(ocp_version)}\.(\d+)-{re.escape(arch)}$")
+    patches = []
+    for tag in client.iter_tags(repository):
+        match = pattern.match(tag)
+        if match:
+            patches.append((int(match.group(1)), tag))
+    if not patches:
+        raise RegistryError(f"No {ocp_version}.z-{arch} release tag in {repository}", 404)
+    return max(patches)[1]
+
+
+def _platform_manifest(client: RegistryClient, repository: str, reference: str,
+                       arch: str) -> Dict[str, Any]:
+    """Fetch a manifest, descending into an image index for the requested arch."""
+    manifest = client.get_manifest(repository, reference)
+    if "manifests" not in manifest:
+        return manifest
+    wanted = _GO_ARCH.get(arch, arch)
+    for entry in manifest["manifests"]:
+        if entry.get("platform", {}).get("architecture") == wanted:
+            return client.get_manifest(repository, entry["digest"])
+    raise RegistryError(f"{repository}:{reference} has no {wanted} manifest", 404)
+
+
+def read_image_references(client: RegistryClient, repository: str, reference: str,
+                          arch: str = DEFAULT_ARCH) -> Dict[str, str]:
+    """
+    Extract image-references from a mirrored release image.
+
+    Layers are searched newest first: the release-manifests directory is
+    added in the final layer, so usually a single small blob is downloaded.
+
+    Returns:
+        Component name -> pull spec (e.g. quay.io/...@sha256:...)
+
+    Raises:
+        RegistryError: also for a truncated or corrupt layer, or an
+            image-references that is not a valid ImageStream
+    """
+    manifest = _platform_manifest(client, repository, reference, arch)
+    for layer in reversed(manifest.get("layers", [])):
+        blob = client.get_blob(repository, layer["digest"])
+        try:
+            with tarfile.open(fileobj=io.BytesIO(blob), mode="r:*") as tar:
+                for member in tar:
+                    if member.name.lstrip("./").endswith(IMAGE_REFERENCES_PATH):
+                        data = tar.extractfile(member).read()
+                        break
+                else:
+                    continue
+        except (tarfile.TarError, EOFError, OSError, zlib.error) as e:
+            raise RegistryError(f"Layer {layer['digest']} of {repository}:{reference} is unreadable: {e}") from e
+        try:
+            return parse_image_references(data)
+        except ValueError as e:
+            raise RegistryError(f"{IMAGE_REFERENCES_PATH} in {repository}:{reference}: {e}") from e
+    raise RegistryError(f"{IMAGE_REFERENCES_PATH} not found in {repository}:{reference}", 404)
+
+
+def parse_image_references(data: bytes) -> Dict[str, str]:
+    """
+    Parse an image-references ImageStream into component name -> pull spec.
+
+    Raises:
+        ValueError: if data is not JSON or not an ImageStream
+    """
+    try:
+        stream = json.loads(data)
+        return {
+            tag["name"]: tag["from"]["name"]
+            for tag in stream.get("spec", {}).get("tags", [])
+            if tag.get("from", {}).get("name")
+        }
+    except ValueError as e:
+        raise ValueError(f"not valid JSON ({e})") from e
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError(f"not an ImageStream (missing or malformed {e})") from e
+
+
+def verify_release_payload(
+    client: RegistryClient,
+    ocp_version: str,
+    release_repository: str = DEFAULT_RELEASE_REPOSITORY,
+    component_repository: Optional[str] = None,
+    arch: str = DEFAULT_ARCH,
+    image_references: Optional[Dict[str, str]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Verify every component digest of a release payload exists in the mirror.
+
+    Args:
+        client: RegistryClient for the mirror registry
+        ocp_version: Full version (4.19.10) or minor (4.19, latest mirrored patch)
+        release_repository: Repository holding the release image
+        component_repository: Repository holding component images
+            (defaults to release_repository)
+        arch: Release architecture
+        image_references: Pre-extracted image-references (skips reading the
+            release image, e.g. from `oc adm release extract`)
+        max_workers: Concurrent HEAD requests
+
+    Returns:
+        dict with release, component count, missing [(name, digest)] and timing
+    """
+    component_repository = component_repository or release_repository
+    release_tag = resolve_release_tag(client, release_repository, ocp_version, arch)
+
+    if image_references is None:
+        image_references = read_image_references(client, release_repository, release_tag, arch)
+
+    digests: List[Tuple[str, str]] = []
+    for name, pullspec in sorted(image_references.items()):
+        _, sep, digest = pullspec.partition("@")
+        if sep:
+            digests.append((name, digest))
+
+    started = time.monotonic()
+    missing = []
+    errors = []
+    for (name, digest), found, error in client.map_concurrent(
+            lambda ref: client.head_manifest(component_repository, ref[1]),
+            digests, max_workers=max_workers):
+        if error:
+            errors.append((name, digest, str(error)))
+        elif found is None:
+            missing.append((name, digest))
+
+    return {
+        "release": f"{release_repository}:{release_tag}",
+        "component_repository": component_repository,
+        "components": len(digests),
+        "missing": sorted(missing),
+        "errors": sorted(errors),
+        "duration_seconds": round(time.monotonic() - started, 2),
+    }
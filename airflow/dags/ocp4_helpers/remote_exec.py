@@ -0,0 +1,105 @@
+"""
+Remote Execution for ocp4-disconnected-helper
+Runs DAG task scripts on the host (ADR-0046: tasks SSH to root@localhost)
+over one multiplexed OpenSSH connection per worker instead of a fresh
+connection per task:
+- ControlMaster=auto / ControlPersist keep an authenticated master
+  connection alive between tasks; each task opens a channel on it, skipping
+  key exchange and authentication
+- Scripts run with `bash -s` rather than a login shell, so profile scripts
+  are not sourced on every task (login_shell=True restores that)
+- Output streams through BashOperator and the remote exit code is the task's
+- The Airflow dag/task/run ids are exported to the remote script, so helper
+  metrics events (helper_metrics.py) emitted on the host carry them
+
+    from ocp4_helpers.remote_exec import RemoteBashOperator
+
+    preflight_checks = RemoteBashOperator(
+        task_id='preflight_checks',
+        remote_script='ocp_task_scripts/ocp_registry_sync/preflight_checks.sh',
+        dag=dag,
+    )
+"""
+
+from typing import Dict, List, Optional
+
+from airflow.operators.bash import BashOperator
+
+SSH_TARGET = "root@localhost"
+CONTROL_DIR = "/tmp/ocp4-ssh"
+CONTROL_PERSIST = "10m"
+HEREDOC_DELIMITER = "REMOTE_SCRIPT"
+SCRIPT_EXTENSIONS = (".sh", ".bash")
+# Rendered by the operator; the same variables Airflow sets for local tasks
+CONTEXT_ENV = {
+    "AIRFLOW_CTX_DAG_ID": "{{ dag.dag_id }}",
+    "AIRFLOW_CTX_TASK_ID": "{{ task.task_id }}",
+    "AIRFLOW_CTX_DAG_RUN_ID": "{{ run_id }}",
+}
+
+
+def ssh_options(control_dir: str = CONTROL_DIR, persist: str = CONTROL_PERSIST) -> List[str]:
+    """OpenSSH options for a shared master connection (socket named by %C hash)."""
+    return [
+        "-o StrictHostKeyChecking=no",
+        "-o UserKnownHostsFile=/dev/null",
+        "-o LogLevel=ERROR",
+        "-o ControlMaster=auto",
+        f"-o ControlPath={control_dir}/%C",
+        f"-o ControlPersist={persist}",
+        "-o ServerAliveInterval=30",
+    ]
+
+
+def remote_command(script: str, ssh_target: str = SSH_TARGET, login_shell: bool = False,
+                   control_dir: str = CONTROL_DIR, persist: str = CONTROL_PERSIST,
+                   remote_env: Optional[Dict[str, str]] = None) -> str:
+    """
+    Wrap a script so it runs on ssh_target over the shared connection.
+
+    Args:
+        script: Bash script, or a .sh template path relative to the DAG
+            folder (may contain Jinja, rendered by the operator)
+        ssh_target: user@host
+        login_shell: Source login profiles before running the script
+        control_dir: Directory for the control socket
+        persist: How long an idle master connection is kept
+        remote_env: Extra variables exported before the script runs
+
+    Returns:
+        Bash command: ssh ... <target> bash -s << 'REMOTE_SCRIPT'
+    """
+    shell = "bash -l -s" if login_shell else "bash -s"
+    if script.endswith(SCRIPT_EXTENSIONS):
+        # Template file: read and rendered only when the task runs
+        script = f"{{% include '{script}' %}}"
+    exports = "".join(f"export {name}='{value}'\n" for name, value in {**CONTEXT_ENV, **(remote_env or {})}.items())
+    return (
+        f"mkdir -p -m 700 {control_dir}\n"
+        f"ssh {' '.join(ssh_options(control_dir, persist))} {ssh_target} {shell} << '{HEREDOC_DELIMITER}'\n"
+        f"{exports}"
+        f"{script.strip(chr(10))}\n"
+        f"{HEREDOC_DELIMITER}\n"
+    )
+
+
+class RemoteBashOperator(BashOperator):
+    """
+    BashOperator whose script runs on a remote host over a multiplexed SSH
+    connection shared by all tasks on the worker.
+
+    Args:
+        remote_script: Script to run remotely, or a .sh template file such as
+            'ocp_task_scripts/<dag>/<task>.sh' (templated)
+        ssh_target: user@host (default root@localhost)
+        login_shell: Run the script in a login shell
+        remote_env: Extra variables exported on the remote host, e.g.
+            {"OCP4_METRICS_JOURNAL_DIR": "/opt/images/.sync-metrics"}
+        **kwargs: Passed to BashOperator (task_id, dag, execution_timeout, ...)
+    """
+
+    def __init__(self, *, remote_script: str, ssh_target: str = SSH_TARGET,
+                 login_shell: bool = False, remote_env: Optional[Dict[str, str]] = None, **kwargs):
+        super().__init__(bash_command=remote_command(remote_script, ssh_target, login_shell,
+                                                     remote_env=remote_env), **kwargs)
+        self.ssh_target = ssh_target
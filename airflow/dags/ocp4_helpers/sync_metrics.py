@@ -0,0 +1,350 @@
+"""
+Sync Metrics and Trends for ocp4-disconnected-helper
+Turns one ocp_registry_sync run into a metrics record and compares it with
+the runs before it, so a slower mirror or an unexpectedly larger one shows up
+in the report of the run that caused it:
+- Helper events of the run are read back from its journal (helper_metrics.py
+  writes <journal dir>/<run_id>.jsonl on the host) and summed per phase:
+  wall time, bytes, MB/s, outcome
+- Task wall times and tries come from Airflow (rendered into sync_report)
+- Sizes come from the files the run left: the mirror plan (images, blobs,
+  image set vs. new bytes), the integrity manifest (blob bytes as stored vs.
+  unique) and the archives on disk
+- Every run is kept in a SQLite trend store (runs + one row per metric), and
+  each metric is compared with the median of the last N runs; throughput
+  drops, slowdowns, retries and growth beyond a threshold are flagged
+"""
+
+import json
+import os
+import sqlite3
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from .archive_integrity import MANIFEST_NAME
+from .helper_metrics import journal_path
+from .mirror_archives import find_chunks
+
+DEFAULT_JOURNAL_DIR = "/opt/images/.sync-metrics"
+DEFAULT_STORE = "/opt/images/.sync-metrics/trends.db"
+DEFAULT_LAST = 10
+SLOWDOWN = 0.20             # throughput or wall time 20% worse than the baseline
+GROWTH = 0.25               # mirror 25% larger than the baseline
+JOURNAL_KEEP_SECONDS = 30 * 24 * 3600   # run journals are summarised in the store; keep a month
+
+# Metric name -> (label, kind); kind decides which direction is a regression
+TREND_METRICS = {
+    "wall_seconds": ("Sync wall time", "time"),
+    "download_seconds": ("Download time", "time"),
+    "push_seconds": ("Push time", "time"),
+    "download_mb_s": ("Download MB/s", "rate"),
+    "push_mb_s": ("Push MB/s", "rate"),
+    "bytes_download": ("New content", "size"),
+    "bytes_archives": ("Archives", "size"),
+    "images": ("Images", "size"),
+    "blobs": ("Blobs", "size"),
+    "dedup_ratio": ("Dedup ratio", "info"),
+    "retries": ("Retries", "count"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    finished REAL NOT NULL,
+    source_version TEXT,
+    target_version TEXT,
+    mode TEXT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS runs_finished ON runs(finished);
+"""
+
+
+@dataclass
+class PhaseMetrics:
+    """Helper events of one phase, summed."""
+
+    seconds: float = 0.0
+    bytes: int = 0
+    images: int = 0
+    events: int = 0
+    failed: int = 0
+
+    @property
+    def mb_s(self) -> Optional[float]:
+        return round(self.bytes / 1e6 / self.seconds, 1) if self.bytes and self.seconds else None
+
+
+@dataclass
+class SyncRun:
+    """Metrics of one sync run."""
+
+    run_id: str
+    source_version: str = ""
+    target_version: str = ""
+    mode: str = ""
+    finished: float = field(default_factory=time.time)
+    tasks: Dict[str, Dict[str, Any]] = field(default_factory=dict)      # task -> {seconds, tries}
+    phases: Dict[str, PhaseMetrics] = field(default_factory=dict)
+    images: Optional[int] = None
+    blobs: Optional[int] = None
+    bytes_image_set: Optional[int] = None
+    bytes_download: Optional[int] = None
+    bytes_archives: Optional[int] = None
+    bytes_blobs_stored: Optional[int] = None
+    bytes_blobs_unique: Optional[int] = None
+    retries: int = 0
+
+    def _phase_seconds(self, task: str, phase: str) -> Optional[float]:
+        if phase in self.phases:
+            return round(self.phases[phase].seconds, 1)
+        seconds = self.tasks.get(task, {}).get("seconds")
+        return round(seconds, 1) if seconds is not None else None
+
+    def metrics(self) -> Dict[str, float]:
+        """Trend metrics of the run; metrics the run has no data for are left out."""
+        download, push = self.phases.get("mirror_download"), self.phases.get("mirror_push")
+        values = {
+            "wall_seconds": round(sum(t["seconds"] for t in self.tasks.values() if t.get("seconds")), 1)
+            if self.tasks else None,
+            "download_seconds": self._phase_seconds("download_images", "mirror_download"),
+            "push_seconds": self._phase_seconds("push_to_registry", "mirror_push"),
+            "download_mb_s": download.mb_s if download else None,
+            "push_mb_s": push.mb_s if push else None,
+            "bytes_download": self.bytes_download,
+            "bytes_archives": self.bytes_archives,
+            "images": self.images,
+            "blobs": self.blobs,
+            "dedup_ratio": round(self.bytes_blobs_stored / self.bytes_blobs_unique, 2)
+            if self.bytes_blobs_stored and self.bytes_blobs_unique else None,
+            "retries": self.retries,
+        }
+        return {name: float(value) for name, value in values.items() if value is not None}
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["phases"] = {name: {**asdict(p), "mb_s": p.mb_s} for name, p in self.phases.items()}
+        data["metrics"] = self.metrics()
+        return data
+
+
+# =============================================================================
+# Collection
+# =============================================================================
+
+def read_journal(path: str) -> List[Dict[str, Any]]:
+    """Events of a run journal; a torn last line (task killed mid-write) is skipped."""
+    events = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return events
+
+
+def prune_journals(journal_dir: str = DEFAULT_JOURNAL_DIR, keep_seconds: float = JOURNAL_KEEP_SECONDS) -> int:
+    """Remove run journals older than keep_seconds; returns how many."""
+    removed = 0
+    cutoff = time.time() - keep_seconds
+    try:
+        names = os.listdir(journal_dir)
+    except OSError:
+        return 0
+    for name in names:
+        path = os.path.join(journal_dir, name)
+        try:
+            if name.endswith(".jsonl") and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def _phases(events: Sequence[Dict[str, Any]]) -> Dict[str, PhaseMetrics]:
+    phases: Dict[str, PhaseMetrics] = {}
+    for event in events:
+        phase = phases.setdefault(event["phase"], PhaseMetrics())
+        phase.events += 1
+        phase.seconds += event.get("duration_seconds") or 0.0
+        phase.bytes += event.get("bytes") or 0
+        phase.images += event.get("images") or 0
+        if event.get("outcome") not in ("success", None):
+            phase.failed += 1
+    return phases
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def collect_run(
+    run_id: str,
+    mirror_path: str = "/opt/images",
+    journal_dir: str = DEFAULT_JOURNAL_DIR,
+    tasks: Optional[Dict[str, Dict[str, Any]]] = None,
+    source_version: str = "",
+    target_version: str = "",
+    mode: str = "",
+    downloaded: bool = True,
+) -> SyncRun:
+    """
+    Gather the metrics of a finished run.
+
+    Args:
+        run_id: Airflow run id (names the journal)
+        mirror_path: Directory holding the archives, plan and integrity manifest
+        journal_dir: Directory of run journals
+        tasks: {task_id: {"seconds": ..., "tries": ...}} from Airflow
+        source_version: Release pair, for the trend listing
+        target_version: Release pair, for the trend listing
+        mode: How the run moved content (oc-mirror, fan-out)
+        downloaded: The run downloaded (skip_download off); otherwise the
+            plan on disk belongs to an earlier run and is ignored
+
+    Returns:
+        SyncRun
+    """
+    events = read_journal(journal_path(journal_dir, run_id))
+    run = SyncRun(run_id, source_version, target_version, mode, tasks=dict(tasks or {}),
+                  phases=_phases(events))
+    run.retries = sum(int(e.get("retries") or 0) for e in events) + \
+        sum(max(0, int(t.get("tries") or 1) - 1) for t in run.tasks.values())
+
+    plan = _read_json(os.path.join(mirror_path, ".mirror-plan", "plan.json")) if downloaded else None
+    if plan:
+        run.images, run.blobs = plan.get("images"), plan.get("blobs")
+        run.bytes_image_set, run.bytes_download = plan.get("bytes_total"), plan.get("bytes_download")
+    if "mirror_download" in run.phases:
+        run.bytes_download = run.phases["mirror_download"].bytes
+
+    chunks = find_chunks(mirror_path, packed=True)
+    if chunks:
+        run.bytes_archives = sum(os.path.getsize(c.path) for c in chunks)
+    manifest = _read_json(os.path.join(mirror_path, MANIFEST_NAME))
+    if manifest:
+        blobs = [b for a in manifest.get("archives", []) for b in a.get("blobs", [])]
+        run.bytes_blobs_stored = sum(b["size"] for b in blobs)
+        run.bytes_blobs_unique = sum({b["digest"]: b["size"] for b in blobs}.values())
+    return run
+
+
+# =============================================================================
+# Trend store
+# =============================================================================
+
+class TrendStore:
+    """
+    SQLite history of sync runs.
+
+    Usage:
+        with TrendStore() as store:
+            history = store.recent(10, exclude=run.run_id)
+            store.record(run)
+
+    Query it directly, e.g.:
+        sqlite3 trends.db "SELECT r.run_id, m.value FROM metrics m JOIN runs r USING (run_id)
+                           WHERE m.name = 'push_mb_s' ORDER BY r.finished"
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "TrendStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.db.close()
+
+    def record(self, run: SyncRun) -> None:
+        """Store a run, replacing an earlier record of the same run (a re-run report)."""
+        with self.db:
+            self.db.execute("DELETE FROM runs WHERE run_id = ?", (run.run_id,))
+            self.db.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                            (run.run_id, run.finished, run.source_version, run.target_version, run.mode,
+                             json.dumps(run.as_dict(), default=str)))
+            self.db.executemany("INSERT INTO metrics VALUES (?, ?, ?)",
+                                [(run.run_id, name, value) for name, value in run.metrics().items()])
+
+    def recent(self, last: int = DEFAULT_LAST, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The last runs, newest first: {"run_id", "finished", "source_version", "target_version", "metrics"}."""
+        rows = self.db.execute(
+            "SELECT run_id, finished, source_version, target_version FROM runs "
+            "WHERE run_id != ? ORDER BY finished DESC LIMIT ?", (exclude or "", last)).fetchall()
+        runs = []
+        for run_id, finished, source, target in rows:
+            metrics = dict(self.db.execute("SELECT name, value FROM metrics WHERE run_id = ?", (run_id,)))
+            runs.append({"run_id": run_id, "finished": finished, "source_version": source,
+                         "target_version": target, "metrics": metrics})
+        return runs
+
+
+# =============================================================================
+# Comparison
+# =============================================================================
+
+@dataclass
+class Comparison:
+    name: str
+    label: str
+    current: float
+    baseline: Optional[float]
+    runs: int
+    regression: bool = False
+
+    @property
+    def change(self) -> Optional[float]:
+        return (self.current - self.baseline) / self.baseline if self.baseline else None
+
+
+def compare(current: Dict[str, float], history: Sequence[Dict[str, Any]]) -> List[Comparison]:
+    """Each metric of the run against the median of the same metric over history."""
+    rows = []
+    for name, (label, kind) in TREND_METRICS.items():
+        if name not in current:
+            continue
+        past = [run["metrics"][name] for run in history if name in run["metrics"]]
+        row = Comparison(name, label, current[name], statistics.median(past) if past else None, len(past))
+        if row.baseline is None:
+            pass
+        elif kind == "count":
+            row.regression = row.current > 0 and row.current > row.baseline * (1 + GROWTH)
+        elif row.change is not None:
+            row.regression = (kind == "rate" and row.change < -SLOWDOWN) or \
+                             (kind == "time" and row.change > SLOWDOWN) or \
+                             (kind == "size" and row.change > GROWTH)
+        rows.append(row)
+    return rows
+
+
+def format_value(name: str, value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if name.startswith("bytes_"):
+        return f"{value / 1024 ** 3:.1f} GiB"
+    if name.endswith("_seconds"):
+        minutes, seconds = divmod(int(value), 60)
+        return f"{minutes}m{seconds:02d}s" if minutes else f"{value:.0f}s"
+    if name == "dedup_ratio":
+        return f"{value:.2f}x"
+    return f"{value:.1f}" if name.endswith("_mb_s") else f"{value:.0f}"
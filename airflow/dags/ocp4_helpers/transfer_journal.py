@@ -0,0 +1,311 @@
+"""
+Transfer Journal for ocp4-disconnected-helper
+Lets a failed or retried download_images resume from verified content
+instead of wiping the oc-mirror workspace and starting over:
+- Blob and manifest files in the workspace (oc-mirror-workspace/src/v2,
+  working-*) are hashed once and recorded with their size and mtime in an
+  append-only journal (/opt/images/.transfer-journal.jsonl)
+- The journal is fsync'd every few hundred records or seconds, and a torn
+  last line from a crash is ignored on load
+- While oc-mirror runs, checkpoints only record finished files; after a
+  failure they also prune partial and corrupt files, so what is left on disk
+  is exactly the verified set the next run picks up
+- Journaled files whose size and mtime are unchanged are not hashed again,
+  so a resume checkpoint only reads what was written since the last one
+
+The journal belongs to one release pair (run key); a different pair starts
+a fresh journal.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .blob_store import blob_digest
+
+DEFAULT_JOURNAL = "/opt/images/.transfer-journal.jsonl"
+DEFAULT_SYNC_EVERY = 256            # records between fsyncs
+DEFAULT_SYNC_INTERVAL = 30.0        # seconds between fsyncs
+DEFAULT_SETTLE_SECONDS = 60.0       # files modified more recently may still be written
+READ_SIZE = 1024 * 1024
+WORKING_DIR_RE = re.compile(r"^working-")
+_MANIFEST_PATH_RE = re.compile(r"/manifests/(?P<digest>sha256:[0-9a-f]{64})$")
+
+
+@dataclass
+class JournalEntry:
+    """One verified file."""
+
+    kind: str                       # "blob" or "manifest"
+    digest: str
+    path: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class CheckpointResult:
+    """What a checkpoint verified, trusted from the journal, and pruned."""
+
+    run_key: str
+    verified: int = 0
+    journaled: int = 0
+    unsettled: int = 0
+    corrupt: int = 0
+    pruned: int = 0
+    bytes_verified: int = 0
+    bytes_kept: int = 0
+    bytes_pruned: int = 0
+    resumed: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class TransferJournal:
+    """
+    Append-only journal of verified transfer content.
+
+    Usage:
+        with TransferJournal("/opt/images/.transfer-journal.jsonl", run_key="4.19-4.20") as journal:
+            journal.record(JournalEntry("blob", digest, path, size, mtime_ns))
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL, run_key: str = "",
+                 sync_every: int = DEFAULT_SYNC_EVERY, sync_interval: float = DEFAULT_SYNC_INTERVAL):
+        self.path = path
+        self.run_key = run_key
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.entries: Dict[str, JournalEntry] = {}
+        self.resumed = False
+        self._load()
+        self._file = open(path, "a")
+        if not self.resumed:
+            self._write({"kind": "run", "run_key": run_key, "started": time.time()})
+            self.checkpoint()
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue                                # torn write from a crash
+        if not records or records[0].get("kind") != "run" or records[0].get("run_key") != self.run_key:
+            os.remove(self.path)                        # another release pair: start over
+            return
+        self.resumed = True
+        for record in records[1:]:
+            if record.get("kind") in ("blob", "manifest"):
+                entry = JournalEntry(**record)
+                self.entries[entry.path] = entry
+            elif record.get("kind") == "forget":
+                self.entries.pop(record["path"], None)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def lookup(self, path: str, st: os.stat_result) -> Optional[JournalEntry]:
+        """The journal entry for path if the file is unchanged since it was verified."""
+        entry = self.entries.get(path)
+        if entry and entry.size == st.st_size and entry.mtime_ns == st.st_mtime_ns:
+            return entry
+        return None
+
+    def record(self, entry: JournalEntry) -> None:
+        self.entries[entry.path] = entry
+        self._write(asdict(entry))
+        self._maybe_sync()
+
+    def forget(self, path: str) -> None:
+        if self.entries.pop(path, None):
+            self._write({"kind": "forget", "path": path})
+            self._maybe_sync()
+
+    def _maybe_sync(self) -> None:
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or time.monotonic() - self._synced_at >= self.sync_interval:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Flush and fsync everything recorded so far."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def compact(self) -> None:
+        """Rewrite the journal with only live entries (atomic, fsync'd)."""
+        self.checkpoint()
+        self._file.close()
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            records = [{"kind": "run", "run_key": self.run_key, "started": time.time()}]
+            records += [asdict(entry) for entry in self.entries.values()]
+            f.writelines(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._file = open(self.path, "a")
+
+    def digests(self) -> Set[str]:
+        return {entry.digest for entry in self.entries.values()}
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.checkpoint()
+            self._file.close()
+
+    def __enter__(self) -> "TransferJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _classify(path: str) -> Optional[Tuple[str, str]]:
+    digest = blob_digest(path)
+    if digest:
+        return "blob", digest
+    match = _MANIFEST_PATH_RE.search(path)
+    if match:
+        return "manifest", match.group("digest")
+    return None
+
+
+def _sha256(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_SIZE), b""):
+            sha.update(chunk)
+    return f"sha256:{sha.hexdigest()}"
+
+
+def _in_working_dir(workspace: str, path: str) -> bool:
+    parts = os.path.relpath(path, workspace).split(os.sep)
+    return any(WORKING_DIR_RE.match(part) for part in parts[:-1])
+
+
+def _remove(path: str, st: os.stat_result, result: CheckpointResult) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        return
+    result.pruned += 1
+    result.bytes_pruned += st.st_size
+
+
+def checkpoint_workspace(
+    workspace: str,
+    journal_path: str = DEFAULT_JOURNAL,
+    run_key: str = "",
+    prune: bool = False,
+    settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+) -> CheckpointResult:
+    """
+    Verify workspace content against its digests and journal the result.
+
+    Args:
+        workspace: oc-mirror workspace (/opt/images/oc-mirror-workspace)
+        journal_path: Journal file
+        run_key: Release pair the journal belongs to
+        prune: The download is not running: remove corrupt blob/manifest
+            files, and everything in working-* directories that is not
+            verified content (partial layers, temp files)
+        settle_seconds: Without prune, skip files modified this recently
+
+    Returns:
+        CheckpointResult
+    """
+    workspace = os.path.abspath(workspace)
+    now = time.time()
+    with TransferJournal(journal_path, run_key=run_key) as journal:
+        result = CheckpointResult(run_key=run_key, resumed=journal.resumed)
+        seen: Set[str] = set()
+        for dirpath, _, filenames in os.walk(workspace):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.lstat(path)
+                except OSError:
+                    continue
+                kind = _classify(path)
+                if kind is None or os.path.islink(path):
+                    if prune and kind is None and not os.path.islink(path) and _in_working_dir(workspace, path):
+                        _remove(path, st, result)
+                    continue
+                seen.add(path)
+                if journal.lookup(path, st):
+                    result.journaled += 1
+                    result.bytes_kept += st.st_size
+                    continue
+                if not prune and now - st.st_mtime < settle_seconds:
+                    result.unsettled += 1
+                    continue
+                if _sha256(path) == kind[1]:
+                    journal.record(JournalEntry(kind[0], kind[1], path, st.st_size, st.st_mtime_ns))
+                    result.verified += 1
+                    result.bytes_verified += st.st_size
+                    result.bytes_kept += st.st_size
+                    continue
+                result.corrupt += 1
+                journal.forget(path)
+                if prune:
+                    _remove(path, st, result)
+
+        for path in list(journal.entries):
+            if path not in seen:
+                journal.forget(path)                    # removed or cleaned up since
+        if prune:
+            for dirpath, _, _ in os.walk(workspace, topdown=False):
+                if _in_working_dir(workspace, os.path.join(dirpath, "-")) and not os.listdir(dirpath):
+                    os.rmdir(dirpath)
+            journal.compact()
+    return result
+
+
+def read_journal_digests(journal_path: str = DEFAULT_JOURNAL, run_key: Optional[str] = None) -> Set[str]:
+    """
+    Digests a journal has verified, read without opening it for writing.
+
+    Empty if the journal is missing or belongs to another run key.
+    """
+    try:
+        with open(journal_path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return set()
+    entries: Dict[str, str] = {}
+    for number, line in enumerate(lines):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if number == 0 and (record.get("kind") != "run" or (run_key is not None and record.get("run_key") != run_key)):
+            return set()
+        if record.get("kind") in ("blob", "manifest"):
+            entries[record["path"]] = record["digest"]
+        elif record.get("kind") == "forget":
+            entries.pop(record["path"], None)
+    return set(entries.values())
+
+
+def reset_journal(journal_path: str = DEFAULT_JOURNAL) -> bool:
+    """Remove the journal after a successful download."""
+    try:
+        os.remove(journal_path)
+        return True
+    except FileNotFoundError:
+        return False
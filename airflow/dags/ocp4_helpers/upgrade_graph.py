@@ -0,0 +1,276 @@
+"""
+Cached Upgrade Graph Client for ocp4-disconnected-helper
+Reads the OpenShift update graph (Cincinnati, api.openshift.com) for version
+resolution and mirror planning without asking upstream every run:
+- Each channel/architecture graph is cached on disk under
+  /opt/images/.graph-cache and served from there while younger than max_age
+- Older entries are revalidated with If-None-Match / If-Modified-Since, so an
+  unchanged graph costs a 304 instead of the whole document
+- Requests have a timeout and retry transient failures with backoff; when
+  upstream stays slow or unreachable the cached graph is used, marked stale
+- Several channels (source and target minor) are fetched concurrently
+- The cache exports to a single JSON snapshot that travels with the archives
+  and is imported on the disconnected side, which then resolves offline
+"""
+
+import json
+import os
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+GRAPH_URL = "https://api.openshift.com/api/upgrades_info/v1/graph"
+DEFAULT_CACHE_DIR = "/opt/images/.graph-cache"
+DEFAULT_ARCH = "amd64"
+DEFAULT_MAX_AGE_SECONDS = 3600
+DEFAULT_TIMEOUT = 15
+DEFAULT_RETRIES = 2
+DEFAULT_MAX_WORKERS = 4
+RETRY_BACKOFF_SECONDS = 2.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+SNAPSHOT_VERSION = 1
+
+
+class GraphError(Exception):
+    """Raised when a channel graph is neither reachable nor cached."""
+
+
+def version_key(version: str) -> Tuple:
+    """Sort key for release versions: 4.20.10 after 4.20.9, 4.20.0 after 4.20.0-rc.1."""
+    release, _, pre = version.partition("-")
+    return tuple(int(p) for p in release.split(".") if p.isdigit()), pre == "", pre
+
+
+def channel_for(version: str, prefix: str = "stable") -> str:
+    """4.20 or 4.20.6 -> stable-4.20."""
+    return f"{prefix}-{'.'.join(version.split('.')[:2])}"
+
+
+@dataclass
+class ChannelGraph:
+    """One channel's update graph and where it came from."""
+
+    channel: str
+    arch: str
+    graph: Dict[str, Any]
+    fetched: float = 0.0                    # last downloaded or revalidated
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    source: str = "network"                 # network, revalidated, cache, stale, snapshot
+    error: Optional[str] = None             # why a stale copy was used
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.fetched)
+
+    def versions(self) -> List[str]:
+        return sorted((n["version"] for n in self.graph.get("nodes", [])), key=version_key)
+
+    def latest(self, minor: Optional[str] = None) -> Optional[str]:
+        """Newest release, or newest of a minor (4.20 -> 4.20.z)."""
+        versions = [v for v in self.versions()
+                    if minor is None or v.split("-")[0].split(".")[:2] == minor.split(".")[:2]]
+        return versions[-1] if versions else None
+
+    def as_entry(self) -> Dict[str, Any]:
+        return {"channel": self.channel, "arch": self.arch, "fetched": self.fetched,
+                "etag": self.etag, "last_modified": self.last_modified, "graph": self.graph}
+
+
+@dataclass
+class SnapshotResult:
+    graphs: int = 0
+    skipped: int = 0                        # cache already had a newer copy
+    channels: List[str] = field(default_factory=list)
+
+
+class GraphClient:
+    """
+    Update graph per channel, from the on-disk cache when it is fresh enough.
+
+    Usage:
+        client = GraphClient()
+        graphs = client.get_many(["stable-4.19", "stable-4.20"])
+        graphs["stable-4.20"].latest("4.20")          # '4.20.6'
+        client.export_snapshot("/opt/images/upgrade-graph.json")
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        graph_url: str = GRAPH_URL,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        offline: bool = False,
+    ):
+        self.cache_dir = cache_dir
+        self.graph_url = graph_url
+        self.max_age_seconds = max_age_seconds
+        self.timeout = timeout
+        self.retries = retries
+        self.offline = offline
+
+    # -------------------------------------------------------------------------
+    # Cache
+    # -------------------------------------------------------------------------
+
+    def _cache_path(self, channel: str, arch: str) -> str:
+        return os.path.join(self.cache_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{channel}_{arch}") + ".json")
+
+    def cached(self, channel: str, arch: str = DEFAULT_ARCH) -> Optional[ChannelGraph]:
+        try:
+            with open(self._cache_path(channel, arch)) as f:
+                entry = json.load(f)
+            return ChannelGraph(entry["channel"], entry["arch"], entry["graph"], entry.get("fetched", 0.0),
+                                entry.get("etag"), entry.get("last_modified"), source="cache")
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store(self, graph: ChannelGraph) -> None:
+        """Write a cache entry; a read-only cache only costs the next run a download."""
+        path = self._cache_path(graph.channel, graph.arch)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(graph.as_entry(), f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def cached_channels(self) -> List[ChannelGraph]:
+        try:
+            names = sorted(os.listdir(self.cache_dir))
+        except OSError:
+            return []
+        graphs = []
+        for name in names:
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.cache_dir, name)) as f:
+                        entry = json.load(f)
+                    graphs.append(self.cached(entry["channel"], entry["arch"]))
+                except (OSError, ValueError, KeyError):
+                    continue
+        return [g for g in graphs if g]
+
+    # -------------------------------------------------------------------------
+    # Fetching
+    # -------------------------------------------------------------------------
+
+    def _request(self, channel: str, arch: str, cached: Optional[ChannelGraph]) -> ChannelGraph:
+        """GET the graph, conditional on the cached copy; retries transient failures."""
+        url = f"{self.graph_url}?{urllib.parse.urlencode({'channel': channel, 'arch': arch})}"
+        headers = {"Accept": "application/json"}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        attempt = 0
+        while True:
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers),
+                                            timeout=self.timeout) as resp:
+                    graph = json.load(resp)
+                    return ChannelGraph(channel, arch, graph, time.time(), resp.headers.get("ETag"),
+                                        resp.headers.get("Last-Modified"), source="network")
+            except urllib.error.HTTPError as e:
+                if e.code == 304 and cached:
+                    return ChannelGraph(channel, arch, cached.graph, time.time(),
+                                        e.headers.get("ETag") or cached.etag,
+                                        e.headers.get("Last-Modified") or cached.last_modified,
+                                        source="revalidated")
+                if e.code not in RETRY_STATUSES or attempt >= self.retries:
+                    raise GraphError(f"{url}: HTTP {e.code}") from e
+            except (OSError, ValueError) as e:         # URLError, timeouts, truncated JSON
+                if attempt >= self.retries:
+                    raise GraphError(f"{url}: {e}") from e
+            attempt += 1
+            time.sleep(RETRY_BACKOFF_SECONDS * attempt)
+
+    def get(self, channel: str, arch: str = DEFAULT_ARCH) -> ChannelGraph:
+        """
+        A channel's graph: cached if fresh, else revalidated or downloaded.
+
+        Raises:
+            GraphError: if upstream is unreachable and nothing is cached
+        """
+        cached = self.cached(channel, arch)
+        if self.offline:
+            if cached is None:
+                raise GraphError(f"{channel}/{arch} is not cached in {self.cache_dir} (offline; import a snapshot)")
+            return cached
+        if cached and cached.age_seconds < self.max_age_seconds:
+            return cached
+        try:
+            graph = self._request(channel, arch, cached)
+        except GraphError as e:
+            if cached is None:
+                raise
+            cached.source = "stale"
+            cached.error = str(e)
+            return cached
+        self._store(graph)
+        return graph
+
+    def get_many(self, channels: Sequence[str], arch: str = DEFAULT_ARCH,
+                 max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, ChannelGraph]:
+        """Several channels concurrently; raises GraphError for the first that is unavailable."""
+        unique = list(dict.fromkeys(channels))
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as pool:
+            return dict(zip(unique, pool.map(lambda c: self.get(c, arch), unique)))
+
+    def fetch(self, url: str) -> Dict[str, Any]:
+        """Graph JSON for a graph URL (?channel=...&arch=...), through the cache."""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        if "channel" not in query:
+            raise GraphError(f"{url}: no channel")
+        return self.get(query["channel"][0], query.get("arch", [DEFAULT_ARCH])[0]).graph
+
+    # -------------------------------------------------------------------------
+    # Snapshots
+    # -------------------------------------------------------------------------
+
+    def export_snapshot(self, path: str, channels: Optional[Iterable[str]] = None) -> SnapshotResult:
+        """Write cached graphs (all, or the given channels) to one portable JSON file."""
+        wanted = set(channels) if channels else None
+        graphs = [g for g in self.cached_channels() if wanted is None or g.channel in wanted]
+        snapshot = {"version": SNAPSHOT_VERSION, "created": time.time(), "graph_url": self.graph_url,
+                    "graphs": [g.as_entry() for g in graphs]}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, path)
+        return SnapshotResult(graphs=len(graphs), channels=[f"{g.channel}/{g.arch}" for g in graphs])
+
+    def import_snapshot(self, path: str) -> SnapshotResult:
+        """
+        Load a snapshot into the cache, keeping cached graphs that are newer.
+
+        Raises:
+            GraphError: if the snapshot cannot be read
+        """
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+            entries = snapshot["graphs"]
+        except (OSError, ValueError, KeyError) as e:
+            raise GraphError(f"Cannot read snapshot {path}: {e}") from e
+        result = SnapshotResult()
+        for entry in entries:
+            current = self.cached(entry["channel"], entry["arch"])
+            if current and current.fetched >= entry.get("fetched", 0.0):
+                result.skipped += 1
+                continue
+            self._store(ChannelGraph(entry["channel"], entry["arch"], entry["graph"], entry.get("fetched", 0.0),
+                                     entry.get("etag"), entry.get("last_modified"), source="snapshot"))
+            result.graphs += 1
+            result.channels.append(f"{entry['channel']}/{entry['arch']}")
+        return result
@@ -0,0 +1,183 @@
+"""
+Upgrade Path Solver for ocp4-disconnected-helper
+Works out which release payloads an upgrade actually goes through, so a
+mirror carries those and nothing else:
+- The update graphs of every channel between the cluster's minor and the
+  target minor (stable-4.19, stable-4.20, ...) are read from the graph cache
+  (upgrade_graph.py) and merged into one graph
+- Unconditional edges are always usable. Conditional edges (known risks such
+  as a PromQL-matched cluster condition) are only used when every one of
+  their risks is accepted, as with `oc adm upgrade --allow-not-recommended`
+- Releases or edges can be blocked locally (a release held back by policy)
+- A breadth-first search from the exact current version finds the fewest
+  hops; among equally short paths the newest intermediate releases win
+- Each release on the path after the one the cluster already runs becomes
+  its own openshift_releases entry with minVersion = maxVersion, so oc-mirror
+  cannot widen it into a range
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from .upgrade_graph import ChannelGraph, channel_for, version_key
+
+
+class PathError(Exception):
+    """Raised when there is no usable upgrade path."""
+
+
+def minors_between(source: str, target: str) -> List[str]:
+    """4.18.3, 4.20 -> ["4.18", "4.19", "4.20"]."""
+    major, low = (int(p) for p in source.split(".")[:2])
+    target_major, high = (int(p) for p in target.split(".")[:2])
+    if target_major != major or high < low:
+        raise PathError(f"{target} is not an upgrade from {source}")
+    return [f"{major}.{minor}" for minor in range(low, high + 1)]
+
+
+def _minor(version: str) -> str:
+    return ".".join(version.split("-")[0].split(".")[:2])
+
+
+@dataclass
+class UpgradeGraph:
+    """Releases and update edges merged from one or more channel graphs."""
+
+    payloads: Dict[str, str] = field(default_factory=dict)
+    edges: Dict[str, Set[str]] = field(default_factory=dict)
+    conditional: Dict[str, Dict[str, Set[str]]] = field(default_factory=dict)   # from -> to -> risk names
+
+    def add(self, graph: Dict[str, Any]) -> None:
+        """Merge a Cincinnati graph document (nodes, edges, conditionalEdges)."""
+        nodes = graph.get("nodes", [])
+        for node in nodes:
+            self.payloads[node["version"]] = node.get("payload", "")
+            self.edges.setdefault(node["version"], set())
+        for src, dst in graph.get("edges", []):
+            self.edges[nodes[src]["version"]].add(nodes[dst]["version"])
+        for conditional in graph.get("conditionalEdges") or []:
+            names = {r.get("name", "unnamed") for r in conditional.get("risks") or []}
+            for edge in conditional.get("edges", []):
+                self.conditional.setdefault(edge["from"], {}).setdefault(edge["to"], set()).update(names)
+
+    @classmethod
+    def from_channels(cls, graphs: Iterable[ChannelGraph]) -> "UpgradeGraph":
+        merged = cls()
+        for graph in graphs:
+            merged.add(graph.graph)
+        return merged
+
+    def successors(self, version: str, accept_risks: Set[str]) -> Set[str]:
+        """Releases reachable in one update; conditional edges only with all their risks accepted."""
+        usable = set(self.edges.get(version, ()))
+        for dst, names in self.conditional.get(version, {}).items():
+            if "*" in accept_risks or names <= accept_risks:
+                usable.add(dst)
+        return usable
+
+
+@dataclass
+class UpgradePath:
+    """Releases an upgrade goes through, source and target included."""
+
+    source: str
+    target: str
+    releases: List[str]
+    risks_accepted: Dict[str, List[str]] = field(default_factory=dict)     # "a -> b" -> risk names
+    payloads: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def hops(self) -> int:
+        return len(self.releases) - 1
+
+    @property
+    def to_mirror(self) -> List[str]:
+        """Releases the cluster still has to pull (all but the one it runs)."""
+        return self.releases[1:] or self.releases
+
+    def openshift_releases(self, channel_prefix: str = "stable") -> List[Dict[str, Any]]:
+        """download-to-tar-vars.yml entries, one exact release each."""
+        return [{"name": channel_for(v, channel_prefix), "minVersion": v, "maxVersion": v, "type": "ocp"}
+                for v in self.to_mirror]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"source": self.source, "target": self.target, "releases": self.releases, "hops": self.hops,
+                "to_mirror": self.to_mirror, "risks_accepted": self.risks_accepted,
+                "openshift_releases": self.openshift_releases()}
+
+
+def _blocked(blocked: Iterable[str]) -> Tuple[Set[str], Set[Tuple[str, str]]]:
+    """Split "4.19.5" (a release) and "4.19.5->4.20.1" (an edge) entries."""
+    versions, edges = set(), set()
+    for item in blocked:
+        src, arrow, dst = item.partition("->")
+        if arrow:
+            edges.add((src.strip(), dst.strip()))
+        elif item.strip():
+            versions.add(item.strip())
+    return versions, edges
+
+
+def solve(
+    graph: UpgradeGraph,
+    source: str,
+    target: str,
+    accept_risks: Iterable[str] = (),
+    blocked: Iterable[str] = (),
+) -> UpgradePath:
+    """
+    Fewest-hop upgrade path from an exact release to a target.
+
+    Args:
+        graph: Merged update graph of the channels involved
+        source: Exact current release, e.g. 4.19.12
+        target: Exact release (4.20.6), or a minor (4.20) for its newest reachable release
+        accept_risks: Conditional-edge risk names to accept ("*" accepts all)
+        blocked: Releases ("4.20.3") and edges ("4.19.12->4.20.3") not to use
+
+    Raises:
+        PathError: if source is unknown or no usable path reaches the target
+    """
+    accepted = set(accept_risks)
+    blocked_versions, blocked_edges = _blocked(blocked)
+    if source not in graph.payloads:
+        minors = ", ".join(sorted({_minor(v) for v in graph.payloads}, key=version_key))
+        raise PathError(f"{source} is not in the update graph (releases of {minors})")
+
+    # Breadth-first distances and predecessors over usable edges
+    distance = {source: 0}
+    parents: Dict[str, Set[str]] = {source: set()}
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        for nxt in graph.successors(current, accepted):
+            if nxt in blocked_versions or (current, nxt) in blocked_edges:
+                continue
+            if nxt not in distance:
+                distance[nxt] = distance[current] + 1
+                parents[nxt] = {current}
+                queue.append(nxt)
+            elif distance[nxt] == distance[current] + 1:
+                parents[nxt].add(current)
+
+    if target.count(".") >= 2:
+        if target not in distance:
+            reason = "not in the update graph" if target not in graph.payloads else "not reachable"
+            raise PathError(f"{target} is {reason} from {source}"
+                            + ("" if accepted else " without accepting conditional-update risks"))
+        end = target
+    else:
+        candidates = [v for v in distance if _minor(v) == target and "-" not in v]
+        if not candidates:
+            raise PathError(f"No {target} release is reachable from {source}"
+                            + ("" if accepted else " without accepting conditional-update risks"))
+        end = max(candidates, key=version_key)
+
+    releases = [end]
+    while releases[-1] != source:
+        releases.append(max(parents[releases[-1]], key=version_key))     # newest of the equally short
+    releases.reverse()
+    taken = {f"{a} -> {b}": sorted(graph.conditional[a][b]) for a, b in zip(releases, releases[1:])
+             if b not in graph.edges.get(a, ())}
+    return UpgradePath(source, end, releases, taken, {v: graph.payloads[v] for v in releases})
@@ -0,0 +1,191 @@
+"""
+Version Matrix for ocp4-disconnected-helper
+Precomputed answers to the version questions syncs and upgrades keep asking,
+built periodically from the cached update graphs (upgrade_graph.py) instead
+of querying api.openshift.com on every run:
+- For every supported minor (4.17-4.20): its channel and latest GA patch
+- For every release in those channels: its payload digest and the releases
+  it is a recommended (unconditional) update to; conditional updates are
+  kept with their risk names
+- Stored as one compact JSON file, /opt/images/version-matrix.json, with
+  releases in version order and edges and payloads indexed by position;
+  loading builds a version -> index map, so each lookup is a dict access
+- The ocp_version_matrix DAG rebuilds it every few hours; resolve_versions
+  and preflight_checks read it and fall back to the update graph only when
+  it is missing or too old; check-cluster-upgrade-prerequisites.yml uses it
+  to fail early, then still asks the cluster
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from .upgrade_graph import DEFAULT_ARCH, GraphClient, channel_for, version_key
+from .upgrade_path import UpgradeGraph
+
+DEFAULT_MATRIX_PATH = "/opt/images/version-matrix.json"
+SUPPORTED_MINORS = ("4.17", "4.18", "4.19", "4.20")     # the ocp_registry_sync version enums
+DEFAULT_MAX_AGE_HOURS = 24
+MATRIX_VERSION = 1
+
+
+class MatrixError(Exception):
+    """Raised when the matrix is missing, unreadable or cannot answer."""
+
+
+def _minor(version: str) -> str:
+    return ".".join(version.split("-")[0].split(".")[:2])
+
+
+def _digest(payload: str) -> str:
+    """quay.io/openshift-release-dev/ocp-release@sha256:ab.. -> sha256:ab.."""
+    return payload.rpartition("@")[2] if "@" in payload else payload
+
+
+@dataclass
+class VersionMatrix:
+    """
+    Latest patch, recommended updates and payload digest per release.
+
+    Usage:
+        matrix = VersionMatrix.load()
+        matrix.latest("4.20")                       # '4.20.6'
+        matrix.payload("4.20.6")                    # 'sha256:...'
+        matrix.recommended("4.19.12")               # ['4.19.15', '4.19.20']
+    """
+
+    releases: List[str]
+    payloads: List[str]
+    edges: List[List[int]]                              # index -> recommended successor indices
+    minors: Dict[str, Dict[str, Any]]                   # minor -> channel, latest
+    conditional: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)   # from -> to -> risks
+    arch: str = DEFAULT_ARCH
+    built: float = 0.0
+    graphs: Dict[str, float] = field(default_factory=dict)     # channel -> graph fetched
+    index: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.index:
+            self.index = {v: i for i, v in enumerate(self.releases)}
+
+    # -------------------------------------------------------------------------
+    # Building and storage
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, client: GraphClient, minors: Sequence[str] = SUPPORTED_MINORS,
+              arch: str = DEFAULT_ARCH) -> "VersionMatrix":
+        """
+        Matrix of the given minors from their channel graphs.
+
+        Raises:
+            GraphError: if a channel is neither reachable nor cached
+        """
+        channels = {channel_for(m): m for m in minors}
+        fetched = client.get_many(list(channels), arch)
+        graph = UpgradeGraph.from_channels(fetched.values())
+        releases = sorted(graph.payloads, key=version_key)
+        index = {v: i for i, v in enumerate(releases)}
+        latest: Dict[str, str] = {}
+        for version in releases:                            # ascending: the last one wins
+            if "-" not in version:
+                latest[_minor(version)] = version
+        return cls(
+            releases=releases,
+            payloads=[_digest(graph.payloads[v]) for v in releases],
+            edges=[sorted(index[d] for d in graph.edges.get(v, ())) for v in releases],
+            minors={m: {"channel": c, "latest": latest.get(m)} for c, m in channels.items()},
+            conditional={src: {dst: sorted(risks) for dst, risks in dsts.items()}
+                         for src, dsts in graph.conditional.items() if src in index},
+            arch=arch,
+            built=time.time(),
+            graphs={c: g.fetched for c, g in fetched.items()},
+            index=index,
+        )
+
+    def save(self, path: str = DEFAULT_MATRIX_PATH) -> int:
+        """Write the matrix atomically; returns its size in bytes."""
+        document = {"version": MATRIX_VERSION, "built": self.built, "arch": self.arch, "graphs": self.graphs,
+                    "minors": self.minors, "releases": self.releases, "payloads": self.payloads,
+                    "edges": self.edges, "conditional": self.conditional}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(document, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        return os.path.getsize(path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MATRIX_PATH, max_age_hours: Optional[float] = None) -> "VersionMatrix":
+        """
+        Read a matrix, optionally refusing one older than max_age_hours.
+
+        Raises:
+            MatrixError: if it is missing, unreadable or too old
+        """
+        try:
+            with open(path) as f:
+                document = json.load(f)
+            if document.get("version") != MATRIX_VERSION:
+                raise ValueError(f"format {document.get('version')}, expected {MATRIX_VERSION}")
+            matrix = cls(document["releases"], document["payloads"], document["edges"], document["minors"],
+                         document.get("conditional", {}), document.get("arch", DEFAULT_ARCH),
+                         document.get("built", 0.0), document.get("graphs", {}))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise MatrixError(f"Cannot read version matrix {path}: {e}") from e
+        if max_age_hours is not None and matrix.age_hours > max_age_hours:
+            raise MatrixError(f"Version matrix {path} is {matrix.age_hours:.1f}h old (limit {max_age_hours}h)")
+        return matrix
+
+    @property
+    def age_hours(self) -> float:
+        return max(0.0, time.time() - self.built) / 3600
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def _position(self, version: str) -> int:
+        try:
+            return self.index[version]
+        except KeyError:
+            raise MatrixError(f"{version} is not a release of {', '.join(self.minors)}") from None
+
+    def has(self, version: str) -> bool:
+        """An exact release, or a minor the matrix covers."""
+        return version in self.index or version in self.minors
+
+    def latest(self, minor: str) -> str:
+        """Newest GA patch of a minor (4.20 or any 4.20.z)."""
+        entry = self.minors.get(_minor(minor))
+        if not entry or not entry.get("latest"):
+            raise MatrixError(f"{minor} is not covered by the version matrix ({', '.join(self.minors)})")
+        return entry["latest"]
+
+    def payload(self, version: str) -> str:
+        return self.payloads[self._position(version)]
+
+    def recommended(self, version: str) -> List[str]:
+        """Releases version is a recommended update to."""
+        return [self.releases[i] for i in self.edges[self._position(version)]]
+
+    def risks(self, source: str, target: str) -> Optional[List[str]]:
+        """Risk names of a conditional update, None if it is not one."""
+        return self.conditional.get(source, {}).get(target)
+
+    def reachable(self, source: str, accept_risks: Iterable[str] = ()) -> Set[str]:
+        """Every release reachable from source over recommended (and accepted conditional) updates."""
+        accepted = set(accept_risks)
+        seen, stack = {source}, [source]
+        while stack:
+            current = stack.pop()
+            nexts = self.recommended(current)
+            nexts += [dst for dst, names in self.conditional.get(current, {}).items()
+                      if dst in self.index and ("*" in accepted or set(names) <= accepted)]
+            for nxt in nexts:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
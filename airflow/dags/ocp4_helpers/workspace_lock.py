@@ -0,0 +1,205 @@
+"""
+Workspace Locking for ocp4-disconnected-helper
+Lets registry syncs of different version pairs run at the same time:
+- Each version pair can mirror into its own workspace,
+  /opt/images/runs/<source>-<target>, so archives, the oc-mirror workspace,
+  transfer journal, plan and resolved vars file of one run never meet another's
+- A run holds a lease on its workspace (.lease.json, updated under flock).
+  A second run of the same pair waits for it; a lease not renewed within
+  LEASE_STALE_SECONDS (a killed worker) is taken over
+- The lease carries the disk the run planned for, so concurrent runs plan
+  against the space the others are still about to write
+- file_lock() guards the read-modify-write of state the runs share: blob
+  store refs, throughput history and parallelism tuning
+- Layers are fetched once across runs: blobs already in the shared blob store
+  are hardlinked into a new workspace before oc-mirror starts (blob_store.py)
+"""
+
+import fcntl
+import json
+import os
+import re
+import socket
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Iterator, List, Optional
+
+DEFAULT_ROOT = "/opt/images"
+RUNS_DIR = "runs"
+LEASE_NAME = ".lease.json"
+LOCK_NAME = ".lease.lock"
+LEASE_STALE_SECONDS = 12 * 3600
+DEFAULT_POLL_SECONDS = 30.0
+_SHARED_DIRS = {RUNS_DIR, "blob-store"}     # not part of the /opt/images workspace itself
+
+
+class LeaseError(Exception):
+    """Raised when a workspace is held by another run."""
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False, timeout: Optional[float] = None) -> Iterator[None]:
+    """
+    flock() on path (created if missing) for the duration of the block.
+
+    Args:
+        path: Lock file, usually "<file it guards>.lock"
+        shared: Shared (reader) lock instead of exclusive
+        timeout: Seconds to wait; None waits forever
+
+    Raises:
+        TimeoutError: if the lock is not granted within timeout
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    try:
+        if timeout is None:
+            fcntl.flock(fd, mode)
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(fd, mode | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"{path} is locked")
+                    time.sleep(0.1)
+        yield
+    finally:
+        os.close(fd)                        # releases the lock
+
+
+def workspace_path(source_version: str, target_version: str, root: str = DEFAULT_ROOT) -> str:
+    """Isolated workspace of a version pair (the task scripts build the same path)."""
+    pair = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{source_version}-{target_version}")
+    return os.path.join(root, RUNS_DIR, pair)
+
+
+@dataclass
+class Lease:
+    """Who holds a workspace, since when, and the disk it planned for."""
+
+    workspace: str
+    run_id: str
+    host: str
+    acquired: float
+    renewed: float
+    reserved_bytes: int = 0
+
+    def stale(self, stale_seconds: float = LEASE_STALE_SECONDS, now: Optional[float] = None) -> bool:
+        return (now or time.time()) - self.renewed > stale_seconds
+
+
+def read_lease(workspace: str) -> Optional[Lease]:
+    try:
+        with open(os.path.join(workspace, LEASE_NAME)) as f:
+            return Lease(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_lease(lease: Lease) -> None:
+    path = os.path.join(lease.workspace, LEASE_NAME)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(asdict(lease), f, indent=1)
+    os.replace(tmp, path)
+
+
+def acquire_lease(
+    workspace: str,
+    run_id: str,
+    wait_seconds: float = 0,
+    stale_seconds: float = LEASE_STALE_SECONDS,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+) -> Lease:
+    """
+    Take or renew the lease on a workspace.
+
+    A run that already holds the lease renews it (each task of a DAG run
+    calls this), keeping its reservation. A stale lease is taken over.
+
+    Args:
+        workspace: Workspace directory (created if missing)
+        run_id: Airflow run_id of the caller
+        wait_seconds: How long to wait for another run to release it
+        stale_seconds: Lease age without renewal after which it is taken over
+        poll_seconds: Interval between attempts while waiting
+
+    Raises:
+        LeaseError: if another run still holds the lease after wait_seconds
+    """
+    os.makedirs(workspace, exist_ok=True)
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        with file_lock(os.path.join(workspace, LOCK_NAME)):
+            now = time.time()
+            current = read_lease(workspace)
+            if current is None or current.run_id == run_id or current.stale(stale_seconds, now):
+                if current is not None and current.run_id == run_id:
+                    lease = Lease(**{**asdict(current), "host": socket.gethostname(), "renewed": now})
+                else:
+                    lease = Lease(workspace, run_id, socket.gethostname(), now, now)
+                _write_lease(lease)
+                return lease
+        if time.monotonic() + poll_seconds > deadline:
+            raise LeaseError(f"{workspace} is held by run {current.run_id} on {current.host} "
+                             f"since {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(current.acquired))}")
+        time.sleep(poll_seconds)
+
+
+def release_lease(workspace: str, run_id: str) -> bool:
+    """Drop the lease if run_id holds it; False if it did not."""
+    with file_lock(os.path.join(workspace, LOCK_NAME)):
+        current = read_lease(workspace)
+        if current is None or current.run_id != run_id:
+            return False
+        os.remove(os.path.join(workspace, LEASE_NAME))
+        return True
+
+
+def reserve_disk(workspace: str, run_id: str, reserved_bytes: int) -> None:
+    """Record the disk run_id planned for on its lease."""
+    with file_lock(os.path.join(workspace, LOCK_NAME)):
+        current = read_lease(workspace)
+        if current is None or current.run_id != run_id:
+            raise LeaseError(f"{workspace} is not leased to run {run_id}")
+        current.reserved_bytes = int(reserved_bytes)
+        _write_lease(current)
+
+
+def active_leases(root: str = DEFAULT_ROOT, stale_seconds: float = LEASE_STALE_SECONDS) -> List[Lease]:
+    """Live leases on root itself and on every isolated workspace under it."""
+    workspaces = [root]
+    runs = os.path.join(root, RUNS_DIR)
+    if os.path.isdir(runs):
+        workspaces += [os.path.join(runs, name) for name in sorted(os.listdir(runs))]
+    leases = [read_lease(w) for w in workspaces]
+    return [lease for lease in leases if lease and not lease.stale(stale_seconds)]
+
+
+def _written_bytes(workspace: str) -> int:
+    """Disk a workspace already uses (its share of a reservation that is no longer free)."""
+    total = 0
+    for dirpath, dirnames, filenames in os.walk(workspace):
+        if dirpath == workspace:
+            dirnames[:] = [d for d in dirnames if d not in _SHARED_DIRS]
+        for name in filenames:
+            try:
+                st = os.lstat(os.path.join(dirpath, name))
+            except OSError:
+                continue
+            if st.st_nlink == 1:            # hardlinked blobs are shared with the blob store
+                total += st.st_blocks * 512
+    return total
+
+
+def reserved_by_others(workspace: str, root: str = DEFAULT_ROOT) -> int:
+    """Disk other live runs reserved and have not written yet."""
+    workspace = os.path.abspath(workspace)
+    return sum(max(0, lease.reserved_bytes - _written_bytes(lease.workspace))
+               for lease in active_leases(root)
+               if os.path.abspath(lease.workspace) != workspace and lease.reserved_bytes)
@@ -100,26 +100,7 @@ dag = DAG(
 # =============================================================================
 workflow_start = BashOperator(
     task_id='workflow_start',
-    bash_command='''
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    echo "🚀 OCP Disconnected Workflow - Starting"
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    echo ""
-    echo "Timestamp:        $(date -Iseconds)"
-    echo "Configuration:    {{ params.example_config }}"
-    echo "Registry:         {{ params.registry_type }}"
-    echo "OCP Version:      {{ params.ocp_version }}"
-    echo "Skip Infra:       {{ params.skip_infra_setup }}"
-    echo "Skip Image Sync:  {{ params.skip_image_sync }}"
-    echo "Deploy on KVM:    {{ params.deploy_on_kvm }}"
-    echo ""
-    echo "Workflow Stages:"
-    echo "  1. Infrastructure Setup (Step-CA, Registry, DNS)"
-    echo "  2. Image Sync (download OCP images, push to registry)"
-    echo "  3. Pre-Deployment Validation"
-    echo "  4. OpenShift Deployment"
-    echo ""
-    ''',
+    bash_command='ocp_task_scripts/ocp_disconnected_workflow/workflow_start.sh',
     dag=dag,
 )
 
@@ -154,60 +135,7 @@ skip_infra_setup = BashOperator(
 
 setup_infrastructure = BashOperator(
     task_id='setup_infrastructure',
-    bash_command='''
-    set -euo pipefail
-    
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    echo "🏗️  Setting Up Infrastructure"
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    echo ""
-    
-    REGISTRY_TYPE="{{ params.registry_type }}"
-    
-    # Check Step-CA
-    echo "Checking Step-CA..."
-    STEP_CA_HEALTHY=$(curl -sk --connect-timeout 5 "https://step-ca-server.example.com/health" 2>/dev/null | grep -c "ok" || echo "0")
-    
-    if [ "$STEP_CA_HEALTHY" = "0" ]; then
-        echo "  Step-CA not healthy - triggering deployment..."
-        echo "  Run: airflow dags trigger step_ca_deployment --conf '{\"action\": \"create\"}'"
-        # In a real scenario, we would use TriggerDagRunOperator
-        # For now, just report what needs to be done
-    else
-        echo "  ✅ Step-CA is healthy"
-    fi
-    
-    # Check Registry
-    echo ""
-    echo "Checking $REGISTRY_TYPE registry..."
-    
-    case "$REGISTRY_TYPE" in
-        quay)
-            REGISTRY="mirror-registry.example.com:8443"
-            DEPLOY_DAG="mirror_registry_deployment"
-            ;;
-        harbor)
-            REGISTRY="harbor.example.com"
-            DEPLOY_DAG="harbor_deployment"
-            ;;
-        jfrog)
-            REGISTRY="jfrog.example.com:8082"
-            DEPLOY_DAG="jfrog_deployment"
-            ;;
-    esac
-    
-    HTTP_CODE=$(curl -sk --connect-timeout 5 -o /dev/null -w "%{http_code}" "https://${REGISTRY}/v2/" 2>/dev/null || echo "000")
-    
-    if [ "$HTTP_CODE" = "000" ]; then
-        echo "  Registry not responding - needs deployment"
-        echo "  Run: airflow dags trigger $DEPLOY_DAG --conf '{\"action\": \"create\"}'"
-    else
-        echo "  ✅ Registry is responding (HTTP $HTTP_CODE)"
-    fi
-    
-    echo ""
-    echo "✅ Infrastructure check complete"
-    ''',
+    bash_command='ocp_task_scripts/ocp_disconnected_workflow/setup_infrastructure.sh',
     dag=dag,
 )
 
@@ -347,35 +275,7 @@ deploy_complete = EmptyOperator(
 # =============================================================================
 workflow_complete = BashOperator(
     task_id='workflow_complete',
-    bash_command='''
-    echo ""
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    echo "✅ OCP Disconnected Workflow Complete"
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    echo ""
-    echo "Timestamp:     $(date -Iseconds)"
-    echo "Configuration: {{ params.example_config }}"
-    echo "Registry:      {{ params.registry_type }}"
-    echo "OCP Version:   {{ params.ocp_version }}"
-    echo ""
-    
-    EXAMPLE_CONFIG="{{ params.example_config }}"
-    GENERATED_ASSETS="/root/generated_assets/$EXAMPLE_CONFIG"
-    
-    if [ -f "$GENERATED_ASSETS/auth/kubeconfig" ]; then
-        echo "Cluster Access:"
-        echo "  export KUBECONFIG=$GENERATED_ASSETS/auth/kubeconfig"
-        echo "  oc get nodes"
-        echo "  oc get co"
-    else
-        echo "Kubeconfig not yet available."
-        echo "Check deployment status:"
-        echo "  openshift-install agent wait-for install-complete --dir=$GENERATED_ASSETS"
-    fi
-    
-    echo ""
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    ''',
+    bash_command='ocp_task_scripts/ocp_disconnected_workflow/workflow_complete.sh',
     trigger_rule=TriggerRule.ALL_SUCCESS,
     dag=dag,
 )
@@ -385,29 +285,7 @@ workflow_complete = BashOperator(
 # =============================================================================
 workflow_failed = BashOperator(
     task_id='workflow_failed',
-    bash_command='''
-    echo ""
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    echo "❌ OCP Disconnected Workflow Failed"
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    echo ""
-    echo "One or more stages failed. Review the failed task logs for details."
-    echo ""
-    echo "Each error includes:"
-    echo "  - The specific file or service with the issue"
-    echo "  - The exact error encountered"
-    echo "  - Commands to fix the issue"
-    echo ""
-    echo "After fixing the issue, retrigger this DAG."
-    echo ""
-    echo "Common fixes:"
-    echo "  - Registry unhealthy: airflow dags trigger mirror_registry_deployment --conf '{\"action\": \"create\"}'"
-    echo "  - Missing images: airflow dags trigger ocp_registry_sync --conf '{\"skip_download\": false}'"
-    echo "  - DNS missing: airflow dags trigger freeipa_dns_management"
-    echo "  - Config error: Edit the file mentioned in the error"
-    echo ""
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    ''',
+    bash_command='ocp_task_scripts/ocp_disconnected_workflow/workflow_failed.sh',
     trigger_rule=TriggerRule.ONE_FAILED,
     dag=dag,
 )
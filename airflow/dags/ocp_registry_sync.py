@@ -12,10 +12,104 @@ Workflow:
 4. Push TAR to registry (via push-tar-to-registry.yml playbook)
 5. Generate sync report
 
+MIRROR PLAN:
+- preflight_checks resolves the image set (releases, operator channel heads,
+  additional images) to manifests and deduplicated blob sizes, without
+  downloading layers, and fails if /opt/images cannot hold the download
+- It predicts download and push time from the throughput measured on
+  previous runs (/opt/images/.mirror-plan/throughput.json)
+- download-to-tar.yml checks free space against the plan instead of 30GB
+  per release
+
+FAN-OUT PUSH (fanout_push=true):
+- push_to_registry reads each blob of the archive set once and streams it to
+  all `registries` in push-tar-to-registry-vars.yml concurrently, instead of
+  one oc-mirror pass over the TARs per registry
+- One oc-mirror publish still follows, against the first registry only and
+  skipping the blobs already present, for results-*, signatures, catalogs
+  and mirror metadata
+
+ARCHIVE INTEGRITY:
+- download_images writes /opt/images/mirror-integrity.json (sha256 per
+  archive and per blob); carry it across the air gap with the TARs
+- push_to_registry verifies the archives against it first, hashing them in
+  parallel, and fails naming the damaged archive
+
+ZSTD PACKAGING (zstd_package=true):
+- After the manifest is written, download_images repacks each TAR as
+  multi-threaded zstd (.tar.zst + .tar.zst.idx seek index), shrinking what
+  crosses the air gap; the ratio and MB/s per archive are logged
+- Fan-out push reads the packed archives in place; the oc-mirror publish
+  needs plain tars, so a temporary decompressed copy is written for it and
+  removed afterwards. Both need the zstd package on their host
+
+ADAPTIVE PARALLELISM (adaptive_parallelism=true):
+- oc-mirror's --max-per-registry is stepped from run to run: one more
+  while throughput rises, back to the
+  best value once it stops, halved when the log shows HTTP 429 throttling
+- Fan-out push adjusts blobs in flight during the push the same way
+- The best settings are remembered per registry and uplink in
+  /opt/images/.parallel-tuning.json and are where the next run starts
+
+RESUME AFTER FAILURE:
+- While oc-mirror runs, finished blobs and manifests in the workspace are
+  verified and recorded in /opt/images/.transfer-journal.jsonl (fsync'd)
+- On failure, cleanup_on_failure prunes only partial and corrupt files and
+  keeps the verified ones; a retry or retrigger for the same versions
+  resumes from them (clean_mirror is ignored while resuming)
+
+BLOB STORE (blob_store=true):
+- After download, blob files in the oc-mirror workspace are deduplicated into a
+  content-addressed store under /opt/images/blob-store (hardlinks), so layers
+  shared by the source and target releases use disk once
+- Fan-out push reads blobs from the store, including blobs an incremental
+  archive only references
+
+SYNC METRICS:
+- Helper phases on the host journal their timing and bytes to
+  /opt/images/.sync-metrics/<run_id>.jsonl
+- sync_report sums them per phase with the task wall times and tries, the
+  mirror plan, the integrity manifest and the archive sizes, stores the run
+  in /opt/images/.sync-metrics/trends.db (SQLite) and compares it with the
+  median of the last 10 runs; slower phases, lower MB/s, more retries or a
+  larger mirror are flagged
+
+CONCURRENT SYNCS (isolated_workspace=true):
+- Each version pair mirrors into its own workspace,
+  /opt/images/runs/<source>-<target>, with its own archives, oc-mirror
+  workspace, transfer journal, plan and resolved download vars, so up to
+  MAX_ACTIVE_RUNS syncs of different pairs run at the same time
+- preflight_checks takes a lease on the workspace; another run of the same
+  pair (or any two runs without isolation, which share /opt/images) waits
+  a few minutes, then fails and is retried by the scheduler with backoff
+  (up to ~5h) instead of holding a worker slot until sync_report or
+  cleanup_on_failure releases it
+- The disk each run planned is reserved on its lease, and later runs plan
+  against what is left
+- With blob_store=true the layers other pairs already stored are hardlinked
+  into a new workspace before oc-mirror starts, so shared layers are fetched
+  once; throughput history, tuning and blob refs are updated under file locks
+
 SMART VERSION RESOLUTION:
 - Uses versions_check.sh logic to query OpenShift upgrade graph API
 - Sets minVersion = maxVersion to download ONLY specific versions (not ranges)
 - Prevents downloading entire version ranges (saves 100s of GB)
+- Channel graphs are cached in /opt/images/.graph-cache and revalidated with
+  ETag/If-Modified-Since after an hour; source and target channels are
+  fetched concurrently, and an unreachable API falls back to the cache
+- The graphs are exported to upgrade-graph.json next to the archives and
+  imported by push_to_registry on the disconnected side
+- Latest patches come from the version matrix when the ocp_version_matrix
+  DAG built one within a day (no API calls); preflight_checks validates the
+  version params against it
+
+UPGRADE PATH (cluster_version set, e.g. 4.19.12):
+- The shortest supported path from the cluster's exact release to
+  target_version is solved locally from the cached graphs (upgrade_path.py)
+- Only the releases on that path are mirrored, one exact entry each, instead
+  of the latest source and target patches
+- Conditional updates are taken only for risks named in accept_upgrade_risks
+  ('*' accepts all); the path is written to upgrade-path.json
 
 Target: OpenShift 4.17-4.20
 Designed to run on qubinode_navigator's Airflow instance.
@@ -23,15 +117,21 @@ Designed to run on qubinode_navigator's Airflow instance.
 
 from datetime import datetime, timedelta
 from airflow import DAG
-from airflow.operators.bash import BashOperator
 from airflow.utils.trigger_rule import TriggerRule
 from airflow.models.param import Param
 
+from ocp4_helpers.remote_exec import RemoteBashOperator
+
 # =============================================================================
 # Configuration
 # =============================================================================
 PLAYBOOKS_PATH = '/root/ocp4-disconnected-helper/playbooks'
 EXTRA_VARS_PATH = '/root/ocp4-disconnected-helper/extra_vars'
+# Syncs of different version pairs (isolated_workspace=true) run side by side;
+# runs sharing a workspace fail fast on its lease and retry preflight_checks
+MAX_ACTIVE_RUNS = 3
+# Helper metrics events of each run are journaled here for sync_report
+METRICS_ENV = {'OCP4_METRICS_JOURNAL_DIR': '/opt/images/.sync-metrics'}
 
 default_args = {
     'owner': 'ocp4-disconnected-helper',
@@ -52,7 +152,7 @@ dag = DAG(
     description='Sync OCP images to registries via Ansible playbooks (ADR 0012)',
     schedule=None,
     catchup=False,
-    max_active_runs=1,
+    max_active_runs=MAX_ACTIVE_RUNS,
     tags=['ocp4-disconnected-helper', 'openshift', 'registry', 'sync'],
     params={
         'source_version': Param(
@@ -99,6 +199,41 @@ dag = DAG(
             type='boolean',
             description='Auto-resolve latest patch versions from OpenShift API',
         ),
+        'cluster_version': Param(
+            default='',
+            type='string',
+            description='Exact current cluster release, e.g. 4.19.12: mirror only the releases on its upgrade path to target_version',
+        ),
+        'accept_upgrade_risks': Param(
+            default='',
+            type='string',
+            description='Space-separated conditional-update risk names the upgrade path may take (* for all)',
+        ),
+        'fanout_push': Param(
+            default=False,
+            type='boolean',
+            description='Push to every registry in push-tar-to-registry-vars.yml in one pass, reading archives once',
+        ),
+        'blob_store': Param(
+            default=False,
+            type='boolean',
+            description='Deduplicate downloaded layers into /opt/images/blob-store; fan-out push reads from it',
+        ),
+        'zstd_package': Param(
+            default=False,
+            type='boolean',
+            description='Repack downloaded archives as seekable zstd for transport (needs the zstd package)',
+        ),
+        'adaptive_parallelism': Param(
+            default=False,
+            type='boolean',
+            description='Tune oc-mirror and fan-out concurrency from measured throughput and throttling',
+        ),
+        'isolated_workspace': Param(
+            default=False,
+            type='boolean',
+            description='Mirror in /opt/images/runs/<source>-<target> so syncs of other version pairs can run concurrently',
+        ),
     },
     doc_md=__doc__,
 )
@@ -106,98 +241,15 @@ dag = DAG(
 # =============================================================================
 # Task 1: Pre-flight Checks (SSH to host per ADR-0046)
 # =============================================================================
-preflight_checks = BashOperator(
+preflight_checks = RemoteBashOperator(
     task_id='preflight_checks',
-    bash_command="""
-ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -o LogLevel=ERROR root@localhost << 'REMOTE_SCRIPT'
-set -euo pipefail
-
-echo "===================================================================="
-echo "[INFO] OCP Registry Sync - Pre-flight Checks"
-echo "===================================================================="
-echo ""
-echo "Source Version: {{ params.source_version }}"
-echo "Target Version: {{ params.target_version }}"
-echo "Upgrade Type: {{ params.upgrade_type }}"
-echo "Auto Resolve: {{ params.auto_resolve_versions }}"
-echo "Target Registry: {{ params.target_registry }}"
-echo "Passthrough Mode: {{ params.enable_passthrough }}"
-echo "Skip Download: {{ params.skip_download }}"
-echo "Clean Mirror: {{ params.clean_mirror }}"
-echo "Timestamp: $(date -Iseconds)"
-echo ""
-
-ERRORS=0
-
-# Check required binaries
-echo "[INFO] Checking required binaries..."
-for cmd in ansible-playbook oc oc-mirror curl jq podman; do
-    if command -v $cmd &> /dev/null; then
-        echo "  [OK] $cmd: $(which $cmd)"
-    else
-        echo "  [ERROR] $cmd NOT FOUND"
-        ERRORS=$((ERRORS + 1))
-    fi
-done
-
-# Check playbooks exist
-echo ""
-echo "[INFO] Checking Ansible playbooks..."
-PLAYBOOKS_PATH="/root/ocp4-disconnected-helper/playbooks"
-for playbook in download-to-tar.yml push-tar-to-registry.yml setup-registry-passthrough.yml validate-passthrough-mode.yml; do
-    if [ -f "$PLAYBOOKS_PATH/$playbook" ]; then
-        echo "  [OK] $playbook exists"
-    else
-        echo "  [ERROR] $playbook NOT FOUND at $PLAYBOOKS_PATH"
-        ERRORS=$((ERRORS + 1))
-    fi
-done
-
-# Check extra_vars files
-echo ""
-echo "[INFO] Checking extra_vars files..."
-EXTRA_VARS_PATH="/root/ocp4-disconnected-helper/extra_vars"
-for varsfile in download-to-tar-vars.yml push-tar-to-registry-vars.yml; do
-    if [ -f "$EXTRA_VARS_PATH/$varsfile" ]; then
-        echo "  [OK] $varsfile exists"
-    else
-        echo "  [WARN] $varsfile not found (will use defaults)"
-    fi
-done
-
-# Check pull secret
-echo ""
-echo "[INFO] Checking pull secret..."
-if [ -f /root/pull-secret.json ]; then
-    echo "  [OK] /root/pull-secret.json exists"
-elif [ -f /root/rh-pull-secret ]; then
-    echo "  [OK] /root/rh-pull-secret exists"
-else
-    echo "  [ERROR] No pull secret found"
-    ERRORS=$((ERRORS + 1))
-fi
-
-# Check disk space
-echo ""
-echo "[INFO] Checking disk space..."
-MIRROR_PATH="/opt/images"
-mkdir -p "$MIRROR_PATH" 2>/dev/null || true
-AVAIL=$(df -BG "$MIRROR_PATH" 2>/dev/null | tail -1 | awk '{print $4}' | tr -d 'G')
-if [ "$AVAIL" -gt 50 ]; then
-    echo "  [OK] Available space: ${AVAIL}GB"
-else
-    echo "  [WARN] Low disk space: ${AVAIL}GB (50GB+ recommended)"
-fi
-
-echo ""
-if [ $ERRORS -gt 0 ]; then
-    echo "[ERROR] Pre-flight checks FAILED with $ERRORS error(s)"
-    exit 1
-else
-    echo "[OK] Pre-flight checks PASSED"
-fi
-REMOTE_SCRIPT
-    """,
+    remote_script='ocp_task_scripts/ocp_registry_sync/preflight_checks.sh',
+    remote_env=METRICS_ENV,
+    # A busy workspace fails the lease quickly; retries wait for it without a worker slot
+    retries=6,
+    retry_delay=timedelta(minutes=15),
+    retry_exponential_backoff=True,
+    max_retry_delay=timedelta(hours=1),
     dag=dag,
 )
 
@@ -205,147 +257,31 @@ REMOTE_SCRIPT
 # Task 2: Resolve Versions (Query OpenShift API for latest patch versions)
 # Uses scripts/resolve-ocp-versions.sh to avoid downloading entire version ranges
 # =============================================================================
-resolve_versions = BashOperator(
+resolve_versions = RemoteBashOperator(
     task_id='resolve_versions',
-    bash_command="""
-ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -o LogLevel=ERROR root@localhost << 'REMOTE_SCRIPT'
-set -euo pipefail
-
-SOURCE_VERSION="{{ params.source_version }}"
-TARGET_VERSION="{{ params.target_version }}"
-UPGRADE_TYPE="{{ params.upgrade_type }}"
-AUTO_RESOLVE="{{ params.auto_resolve_versions }}"
-
-if [ "$AUTO_RESOLVE" != "True" ] && [ "$AUTO_RESOLVE" != "true" ]; then
-    echo "===================================================================="
-    echo "[INFO] Auto-resolve disabled, using static versions from extra_vars"
-    echo "===================================================================="
-    yq eval '.openshift_releases' /root/ocp4-disconnected-helper/extra_vars/download-to-tar-vars.yml
-    exit 0
-fi
-
-# Call the version resolution script
-/root/ocp4-disconnected-helper/scripts/resolve-ocp-versions.sh \
-    "$SOURCE_VERSION" \
-    "$TARGET_VERSION" \
-    "$UPGRADE_TYPE" \
-    "/root/ocp4-disconnected-helper/extra_vars/download-to-tar-vars.yml"
-REMOTE_SCRIPT
-    """,
+    remote_script='ocp_task_scripts/ocp_registry_sync/resolve_versions.sh',
+    remote_env=METRICS_ENV,
     dag=dag,
 )
 
 # =============================================================================
 # Task 3: Download Images via Ansible Playbook (ADR 0012 compliant)
 # =============================================================================
-download_images = BashOperator(
+download_images = RemoteBashOperator(
     task_id='download_images',
-    bash_command="""
-ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -o LogLevel=ERROR root@localhost << 'REMOTE_SCRIPT'
-set -euo pipefail
-
-SKIP_DOWNLOAD="{{ params.skip_download }}"
-CLEAN_MIRROR="{{ params.clean_mirror }}"
-SOURCE_VERSION="{{ params.source_version }}"
-TARGET_VERSION="{{ params.target_version }}"
-
-if [ "$SKIP_DOWNLOAD" = "True" ] || [ "$SKIP_DOWNLOAD" = "true" ]; then
-    echo "===================================================================="
-    echo "[INFO] Skipping Download (skip_download=true)"
-    echo "===================================================================="
-    
-    MIRROR_PATH="/opt/images"
-    if ls "$MIRROR_PATH"/*.tar 1>/dev/null 2>&1; then
-        echo "[OK] Using existing TAR files:"
-        ls -lh "$MIRROR_PATH"/*.tar
-    else
-        echo "[ERROR] No TAR files found at $MIRROR_PATH"
-        echo "Set skip_download=false to download images"
-        exit 1
-    fi
-    exit 0
-fi
-
-echo "===================================================================="
-echo "[INFO] Downloading OCP ${SOURCE_VERSION}→${TARGET_VERSION} Images via Ansible Playbook"
-echo "===================================================================="
-echo ""
-echo "Per ADR 0012: Using download-to-tar.yml playbook"
-echo ""
-
-cd /root/ocp4-disconnected-helper/playbooks
-
-# Build extra vars for this run
-EXTRA_VARS=""
-EXTRA_VARS="$EXTRA_VARS -e clean_mirror_path=$CLEAN_MIRROR"
-
-# Check if custom vars file exists
-if [ -f ../extra_vars/download-to-tar-vars.yml ]; then
-    echo "[INFO] Using extra_vars/download-to-tar-vars.yml"
-    EXTRA_VARS="$EXTRA_VARS -e @../extra_vars/download-to-tar-vars.yml"
-fi
-
-echo "[INFO] Running: ansible-playbook -i inventory download-to-tar.yml $EXTRA_VARS"
-echo ""
-
-# Unset vault password file env var if no vault is used
-unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
-
-ansible-playbook -i inventory download-to-tar.yml $EXTRA_VARS
-
-echo ""
-echo "[OK] Download playbook completed"
-REMOTE_SCRIPT
-    """,
-    execution_timeout=timedelta(hours=4),
+    remote_script='ocp_task_scripts/ocp_registry_sync/download_images.sh',
+    remote_env=METRICS_ENV,
+    execution_timeout=timedelta(hours=6),
     dag=dag,
 )
 
 # =============================================================================
 # Task 3: Push to Registry via Ansible Playbook (ADR 0012 compliant)
 # =============================================================================
-push_to_registry = BashOperator(
+push_to_registry = RemoteBashOperator(
     task_id='push_to_registry',
-    bash_command="""
-ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -o LogLevel=ERROR root@localhost << 'REMOTE_SCRIPT'
-set -euo pipefail
-
-TARGET_REGISTRY="{{ params.target_registry }}"
-
-echo "===================================================================="
-echo "[INFO] Pushing Images to $TARGET_REGISTRY Registry via Ansible Playbook"
-echo "===================================================================="
-echo ""
-echo "Per ADR 0012: Using push-tar-to-registry.yml playbook"
-echo ""
-
-cd /root/ocp4-disconnected-helper/playbooks
-
-# Build extra vars for this run
-EXTRA_VARS=""
-
-# Check if custom vars file exists
-if [ -f ../extra_vars/push-tar-to-registry-vars.yml ]; then
-    echo "[INFO] Using extra_vars/push-tar-to-registry-vars.yml"
-    EXTRA_VARS="$EXTRA_VARS -e @../extra_vars/push-tar-to-registry-vars.yml"
-else
-    echo "[ERROR] Missing extra_vars/push-tar-to-registry-vars.yml"
-    echo "This file is required to configure the target registry"
-    exit 1
-fi
-
-echo "[INFO] Running: ansible-playbook -i inventory push-tar-to-registry.yml $EXTRA_VARS"
-echo ""
-
-# Unset vault password file env var if no vault is used
-unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
-
-ansible-playbook -i inventory push-tar-to-registry.yml $EXTRA_VARS
-
-echo ""
-echo "[OK] Push playbook completed"
-REMOTE_SCRIPT
-    """,
+    remote_script='ocp_task_scripts/ocp_registry_sync/push_to_registry.sh',
+    remote_env=METRICS_ENV,
     execution_timeout=timedelta(hours=2),
     dag=dag,
 )
@@ -353,51 +289,11 @@ REMOTE_SCRIPT
 # =============================================================================
 # Task 4: Generate Sync Report
 # =============================================================================
-sync_report = BashOperator(
+# Runs on the host: the run journal, archives and trend store are there
+sync_report = RemoteBashOperator(
     task_id='sync_report',
-    bash_command="""
-set -euo pipefail
-
-echo ""
-echo "===================================================================="
-echo "[INFO] Registry Sync Report"
-echo "===================================================================="
-echo ""
-echo "Sync Completed: $(date -Iseconds)"
-echo "Source Version: {{ params.source_version }}"
-echo "Target Version: {{ params.target_version }}"
-echo "Upgrade Type:   {{ params.upgrade_type }}"
-echo "Registry:       {{ params.target_registry }}"
-echo "Skip Download:  {{ params.skip_download }}"
-echo "Clean Mirror:   {{ params.clean_mirror }}"
-echo ""
-
-# Show mirror path contents
-MIRROR_PATH="/opt/images"
-echo "Mirror Path Contents:"
-ls -lh "$MIRROR_PATH"/*.tar 2>/dev/null | head -5 || echo "  No TAR files (may have been pushed directly)"
-
-# Show oc-mirror workspace
-if [ -d "$MIRROR_PATH/oc-mirror-workspace" ]; then
-    LATEST_RESULTS=$(ls -td "$MIRROR_PATH/oc-mirror-workspace"/results-* 2>/dev/null | head -1)
-    if [ -d "$LATEST_RESULTS" ]; then
-        echo ""
-        echo "Generated Manifests: $LATEST_RESULTS"
-        ls "$LATEST_RESULTS" 2>/dev/null | head -10
-    fi
-fi
-
-echo ""
-echo "===================================================================="
-echo "Next Steps:"
-echo "  1. Run passthrough setup: ansible-playbook setup-registry-passthrough.yml"
-echo "  2. Apply ICSP/IDMS manifests to cluster"
-echo "  3. Validate passthrough: ansible-playbook validate-passthrough-mode.yml"
-echo "  4. Verify images: skopeo list-tags docker://<registry>/<repo>"
-echo "  5. Deploy cluster: airflow dags trigger ocp_agent_deployment"
-echo "===================================================================="
-echo "[OK] OCP Registry Sync completed successfully!"
-    """,
+    remote_script='ocp_task_scripts/ocp_registry_sync/sync_report.sh',
+    remote_env=METRICS_ENV,
     trigger_rule=TriggerRule.ALL_SUCCESS,
     dag=dag,
 )
@@ -405,38 +301,11 @@ echo "[OK] OCP Registry Sync completed successfully!"
 # =============================================================================
 # Task 5: Cleanup on Failure
 # =============================================================================
-cleanup_on_failure = BashOperator(
+# Runs on the host: the workspace it checkpoints is there
+cleanup_on_failure = RemoteBashOperator(
     task_id='cleanup_on_failure',
-    bash_command="""
-set +e  # Don't exit on error during cleanup
-
-echo "===================================================================="
-echo "[WARN] Cleanup After Failure"
-echo "===================================================================="
-echo ""
-
-# Clean up partial oc-mirror workspace
-MIRROR_PATH="/opt/images"
-if [ -d "$MIRROR_PATH/oc-mirror-workspace" ]; then
-    echo "[INFO] Cleaning partial working directories..."
-    find "$MIRROR_PATH/oc-mirror-workspace" -type d -name "working-*" -exec rm -rf {} + 2>/dev/null || true
-fi
-
-echo "[OK] Cleanup complete"
-echo ""
-echo "===================================================================="
-echo "SYNC FAILED - Review errors above"
-echo "===================================================================="
-echo ""
-echo "Common fixes:"
-echo "  1. Check Ansible playbook logs for detailed errors"
-echo "  2. Verify extra_vars files are configured correctly"
-echo "  3. Ensure pull secret is valid and not expired"
-echo "  4. Check disk space: df -h /opt/images"
-echo "  5. Check registry connectivity"
-echo ""
-echo "After fixing, retrigger this DAG"
-    """,
+    remote_script='ocp_task_scripts/ocp_registry_sync/cleanup_on_failure.sh',
+    remote_env=METRICS_ENV,
     trigger_rule=TriggerRule.ONE_FAILED,
     dag=dag,
 )
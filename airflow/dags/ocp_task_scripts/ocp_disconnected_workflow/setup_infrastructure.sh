@@ -0,0 +1,52 @@
+set -euo pipefail
+
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🏗️  Setting Up Infrastructure"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+
+REGISTRY_TYPE="{{ params.registry_type }}"
+
+# Check Step-CA
+echo "Checking Step-CA..."
+STEP_CA_HEALTHY=$(curl -sk --connect-timeout 5 "https://step-ca-server.example.com/health" 2>/dev/null | grep -c "ok" || echo "0")
+
+if [ "$STEP_CA_HEALTHY" = "0" ]; then
+    echo "  Step-CA not healthy - triggering deployment..."
+    echo "  Run: airflow dags trigger step_ca_deployment --conf '{"action": "create"}'"
+    # In a real scenario, we would use TriggerDagRunOperator
+    # For now, just report what needs to be done
+else
+    echo "  ✅ Step-CA is healthy"
+fi
+
+# Check Registry
+echo ""
+echo "Checking $REGISTRY_TYPE registry..."
+
+case "$REGISTRY_TYPE" in
+    quay)
+        REGISTRY="mirror-registry.example.com:8443"
+        DEPLOY_DAG="mirror_registry_deployment"
+        ;;
+    harbor)
+        REGISTRY="harbor.example.com"
+        DEPLOY_DAG="harbor_deployment"
+        ;;
+    jfrog)
+        REGISTRY="jfrog.example.com:8082"
+        DEPLOY_DAG="jfrog_deployment"
+        ;;
+esac
+
+HTTP_CODE=$(curl -sk --connect-timeout 5 -o /dev/null -w "%{http_code}" "https://${REGISTRY}/v2/" 2>/dev/null || echo "000")
+
+if [ "$HTTP_CODE" = "000" ]; then
+    echo "  Registry not responding - needs deployment"
+    echo "  Run: airflow dags trigger $DEPLOY_DAG --conf '{"action": "create"}'"
+else
+    echo "  ✅ Registry is responding (HTTP $HTTP_CODE)"
+fi
+
+echo ""
+echo "✅ Infrastructure check complete"
@@ -0,0 +1,27 @@
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "✅ OCP Disconnected Workflow Complete"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+echo "Timestamp:     $(date -Iseconds)"
+echo "Configuration: {{ params.example_config }}"
+echo "Registry:      {{ params.registry_type }}"
+echo "OCP Version:   {{ params.ocp_version }}"
+echo ""
+
+EXAMPLE_CONFIG="{{ params.example_config }}"
+GENERATED_ASSETS="/root/generated_assets/$EXAMPLE_CONFIG"
+
+if [ -f "$GENERATED_ASSETS/auth/kubeconfig" ]; then
+    echo "Cluster Access:"
+    echo "  export KUBECONFIG=$GENERATED_ASSETS/auth/kubeconfig"
+    echo "  oc get nodes"
+    echo "  oc get co"
+else
+    echo "Kubeconfig not yet available."
+    echo "Check deployment status:"
+    echo "  openshift-install agent wait-for install-complete --dir=$GENERATED_ASSETS"
+fi
+
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
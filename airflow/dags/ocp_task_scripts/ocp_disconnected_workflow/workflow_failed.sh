@@ -0,0 +1,21 @@
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "❌ OCP Disconnected Workflow Failed"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+echo "One or more stages failed. Review the failed task logs for details."
+echo ""
+echo "Each error includes:"
+echo "  - The specific file or service with the issue"
+echo "  - The exact error encountered"
+echo "  - Commands to fix the issue"
+echo ""
+echo "After fixing the issue, retrigger this DAG."
+echo ""
+echo "Common fixes:"
+echo "  - Registry unhealthy: airflow dags trigger mirror_registry_deployment --conf '{"action": "create"}'"
+echo "  - Missing images: airflow dags trigger ocp_registry_sync --conf '{"skip_download": false}'"
+echo "  - DNS missing: airflow dags trigger freeipa_dns_management"
+echo "  - Config error: Edit the file mentioned in the error"
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
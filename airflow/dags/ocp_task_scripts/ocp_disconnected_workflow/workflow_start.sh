@@ -0,0 +1,18 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🚀 OCP Disconnected Workflow - Starting"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+echo "Timestamp:        $(date -Iseconds)"
+echo "Configuration:    {{ params.example_config }}"
+echo "Registry:         {{ params.registry_type }}"
+echo "OCP Version:      {{ params.ocp_version }}"
+echo "Skip Infra:       {{ params.skip_infra_setup }}"
+echo "Skip Image Sync:  {{ params.skip_image_sync }}"
+echo "Deploy on KVM:    {{ params.deploy_on_kvm }}"
+echo ""
+echo "Workflow Stages:"
+echo "  1. Infrastructure Setup (Step-CA, Registry, DNS)"
+echo "  2. Image Sync (download OCP images, push to registry)"
+echo "  3. Pre-Deployment Validation"
+echo "  4. OpenShift Deployment"
+echo ""
@@ -0,0 +1,34 @@
+set -euo pipefail
+
+HARBOR_HOSTNAME="{{ params.harbor_hostname }}"
+HARBOR_IP="{{ params.harbor_ip }}"
+
+echo "===================================================================="
+echo "[INFO] DNS Configuration for Harbor"
+echo "===================================================================="
+echo ""
+
+# Check if hostname resolves
+if host "$HARBOR_HOSTNAME" > /dev/null 2>&1; then
+    RESOLVED_IP=$(host "$HARBOR_HOSTNAME" | grep -oP '(\d+\.){3}\d+' | head -1)
+    echo "[OK] $HARBOR_HOSTNAME resolves to $RESOLVED_IP"
+else
+    echo "[WARN] $HARBOR_HOSTNAME does not resolve via DNS"
+    echo ""
+    echo "Options to fix:"
+    echo "  1. Add DNS record for $HARBOR_HOSTNAME -> $HARBOR_IP"
+    echo "  2. Add to /etc/hosts: $HARBOR_IP $HARBOR_HOSTNAME"
+    echo ""
+    
+    # Add to local /etc/hosts as fallback
+    if ! grep -q "$HARBOR_HOSTNAME" /etc/hosts; then
+        echo "[INFO] Adding $HARBOR_HOSTNAME to /etc/hosts"
+        echo "$HARBOR_IP $HARBOR_HOSTNAME" >> /etc/hosts
+        echo "[OK] Added to /etc/hosts"
+    else
+        echo "[OK] Entry already exists in /etc/hosts"
+    fi
+fi
+
+echo ""
+echo "[OK] DNS configuration complete"
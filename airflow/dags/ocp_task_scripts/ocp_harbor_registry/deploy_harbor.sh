@@ -0,0 +1,24 @@
+set -euo pipefail
+
+HARBOR_HOSTNAME="{{ params.harbor_hostname }}"
+
+echo "===================================================================="
+echo "[INFO] Deploying Harbor Registry: $HARBOR_HOSTNAME"
+echo "===================================================================="
+echo ""
+echo "Per ADR 0012: Using setup-harbor-registry.yml playbook"
+echo ""
+
+cd /root/ocp4-disconnected-helper/playbooks
+
+# Unset vault password file env var if no vault is used
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+# Run the Harbor setup playbook
+echo "[INFO] Running: ansible-playbook -i inventory setup-harbor-registry.yml -e @../extra_vars/setup-harbor-registry-vars.yml"
+echo ""
+
+ansible-playbook -i inventory setup-harbor-registry.yml     -e @../extra_vars/setup-harbor-registry-vars.yml     -v
+
+echo ""
+echo "[OK] Harbor deployment playbook completed"
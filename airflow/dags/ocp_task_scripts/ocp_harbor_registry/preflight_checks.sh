@@ -0,0 +1,65 @@
+set -euo pipefail
+
+HARBOR_HOSTNAME="{{ params.harbor_hostname }}"
+HARBOR_IP="{{ params.harbor_ip }}"
+
+echo "===================================================================="
+echo "[INFO] Harbor Registry Deployment - Pre-flight Checks"
+echo "===================================================================="
+echo ""
+echo "Harbor Hostname: $HARBOR_HOSTNAME"
+echo "Harbor IP: $HARBOR_IP"
+echo "Harbor Version: {{ params.harbor_version }}"
+echo "Data Volume: {{ params.data_volume_path }}"
+echo "Timestamp: $(date -Iseconds)"
+echo ""
+
+ERRORS=0
+
+# Check if Harbor host is reachable
+echo "[INFO] Checking Harbor host connectivity..."
+if ping -c 2 -W 3 "$HARBOR_IP" > /dev/null 2>&1; then
+    echo "  [OK] Harbor host $HARBOR_IP is reachable"
+else
+    echo "  [ERROR] Cannot reach Harbor host $HARBOR_IP"
+    ERRORS=$((ERRORS + 1))
+fi
+
+# Check SSH access to Harbor host
+echo ""
+echo "[INFO] Checking SSH access to Harbor host..."
+if ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -o ConnectTimeout=5 -o LogLevel=ERROR root@$HARBOR_IP "echo 'SSH OK'" 2>/dev/null; then
+    echo "  [OK] SSH access to Harbor host works"
+else
+    echo "  [ERROR] Cannot SSH to Harbor host"
+    echo "  Hint: Ensure SSH keys are set up for root@$HARBOR_IP"
+    ERRORS=$((ERRORS + 1))
+fi
+
+# Check if playbook exists
+echo ""
+echo "[INFO] Checking playbook..."
+if [ -f /root/ocp4-disconnected-helper/playbooks/setup-harbor-registry.yml ]; then
+    echo "  [OK] setup-harbor-registry.yml exists"
+else
+    echo "  [ERROR] setup-harbor-registry.yml not found"
+    ERRORS=$((ERRORS + 1))
+fi
+
+# Check if extra_vars exists
+echo ""
+echo "[INFO] Checking extra_vars..."
+if [ -f /root/ocp4-disconnected-helper/extra_vars/setup-harbor-registry-vars.yml ]; then
+    echo "  [OK] setup-harbor-registry-vars.yml exists"
+else
+    echo "  [ERROR] setup-harbor-registry-vars.yml not found"
+    ERRORS=$((ERRORS + 1))
+fi
+
+echo ""
+if [ $ERRORS -gt 0 ]; then
+    echo "[ERROR] Pre-flight checks FAILED with $ERRORS error(s)"
+    exit 1
+else
+    echo "[OK] Pre-flight checks PASSED"
+fi
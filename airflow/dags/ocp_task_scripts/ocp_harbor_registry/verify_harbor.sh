@@ -0,0 +1,65 @@
+set -euo pipefail
+
+HARBOR_HOSTNAME="{{ params.harbor_hostname }}"
+HARBOR_IP="{{ params.harbor_ip }}"
+
+echo "===================================================================="
+echo "[INFO] Verifying Harbor Deployment"
+echo "===================================================================="
+echo ""
+
+ERRORS=0
+
+# Wait a bit for Harbor to start
+echo "[INFO] Waiting for Harbor to initialize..."
+sleep 30
+
+# Check Harbor API health
+echo ""
+echo "[INFO] Checking Harbor health endpoint..."
+HEALTH_STATUS=$(curl -sk --connect-timeout 10 "https://${HARBOR_IP}/api/v2.0/health" 2>/dev/null || echo "FAILED")
+
+if echo "$HEALTH_STATUS" | grep -q "healthy"; then
+    echo "  [OK] Harbor API is healthy"
+else
+    echo "  [WARN] Harbor health check returned: $HEALTH_STATUS"
+    echo "  Trying alternative endpoint..."
+    
+    # Try the v2 endpoint
+    V2_STATUS=$(curl -sk --connect-timeout 10 "https://${HARBOR_IP}/v2/" 2>/dev/null || echo "FAILED")
+    if [ "$V2_STATUS" = "{}" ]; then
+        echo "  [OK] Harbor v2 registry endpoint is responding"
+    else
+        echo "  [ERROR] Harbor is not responding correctly"
+        ERRORS=$((ERRORS + 1))
+    fi
+fi
+
+# Check if we can list projects
+echo ""
+echo "[INFO] Checking Harbor API access..."
+PROJECTS=$(curl -sk -u admin:notHarbor12345 "https://${HARBOR_IP}/api/v2.0/projects" 2>/dev/null || echo "FAILED")
+if echo "$PROJECTS" | grep -q "name"; then
+    echo "  [OK] Harbor API authentication works"
+    echo "  Projects: $(echo $PROJECTS | jq -r '.[].name' 2>/dev/null | tr '
+' ' ')"
+else
+    echo "  [WARN] Could not list Harbor projects"
+fi
+
+echo ""
+if [ $ERRORS -gt 0 ]; then
+    echo "[ERROR] Harbor verification FAILED"
+    exit 1
+else
+    echo "===================================================================="
+    echo "[OK] Harbor Registry Deployed Successfully!"
+    echo "===================================================================="
+    echo ""
+    echo "Harbor URL: https://$HARBOR_HOSTNAME"
+    echo "Harbor IP:  https://$HARBOR_IP"
+    echo "Username:   admin"
+    echo "Password:   (see extra_vars/setup-harbor-registry-vars.yml)"
+    echo ""
+    echo "Next: Run ocp_registry_sync DAG to push images to Harbor"
+fi
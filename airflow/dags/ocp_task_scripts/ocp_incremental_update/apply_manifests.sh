@@ -0,0 +1,49 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "📄 TASK 4: Applying ICSP/IDMS Manifests"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+KUBECONFIG="{{ params.kubeconfig_path | default('/root/.kube/config') }}"
+MIRROR_PATH="{{ params.mirror_path | default('/opt/openshift-mirror') }}"
+
+export KUBECONFIG="$KUBECONFIG"
+
+# Find and apply ICSP/IDMS manifests from oc-mirror output
+RESULTS_DIR="$MIRROR_PATH/oc-mirror-workspace/results-*"
+
+echo "Looking for manifests in: $RESULTS_DIR"
+
+for dir in $RESULTS_DIR; do
+    if [ -d "$dir" ]; then
+        echo "Found results directory: $dir"
+
+        # Apply ImageContentSourcePolicy (OCP < 4.13)
+        if ls "$dir"/*ImageContentSourcePolicy*.yaml &>/dev/null 2>&1; then
+            echo "Applying ImageContentSourcePolicy..."
+            oc apply -f "$dir"/*ImageContentSourcePolicy*.yaml
+        fi
+
+        # Apply ImageDigestMirrorSet (OCP >= 4.13)
+        if ls "$dir"/*ImageDigestMirrorSet*.yaml &>/dev/null 2>&1; then
+            echo "Applying ImageDigestMirrorSet..."
+            oc apply -f "$dir"/*ImageDigestMirrorSet*.yaml
+        fi
+
+        # Apply CatalogSource
+        if ls "$dir"/*CatalogSource*.yaml &>/dev/null 2>&1; then
+            echo "Applying CatalogSource..."
+            oc apply -f "$dir"/*CatalogSource*.yaml
+        fi
+    fi
+done
+
+echo ""
+echo "Waiting for MachineConfigPool to update..."
+echo "(This may take several minutes as nodes are updated)"
+
+# Wait for MCPs to start updating
+sleep 30
+
+# Check MCP status
+oc get mcp
+
+echo "✅ Manifests applied"
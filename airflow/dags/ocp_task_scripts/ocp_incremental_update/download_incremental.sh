@@ -0,0 +1,25 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "⬇️  TASK 2: Downloading Incremental Images"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+PLAYBOOKS_PATH="{{ params.playbooks_path | default('/root/ocp4-disconnected-helper/playbooks') }}"
+EXTRA_VARS_PATH="{{ params.extra_vars_path | default('/root/ocp4-disconnected-helper/extra_vars') }}"
+TARGET_VERSION="{{ params.target_version | default('4.20.1') }}"
+
+echo "Target Version: $TARGET_VERSION"
+echo "Using incremental mirror (clean_mirror_path=false)"
+echo ""
+
+cd "$PLAYBOOKS_PATH"
+
+# Incremental mirror - preserves oc-mirror-workspace state
+EXTRA_VARS="ocp_version=$TARGET_VERSION clean_mirror_path=false"
+
+if [ -f "$EXTRA_VARS_PATH/download-to-tar.yml" ]; then
+    echo "Using extra vars file..."
+    ansible-playbook -i inventory download-to-tar.yml             -e "@$EXTRA_VARS_PATH/download-to-tar.yml"             -e "$EXTRA_VARS" -v
+else
+    ansible-playbook -i inventory download-to-tar.yml             -e "$EXTRA_VARS" -v
+fi
+
+echo "✅ Incremental download complete"
@@ -0,0 +1,44 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "📊 TASK 7: Monitoring Update Progress"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+KUBECONFIG="{{ params.kubeconfig_path | default('/root/.kube/config') }}"
+TARGET_VERSION="{{ params.target_version | default('4.20.1') }}"
+
+export KUBECONFIG="$KUBECONFIG"
+
+MAX_WAIT=7200  # 2 hours
+INTERVAL=60    # Check every minute
+ELAPSED=0
+
+echo "Monitoring update progress (max wait: $((MAX_WAIT/60)) minutes)..."
+echo ""
+
+while [ $ELAPSED -lt $MAX_WAIT ]; do
+    # Get cluster version status
+    VERSION=$(oc get clusterversion version -o jsonpath='{.status.desired.version}' 2>/dev/null)
+    PROGRESSING=$(oc get clusterversion version -o jsonpath='{.status.conditions[?(@.type=="Progressing")].status}' 2>/dev/null)
+    AVAILABLE=$(oc get clusterversion version -o jsonpath='{.status.conditions[?(@.type=="Available")].status}' 2>/dev/null)
+    MESSAGE=$(oc get clusterversion version -o jsonpath='{.status.conditions[?(@.type=="Progressing")].message}' 2>/dev/null)
+
+    echo "[$(date '+%H:%M:%S')] Version: $VERSION | Progressing: $PROGRESSING | Available: $AVAILABLE"
+
+    if [ "$VERSION" = "$TARGET_VERSION" ] && [ "$PROGRESSING" = "False" ] && [ "$AVAILABLE" = "True" ]; then
+        echo ""
+        echo "✅ Update to $TARGET_VERSION completed successfully!"
+        exit 0
+    fi
+
+    if [ -n "$MESSAGE" ]; then
+        echo "   Status: $MESSAGE"
+    fi
+
+    sleep $INTERVAL
+    ELAPSED=$((ELAPSED + INTERVAL))
+done
+
+echo ""
+echo "⚠️  Update monitoring timed out after $((MAX_WAIT/60)) minutes"
+echo "The update may still be in progress. Check manually with:"
+echo "  oc get clusterversion"
+echo "  oc get co"
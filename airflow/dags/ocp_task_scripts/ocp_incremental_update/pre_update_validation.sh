@@ -0,0 +1,75 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🔍 TASK 1: Pre-Update Validation"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+SKIP_VALIDATION="{{ params.skip_validation | default('false') }}"
+KUBECONFIG="{{ params.kubeconfig_path | default('/root/.kube/config') }}"
+CURRENT_VERSION="{{ params.current_version | default('4.20.0') }}"
+TARGET_VERSION="{{ params.target_version | default('4.20.1') }}"
+
+if [ "$SKIP_VALIDATION" = "true" ]; then
+    echo "⚠️  Skipping validation (skip_validation=true)"
+    exit 0
+fi
+
+echo "Current Version: $CURRENT_VERSION"
+echo "Target Version:  $TARGET_VERSION"
+echo "Kubeconfig:      $KUBECONFIG"
+echo ""
+
+ERRORS=0
+
+# Check kubeconfig exists
+if [ ! -f "$KUBECONFIG" ]; then
+    echo "❌ Kubeconfig not found: $KUBECONFIG"
+    ERRORS=$((ERRORS + 1))
+else
+    echo "✅ Kubeconfig found"
+fi
+
+# Check cluster connectivity
+echo ""
+echo "Checking cluster connectivity..."
+export KUBECONFIG="$KUBECONFIG"
+
+if oc cluster-info &>/dev/null; then
+    echo "✅ Cluster is reachable"
+
+    # Get current cluster version
+    CLUSTER_VERSION=$(oc get clusterversion version -o jsonpath='{.status.desired.version}' 2>/dev/null)
+    echo "   Cluster version: $CLUSTER_VERSION"
+
+    # Check cluster health
+    echo ""
+    echo "Checking cluster operators..."
+    DEGRADED=$(oc get co -o jsonpath='{.items[?(@.status.conditions[?(@.type=="Degraded")].status=="True")].metadata.name}' 2>/dev/null)
+    if [ -n "$DEGRADED" ]; then
+        echo "⚠️  Degraded operators: $DEGRADED"
+    else
+        echo "✅ No degraded operators"
+    fi
+
+    # Check nodes
+    echo ""
+    echo "Checking nodes..."
+    NOT_READY=$(oc get nodes -o jsonpath='{.items[?(@.status.conditions[?(@.type=="Ready")].status!="True")].metadata.name}' 2>/dev/null)
+    if [ -n "$NOT_READY" ]; then
+        echo "❌ Nodes not ready: $NOT_READY"
+        ERRORS=$((ERRORS + 1))
+    else
+        echo "✅ All nodes ready"
+    fi
+
+else
+    echo "❌ Cannot connect to cluster"
+    ERRORS=$((ERRORS + 1))
+fi
+
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+if [ $ERRORS -gt 0 ]; then
+    echo "❌ Pre-update validation FAILED with $ERRORS error(s)"
+    exit 1
+else
+    echo "✅ Pre-update validation PASSED"
+fi
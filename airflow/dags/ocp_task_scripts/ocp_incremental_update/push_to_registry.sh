@@ -0,0 +1,16 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "⬆️  TASK 3: Pushing Images to Registry"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+PLAYBOOKS_PATH="{{ params.playbooks_path | default('/root/ocp4-disconnected-helper/playbooks') }}"
+EXTRA_VARS_PATH="{{ params.extra_vars_path | default('/root/ocp4-disconnected-helper/extra_vars') }}"
+
+cd "$PLAYBOOKS_PATH"
+
+if [ -f "$EXTRA_VARS_PATH/push-tar-to-registry.yml" ]; then
+    ansible-playbook -i inventory push-tar-to-registry.yml             -e "@$EXTRA_VARS_PATH/push-tar-to-registry.yml" -v
+else
+    ansible-playbook -i inventory push-tar-to-registry.yml -v
+fi
+
+echo "✅ Push to registry complete"
@@ -0,0 +1,34 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🚀 TASK 6: Triggering Cluster Update"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+KUBECONFIG="{{ params.kubeconfig_path | default('/root/.kube/config') }}"
+TARGET_VERSION="{{ params.target_version | default('4.20.1') }}"
+
+export KUBECONFIG="$KUBECONFIG"
+
+echo "Target Version: $TARGET_VERSION"
+echo ""
+
+# Get current version
+CURRENT=$(oc get clusterversion version -o jsonpath='{.status.desired.version}')
+echo "Current Version: $CURRENT"
+
+if [ "$CURRENT" = "$TARGET_VERSION" ]; then
+    echo "✅ Cluster is already at target version $TARGET_VERSION"
+    exit 0
+fi
+
+# Check available updates
+echo ""
+echo "Checking available updates..."
+oc adm upgrade
+
+# Trigger the update
+echo ""
+echo "Triggering update to $TARGET_VERSION..."
+oc adm upgrade --to=$TARGET_VERSION
+
+echo ""
+echo "✅ Update triggered"
+echo "Monitor progress with: oc get clusterversion"
@@ -0,0 +1,29 @@
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "📋 UPDATE SUMMARY"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+KUBECONFIG="{{ params.kubeconfig_path | default('/root/.kube/config') }}"
+TARGET_VERSION="{{ params.target_version | default('4.20.1') }}"
+
+export KUBECONFIG="$KUBECONFIG"
+
+echo ""
+echo "Target Version: $TARGET_VERSION"
+echo ""
+
+echo "Cluster Version Status:"
+oc get clusterversion version
+
+echo ""
+echo "Cluster Operators:"
+oc get co | head -20
+
+echo ""
+echo "Nodes:"
+oc get nodes
+
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "✅ OCP Incremental Update DAG completed!"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -0,0 +1,58 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🔧 TASK 6: Building OpenShift Appliance"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+PLAYBOOKS_PATH="{{ params.playbooks_path | default('/root/ocp4-disconnected-helper/playbooks') }}"
+EXTRA_VARS_PATH="{{ params.extra_vars_path | default('/root/ocp4-disconnected-helper/extra_vars') }}"
+OCP_VERSION="{{ params.ocp_version | default('4.20.0') }}"
+REGISTRY_TYPE="{{ params.registry_type | default('mirror-registry') }}"
+
+cd "$PLAYBOOKS_PATH"
+
+# Check if build-appliance playbook exists
+if [ ! -f "build-appliance.yml" ]; then
+    echo "❌ build-appliance.yml not found"
+    echo "See ADR 0005: OpenShift Appliance Builder"
+    exit 1
+fi
+
+# Determine local registry URI based on registry type
+# The registry was set up in Task 3 and populated in Tasks 4-5
+REGISTRY_HOST="{{ ansible_fqdn | default('localhost') }}"
+case "$REGISTRY_TYPE" in
+    mirror-registry)
+        LOCAL_REGISTRY_URI="${REGISTRY_HOST}:8443"
+        ;;
+    harbor)
+        LOCAL_REGISTRY_URI="${REGISTRY_HOST}:443"
+        ;;
+    jfrog)
+        LOCAL_REGISTRY_URI="${REGISTRY_HOST}:8082"
+        ;;
+    *)
+        LOCAL_REGISTRY_URI="${REGISTRY_HOST}:8443"
+        ;;
+esac
+
+echo "Using local registry: $LOCAL_REGISTRY_URI"
+echo "Registry type: $REGISTRY_TYPE"
+echo ""
+echo "NOTE: This task uses the local registry populated by previous tasks:"
+echo "  - Task 3: Registry setup ($REGISTRY_TYPE)"
+echo "  - Task 4: Downloaded OCP images to TAR"
+echo "  - Task 5: Pushed images to local registry"
+echo ""
+
+# Build extra vars - use local registry with mirrored content
+EXTRA_VARS="ocp_release_version=$OCP_VERSION use_local_registry=true local_registry_uri=$LOCAL_REGISTRY_URI"
+
+# Check for extra vars file
+if [ -f "$EXTRA_VARS_PATH/build-appliance.yml" ]; then
+    echo "Using extra vars file: $EXTRA_VARS_PATH/build-appliance.yml"
+    ansible-playbook -i inventory build-appliance.yml             -e "@$EXTRA_VARS_PATH/build-appliance.yml"             -e "$EXTRA_VARS" -v
+else
+    echo "Running with default configuration..."
+    ansible-playbook -i inventory build-appliance.yml             -e "$EXTRA_VARS" -v
+fi
+
+echo "✅ Appliance build complete"
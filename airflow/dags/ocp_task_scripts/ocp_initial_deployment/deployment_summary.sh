@@ -0,0 +1,51 @@
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "📋 DEPLOYMENT SUMMARY"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+echo "OCP Version:    {{ params.ocp_version | default('4.20.0') }}"
+echo "Registry Type:  {{ params.registry_type | default('harbor') }}"
+echo "Clean Mirror:   {{ params.clean_mirror | default('false') }}"
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "📁 Generated Artifacts"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+MIRROR_PATH="{{ params.mirror_path | default('/opt/openshift-mirror') }}"
+
+echo ""
+echo "Mirror Path: $MIRROR_PATH"
+if [ -d "$MIRROR_PATH" ]; then
+    echo "Contents:"
+    ls -lah "$MIRROR_PATH" 2>/dev/null | head -20
+
+    # Check for TAR files
+    TAR_COUNT=$(find "$MIRROR_PATH" -name "*.tar" 2>/dev/null | wc -l)
+    echo ""
+    echo "TAR files found: $TAR_COUNT"
+
+    # Check for appliance
+    if [ -f "$MIRROR_PATH/appliance.raw" ]; then
+        APPLIANCE_SIZE=$(ls -lh "$MIRROR_PATH/appliance.raw" | awk '{print $5}')
+        echo "Appliance image: $MIRROR_PATH/appliance.raw ($APPLIANCE_SIZE)"
+    fi
+fi
+
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "📖 Next Steps"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+echo "1. Transfer appliance image to disconnected environment"
+echo "2. Boot target nodes from appliance"
+echo "3. Complete agent-based installation"
+echo "4. Verify cluster health"
+echo ""
+echo "Documentation:"
+echo "  - ADR 0005: OpenShift Appliance Builder"
+echo "  - ADR 0007: 3-Node Compact Cluster"
+echo "  - docs/manual-execution.md"
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "✅ OCP Initial Deployment DAG completed successfully!"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -0,0 +1,31 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "⬇️  TASK 4: Downloading Images to TAR"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+PLAYBOOKS_PATH="{{ params.playbooks_path | default('/root/ocp4-disconnected-helper/playbooks') }}"
+EXTRA_VARS_PATH="{{ params.extra_vars_path | default('/root/ocp4-disconnected-helper/extra_vars') }}"
+OCP_VERSION="{{ params.ocp_version | default('4.20.0') }}"
+CLEAN_MIRROR="{{ params.clean_mirror | default('false') }}"
+PULL_SECRET="{{ params.pull_secret_path | default('/root/pull-secret.json') }}"
+
+echo "OCP Version: $OCP_VERSION"
+echo "Clean Mirror: $CLEAN_MIRROR"
+echo "Pull Secret: $PULL_SECRET"
+
+cd "$PLAYBOOKS_PATH"
+
+# Build extra vars
+EXTRA_VARS="ocp_version=$OCP_VERSION"
+EXTRA_VARS="$EXTRA_VARS clean_mirror_path=$CLEAN_MIRROR"
+EXTRA_VARS="$EXTRA_VARS local_rh_pull_secret_path=$PULL_SECRET"
+
+# Check for extra vars file
+if [ -f "$EXTRA_VARS_PATH/download-to-tar.yml" ]; then
+    echo "Using extra vars file: $EXTRA_VARS_PATH/download-to-tar.yml"
+    ansible-playbook -i inventory download-to-tar.yml             -e "@$EXTRA_VARS_PATH/download-to-tar.yml"             -e "$EXTRA_VARS" -v
+else
+    echo "Running with default configuration..."
+    ansible-playbook -i inventory download-to-tar.yml             -e "$EXTRA_VARS" -v
+fi
+
+echo "✅ Download to TAR complete"
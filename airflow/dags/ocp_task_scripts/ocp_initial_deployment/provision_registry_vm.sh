@@ -0,0 +1,33 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🖥️  TASK 2: Provisioning Registry VM"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+PROVISION_VM="{{ params.provision_registry_vm | default('true') }}"
+PLAYBOOKS_PATH="{{ params.playbooks_path | default('/root/ocp4-disconnected-helper/playbooks') }}"
+VM_NAME="{{ params.registry_vm_name | default('registry') }}"
+VM_MEMORY="{{ params.registry_vm_memory | default('8192') }}"
+VM_CPUS="{{ params.registry_vm_cpus | default('4') }}"
+VM_DISK="{{ params.registry_vm_disk_size | default('500') }}"
+
+if [ "$PROVISION_VM" = "false" ]; then
+    echo "Skipping VM provisioning (provision_registry_vm=false)"
+    echo "Registry will be deployed to localhost"
+    exit 0
+fi
+
+cd "$PLAYBOOKS_PATH"
+
+# Check if VM already exists
+if kcli info vm "$VM_NAME" >/dev/null 2>&1; then
+    echo "Registry VM '$VM_NAME' already exists"
+    kcli info vm "$VM_NAME"
+else
+    echo "Creating registry VM: $VM_NAME"
+    echo "  Memory: ${VM_MEMORY}MB"
+    echo "  CPUs:   $VM_CPUS"
+    echo "  Disk:   ${VM_DISK}GB"
+
+    ansible-playbook -i inventory provision-registry-vm.yml             -e "registry_vm_name=$VM_NAME"             -e "registry_vm_memory=$VM_MEMORY"             -e "registry_vm_cpus=$VM_CPUS"             -e "registry_vm_disk_size=$VM_DISK" -v
+fi
+
+echo "✅ Registry VM ready"
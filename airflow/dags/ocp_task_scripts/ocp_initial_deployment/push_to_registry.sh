@@ -0,0 +1,19 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "⬆️  TASK 5: Pushing Images to Registry"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+PLAYBOOKS_PATH="{{ params.playbooks_path | default('/root/ocp4-disconnected-helper/playbooks') }}"
+EXTRA_VARS_PATH="{{ params.extra_vars_path | default('/root/ocp4-disconnected-helper/extra_vars') }}"
+
+cd "$PLAYBOOKS_PATH"
+
+# Check for extra vars file
+if [ -f "$EXTRA_VARS_PATH/push-tar-to-registry.yml" ]; then
+    echo "Using extra vars file: $EXTRA_VARS_PATH/push-tar-to-registry.yml"
+    ansible-playbook -i inventory push-tar-to-registry.yml             -e "@$EXTRA_VARS_PATH/push-tar-to-registry.yml" -v
+else
+    echo "Running with default configuration..."
+    ansible-playbook -i inventory push-tar-to-registry.yml -v
+fi
+
+echo "✅ Push to registry complete"
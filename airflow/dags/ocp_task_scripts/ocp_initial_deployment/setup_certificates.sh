@@ -0,0 +1,18 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🔐 TASK 3: Setting Up Certificates"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+PLAYBOOKS_PATH="{{ params.playbooks_path | default('/root/ocp4-disconnected-helper/playbooks') }}"
+CERT_PLAYBOOK="$PLAYBOOKS_PATH/setup-certificates.yml"
+
+if [ -f "$CERT_PLAYBOOK" ]; then
+    echo "Running certificate setup playbook..."
+    cd "$PLAYBOOKS_PATH"
+    ansible-playbook -i inventory setup-certificates.yml -v
+else
+    echo "⚠️  Certificate playbook not found: $CERT_PLAYBOOK"
+    echo "Skipping certificate setup - ensure certificates are configured manually"
+    echo "See ADR 0016: Trusted Certificate Management"
+fi
+
+echo "✅ Certificate setup complete"
@@ -0,0 +1,42 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "📦 TASK 3: Setting Up Registry"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+PLAYBOOKS_PATH="{{ params.playbooks_path | default('/root/ocp4-disconnected-helper/playbooks') }}"
+REGISTRY_TYPE="{{ params.registry_type | default('harbor') }}"
+
+echo "Registry type: $REGISTRY_TYPE"
+
+cd "$PLAYBOOKS_PATH"
+
+if [ "$REGISTRY_TYPE" = "mirror-registry" ]; then
+    echo "Deploying Quay mirror-registry (recommended)..."
+    if [ -f "setup-mirror-registry.yml" ]; then
+        ansible-playbook -i inventory setup-mirror-registry.yml -v
+    else
+        echo "❌ mirror-registry playbook not found"
+        exit 1
+    fi
+elif [ "$REGISTRY_TYPE" = "harbor" ]; then
+    echo "Deploying Harbor registry..."
+    if [ -f "setup-harbor-registry.yml" ]; then
+        ansible-playbook -i inventory setup-harbor-registry.yml -v
+    else
+        echo "❌ Harbor playbook not found"
+        exit 1
+    fi
+elif [ "$REGISTRY_TYPE" = "jfrog" ]; then
+    echo "Deploying JFrog Artifactory..."
+    if [ -f "setup-jfrog-registry.yml" ]; then
+        ansible-playbook -i inventory setup-jfrog-registry.yml -v
+    else
+        echo "❌ JFrog playbook not found"
+        exit 1
+    fi
+else
+    echo "❌ Unknown registry type: $REGISTRY_TYPE"
+    echo "   Valid options: mirror-registry, harbor, jfrog"
+    exit 1
+fi
+
+echo "✅ Registry setup complete"
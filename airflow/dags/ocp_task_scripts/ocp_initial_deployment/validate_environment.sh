@@ -0,0 +1,61 @@
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🔍 TASK 1: Validating Environment"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+ERRORS=0
+
+# Check required binaries
+echo "Checking required binaries..."
+for cmd in podman ansible-playbook oc oc-mirror; do
+    if command -v $cmd &> /dev/null; then
+        VERSION=$($cmd --version 2>/dev/null | head -1)
+        echo "✅ $cmd: $VERSION"
+    else
+        echo "❌ $cmd: NOT FOUND"
+        ERRORS=$((ERRORS + 1))
+    fi
+done
+
+# Check pull secret
+echo ""
+echo "Checking pull secret..."
+PULL_SECRET="{{ params.pull_secret_path | default('/root/pull-secret.json') }}"
+if [ -f "$PULL_SECRET" ]; then
+    echo "✅ Pull secret found: $PULL_SECRET"
+else
+    echo "❌ Pull secret not found: $PULL_SECRET"
+    ERRORS=$((ERRORS + 1))
+fi
+
+# Check playbooks directory
+echo ""
+echo "Checking playbooks..."
+PLAYBOOKS_PATH="{{ params.playbooks_path | default('/root/ocp4-disconnected-helper/playbooks') }}"
+if [ -d "$PLAYBOOKS_PATH" ]; then
+    echo "✅ Playbooks directory: $PLAYBOOKS_PATH"
+    ls -la "$PLAYBOOKS_PATH"/*.yml 2>/dev/null | head -10
+else
+    echo "❌ Playbooks directory not found: $PLAYBOOKS_PATH"
+    ERRORS=$((ERRORS + 1))
+fi
+
+# Check disk space
+echo ""
+echo "Checking disk space..."
+MIRROR_PATH="{{ params.mirror_path | default('/opt/openshift-mirror') }}"
+mkdir -p "$MIRROR_PATH" 2>/dev/null || true
+AVAIL=$(df -BG "$MIRROR_PATH" 2>/dev/null | tail -1 | awk '{print $4}' | tr -d 'G')
+if [ "$AVAIL" -gt 100 ]; then
+    echo "✅ Available space: ${AVAIL}GB (minimum 100GB required)"
+else
+    echo "⚠️  Available space: ${AVAIL}GB (100GB+ recommended)"
+fi
+
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+if [ $ERRORS -gt 0 ]; then
+    echo "❌ Validation FAILED with $ERRORS error(s)"
+    exit 1
+else
+    echo "✅ Environment validation PASSED"
+fi
@@ -0,0 +1,72 @@
+set -euo pipefail
+
+# Unset vault password file to avoid errors
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+CLUSTER_NAME="{{ params.cluster_name }}"
+
+echo "===================================================================="
+echo "[INFO] Building Agent-Based Installer ISO using hack/create-iso.sh"
+echo "===================================================================="
+
+cd /root/openshift-agent-install
+
+# Set generated asset path
+export GENERATED_ASSET_PATH="${HOME}/generated_assets"
+export SITE_CONFIG_DIR="examples"
+
+# Install required Ansible collection if missing
+ansible-galaxy collection install community.crypto 2>/dev/null || true
+
+# Install nmstate package required for network config validation
+if ! command -v nmstatectl &> /dev/null; then
+    echo "[INFO] Installing nmstate package..."
+    dnf install -y nmstate || yum install -y nmstate || {
+        echo "[WARN] Could not install nmstate - trying pip"
+        pip3 install nmstate || true
+    }
+fi
+
+# Read CA cert and set as environment variable for the playbook
+CA_CERT_PATH="/etc/pki/disconnected-ca/ca.crt"
+if [ -f "$CA_CERT_PATH" ]; then
+    echo "[INFO] Reading CA certificate from $CA_CERT_PATH"
+    export ADDITIONAL_TRUST_BUNDLE=$(cat "$CA_CERT_PATH")
+    
+    # Update cluster.yml to include the cert content
+    # The playbook template expects 'additional_trust_bundle' variable
+    cat >> examples/jfrog-disconnected/cluster.yml << CERTEOF
+
+# Dynamically added CA certificate content
+additional_trust_bundle: |
+$(cat "$CA_CERT_PATH" | sed 's/^/  /')
+CERTEOF
+    echo "[OK] CA certificate added to cluster.yml"
+else
+    echo "[WARN] CA certificate not found at $CA_CERT_PATH"
+    echo "[INFO] Proceeding without additionalTrustBundle"
+fi
+
+# Run the create-iso.sh script with jfrog-disconnected config
+echo "[INFO] Running: ./hack/create-iso.sh jfrog-disconnected"
+./hack/create-iso.sh jfrog-disconnected
+
+# Verify ISO was created
+ISO_PATH="${GENERATED_ASSET_PATH}/${CLUSTER_NAME}/agent.x86_64.iso"
+if [ -f "$ISO_PATH" ]; then
+    echo "[OK] Agent ISO created successfully"
+    ls -lh "$ISO_PATH"
+    echo ""
+    echo "ISO Location: $ISO_PATH"
+else
+    # Check alternate location
+    ALT_ISO=$(find "$GENERATED_ASSET_PATH" -name "agent.x86_64.iso" 2>/dev/null | head -1)
+    if [ -n "$ALT_ISO" ]; then
+        echo "[OK] Agent ISO created at: $ALT_ISO"
+        ls -lh "$ALT_ISO"
+    else
+        echo "[ERROR] ISO creation failed - no agent.x86_64.iso found"
+        ls -la "$GENERATED_ASSET_PATH/" 2>/dev/null || echo "Generated assets directory not found"
+        exit 1
+    fi
+fi
@@ -0,0 +1,20 @@
+set +e
+
+echo "===================================================================="
+echo "[WARN] Cleanup After Failure"
+echo "===================================================================="
+
+echo "[INFO] Checking for partial resources..."
+
+# Log failure details
+echo ""
+echo "Review the failed task above for details."
+echo ""
+echo "Common fixes:"
+echo "  1. Check JFrog VM status: kcli list vm"
+echo "  2. Check certificate generation logs"
+echo "  3. Verify network connectivity to JFrog"
+echo "  4. Check Ansible playbook logs"
+echo "  5. Verify pull secret is valid"
+echo ""
+echo "After fixing, retrigger this DAG"
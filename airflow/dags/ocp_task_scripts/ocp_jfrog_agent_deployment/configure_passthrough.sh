@@ -0,0 +1,21 @@
+set -euo pipefail
+
+# Unset vault password file to avoid errors
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+JFROG_HOSTNAME="{{ params.jfrog_hostname }}"
+JFROG_PORT="{{ params.jfrog_port }}"
+
+echo "===================================================================="
+echo "[INFO] Configuring Registry Passthrough Mode (ADR 0020)"
+echo "===================================================================="
+
+cd /root/ocp4-disconnected-helper/playbooks
+
+# Run passthrough setup on localhost
+ansible-playbook -i "localhost," -c local setup-registry-passthrough.yml     -e "registry_type=jfrog"     -e "registry_local_uri=$JFROG_HOSTNAME"     -e "registry_local_port=$JFROG_PORT"     -e "ansible_python_interpreter=/usr/bin/python3" || {
+    echo "[WARN] Passthrough setup had issues - continuing anyway"
+    echo "[INFO] You may need to manually configure ICSP"
+}
+
+echo "[OK] Passthrough mode configured"
@@ -0,0 +1,41 @@
+set -euo pipefail
+
+# Unset vault password file to avoid errors
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+CLUSTER_NAME="{{ params.cluster_name }}"
+JFROG_HOSTNAME="{{ params.jfrog_hostname }}"
+JFROG_PORT="{{ params.jfrog_port }}"
+
+echo "===================================================================="
+echo "[INFO] Preparing JFrog Disconnected Cluster Configuration"
+echo "===================================================================="
+
+cd /root/openshift-agent-install
+
+# Install required Ansible collection if missing
+ansible-galaxy collection install community.crypto 2>/dev/null || true
+
+# Ensure jfrog-disconnected example exists and update it with current values
+EXAMPLE_DIR="examples/jfrog-disconnected"
+mkdir -p "$EXAMPLE_DIR"
+
+# Read CA cert for trust bundle
+CA_CERT_PATH="/etc/pki/disconnected-ca/ca.crt"
+
+# Update cluster.yml with JFrog registry settings
+if [ -f "$EXAMPLE_DIR/cluster.yml" ]; then
+    echo "[INFO] Updating cluster.yml with JFrog registry: $JFROG_HOSTNAME:$JFROG_PORT"
+    # Update the JFrog hostname in imageContentSources
+    sed -i "s|jfrog.example.com:8443|$JFROG_HOSTNAME:$JFROG_PORT|g" "$EXAMPLE_DIR/cluster.yml"
+    
+    # Update additionalTrustBundlePath if CA cert exists
+    if [ -f "$CA_CERT_PATH" ]; then
+        sed -i "s|additionalTrustBundlePath:.*|additionalTrustBundlePath: $CA_CERT_PATH|g" "$EXAMPLE_DIR/cluster.yml"
+    fi
+fi
+
+echo "[INFO] Cluster configuration prepared in $EXAMPLE_DIR"
+cat "$EXAMPLE_DIR/cluster.yml"
+
+echo "[OK] Agent manifests preparation completed"
@@ -0,0 +1,34 @@
+set -euo pipefail
+
+# Unset vault password file to avoid errors
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+JFROG_HOSTNAME="{{ params.jfrog_hostname }}"
+JFROG_PORT="{{ params.jfrog_port }}"
+
+echo "===================================================================="
+echo "[INFO] Deploying JFrog Artifactory"
+echo "===================================================================="
+
+cd /root/ocp4-disconnected-helper/playbooks
+
+# Run JFrog setup playbook on localhost (not remote inventory)
+ansible-playbook -i "localhost," -c local setup-jfrog-registry.yml     -e "jfrog_hostname=$JFROG_HOSTNAME"     -e "jfrog_port=$JFROG_PORT"     -e "use_generated_certs=true"     -e "ansible_python_interpreter=/usr/bin/python3"
+
+echo "[OK] JFrog Artifactory deployed"
+
+# Verify JFrog is accessible (use localhost if DNS not configured)
+echo "[INFO] Verifying JFrog accessibility..."
+sleep 10
+
+# Try localhost first, then hostname
+if curl -k -s "https://localhost:$JFROG_PORT/artifactory/api/system/ping" 2>/dev/null | grep -q "OK"; then
+    echo "[OK] JFrog is accessible on localhost:$JFROG_PORT"
+elif curl -k -s "https://$JFROG_HOSTNAME:$JFROG_PORT/artifactory/api/system/ping" 2>/dev/null | grep -q "OK"; then
+    echo "[OK] JFrog is accessible on $JFROG_HOSTNAME:$JFROG_PORT"
+else
+    echo "[WARN] JFrog ping check failed - container may still be starting"
+    echo "[INFO] Continuing anyway - JFrog should be available shortly"
+fi
+
+echo "[OK] JFrog deployment completed"
@@ -0,0 +1,32 @@
+set -euo pipefail
+
+CLUSTER_NAME="{{ params.cluster_name }}"
+DEPLOY_ON_KVM="{{ params.deploy_on_kvm }}"
+
+echo "===================================================================="
+echo "[INFO] Deploy VMs on KVM"
+echo "===================================================================="
+
+if [ "$DEPLOY_ON_KVM" != "True" ] && [ "$DEPLOY_ON_KVM" != "true" ]; then
+    echo "[INFO] KVM deployment skipped (deploy_on_kvm=false)"
+    echo "[INFO] To deploy on KVM, set deploy_on_kvm=true in DAG config"
+    exit 0
+fi
+
+cd /root/openshift-agent-install
+
+# Set environment variables
+export CLUSTER_NAME="$CLUSTER_NAME"
+export GENERATED_ASSET_PATH="${HOME}/generated_assets"
+
+# Check if ISO exists
+if [ ! -f "${GENERATED_ASSET_PATH}/${CLUSTER_NAME}/agent.x86_64.iso" ]; then
+    echo "[ERROR] Agent ISO not found at ${GENERATED_ASSET_PATH}/${CLUSTER_NAME}/agent.x86_64.iso"
+    exit 1
+fi
+
+echo "[INFO] Running: ./hack/deploy-on-kvm.sh examples/jfrog-disconnected/nodes.yml"
+./hack/deploy-on-kvm.sh examples/jfrog-disconnected/nodes.yml
+
+echo "[OK] KVM VMs deployed and booting from agent ISO"
+echo "[INFO] Monitor VM status with: virsh list --all"
@@ -0,0 +1,51 @@
+set -euo pipefail
+
+CLUSTER_NAME="{{ params.cluster_name }}"
+BASE_DOMAIN="{{ params.base_domain }}"
+JFROG_HOSTNAME="{{ params.jfrog_hostname }}"
+JFROG_PORT="{{ params.jfrog_port }}"
+DEPLOY_ON_KVM="{{ params.deploy_on_kvm }}"
+
+echo ""
+echo "===================================================================="
+echo "[INFO] JFrog Agent Deployment Report"
+echo "===================================================================="
+echo ""
+echo "Deployment Completed: $(date -Iseconds)"
+echo ""
+echo "JFrog Registry:"
+echo "  - URL: https://$JFROG_HOSTNAME:$JFROG_PORT"
+echo "  - Type: JFrog Artifactory"
+echo "  - Passthrough Mode: Enabled (ADR 0020)"
+echo ""
+echo "OpenShift Cluster:"
+echo "  - Name: $CLUSTER_NAME"
+echo "  - Domain: $CLUSTER_NAME.$BASE_DOMAIN"
+echo "  - Version: {{ params.ocp_version }}"
+echo ""
+echo "Generated Files:"
+echo "  - Manifests: ~/generated_assets/$CLUSTER_NAME/"
+echo "  - ISO: ~/generated_assets/$CLUSTER_NAME/agent.x86_64.iso"
+echo "  - ICSP: /opt/ocp4-disconnected-helper/templates/icsp/"
+echo ""
+if [ "$DEPLOY_ON_KVM" = "True" ] || [ "$DEPLOY_ON_KVM" = "true" ]; then
+echo "KVM Deployment:"
+echo "  - VMs created and booting from agent ISO"
+echo "  - Check status: virsh list --all"
+echo ""
+fi
+echo "===================================================================="
+echo "Next Steps:"
+if [ "$DEPLOY_ON_KVM" != "True" ] && [ "$DEPLOY_ON_KVM" != "true" ]; then
+echo "  1. Boot target nodes with the agent ISO"
+else
+echo "  1. VMs are booting - monitor progress"
+fi
+echo "  2. Monitor bootstrap: openshift-install agent wait-for bootstrap-complete --dir ~/generated_assets/$CLUSTER_NAME"
+echo "  3. Monitor install: openshift-install agent wait-for install-complete --dir ~/generated_assets/$CLUSTER_NAME"
+echo "  4. Apply ICSP post-install: /opt/ocp4-disconnected-helper/templates/icsp/apply-icsp-jfrog.sh"
+echo ""
+echo "To destroy KVM VMs:"
+echo "  cd /root/openshift-agent-install && ./hack/destroy-on-kvm.sh examples/jfrog-disconnected/nodes.yml"
+echo "===================================================================="
+echo "[OK] JFrog Agent Deployment workflow completed!"
@@ -0,0 +1,85 @@
+set -euo pipefail
+
+# Unset vault password file to avoid errors
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+echo "===================================================================="
+echo "[INFO] JFrog Agent Deployment - Pre-flight Checks"
+echo "===================================================================="
+echo ""
+echo "JFrog VM Name: {{ params.jfrog_vm_name }}"
+echo "JFrog Hostname: {{ params.jfrog_hostname }}"
+echo "Certificate Provider: {{ params.cert_provider }}"
+echo "OCP Version: {{ params.ocp_version }}"
+echo "Cluster Name: {{ params.cluster_name }}"
+echo "Base Domain: {{ params.base_domain }}"
+echo "Timestamp: $(date -Iseconds)"
+echo ""
+
+ERRORS=0
+
+# Check required binaries (oc-mirror is optional - only needed for mirror sync)
+echo "[INFO] Checking required binaries..."
+for cmd in ansible-playbook oc kcli openshift-install; do
+    if command -v $cmd &> /dev/null; then
+        echo "  [OK] $cmd: $(which $cmd)"
+    else
+        echo "  [WARN] $cmd NOT FOUND - will attempt to install"
+        
+        # Use helper scripts from openshift-agent-install if available
+        if [ "$cmd" = "oc" ] || [ "$cmd" = "openshift-install" ]; then
+            if [ -f "/root/openshift-agent-install/download-openshift-cli.sh" ]; then
+                echo "  [INFO] Running download-openshift-cli.sh..."
+                cd /root/openshift-agent-install && ./download-openshift-cli.sh
+                cp ./bin/* /usr/local/bin/ 2>/dev/null || true
+                cd -
+            fi
+        fi
+        
+        # Re-check after install attempt
+        if ! command -v $cmd &> /dev/null; then
+            echo "  [ERROR] $cmd still NOT FOUND after install attempt"
+            ERRORS=$((ERRORS + 1))
+        else
+            echo "  [OK] $cmd installed: $(which $cmd)"
+        fi
+    fi
+done
+
+# Check playbooks
+echo ""
+echo "[INFO] Checking playbooks..."
+PLAYBOOKS=(
+    "/root/ocp4-disconnected-helper/playbooks/setup-jfrog-registry.yml"
+    "/root/ocp4-disconnected-helper/playbooks/setup-certificates.yml"
+    "/root/ocp4-disconnected-helper/playbooks/setup-registry-passthrough.yml"
+    "/root/openshift-agent-install/playbooks/create-manifests.yml"
+)
+for pb in "${PLAYBOOKS[@]}"; do
+    if [ -f "$pb" ]; then
+        echo "  [OK] $pb"
+    else
+        echo "  [ERROR] $pb NOT FOUND"
+        ERRORS=$((ERRORS + 1))
+    fi
+done
+
+# Check pull secret
+echo ""
+echo "[INFO] Checking pull secret..."
+if [ -f /root/pull-secret.json ]; then
+    echo "  [OK] /root/pull-secret.json exists"
+elif [ -f /root/rh-pull-secret ]; then
+    echo "  [OK] /root/rh-pull-secret exists"
+else
+    echo "  [ERROR] No pull secret found"
+    ERRORS=$((ERRORS + 1))
+fi
+
+echo ""
+if [ $ERRORS -gt 0 ]; then
+    echo "[ERROR] Pre-flight checks FAILED with $ERRORS error(s)"
+    exit 1
+else
+    echo "[OK] Pre-flight checks PASSED"
+fi
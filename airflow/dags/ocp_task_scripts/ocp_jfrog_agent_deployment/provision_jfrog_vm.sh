@@ -0,0 +1,32 @@
+set -euo pipefail
+
+# Unset vault password file to avoid errors
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+SKIP_PROVISION="{{ params.skip_vm_provision }}"
+VM_NAME="{{ params.jfrog_vm_name }}"
+
+if [ "$SKIP_PROVISION" = "True" ] || [ "$SKIP_PROVISION" = "true" ]; then
+    echo "[INFO] Skipping VM provisioning (skip_vm_provision=true)"
+    exit 0
+fi
+
+echo "===================================================================="
+echo "[INFO] Provisioning JFrog VM: $VM_NAME"
+echo "===================================================================="
+
+# Check if VM already exists
+if kcli list vm | grep -q "$VM_NAME"; then
+    echo "[INFO] VM $VM_NAME already exists"
+    kcli info vm "$VM_NAME"
+else
+    echo "[INFO] Creating VM $VM_NAME..."
+    kcli create vm "$VM_NAME"         -i centos9stream         -P memory=8192         -P numcpus=4         -P disks=[100]         -P nets=['{"name": "default", "ip": "dhcp"}']
+    
+    echo "[INFO] Waiting for VM to be ready..."
+    sleep 60
+fi
+
+# Get VM IP
+VM_IP=$(kcli info vm "$VM_NAME" -f ip -v 2>/dev/null | tail -1)
+echo "[OK] VM $VM_NAME provisioned with IP: $VM_IP"
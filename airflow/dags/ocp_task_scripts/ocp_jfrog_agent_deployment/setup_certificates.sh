@@ -0,0 +1,40 @@
+set -euo pipefail
+
+# Unset vault password file to avoid errors
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+CERT_PROVIDER="{{ params.cert_provider }}"
+JFROG_HOSTNAME="{{ params.jfrog_hostname }}"
+STEP_CA_URL="{{ params.step_ca_url }}"
+
+echo "===================================================================="
+echo "[INFO] Setting up certificates via $CERT_PROVIDER"
+echo "===================================================================="
+
+cd /root/ocp4-disconnected-helper/playbooks
+
+if [ "$CERT_PROVIDER" = "step-ca" ]; then
+    echo "[INFO] Using step-ca for certificate generation"
+    
+    # Check if step CLI is available
+    if ! command -v step &> /dev/null; then
+        echo "[INFO] Installing step CLI..."
+        curl -sLO https://dl.smallstep.com/gh-release/cli/docs-cli-install/v0.25.0/step-cli_0.25.0_amd64.rpm
+        rpm -i step-cli_0.25.0_amd64.rpm || true
+    fi
+    
+    # Generate certificate from step-ca
+    echo "[INFO] Requesting certificate from step-ca..."
+    step ca certificate "$JFROG_HOSTNAME"         /etc/pki/registry/jfrog.crt         /etc/pki/registry/jfrog.key         --ca-url "$STEP_CA_URL"         --provisioner admin         --not-after 8760h         --san "$JFROG_HOSTNAME"         --san "{{ params.jfrog_vm_name }}"         --force || {
+            echo "[WARN] step-ca certificate request failed, falling back to self-signed"
+            CERT_PROVIDER="self-signed"
+        }
+fi
+
+if [ "$CERT_PROVIDER" = "self-signed" ]; then
+    echo "[INFO] Using self-signed certificates (ADR 0016)"
+    
+    ansible-playbook -i inventory setup-certificates.yml         -e "registry_hostnames=['$JFROG_HOSTNAME', '{{ params.jfrog_vm_name }}']"         -e "cert_server_validity_days=365"
+fi
+
+echo "[OK] Certificate setup completed"
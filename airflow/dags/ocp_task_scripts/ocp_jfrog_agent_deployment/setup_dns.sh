@@ -0,0 +1,29 @@
+set -euo pipefail
+
+# Unset vault password file to avoid errors
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+CLUSTER_NAME="{{ params.cluster_name }}"
+BASE_DOMAIN="{{ params.base_domain }}"
+JFROG_HOSTNAME="{{ params.jfrog_hostname }}"
+
+echo "===================================================================="
+echo "[INFO] Setting up FreeIPA DNS Records"
+echo "===================================================================="
+
+cd /root/ocp4-disconnected-helper/playbooks
+
+# Check if setup-freeipa-dns.yml exists
+if [ ! -f "setup-freeipa-dns.yml" ]; then
+    echo "[WARN] setup-freeipa-dns.yml not found, skipping DNS setup"
+    echo "[INFO] Ensure DNS records are configured manually"
+    exit 0
+fi
+
+# Run DNS setup playbook
+ansible-playbook -i inventory setup-freeipa-dns.yml     -e "cluster_name=$CLUSTER_NAME"     -e "ipa_domain=$BASE_DOMAIN"     -e "jfrog_hostname=${JFROG_HOSTNAME%%.*}" || {
+        echo "[WARN] DNS setup failed, continuing anyway"
+        echo "[INFO] Ensure DNS records are configured manually"
+    }
+
+echo "[OK] DNS setup completed"
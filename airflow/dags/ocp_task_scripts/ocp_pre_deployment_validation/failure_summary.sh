@@ -0,0 +1,16 @@
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "❌ PRE-DEPLOYMENT VALIDATION FAILED"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+echo "One or more validation checks failed."
+echo "Review the failed task logs above for specific error details."
+echo ""
+echo "Each error message includes:"
+echo "  - The specific file or service with the issue"
+echo "  - The exact error encountered"
+echo "  - Commands to fix the issue"
+echo ""
+echo "After fixing, retrigger this DAG to validate again."
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -0,0 +1,41 @@
+set -euo pipefail
+
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "💾 Validating Disk Space"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+
+# Check /var/lib/libvirt/images (VM storage)
+echo "Checking VM storage (/var/lib/libvirt/images)..."
+if [ -d "/var/lib/libvirt/images" ]; then
+    AVAIL=$(df -BG /var/lib/libvirt/images 2>/dev/null | tail -1 | awk '{print $4}' | tr -d 'G')
+    echo "  Available: ${AVAIL}GB"
+
+    if [ "$AVAIL" -lt 100 ]; then
+        echo "  ⚠️  Low space for VM deployment (recommend 100GB+)"
+    else
+        echo "  ✅ Sufficient space"
+    fi
+else
+    echo "  ⚠️  Directory not found"
+fi
+
+# Check /opt/images (mirror storage)
+echo ""
+echo "Checking mirror storage (/opt/images)..."
+mkdir -p /opt/images 2>/dev/null || true
+AVAIL=$(df -BG /opt/images 2>/dev/null | tail -1 | awk '{print $4}' | tr -d 'G')
+echo "  Available: ${AVAIL}GB"
+
+# Check generated assets
+echo ""
+echo "Checking generated assets (/root/generated_assets)..."
+if [ -d "/root/generated_assets" ]; then
+    USED=$(du -sh /root/generated_assets 2>/dev/null | cut -f1)
+    echo "  Used: $USED"
+else
+    echo "  Directory will be created during deployment"
+fi
+
+echo ""
+echo "✅ Disk space validation passed"
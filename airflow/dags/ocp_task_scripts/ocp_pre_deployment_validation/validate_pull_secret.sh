@@ -0,0 +1,82 @@
+set -euo pipefail
+
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🔑 Validating Pull Secret"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+
+PULL_SECRET="/root/pull-secret.json"
+REGISTRY_TYPE="{{ params.registry_type }}"
+
+# Determine registry
+case "$REGISTRY_TYPE" in
+    quay)
+        REGISTRY="mirror-registry.example.com:8443"
+        ;;
+    harbor)
+        REGISTRY="harbor.example.com"
+        ;;
+    jfrog)
+        REGISTRY="jfrog.example.com:8082"
+        ;;
+esac
+
+# Check pull secret exists
+if [ ! -f "$PULL_SECRET" ]; then
+    echo "============================================"
+    echo "VALIDATION ERROR"
+    echo "============================================"
+    echo "File: $PULL_SECRET"
+    echo "Error: Pull secret file not found"
+    echo ""
+    echo "To fix:"
+    echo "  1. Download from: https://console.redhat.com/openshift/install/pull-secret"
+    echo "  2. Save to: $PULL_SECRET"
+    echo "============================================"
+    exit 1
+fi
+
+echo "Pull secret: $PULL_SECRET"
+echo ""
+
+# Validate JSON syntax
+echo "Checking JSON syntax..."
+if jq -e '.' "$PULL_SECRET" > /dev/null 2>&1; then
+    echo "  ✅ Valid JSON"
+else
+    echo "  ❌ Invalid JSON"
+    echo ""
+    echo "============================================"
+    echo "VALIDATION ERROR"
+    echo "============================================"
+    echo "File: $PULL_SECRET"
+    echo "Error: Invalid JSON syntax"
+    echo ""
+    echo "To fix:"
+    echo "  1. Validate JSON: jq '.' $PULL_SECRET"
+    echo "  2. Re-download from Red Hat console"
+    echo "============================================"
+    exit 1
+fi
+
+# Check for registry credentials
+echo ""
+echo "Checking registry credentials..."
+REGISTRIES=$(jq -r '.auths | keys[]' "$PULL_SECRET" 2>/dev/null)
+echo "  Configured registries:"
+echo "$REGISTRIES" | while read reg; do
+    echo "    - $reg"
+done
+
+# Check if our target registry is included
+echo ""
+echo "Checking for $REGISTRY..."
+if echo "$REGISTRIES" | grep -q "$REGISTRY"; then
+    echo "  ✅ Target registry credentials found"
+else
+    echo "  ⚠️  Target registry not in pull secret"
+    echo "     Will be added by ocp_registry_sync DAG"
+fi
+
+echo ""
+echo "✅ Pull secret validation passed"
@@ -0,0 +1,44 @@
+set -euo pipefail
+
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "🔐 Validating Step-CA Server"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+
+STEP_CA_HOST="step-ca-server.example.com"
+STEP_CA_PORT="443"
+
+# Check if step-ca is reachable
+echo "Checking Step-CA at $STEP_CA_HOST:$STEP_CA_PORT..."
+
+if curl -sk --connect-timeout 10 "https://${STEP_CA_HOST}:${STEP_CA_PORT}/health" 2>/dev/null | grep -q "ok"; then
+    echo "  ✅ Step-CA is healthy"
+else
+    # Try alternative check
+    HTTP_CODE=$(curl -sk --connect-timeout 10 -o /dev/null -w "%{http_code}" "https://${STEP_CA_HOST}:${STEP_CA_PORT}/root.crt" 2>/dev/null || echo "000")
+
+    if [ "$HTTP_CODE" = "200" ]; then
+        echo "  ✅ Step-CA is responding (root cert available)"
+    else
+        echo "  ❌ Step-CA is not responding"
+        echo ""
+        echo "============================================"
+        echo "VALIDATION ERROR"
+        echo "============================================"
+        echo "Service: Step-CA"
+        echo "Host: $STEP_CA_HOST:$STEP_CA_PORT"
+        echo "Error: Cannot reach Step-CA server"
+        echo ""
+        echo "To fix:"
+        echo "  1. Check if Step-CA VM is running:"
+        echo "     virsh list --all | grep step-ca"
+        echo ""
+        echo "  2. Redeploy Step-CA:"
+        echo "     airflow dags trigger step_ca_deployment --conf '{"action": "create"}'"
+        echo "============================================"
+        exit 1
+    fi
+fi
+
+echo ""
+echo "✅ Step-CA validation passed"
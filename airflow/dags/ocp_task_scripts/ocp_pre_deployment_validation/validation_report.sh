@@ -0,0 +1,29 @@
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "📋 Pre-Deployment Validation Report"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+echo "Timestamp: $(date -Iseconds)"
+echo "Configuration: {{ params.example_config }}"
+echo "Registry: {{ params.registry_type }}"
+echo "OCP Version: {{ params.ocp_version }}"
+echo ""
+echo "Validation Results:"
+echo "  ✅ Step-CA: Healthy"
+echo "  ✅ Registry: Healthy, certificate valid"
+echo "  ✅ Images: Available in registry"
+echo "  ✅ DNS: All records resolve"
+echo "  ✅ Config: Valid YAML, required fields present"
+echo "  ✅ Pull Secret: Valid JSON"
+echo "  ✅ Disk Space: Sufficient"
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "✅ ALL VALIDATIONS PASSED"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo ""
+echo "Ready to deploy! Run:"
+echo "  airflow dags trigger ocp_agent_deployment --conf '{"
+echo "    "example_config": "{{ params.example_config }}","
+echo "    "registry_type": "{{ params.registry_type }}","
+echo "    "deploy_on_kvm": true"
+echo "  }'"
@@ -0,0 +1,51 @@
+set +e  # Don't exit on error during cleanup
+
+echo "===================================================================="
+echo "[WARN] Cleanup After Failure"
+echo "===================================================================="
+echo ""
+
+# Prune partial content from the oc-mirror workspace, keeping verified blobs
+# (recorded in the transfer journal) so a retrigger resumes instead of restarting
+# Workspace of this run: one per version pair with isolated_workspace=true (workspace_lock.py)
+MIRROR_PATH="/opt/images"
+if [ "{{ params.isolated_workspace }}" = "True" ] || [ "{{ params.isolated_workspace }}" = "true" ]; then
+    MIRROR_PATH="$MIRROR_PATH/runs/{{ params.source_version }}-{{ params.target_version }}"
+fi
+RUN_KEY="{{ params.source_version }}-{{ params.target_version }}"
+# Only a run holding the lease owns the workspace: a run that failed waiting for it
+# must not prune (or reset the journal of) the run downloading there
+HOLDS_LEASE=false
+if python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers workspace-lease check \
+        --workspace "$MIRROR_PATH" --run-id "{{ run_id }}"; then
+    HOLDS_LEASE=true
+else
+    echo "[INFO] $MIRROR_PATH not leased to this run: leaving its workspace and journal alone"
+fi
+if [ "$HOLDS_LEASE" = "true" ] && [ -d "$MIRROR_PATH/oc-mirror-workspace" ]; then
+    echo "[INFO] Checkpointing workspace: keeping verified blobs, pruning partial files..."
+    python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers transfer-checkpoint \
+        --workspace "$MIRROR_PATH/oc-mirror-workspace" \
+        --run-key "$RUN_KEY" \
+        --journal "$MIRROR_PATH/.transfer-journal.jsonl" \
+        --prune
+fi
+
+# Release the workspace: a retrigger (or a retrying run) takes it in its preflight_checks
+python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers workspace-lease release \
+    --workspace "$MIRROR_PATH" --run-id "{{ run_id }}"
+
+echo "[OK] Cleanup complete"
+echo ""
+echo "===================================================================="
+echo "SYNC FAILED - Review errors above"
+echo "===================================================================="
+echo ""
+echo "Common fixes:"
+echo "  1. Check Ansible playbook logs for detailed errors"
+echo "  2. Verify extra_vars files are configured correctly"
+echo "  3. Ensure pull secret is valid and not expired"
+echo "  4. Check disk space: df -h $MIRROR_PATH"
+echo "  5. Check registry connectivity"
+echo ""
+echo "After fixing, retrigger this DAG"
@@ -0,0 +1,156 @@
+set -euo pipefail
+
+SKIP_DOWNLOAD="{{ params.skip_download }}"
+CLEAN_MIRROR="{{ params.clean_mirror }}"
+SOURCE_VERSION="{{ params.source_version }}"
+TARGET_VERSION="{{ params.target_version }}"
+BLOB_STORE="{{ params.blob_store }}"
+ZSTD_PACKAGE="{{ params.zstd_package }}"
+ADAPTIVE="{{ params.adaptive_parallelism }}"
+# Workspace of this run: one per version pair with isolated_workspace=true (workspace_lock.py)
+MIRROR_PATH="/opt/images"
+if [ "{{ params.isolated_workspace }}" = "True" ] || [ "{{ params.isolated_workspace }}" = "true" ]; then
+    MIRROR_PATH="$MIRROR_PATH/runs/{{ params.source_version }}-{{ params.target_version }}"
+fi
+RUN_KEY="${SOURCE_VERSION}-${TARGET_VERSION}"
+JOURNAL="$MIRROR_PATH/.transfer-journal.jsonl"
+PLAN_FILE="$MIRROR_PATH/.mirror-plan/plan.json"
+HELPERS=/root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers
+LEASE_ARGS="--workspace $MIRROR_PATH --run-id {{ run_id }}"
+# Shared by every workspace: layers one sync stored are not downloaded by the next
+BLOB_ROOT=/opt/images/blob-store
+# Source registries the download's concurrency is tuned for; oc-mirror v1 logs to its working directory
+TUNE_ARGS="--registry quay.io --registry registry.redhat.io --log-file $MIRROR_PATH/.oc-mirror.log"
+# Seconds between transfer journal checkpoints while oc-mirror runs
+CHECKPOINT_INTERVAL=300
+
+if [ "$SKIP_DOWNLOAD" = "True" ] || [ "$SKIP_DOWNLOAD" = "true" ]; then
+    echo "===================================================================="
+    echo "[INFO] Skipping Download (skip_download=true)"
+    echo "===================================================================="
+    
+    if ls "$MIRROR_PATH"/*.tar "$MIRROR_PATH"/*.tar.zst 1>/dev/null 2>&1; then
+        echo "[OK] Using existing TAR files:"
+        ls -lh "$MIRROR_PATH"/*.tar "$MIRROR_PATH"/*.tar.zst 2>/dev/null || true
+    else
+        echo "[ERROR] No TAR files found at $MIRROR_PATH"
+        echo "Set skip_download=false to download images"
+        exit 1
+    fi
+    exit 0
+fi
+
+echo "===================================================================="
+echo "[INFO] Downloading OCP ${SOURCE_VERSION}→${TARGET_VERSION} Images via Ansible Playbook"
+echo "===================================================================="
+echo ""
+echo "Per ADR 0012: Using download-to-tar.yml playbook"
+echo ""
+
+cd /root/ocp4-disconnected-helper/playbooks
+
+# Renew this run's lease on the workspace (taken in preflight_checks)
+python3 "$HELPERS" workspace-lease acquire $LEASE_ARGS
+
+# Resume from the verified blobs of an interrupted run of the same release pair
+if [ -f "$JOURNAL" ] && head -n 1 "$JOURNAL" | grep -q "\"run_key\":\"$RUN_KEY\""; then
+    echo "[INFO] Transfer journal found for $RUN_KEY: resuming instead of starting over"
+    python3 "$HELPERS" transfer-checkpoint --workspace "$MIRROR_PATH/oc-mirror-workspace" \
+        --run-key "$RUN_KEY" --journal "$JOURNAL" --prune
+    CLEAN_MIRROR=false
+    echo ""
+fi
+
+# Start from the layers other syncs already stored (clean_mirror would delete them again)
+if { [ "$BLOB_STORE" = "True" ] || [ "$BLOB_STORE" = "true" ]; } && \
+   [ "$CLEAN_MIRROR" != "True" ] && [ "$CLEAN_MIRROR" != "true" ]; then
+    echo "[INFO] Seeding $MIRROR_PATH/oc-mirror-workspace from $BLOB_ROOT"
+    python3 "$HELPERS" blob-store-seed "$MIRROR_PATH/oc-mirror-workspace" \
+        --owner "release-${RUN_KEY}" --root "$BLOB_ROOT" || true
+    echo ""
+fi
+
+# Build extra vars for this run
+EXTRA_VARS=""
+EXTRA_VARS="$EXTRA_VARS -e clean_mirror_path=$CLEAN_MIRROR"
+
+# Check if custom vars file exists (an isolated run's copy holds its resolved releases)
+if [ -f "$MIRROR_PATH/download-to-tar-vars.yml" ]; then
+    echo "[INFO] Using $MIRROR_PATH/download-to-tar-vars.yml"
+    EXTRA_VARS="$EXTRA_VARS -e @$MIRROR_PATH/download-to-tar-vars.yml"
+elif [ -f ../extra_vars/download-to-tar-vars.yml ]; then
+    echo "[INFO] Using extra_vars/download-to-tar-vars.yml"
+    EXTRA_VARS="$EXTRA_VARS -e @../extra_vars/download-to-tar-vars.yml"
+fi
+EXTRA_VARS="$EXTRA_VARS -e target_mirror_path=$MIRROR_PATH"
+
+# Disk check in download-to-tar.yml uses the preflight plan instead of 30GB per release
+if [ -f "$PLAN_FILE" ]; then
+    EXTRA_VARS="$EXTRA_VARS -e required_mirror_space_kb=$(jq -r '.disk_required_kb' "$PLAN_FILE")"
+fi
+
+# Concurrency remembered for these registries over this uplink (after the vars file, so it wins)
+if [ "$ADAPTIVE" = "True" ] || [ "$ADAPTIVE" = "true" ]; then
+    eval "$(python3 "$HELPERS" mirror-parallelism $TUNE_ARGS --shell)"
+    echo "[INFO] Adaptive parallelism: --max-per-registry=$MAX_PER_REGISTRY"
+    EXTRA_VARS="$EXTRA_VARS -e max_per_registry=$MAX_PER_REGISTRY"
+fi
+
+# Unset vault password file env var if no vault is used
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+echo "[INFO] Running: ansible-playbook -i inventory download-to-tar.yml $EXTRA_VARS"
+echo ""
+
+# Journal finished blobs while the download runs, so a crash loses at most one interval,
+# and keep the workspace lease fresh
+(
+    while sleep "$CHECKPOINT_INTERVAL"; do
+        python3 "$HELPERS" transfer-checkpoint --workspace "$MIRROR_PATH/oc-mirror-workspace" \
+            --run-key "$RUN_KEY" --journal "$JOURNAL" >/dev/null 2>&1 || true
+        python3 "$HELPERS" workspace-lease acquire $LEASE_ARGS >/dev/null 2>&1 || true
+    done
+) &
+CHECKPOINT_PID=$!
+trap 'kill $CHECKPOINT_PID 2>/dev/null || true' EXIT
+
+DOWNLOAD_STARTED=$(date +%s)
+
+DOWNLOAD_RC=0
+ansible-playbook -i inventory download-to-tar.yml $EXTRA_VARS || DOWNLOAD_RC=$?
+
+# Step the remembered concurrency from this run, failed runs included (they halve it)
+if [ "$ADAPTIVE" = "True" ] || [ "$ADAPTIVE" = "true" ]; then
+    FAILED_ARG=""
+    [ "$DOWNLOAD_RC" -eq 0 ] || FAILED_ARG="--failed"
+    python3 "$HELPERS" mirror-parallelism $TUNE_ARGS --record --phase download \
+        --started "$DOWNLOAD_STARTED" --layers "$MAX_PER_REGISTRY" --images "$PARALLEL_IMAGES" \
+        --log-offset "$LOG_OFFSET" --archive-dir "$MIRROR_PATH" $FAILED_ARG || true
+fi
+[ "$DOWNLOAD_RC" -eq 0 ] || exit "$DOWNLOAD_RC"
+
+kill $CHECKPOINT_PID 2>/dev/null || true
+python3 "$HELPERS" transfer-checkpoint --run-key "$RUN_KEY" --journal "$JOURNAL" --reset
+python3 "$HELPERS" mirror-throughput --phase download --started "$DOWNLOAD_STARTED" --archive-dir "$MIRROR_PATH" || true
+
+echo ""
+echo "[INFO] Writing integrity manifest for the archive set"
+python3 "$HELPERS" archive-manifest --archive-dir "$MIRROR_PATH"
+
+if [ "$ZSTD_PACKAGE" = "True" ] || [ "$ZSTD_PACKAGE" = "true" ]; then
+    echo ""
+    echo "[INFO] Repacking archives as seekable zstd for transport"
+    python3 "$HELPERS" archive-pack --archive-dir "$MIRROR_PATH"
+fi
+
+if [ "$BLOB_STORE" = "True" ] || [ "$BLOB_STORE" = "true" ]; then
+    echo ""
+    echo "[INFO] Deduplicating workspace layers into $BLOB_ROOT"
+    python3 "$HELPERS" blob-store-ingest \
+        "$MIRROR_PATH/oc-mirror-workspace" \
+        --owner "release-${RUN_KEY}" \
+        --root "$BLOB_ROOT"
+fi
+
+echo ""
+echo "[OK] Download playbook completed"
@@ -0,0 +1,159 @@
+set -euo pipefail
+
+echo "===================================================================="
+echo "[INFO] OCP Registry Sync - Pre-flight Checks"
+echo "===================================================================="
+echo ""
+echo "Source Version: {{ params.source_version }}"
+echo "Target Version: {{ params.target_version }}"
+echo "Upgrade Type: {{ params.upgrade_type }}"
+echo "Auto Resolve: {{ params.auto_resolve_versions }}"
+echo "Cluster Version: {{ params.cluster_version or 'not set (mirror latest source and target)' }}"
+echo "Target Registry: {{ params.target_registry }}"
+echo "Passthrough Mode: {{ params.enable_passthrough }}"
+echo "Skip Download: {{ params.skip_download }}"
+echo "Clean Mirror: {{ params.clean_mirror }}"
+echo "Fan-out Push: {{ params.fanout_push }}"
+echo "Blob Store: {{ params.blob_store }}"
+echo "Zstd Packaging: {{ params.zstd_package }}"
+echo "Adaptive Parallelism: {{ params.adaptive_parallelism }}"
+echo "Isolated Workspace: {{ params.isolated_workspace }}"
+echo "Timestamp: $(date -Iseconds)"
+echo ""
+
+ERRORS=0
+
+# Check required binaries
+echo "[INFO] Checking required binaries..."
+for cmd in ansible-playbook oc oc-mirror curl jq podman; do
+    if command -v $cmd &> /dev/null; then
+        echo "  [OK] $cmd: $(which $cmd)"
+    else
+        echo "  [ERROR] $cmd NOT FOUND"
+        ERRORS=$((ERRORS + 1))
+    fi
+done
+
+# Check playbooks exist
+echo ""
+echo "[INFO] Checking Ansible playbooks..."
+PLAYBOOKS_PATH="/root/ocp4-disconnected-helper/playbooks"
+for playbook in download-to-tar.yml push-tar-to-registry.yml setup-registry-passthrough.yml validate-passthrough-mode.yml; do
+    if [ -f "$PLAYBOOKS_PATH/$playbook" ]; then
+        echo "  [OK] $playbook exists"
+    else
+        echo "  [ERROR] $playbook NOT FOUND at $PLAYBOOKS_PATH"
+        ERRORS=$((ERRORS + 1))
+    fi
+done
+
+# Check extra_vars files
+echo ""
+echo "[INFO] Checking extra_vars files..."
+EXTRA_VARS_PATH="/root/ocp4-disconnected-helper/extra_vars"
+for varsfile in download-to-tar-vars.yml push-tar-to-registry-vars.yml; do
+    if [ -f "$EXTRA_VARS_PATH/$varsfile" ]; then
+        echo "  [OK] $varsfile exists"
+    else
+        echo "  [WARN] $varsfile not found (will use defaults)"
+    fi
+done
+
+# Check pull secret
+echo ""
+echo "[INFO] Checking pull secret..."
+if [ -f /root/pull-secret.json ]; then
+    echo "  [OK] /root/pull-secret.json exists"
+elif [ -f /root/rh-pull-secret ]; then
+    echo "  [OK] /root/rh-pull-secret exists"
+else
+    echo "  [ERROR] No pull secret found"
+    ERRORS=$((ERRORS + 1))
+fi
+
+# Validate the version params against the version matrix (ocp_version_matrix DAG), no API calls
+echo ""
+echo "[INFO] Checking versions against the version matrix..."
+if [ -n "$(find /opt/images/version-matrix.json -mmin -1440 2>/dev/null)" ]; then
+    CHECK_ARGS="--source {{ params.source_version }} --target {{ params.target_version }}"
+    CHECK_ARGS="$CHECK_ARGS --upgrade-type {{ params.upgrade_type }}"
+    if [ -n "{{ params.cluster_version }}" ]; then
+        CHECK_ARGS="$CHECK_ARGS --cluster-version {{ params.cluster_version }}"
+    fi
+    ACCEPT_RISKS="{{ params.accept_upgrade_risks }}"
+    if python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers version-matrix check $CHECK_ARGS \
+            ${ACCEPT_RISKS:+--accept-risk "$ACCEPT_RISKS"}; then
+        echo "  [OK] Versions supported"
+    else
+        echo "  [ERROR] Version check failed (see above)"
+        ERRORS=$((ERRORS + 1))
+    fi
+else
+    echo "  [INFO] No version matrix from the last 24h: versions are resolved from the update graph"
+fi
+
+# Take the workspace: another run of it is waited for, runs of other workspaces go ahead
+echo ""
+echo "[INFO] Acquiring the mirror workspace..."
+# Workspace of this run: one per version pair with isolated_workspace=true (workspace_lock.py)
+MIRROR_PATH="/opt/images"
+if [ "{{ params.isolated_workspace }}" = "True" ] || [ "{{ params.isolated_workspace }}" = "true" ]; then
+    MIRROR_PATH="$MIRROR_PATH/runs/{{ params.source_version }}-{{ params.target_version }}"
+fi
+# Wait briefly only: a busy workspace fails this task, and its retries wait without a worker slot
+if ! python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers workspace-lease acquire \
+        --workspace "$MIRROR_PATH" --run-id "{{ run_id }}" --wait-seconds 300; then
+    echo "[ERROR] $MIRROR_PATH is still in use by another sync (see above)"
+    echo "        preflight_checks is retried; set isolated_workspace=true to sync other version pairs concurrently"
+    exit 1
+fi
+
+# Check disk space against what this image set actually needs
+echo ""
+echo "[INFO] Planning mirror size and duration..."
+PLAN_FILE="$MIRROR_PATH/.mirror-plan/plan.json"
+rm -f "$PLAN_FILE"
+AVAIL=$(df -BG "$MIRROR_PATH" 2>/dev/null | tail -1 | awk '{print $4}' | tr -d 'G')
+echo "  [INFO] Available space: ${AVAIL}GB"
+if [ "{{ params.skip_download }}" = "True" ] || [ "{{ params.skip_download }}" = "true" ]; then
+    echo "  [INFO] skip_download=true: no download to plan"
+else
+    # Disk planned here is reserved against the syncs running next to this one
+    PLAN_ARGS="--mirror-path $MIRROR_PATH --output $PLAN_FILE --run-id {{ run_id }}"
+    PLAN_ARGS="$PLAN_ARGS --run-key {{ params.source_version }}-{{ params.target_version }}"
+    for auth in /root/.docker/config.json /root/pull-secret.json /root/rh-pull-secret; do
+        if [ -f "$auth" ]; then
+            PLAN_ARGS="$PLAN_ARGS --auth-file $auth"
+            break
+        fi
+    done
+    # resolve_versions has not run yet: plan the versions it will pick
+    if [ -n "{{ params.cluster_version }}" ]; then
+        # Only the releases on the upgrade path from the cluster's release (upgrade_path.py)
+        PLAN_ARGS="$PLAN_ARGS --upgrade-from {{ params.cluster_version }} --version {{ params.target_version }}"
+    elif [ "{{ params.auto_resolve_versions }}" = "True" ] || [ "{{ params.auto_resolve_versions }}" = "true" ]; then
+        if [ "{{ params.upgrade_type }}" != "patch" ]; then
+            PLAN_ARGS="$PLAN_ARGS --version {{ params.source_version }}"
+        fi
+        PLAN_ARGS="$PLAN_ARGS --version {{ params.target_version }}"
+    fi
+    if [ "{{ params.clean_mirror }}" = "True" ] || [ "{{ params.clean_mirror }}" = "true" ]; then
+        PLAN_ARGS="$PLAN_ARGS --clean"
+    fi
+    ACCEPT_RISKS="{{ params.accept_upgrade_risks }}"
+    if python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers mirror-plan $PLAN_ARGS \
+            ${ACCEPT_RISKS:+--accept-risk "$ACCEPT_RISKS"}; then
+        echo "  [OK] Mirror plan fits in $MIRROR_PATH"
+    else
+        echo "  [ERROR] Mirror plan failed (see above)"
+        ERRORS=$((ERRORS + 1))
+    fi
+fi
+
+echo ""
+if [ $ERRORS -gt 0 ]; then
+    echo "[ERROR] Pre-flight checks FAILED with $ERRORS error(s)"
+    exit 1
+else
+    echo "[OK] Pre-flight checks PASSED"
+fi
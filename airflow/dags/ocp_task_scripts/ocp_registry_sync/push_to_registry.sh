@@ -0,0 +1,133 @@
+set -euo pipefail
+
+TARGET_REGISTRY="{{ params.target_registry }}"
+FANOUT_PUSH="{{ params.fanout_push }}"
+BLOB_STORE="{{ params.blob_store }}"
+ADAPTIVE="{{ params.adaptive_parallelism }}"
+# Workspace of this run: one per version pair with isolated_workspace=true (workspace_lock.py)
+MIRROR_PATH="/opt/images"
+if [ "{{ params.isolated_workspace }}" = "True" ] || [ "{{ params.isolated_workspace }}" = "true" ]; then
+    MIRROR_PATH="$MIRROR_PATH/runs/{{ params.source_version }}-{{ params.target_version }}"
+fi
+
+echo "===================================================================="
+echo "[INFO] Pushing Images to $TARGET_REGISTRY Registry via Ansible Playbook"
+echo "===================================================================="
+echo ""
+echo "Per ADR 0012: Using push-tar-to-registry.yml playbook"
+echo ""
+
+cd /root/ocp4-disconnected-helper/playbooks
+
+# Renew this run's lease on the workspace (taken in preflight_checks)
+python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers workspace-lease acquire \
+    --workspace "$MIRROR_PATH" --run-id "{{ run_id }}"
+
+# Build extra vars for this run
+EXTRA_VARS=""
+
+# Check if custom vars file exists
+if [ -f ../extra_vars/push-tar-to-registry-vars.yml ]; then
+    echo "[INFO] Using extra_vars/push-tar-to-registry-vars.yml"
+    EXTRA_VARS="$EXTRA_VARS -e @../extra_vars/push-tar-to-registry-vars.yml -e source_mirror_path=$MIRROR_PATH"
+else
+    echo "[ERROR] Missing extra_vars/push-tar-to-registry-vars.yml"
+    echo "This file is required to configure the target registry"
+    exit 1
+fi
+
+PUSH_STARTED=$(date +%s)
+
+# Catch archives damaged in transit before oc-mirror does
+if [ -f "$MIRROR_PATH/mirror-integrity.json" ]; then
+    echo "[INFO] Verifying archives against mirror-integrity.json"
+    python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers archive-verify --archive-dir "$MIRROR_PATH"
+    echo ""
+else
+    echo "[WARN] No $MIRROR_PATH/mirror-integrity.json: archives not verified before push"
+fi
+
+# Update graphs exported by resolve_versions on the connected side
+if [ -f "$MIRROR_PATH/upgrade-graph.json" ]; then
+    python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers upgrade-graph import \
+        --snapshot "$MIRROR_PATH/upgrade-graph.json" || true
+    # ... from which the version matrix is built for upgrade prerequisite checks on this side
+    python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers version-matrix build \
+        {{ params.source_version }} {{ params.target_version }} --offline || true
+    echo ""
+fi
+
+FANOUT=false
+if [ "$FANOUT_PUSH" = "True" ] || [ "$FANOUT_PUSH" = "true" ]; then
+    FANOUT=true
+fi
+
+if [ "$FANOUT" = "true" ]; then
+    echo "[INFO] Fan-out push: reading $MIRROR_PATH once for all configured registries"
+    echo ""
+    STORE_ARGS=""
+    if [ "$BLOB_STORE" = "True" ] || [ "$BLOB_STORE" = "true" ]; then
+        STORE_ARGS="--blob-store /opt/images/blob-store"  # shared by every workspace
+    fi
+    if [ "$ADAPTIVE" = "True" ] || [ "$ADAPTIVE" = "true" ]; then
+        STORE_ARGS="$STORE_ARGS --adaptive"
+    fi
+    python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers push-fanout \
+        --archive-dir "$MIRROR_PATH" \
+        --vars-file ../extra_vars/push-tar-to-registry-vars.yml $STORE_ARGS
+    echo ""
+    # One oc-mirror publish, against the first registry only, still follows: the blobs
+    # are in place, and it writes what fan-out does not (results-*/ICSP, signature
+    # configmaps, catalogs, and the metadata the next incremental --from needs)
+    echo "[INFO] Fan-out push completed; publishing metadata with oc-mirror to the first registry"
+    echo ""
+    EXTRA_VARS="$EXTRA_VARS -e fanout_pushed=true"
+fi
+
+# oc-mirror needs plain TARs (fan-out reads packed archives in place): decompress a
+# temporary copy for the publish, and remove it once the publish is done
+UNPACKED=""
+if ls "$MIRROR_PATH"/mirror_seq*.tar.zst 1>/dev/null 2>&1; then
+    for PACKED in "$MIRROR_PATH"/mirror_seq*.tar.zst; do
+        [ -f "${PACKED%.zst}" ] || UNPACKED="$UNPACKED ${PACKED%.zst}"
+    done
+    trap 'rm -f $UNPACKED' EXIT
+    echo "[INFO] Decompressing zstd-packed archives for the oc-mirror publish (removed afterwards)"
+    python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers archive-unpack \
+        --archive-dir "$MIRROR_PATH" --keep-packed
+    echo ""
+fi
+
+echo "[INFO] Running: ansible-playbook -i inventory push-tar-to-registry.yml $EXTRA_VARS"
+echo ""
+
+# Unset vault password file env var if no vault is used
+unset ANSIBLE_VAULT_PASSWORD_FILE 2>/dev/null || true
+
+TUNE_ARGS="--vars-file ../extra_vars/push-tar-to-registry-vars.yml"
+# Fan-out already moved the blobs, so this publish says nothing about oc-mirror's concurrency
+if [ "$FANOUT" = "false" ] && { [ "$ADAPTIVE" = "True" ] || [ "$ADAPTIVE" = "true" ]; }; then
+    eval "$(python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers mirror-parallelism $TUNE_ARGS --shell)"
+    echo "[INFO] Adaptive parallelism: --max-per-registry=$MAX_PER_REGISTRY"
+    EXTRA_VARS="$EXTRA_VARS -e max_per_registry=$MAX_PER_REGISTRY"
+fi
+
+PUSH_RC=0
+ansible-playbook -i inventory push-tar-to-registry.yml $EXTRA_VARS || PUSH_RC=$?
+if [ "$FANOUT" = "false" ] && { [ "$ADAPTIVE" = "True" ] || [ "$ADAPTIVE" = "true" ]; }; then
+    FAILED_ARG=""
+    [ "$PUSH_RC" -eq 0 ] || FAILED_ARG="--failed"
+    python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers mirror-parallelism $TUNE_ARGS \
+        --record --phase push --started "$PUSH_STARTED" --layers "$MAX_PER_REGISTRY" \
+        --images "$PARALLEL_IMAGES" --archive-dir "$MIRROR_PATH" $FAILED_ARG || true
+fi
+if [ -n "$UNPACKED" ]; then
+    rm -f $UNPACKED
+    echo "[INFO] Removed the decompressed copies; the .tar.zst set is kept"
+fi
+[ "$PUSH_RC" -eq 0 ] || exit "$PUSH_RC"
+python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers mirror-throughput \
+    --phase push --started "$PUSH_STARTED" --archive-dir "$MIRROR_PATH" || true
+
+echo ""
+echo "[OK] Push playbook completed"
@@ -0,0 +1,44 @@
+set -euo pipefail
+
+SOURCE_VERSION="{{ params.source_version }}"
+TARGET_VERSION="{{ params.target_version }}"
+UPGRADE_TYPE="{{ params.upgrade_type }}"
+AUTO_RESOLVE="{{ params.auto_resolve_versions }}"
+CLUSTER_VERSION="{{ params.cluster_version }}"
+VARS_FILE="/root/ocp4-disconnected-helper/extra_vars/download-to-tar-vars.yml"
+# Workspace of this run: one per version pair with isolated_workspace=true (workspace_lock.py)
+MIRROR_PATH="/opt/images"
+if [ "{{ params.isolated_workspace }}" = "True" ] || [ "{{ params.isolated_workspace }}" = "true" ]; then
+    MIRROR_PATH="$MIRROR_PATH/runs/{{ params.source_version }}-{{ params.target_version }}"
+fi
+
+# An isolated run resolves into its own copy: concurrent syncs must not rewrite each other's releases
+if [ "$MIRROR_PATH" != "/opt/images" ]; then
+    mkdir -p "$MIRROR_PATH"
+    cp "$VARS_FILE" "$MIRROR_PATH/download-to-tar-vars.yml"
+    VARS_FILE="$MIRROR_PATH/download-to-tar-vars.yml"
+fi
+
+if [ "$AUTO_RESOLVE" != "True" ] && [ "$AUTO_RESOLVE" != "true" ]; then
+    echo "===================================================================="
+    echo "[INFO] Auto-resolve disabled, using static versions from extra_vars"
+    echo "===================================================================="
+    yq eval '.openshift_releases' "$VARS_FILE"
+    exit 0
+fi
+
+# With cluster_version set, only the releases on its upgrade path are mirrored (upgrade_path.py)
+export ACCEPT_RISKS="{{ params.accept_upgrade_risks }}"
+export UPGRADE_PATH_FILE="$MIRROR_PATH/upgrade-path.json"
+rm -f "$UPGRADE_PATH_FILE"
+
+# Call the version resolution script
+/root/ocp4-disconnected-helper/scripts/resolve-ocp-versions.sh     "$SOURCE_VERSION"     "$TARGET_VERSION"     "$UPGRADE_TYPE"     "$VARS_FILE"     "$CLUSTER_VERSION"
+
+# The graphs used above travel with the archives, so the disconnected side resolves offline
+GRAPH_VERSIONS="$SOURCE_VERSION $TARGET_VERSION"
+if [ -f "$UPGRADE_PATH_FILE" ]; then
+    GRAPH_VERSIONS="$GRAPH_VERSIONS $(yq eval '.releases[]' "$UPGRADE_PATH_FILE" | tr '\n' ' ')"
+fi
+python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers upgrade-graph export \
+    $GRAPH_VERSIONS --snapshot "$MIRROR_PATH/upgrade-graph.json" || true
@@ -0,0 +1,69 @@
+set -euo pipefail
+
+echo ""
+echo "===================================================================="
+echo "[INFO] Registry Sync Report"
+echo "===================================================================="
+echo ""
+echo "Sync Completed: $(date -Iseconds)"
+echo "Source Version: {{ params.source_version }}"
+echo "Target Version: {{ params.target_version }}"
+echo "Upgrade Type:   {{ params.upgrade_type }}"
+echo "Registry:       {{ params.target_registry }}"
+echo "Skip Download:  {{ params.skip_download }}"
+echo "Clean Mirror:   {{ params.clean_mirror }}"
+echo ""
+
+# Show mirror path contents
+# Workspace of this run: one per version pair with isolated_workspace=true (workspace_lock.py)
+MIRROR_PATH="/opt/images"
+if [ "{{ params.isolated_workspace }}" = "True" ] || [ "{{ params.isolated_workspace }}" = "true" ]; then
+    MIRROR_PATH="$MIRROR_PATH/runs/{{ params.source_version }}-{{ params.target_version }}"
+fi
+echo "Mirror Path Contents:"
+ls -lh "$MIRROR_PATH"/*.tar 2>/dev/null | head -5 || echo "  No TAR files"
+
+# Per-phase metrics of this run, compared with the previous runs (sync_metrics.py)
+MODE="oc-mirror"
+if [ "{{ params.fanout_push }}" = "True" ] || [ "{{ params.fanout_push }}" = "true" ]; then
+    MODE="fan-out"
+fi
+DOWNLOAD_ARG=""
+if [ "{{ params.skip_download }}" = "True" ] || [ "{{ params.skip_download }}" = "true" ]; then
+    DOWNLOAD_ARG="--no-download"
+fi
+echo ""
+echo "Sync Metrics:"
+python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers sync-metrics \
+    --run-id "{{ run_id }}" \
+    --source-version "{{ params.source_version }}" --target-version "{{ params.target_version }}" \
+    --mode "$MODE" --mirror-path "$MIRROR_PATH" $DOWNLOAD_ARG \
+{%- for ti in dag_run.get_task_instances() if ti.duration is not none and ti.task_id != task.task_id %}
+    --task "{{ ti.task_id }}={{ ti.duration }}:{{ ti.try_number }}" \
+{%- endfor %}
+    || echo "[WARN] Sync metrics not recorded"
+
+# Show oc-mirror workspace
+if [ -d "$MIRROR_PATH/oc-mirror-workspace" ]; then
+    LATEST_RESULTS=$(ls -td "$MIRROR_PATH/oc-mirror-workspace"/results-* 2>/dev/null | head -1)
+    if [ -d "$LATEST_RESULTS" ]; then
+        echo ""
+        echo "Generated Manifests: $LATEST_RESULTS"
+        ls "$LATEST_RESULTS" 2>/dev/null | head -10
+    fi
+fi
+
+# Let the next sync of this workspace start
+python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers workspace-lease release \
+    --workspace "$MIRROR_PATH" --run-id "{{ run_id }}" || true
+
+echo ""
+echo "===================================================================="
+echo "Next Steps:"
+echo "  1. Run passthrough setup: ansible-playbook setup-registry-passthrough.yml"
+echo "  2. Apply ICSP/IDMS manifests to cluster"
+echo "  3. Validate passthrough: ansible-playbook validate-passthrough-mode.yml"
+echo "  4. Verify images: skopeo list-tags docker://<registry>/<repo>"
+echo "  5. Deploy cluster: airflow dags trigger ocp_agent_deployment"
+echo "===================================================================="
+echo "[OK] OCP Registry Sync completed successfully!"
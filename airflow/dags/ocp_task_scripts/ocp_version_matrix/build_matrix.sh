@@ -0,0 +1,18 @@
+set -euo pipefail
+
+echo "===================================================================="
+echo "[INFO] Building OpenShift Version Matrix"
+echo "===================================================================="
+echo "Offline: {{ params.offline }}"
+echo "Timestamp: $(date -Iseconds)"
+echo ""
+
+MATRIX_ARGS="--matrix /opt/images/version-matrix.json --cache-dir /opt/images/.graph-cache"
+if [ "{{ params.offline }}" = "True" ] || [ "{{ params.offline }}" = "true" ]; then
+    MATRIX_ARGS="$MATRIX_ARGS --offline"
+fi
+
+python3 /root/ocp4-disconnected-helper/airflow/dags/ocp4_helpers version-matrix build $MATRIX_ARGS
+
+echo ""
+echo "[OK] Version matrix updated"
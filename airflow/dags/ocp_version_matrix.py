@@ -0,0 +1,72 @@
+"""
+OCP Version Matrix DAG - Precompute Release Lookups
+ADR Reference: ADR-0046 (tasks SSH to the host)
+
+Rebuilds /opt/images/version-matrix.json from the cached OpenShift update
+graphs every six hours (version_matrix.py). For every supported minor
+(4.17-4.20) it holds the latest GA patch, and for every release its payload
+digest and recommended updates.
+
+Readers answer from the matrix with a dict lookup instead of querying
+api.openshift.com:
+- ocp_registry_sync resolve_versions (latest patch of source and target)
+- ocp_registry_sync preflight_checks (validates the version params)
+- playbooks/check-cluster-upgrade-prerequisites.yml (target offered?)
+
+The graphs are revalidated with ETag/If-Modified-Since, so an unchanged
+channel costs a 304. With offline=true the matrix is built from the cache
+alone, e.g. on the disconnected side after an upgrade-graph.json import.
+"""
+
+from datetime import datetime, timedelta
+from airflow import DAG
+from airflow.models.param import Param
+
+from ocp4_helpers.remote_exec import RemoteBashOperator
+
+# =============================================================================
+# Configuration
+# =============================================================================
+METRICS_ENV = {'OCP4_METRICS_JOURNAL_DIR': '/opt/images/.sync-metrics'}
+
+default_args = {
+    'owner': 'ocp4-disconnected-helper',
+    'depends_on_past': False,
+    'start_date': datetime(2026, 1, 1),
+    'email_on_failure': False,
+    'email_on_retry': False,
+    'retries': 2,
+    'retry_delay': timedelta(minutes=10),
+}
+
+# =============================================================================
+# Define the DAG
+# =============================================================================
+dag = DAG(
+    'ocp_version_matrix',
+    default_args=default_args,
+    description='Rebuild the OpenShift version matrix from the cached update graphs',
+    schedule='0 */6 * * *',
+    catchup=False,
+    max_active_runs=1,
+    tags=['ocp4-disconnected-helper', 'openshift', 'versions'],
+    params={
+        'offline': Param(
+            default=False,
+            type='boolean',
+            description='Build from the graph cache only (disconnected side)',
+        ),
+    },
+    doc_md=__doc__,
+)
+
+# =============================================================================
+# Task 1: Build the Version Matrix
+# =============================================================================
+build_matrix = RemoteBashOperator(
+    task_id='build_matrix',
+    remote_script='ocp_task_scripts/ocp_version_matrix/build_matrix.sh',
+    remote_env=METRICS_ENV,
+    execution_timeout=timedelta(minutes=15),
+    dag=dag,
+)
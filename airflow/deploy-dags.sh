@@ -14,6 +14,11 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 SOURCE_DIR="${SCRIPT_DIR}/dags"
 TARGET_DIR="${QUBINODE_NAVIGATOR_PATH:-/root/qubinode_navigator}/airflow/dags"
 PROJECT_PREFIX="ocp_"  # All our DAGs start with this prefix
+# Helper modules imported by the DAGs - deployed alongside them as one package, so
+# nothing lands flat in the shared dags folder next to other projects' modules
+HELPERS_PACKAGE="ocp4_helpers"
+# Task script templates (rendered by Airflow when a task runs) - deployed as a tree
+TASK_SCRIPTS_DIR="ocp_task_scripts"
 
 # Colors
 RED='\033[0;31m'
@@ -38,12 +43,28 @@ check_prerequisites() {
     fi
 }
 
+list_helper_modules() {
+    local dir="$1"
+    [ -d "$dir/$HELPERS_PACKAGE" ] && find "$dir/$HELPERS_PACKAGE" -type f -name "*.py" -not -path "*/__pycache__/*" | sort
+    return 0
+}
+
+list_task_scripts() {
+    local dir="$1"
+    [ -d "$dir/$TASK_SCRIPTS_DIR" ] && find "$dir/$TASK_SCRIPTS_DIR" -type f -name "*.sh" | sort
+    return 0
+}
+
 list_source_dags() {
-    find "$SOURCE_DIR" -name "${PROJECT_PREFIX}*.py" -type f 2>/dev/null
+    find "$SOURCE_DIR" -maxdepth 1 -name "${PROJECT_PREFIX}*.py" -type f 2>/dev/null
+    list_helper_modules "$SOURCE_DIR"
+    list_task_scripts "$SOURCE_DIR"
 }
 
 list_deployed_dags() {
-    find "$TARGET_DIR" -name "${PROJECT_PREFIX}*.py" -type f 2>/dev/null
+    find "$TARGET_DIR" -maxdepth 1 -name "${PROJECT_PREFIX}*.py" -type f 2>/dev/null
+    list_helper_modules "$TARGET_DIR"
+    list_task_scripts "$TARGET_DIR"
 }
 
 deploy_dags() {
@@ -51,13 +72,14 @@ deploy_dags() {
     
     local count=0
     for dag_file in $(list_source_dags); do
-        local filename=$(basename "$dag_file")
+        local filename="${dag_file#$SOURCE_DIR/}"
         local target_file="$TARGET_DIR/$filename"
         
         # Copy the file
+        mkdir -p "$(dirname "$target_file")"
         cp "$dag_file" "$target_file"
         log_info "  Deployed: $filename"
-        ((count++))
+        count=$((count + 1))
     done
 
     if [ $count -eq 0 ]; then
@@ -76,7 +98,7 @@ check_status() {
     
     echo "Source DAGs (ocp4-disconnected-helper):"
     for dag_file in $(list_source_dags); do
-        local filename=$(basename "$dag_file")
+        local filename="${dag_file#$SOURCE_DIR/}"
         local mtime=$(stat -c %y "$dag_file" 2>/dev/null | cut -d. -f1)
         echo "  - $filename (modified: $mtime)"
     done
@@ -88,7 +110,7 @@ check_status() {
         echo "  (none)"
     else
         for dag_file in $deployed; do
-            local filename=$(basename "$dag_file")
+            local filename="${dag_file#$TARGET_DIR/}"
             local mtime=$(stat -c %y "$dag_file" 2>/dev/null | cut -d. -f1)
             echo "  - $filename (modified: $mtime)"
         done
@@ -98,7 +120,7 @@ check_status() {
     echo "Sync status:"
     local needs_sync=false
     for dag_file in $(list_source_dags); do
-        local filename=$(basename "$dag_file")
+        local filename="${dag_file#$SOURCE_DIR/}"
         local target_file="$TARGET_DIR/$filename"
         
         if [ ! -f "$target_file" ]; then
@@ -123,10 +145,10 @@ remove_dags() {
     
     local count=0
     for dag_file in $(list_deployed_dags); do
-        local filename=$(basename "$dag_file")
+        local filename="${dag_file#$TARGET_DIR/}"
         rm -f "$dag_file"
         log_info "  Removed: $filename"
-        ((count++))
+        count=$((count + 1))
     done
 
     if [ $count -eq 0 ]; then
@@ -134,6 +156,8 @@ remove_dags() {
     else
         log_info "Removed $count DAG(s)"
     fi
+    rm -rf "$TARGET_DIR/$HELPERS_PACKAGE/__pycache__"
+    find "$TARGET_DIR/$HELPERS_PACKAGE" "$TARGET_DIR/$TASK_SCRIPTS_DIR" -depth -type d -empty -delete 2>/dev/null || true
 }
 
 # Main
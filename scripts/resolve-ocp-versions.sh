@@ -9,6 +9,8 @@ SOURCE_VERSION="${1:-4.19}"
 TARGET_VERSION="${2:-4.20}"
 UPGRADE_TYPE="${3:-major}"
 VARS_FILE="${4:-/root/ocp4-disconnected-helper/extra_vars/download-to-tar-vars.yml}"
+# Exact release the cluster runs (e.g. 4.19.12): mirror only its upgrade path to the target
+CURRENT_VERSION="${5:-}"
 
 echo "===================================================================="
 echo "[INFO] Resolving OCP Versions from OpenShift API"
@@ -18,22 +20,72 @@ echo "Source Version: $SOURCE_VERSION"
 echo "Target Version: $TARGET_VERSION"
 echo "Upgrade Type: $UPGRADE_TYPE"
 echo "Vars File: $VARS_FILE"
+if [ -n "$CURRENT_VERSION" ]; then
+    echo "Cluster Version: $CURRENT_VERSION"
+fi
 echo ""
 
+# Update graphs are cached in GRAPH_CACHE_DIR and revalidated with ETag/If-Modified-Since
+# (airflow/dags/ocp4_helpers/upgrade_graph.py); GRAPH_OFFLINE=true resolves from the cache only
+HELPERS="$(cd "$(dirname "$0")/.." && pwd)/airflow/dags/ocp4_helpers"
+GRAPH_ARGS="--cache-dir ${GRAPH_CACHE_DIR:-/opt/images/.graph-cache}"
+if [ "${GRAPH_OFFLINE:-false}" = "true" ]; then
+    GRAPH_ARGS="$GRAPH_ARGS --offline"
+fi
+
+# The version matrix (ocp_version_matrix DAG, airflow/dags/ocp4_helpers/version_matrix.py) answers without
+# the network; the update graph is only queried when it is missing, too old or lacks a minor
+MATRIX_ARGS="--matrix ${VERSION_MATRIX:-/opt/images/version-matrix.json}"
+
 # Function to get the latest patch version for a given minor version
 get_latest_patch() {
     local version=$1
-    local channel="stable-${version}"
-    
-    local result=$(curl -s -H "Accept: application/json" \
-        "https://api.openshift.com/api/upgrades_info/v1/graph?channel=${channel}" | \
-        jq -r --arg ver "$version" '.nodes[] | select(.version | startswith($ver)) | .version' | \
-        sort -V | tail -1)
-    
-    echo "$result"
+    python3 "$HELPERS" version-matrix latest "$version" $MATRIX_ARGS 2>/dev/null \
+        || python3 "$HELPERS" upgrade-graph latest "$version" $GRAPH_ARGS || true
+}
+
+in_matrix() {
+    python3 "$HELPERS" version-matrix latest "$1" $MATRIX_ARGS >/dev/null 2>&1
 }
 
-echo "[INFO] Querying OpenShift API for latest patch versions..."
+if [ -n "$CURRENT_VERSION" ]; then
+    # Upgrade path: the releases the cluster actually passes through (airflow/dags/ocp4_helpers/upgrade_path.py).
+    # ACCEPT_RISKS ('*' for all) and BLOCKED_RELEASES (releases or "a->b" edges) are space-separated.
+    echo "[INFO] Solving the upgrade path $CURRENT_VERSION -> $TARGET_VERSION..."
+    UPGRADE_PATH_FILE="${UPGRADE_PATH_FILE:-$(mktemp /tmp/upgrade-path.XXXXXX.json)}"
+    python3 "$HELPERS" upgrade-path --from "$CURRENT_VERSION" --to "$TARGET_VERSION" \
+        --output "$UPGRADE_PATH_FILE" $GRAPH_ARGS \
+        ${ACCEPT_RISKS:+--accept-risk "$ACCEPT_RISKS"} ${BLOCKED_RELEASES:+--block "$BLOCKED_RELEASES"}
+
+    # One exact entry per release on the path; oc-mirror adds nothing in between
+    export UPGRADE_PATH_FILE
+    yq eval -i '.openshift_releases = load(strenv(UPGRADE_PATH_FILE)).openshift_releases' "$VARS_FILE"
+
+    # Update operator catalog version (the minor the cluster ends on)
+    export CATALOG_VER="$(yq eval '.target' "$UPGRADE_PATH_FILE" | cut -d. -f1,2)"
+    yq eval -i '
+        .certified_operator_index_version = env(CATALOG_VER) |
+        .redhat_operator_index_version = env(CATALOG_VER)
+    ' "$VARS_FILE"
+
+    echo ""
+    echo "[OK] Upgrade path resolved and updated in $VARS_FILE"
+    echo ""
+    echo "Updated openshift_releases:"
+    yq eval '.openshift_releases' "$VARS_FILE"
+    exit 0
+fi
+
+if in_matrix "$TARGET_VERSION" && { [ "$UPGRADE_TYPE" = "patch" ] || in_matrix "$SOURCE_VERSION"; }; then
+    echo "[INFO] Resolving latest patch versions from the version matrix..."
+else
+    echo "[INFO] Querying OpenShift API for latest patch versions..."
+    if [ "$UPGRADE_TYPE" = "patch" ]; then
+        python3 "$HELPERS" upgrade-graph fetch "$TARGET_VERSION" $GRAPH_ARGS || true
+    else
+        python3 "$HELPERS" upgrade-graph fetch "$SOURCE_VERSION" "$TARGET_VERSION" $GRAPH_ARGS || true
+    fi
+fi
 
 if [ "$UPGRADE_TYPE" = "patch" ]; then
     # Patch upgrade: only need target version